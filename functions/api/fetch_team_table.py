@@ -2,13 +2,20 @@
 # functions/api/fetch_team_table.py
 
 import requests
-from bs4 import BeautifulSoup
 import argparse
+import json
 import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
 from flask import Flask, request, jsonify
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
+from lib import http_client
 from lib.env_loader import ensure_loaded_for
+from lib.nst_team_table import TeamTableNotFound, clean_header, parse_team_table, validate_percentage  # noqa: F401
+from lib.response_cache import MemoryBackend, ResponseCache, SQLiteBackend
 
 # Optional DB access for dynamic season discovery
 try:
@@ -17,6 +24,10 @@ except Exception:  # pragma: no cover
     get_conn = None  # type: ignore
 
 
+# NST is rate limited: retry a 429/5xx once, and only when Retry-After is short
+TEAM_TABLE_RETRY = http_client.RetryPolicy(retries=1, retry_after_max=5.0)
+
+
 @dataclass(frozen=True)
 class TeamTableResult:
     payload: Dict[str, Any]
@@ -47,25 +58,6 @@ def missing_required_parameters_result() -> TeamTableResult:
     )
 
 
-def clean_header(header: str) -> str:
-    """
-    Replace '/60' with '_perSixty' and '%' with 'Pct' in the header names.
-    """
-    header = header.replace('/60', '_perSixty')  # Added underscore
-    header = header.replace('/GP', '_perGame')  # Added underscore
-    header = header.replace('%', 'Pct')
-    return header
-
-def validate_percentage(value):
-    try:
-        num = float(value)
-        if 0 <= num <= 100:
-            return num
-        else:
-            return None
-    except:
-        return None
-
 def fetch_team_table(from_season='20242025', thru_season='20242025',
                     stype='2', sit='pk', score='all', rate='n',
                     team='all', loc='B', gpf='410', fd='', td=''):
@@ -103,16 +95,14 @@ def fetch_team_table(from_season='20242025', thru_season='20242025',
     }
 
     try:
-        # Fetch the team table page
-        response = requests.get(url, headers=headers, timeout=10)
+        # Fetch the team table page (shared keep-alive client; one retry on 429/5xx)
+        response = http_client.get_client().get(url, headers=headers, timeout=10, retry=TEAM_TABLE_RETRY)
         response.raise_for_status()
 
-        # Parse the HTML content
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Locate the table by ID
-        table = soup.find('table', id='teams')
-        if not table:
+        # Parse only table#teams (lxml when installed, html.parser otherwise)
+        try:
+            headers, rows = parse_team_table(response.text, fd=fd, sit=sit)
+        except TeamTableNotFound:
             return _error_result(
                 result,
                 code="missing_table",
@@ -123,52 +113,9 @@ def fetch_team_table(from_season='20242025', thru_season='20242025',
                 ),
             )
 
-        # Extract table headers and clean them
-        headers = []
-        for th in table.find('thead').find_all('th'):
-            raw_header = th.get_text(strip=True)
-            cleaned_header = clean_header(raw_header)
-            headers.append(cleaned_header)
-
         # Log the table headers
         result["debug"]["Table headers"] = headers
 
-        # Define necessary columns
-        necessary_columns = {
-            "Team", "GP", "TOI", "W", "L", "OTL", "Points",
-            "CF", "CA", "CFPct", "FF", "FA", "FFPct",
-            "SF", "SA", "SFPct", "GF", "GA", "GFPct",
-            "xGF", "xGA", "xGFPct", "SCF", "SCA", "SCFPct",
-            "HDCF", "HDCA", "HDCFPct", "HDSF", "HDSA", "HDSFPct",
-            "HDGF", "HDGA", "HDGFPct", "SHPct", "SVPct", "PDO"
-        }
-
-        # Extract table rows
-        rows = []
-        for tr in table.find('tbody').find_all('tr'):
-            cells = tr.find_all('td')
-            row = {}
-            row['date'] = fd  # Assign the fetch date
-            row['situation'] = sit  # Assign the situation
-
-            for i, th in enumerate(headers):
-                if th not in necessary_columns:
-                    continue  # Skip unnecessary columns
-                if i < len(cells):
-                    cell_text = cells[i].get_text(strip=True)
-                    # Convert '-' to None
-                    cell_text = cell_text if cell_text != '-' else None
-                    # Validate percentage fields
-                    if th.endswith('Pct'):
-                        cell_text = validate_percentage(cell_text)
-                    row[th] = cell_text
-                else:
-                    # Assign default value if cell is missing
-                    row[th] = None
-
-            if row:  # Ensure row is not empty
-                rows.append(row)
-
         # Log the number of rows parsed
         result["debug"]["Number of rows parsed"] = len(rows)
 
@@ -213,6 +160,149 @@ def fetch_team_table(from_season='20242025', thru_season='20242025',
     return TeamTableResult(payload=result, status_code=200)
 
 
+# Response cache (TEAM_TABLE_CACHE=memory|sqlite|off). Tables for date ranges that
+# ended before yesterday never change upstream; open ranges get a short TTL and are
+# served stale while one background fetch refreshes them.
+CLOSED_RANGE_TTL_SECONDS = 24 * 3600
+OPEN_RANGE_TTL_SECONDS = 300
+OPEN_RANGE_STALE_SECONDS = 900
+
+
+def _team_table_cache_from_env() -> ResponseCache | None:
+    mode = (os.environ.get("TEAM_TABLE_CACHE") or "memory").strip().lower()
+    if mode in ("off", "none", "0", "false"):
+        return None
+    if mode == "sqlite":
+        path = os.environ.get("TEAM_TABLE_CACHE_PATH") or os.path.join(
+            tempfile.gettempdir(), "team_table_cache.sqlite"
+        )
+        backend = SQLiteBackend(path)
+    else:
+        backend = MemoryBackend(max_entries=int(os.environ.get("TEAM_TABLE_CACHE_MAX_ENTRIES", "256")))
+    # Errors (missing key, upstream failures) are never cached
+    return ResponseCache(backend, should_cache=lambda value: value["status_code"] == 200)
+
+
+team_table_cache = _team_table_cache_from_env()
+
+
+def team_table_ttl(thru_season: str, td: str, today: date | None = None) -> Tuple[float, float]:
+    """Return (ttl, stale_ttl) seconds for a request's date range."""
+    today = today or datetime.now(timezone.utc).date()
+    try:
+        if td:
+            closed = date.fromisoformat(td) < today - timedelta(days=1)
+        else:
+            closed = int(str(thru_season)[4:8]) < today.year
+    except ValueError:
+        closed = False
+    if closed:
+        return CLOSED_RANGE_TTL_SECONDS, 0.0
+    return OPEN_RANGE_TTL_SECONDS, OPEN_RANGE_STALE_SECONDS
+
+
+def cached_fetch_team_table(**params: str) -> Tuple[TeamTableResult, str]:
+    """`fetch_team_table` behind `team_table_cache`; returns (result, cache status)."""
+    if team_table_cache is None:
+        return fetch_team_table(**params), "bypass"
+
+    def load() -> Dict[str, Any]:
+        result = fetch_team_table(**params)
+        return {"payload": result.payload, "status_code": result.status_code}
+
+    ttl, stale_ttl = team_table_ttl(params.get("thru_season", ""), params.get("td", ""))
+    key = "team_table:" + json.dumps(params, sort_keys=True)
+    value, status = team_table_cache.get_or_load(key, load, ttl=ttl, stale_ttl=stale_ttl)
+    return TeamTableResult(payload=value["payload"], status_code=value["status_code"]), status
+
+
+# Batch endpoint: several (sit, rate, fd, td) tables for one season range, fetched
+# concurrently over the shared keep-alive client so total latency tracks the slowest table.
+BATCH_SPEC_FIELDS = ("sit", "rate", "fd", "td")
+BATCH_SHARED_DEFAULTS = {"stype": "2", "score": "all", "team": "all", "loc": "B", "gpf": "410"}
+BATCH_MAX_SPECS = 16
+BATCH_MAX_WORKERS = 4
+
+def invalid_batch_result(message: str) -> TeamTableResult:
+    return _error_result(
+        {"debug": {}, "data": []},
+        code="invalid_request",
+        message=message,
+        status_code=400,
+    )
+
+
+def parse_batch_request(body: Any, from_season: str, thru_season: str) -> Tuple[Dict[str, str], List[Dict[str, str]]] | TeamTableResult:
+    """Validate a batch body into (shared params, specs), or an invalid_request result.
+
+    Body: {"specs": [{"sit": ..., "rate": ..., "fd"?: ..., "td"?: ...}, ...]} plus
+    optional shared from_season / thru_season / stype / score / team / loc / gpf.
+    """
+    if not isinstance(body, dict) or not isinstance(body.get("specs"), list) or not body["specs"]:
+        return invalid_batch_result("Body must contain a non-empty 'specs' list.")
+    if len(body["specs"]) > BATCH_MAX_SPECS:
+        return invalid_batch_result(f"At most {BATCH_MAX_SPECS} specs per batch.")
+    shared = {
+        "from_season": str(body.get("from_season") or from_season),
+        "thru_season": str(body.get("thru_season") or thru_season),
+    }
+    for key, default in BATCH_SHARED_DEFAULTS.items():
+        shared[key] = str(body.get(key) or default)
+    specs = []
+    for i, raw in enumerate(body["specs"]):
+        if not isinstance(raw, dict) or not raw.get("sit") or not raw.get("rate"):
+            return invalid_batch_result(f"Spec {i} is missing required parameters: 'sit' and 'rate'.")
+        specs.append({key: str(raw.get(key) or "") for key in BATCH_SPEC_FIELDS})
+    return shared, specs
+
+
+def fetch_team_tables(
+    specs: List[Dict[str, str]],
+    shared: Dict[str, str],
+    max_workers: int = BATCH_MAX_WORKERS,
+) -> TeamTableResult:
+    """Fetch every spec concurrently (through the response cache); one combined payload.
+
+    `data` holds one entry per spec, in request order, with its own status_code,
+    cache outcome, rows and error. Status is 200 when every spec succeeded, 207 when
+    some failed and 502 when all failed.
+    """
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(len(specs), max_workers))) as pool:
+        outcomes = list(pool.map(lambda spec: cached_fetch_team_table(**shared, **spec), specs))
+
+    entries = []
+    for spec, (result, cache_status) in zip(specs, outcomes):
+        entry = {
+            "spec": spec,
+            "status_code": result.status_code,
+            "cache": cache_status,
+            "data": result.payload.get("data", []),
+        }
+        if "error" in result.payload:
+            entry["error"] = result.payload["error"]
+        entries.append(entry)
+
+    succeeded = sum(1 for e in entries if e["status_code"] == 200)
+    payload: Dict[str, Any] = {
+        "debug": {
+            "Specs": len(specs),
+            "Succeeded": succeeded,
+            "Duration ms": round((time.perf_counter() - t0) * 1000, 1),
+            "Resolved from_season": shared["from_season"],
+            "Resolved thru_season": shared["thru_season"],
+        },
+        "data": entries,
+    }
+    if succeeded == len(entries):
+        return TeamTableResult(payload=payload, status_code=200)
+    if succeeded:
+        return TeamTableResult(payload=payload, status_code=207)
+    payload["error"] = {"code": "batch_failed", "message": "Every team-table request in the batch failed."}
+    payload["debug"]["Status"] = "batch_failed"
+    return TeamTableResult(payload=payload, status_code=502)
+
+
 app = Flask(__name__)
 
 
@@ -274,9 +364,9 @@ def _handle_fetch_team_table_request():
         result = missing_required_parameters_result()
         return jsonify(result.payload), result.status_code
 
-    result = fetch_team_table(
-    from_season=from_season,
-    thru_season=thru_season,
+    result, cache_status = cached_fetch_team_table(
+        from_season=from_season,
+        thru_season=thru_season,
         stype=stype,
         sit=sit,
         score=score,
@@ -294,7 +384,20 @@ def _handle_fetch_team_table_request():
         dbg = payload.setdefault('debug', {})
         dbg.setdefault('Resolved from_season', from_season)
         dbg.setdefault('Resolved thru_season', thru_season)
-    return jsonify(payload), result.status_code
+    return jsonify(payload), result.status_code, {"X-Cache": cache_status}
+
+
+def _handle_fetch_team_tables_request():
+    body = request.get_json(silent=True)
+    current_sid = None
+    if not isinstance(body, dict) or not body.get("from_season") or not body.get("thru_season"):
+        current_sid, _last_sid = _get_current_and_last_season_ids()
+    parsed = parse_batch_request(body, current_sid, current_sid)
+    if isinstance(parsed, TeamTableResult):
+        return jsonify(parsed.payload), parsed.status_code
+    shared, specs = parsed
+    result = fetch_team_tables(specs, shared)
+    return jsonify(result.payload), result.status_code
 
 
 # Support both styles of routing depending on how Vercel forwards PATH_INFO
@@ -309,6 +412,11 @@ def fetch_team_table_handler_api_path():
     return _handle_fetch_team_table_request()
 
 
+@app.route("/api/fetch_team_table/batch", methods=["POST"])
+def fetch_team_tables_handler():
+    return _handle_fetch_team_tables_request()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Fetch team table data.')
     parser.add_argument('--from_season', default='20242025', help='From season')
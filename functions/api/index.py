@@ -1,5 +1,14 @@
 from flask import Flask, request, jsonify
-from api.fetch_team_table import fetch_team_table, missing_required_parameters_result
+from api.fetch_team_table import (
+    TeamTableResult,
+    cached_fetch_team_table,
+    fetch_team_tables,
+    missing_required_parameters_result,
+    parse_batch_request,
+    team_table_cache,
+)
+from lib import http_client
+from lib.sko_jobs import get_runner as get_sko_job_runner
 from lib.sko_pipeline import trigger_sko_step_forward
 import os
 import secrets
@@ -13,7 +22,8 @@ def home():
 
 @app.route('/healthz')
 def healthz():
-    return jsonify({"ok": True}), 200
+    cache = {"team_table": team_table_cache.stats() if team_table_cache is not None else None}
+    return jsonify({"ok": True, "cache": cache, "http": http_client.get_client().metrics()}), 200
 
 
 def _check_auth() -> tuple[bool, str]:
@@ -53,8 +63,8 @@ def fetch_team_table_api():
         result = missing_required_parameters_result()
         return jsonify(result.payload), result.status_code
 
-    # Call fetch_team_table with the parameters
-    result = fetch_team_table(
+    # Call fetch_team_table (through the response cache) with the parameters
+    result, cache_status = cached_fetch_team_table(
         from_season=from_season,
         thru_season=thru_season,
         stype=stype,
@@ -75,14 +85,21 @@ def fetch_team_table_api():
         debug.setdefault('Resolved thru_season', thru_season)
 
     # Both Flask entrypoints serialize the same structured payload once.
-    return jsonify(payload), result.status_code
+    return jsonify(payload), result.status_code, {"X-Cache": cache_status}
 
 
-@app.route('/sko/pipeline', methods=['POST'])
-def run_sko_pipeline():
-    ok, msg = _check_auth()
-    if not ok:
-        return jsonify({"success": False, "message": msg}), 401
+@app.route('/fetch_team_tables', methods=['POST'])
+def fetch_team_tables_api():
+    # Shared season range defaults match /fetch_team_table
+    parsed = parse_batch_request(request.get_json(silent=True), '20242025', '20242025')
+    if isinstance(parsed, TeamTableResult):
+        return jsonify(parsed.payload), parsed.status_code
+    shared, specs = parsed
+    result = fetch_team_tables(specs, shared)
+    return jsonify(result.payload), result.status_code
+
+
+def _pipeline_payload() -> dict:
     payload = dict(request.get_json(silent=True) or {})
 
     # Allow callers to pass ?step=score or ?steps=backfill,train,score via query string.
@@ -91,12 +108,66 @@ def run_sko_pipeline():
             payload['step'] = request.args['step']
         elif 'steps' in request.args:
             payload['steps'] = [value.strip() for value in request.args['steps'].split(',') if value.strip()]
+    return payload
+
+
+@app.route('/sko/pipeline', methods=['POST'])
+def run_sko_pipeline():
+    ok, msg = _check_auth()
+    if not ok:
+        return jsonify({"success": False, "message": msg}), 401
+    payload = _pipeline_payload()
 
     result = trigger_sko_step_forward(payload)
     status = 200 if result.get("success") else 500
     return jsonify(result), status
 
 
+def _sko_jobs_enabled() -> bool:
+    # Job threads and the /tmp store don't survive a frozen serverless instance
+    if os.environ.get("VERCEL"):
+        return False
+    return (os.environ.get("SKO_JOBS_ENABLED") or "").strip().lower() in ("1", "true", "yes")
+
+
+def _sko_jobs_unavailable():
+    return jsonify({
+        "success": False,
+        "message": "SKO pipeline jobs require a long-running worker (set SKO_JOBS_ENABLED).",
+        "implemented": False,
+    }), 501
+
+
+@app.route('/sko/jobs', methods=['POST'])
+def submit_sko_job():
+    """Start the pipeline in the background; poll /sko/jobs/<job_id> for progress."""
+    ok, msg = _check_auth()
+    if not ok:
+        return jsonify({"success": False, "message": msg}), 401
+    if not _sko_jobs_enabled():
+        return _sko_jobs_unavailable()
+
+    result = get_sko_job_runner().submit(_pipeline_payload())
+    if not result.get("success"):
+        return jsonify(result), 500
+    result["status_url"] = f"/sko/jobs/{result['job_id']}"
+    return jsonify(result), 202
+
+
+@app.route('/sko/jobs/<job_id>', methods=['GET'])
+def get_sko_job(job_id: str):
+    ok, msg = _check_auth()
+    if not ok:
+        return jsonify({"success": False, "message": msg}), 401
+    if not _sko_jobs_enabled():
+        return _sko_jobs_unavailable()
+
+    job = get_sko_job_runner().status(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": f"Unknown job '{job_id}'"}), 404
+    return jsonify({"success": True, **job}), 200
+
+
 @app.route('/sko/pipeline-step', methods=['POST'])
 def run_sko_pipeline_step():
     """Lightweight segmented step handler.
@@ -0,0 +1,223 @@
+"""Shared HTTP client for upstream calls (NST, sKO pipeline, ...).
+
+Purpose:
+  One `requests.Session` per process, so repeated calls to the same host reuse
+  keep-alive connections instead of paying a TCP/TLS handshake each time.
+
+Features:
+  * Connection pools per host (`pool_maxsize` connections kept alive per host).
+  * Per-host concurrency limit (`max_per_host`): callers block rather than open
+    more simultaneous requests than the upstream tolerates.
+  * Retries with exponential backoff and jitter for connection errors and
+    retryable statuses (429 / 5xx). A `Retry-After` header (seconds or HTTP date)
+    replaces the computed delay. If it asks for longer than `retry_after_max`,
+    the response is returned as-is. Only idempotent methods are retried by
+    default; POSTs that trigger work are never replayed.
+  * Per-host timing metrics (`metrics()`), surfaced on `/healthz`.
+
+Usage:
+  from lib import http_client
+  resp = http_client.get_client().get(url, headers=..., timeout=10)
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    jitter: float = 0.5  # +/- fraction of the computed delay
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    retry_methods: Tuple[str, ...] = ("GET", "HEAD", "OPTIONS")
+    retry_timeouts: bool = False
+    retry_after_max: float = 30.0
+
+
+NO_RETRY = RetryPolicy(retries=0)
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.total_ms / self.requests, 1) if self.requests else None,
+            "max_ms": round(self.max_ms, 1),
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "statuses": dict(self.statuses),
+        }
+
+
+def parse_retry_after(value: Any, now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header value, or None when absent/invalid."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class HttpClient:
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        max_per_host: int = 8,
+        retry: RetryPolicy = RetryPolicy(),
+        default_timeout: float = 10.0,
+        sleep: Callable[[float], None] = time.sleep,
+        rand: Callable[[], float] = random.random,
+    ):
+        self.retry = retry
+        self.default_timeout = default_timeout
+        self.max_per_host = max_per_host
+        self.sleep = sleep
+        self.rand = rand
+        self.session = requests.Session()
+        # Retries are handled here (with metrics and Retry-After), not by urllib3
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._metrics: Dict[str, HostMetrics] = {}
+
+    def _host(self, host: str) -> Tuple[threading.BoundedSemaphore, HostMetrics]:
+        with self._lock:
+            if host not in self._limits:
+                self._limits[host] = threading.BoundedSemaphore(self.max_per_host)
+                self._metrics[host] = HostMetrics()
+            return self._limits[host], self._metrics[host]
+
+    def backoff(self, attempt: int, policy: RetryPolicy) -> float:
+        delay = min(policy.backoff_max, policy.backoff_base * (2 ** attempt))
+        return max(0.0, delay * (1 + policy.jitter * (2 * self.rand() - 1)))
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retry: RetryPolicy | None = None,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        policy = retry or self.retry
+        method = method.upper()
+        limit, stats = self._host(urlsplit(url).netloc)
+        can_retry = method in policy.retry_methods
+        attempt = 0
+        while True:
+            with limit:
+                with self._lock:
+                    stats.in_flight += 1
+                    stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+                started = time.perf_counter()
+                try:
+                    response = self.session.request(
+                        method, url, timeout=timeout if timeout is not None else self.default_timeout, **kwargs
+                    )
+                    error: Optional[requests.RequestException] = None
+                except requests.RequestException as exc:
+                    response, error = None, exc
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    stats.in_flight -= 1
+                    stats.requests += 1
+                    stats.total_ms += elapsed_ms
+                    stats.max_ms = max(stats.max_ms, elapsed_ms)
+                    if error is not None:
+                        stats.errors += 1
+                    else:
+                        key = str(response.status_code)
+                        stats.statuses[key] = stats.statuses.get(key, 0) + 1
+
+            attempts_left = can_retry and attempt < policy.retries
+            if error is not None:
+                retryable = isinstance(error, requests.ConnectionError) or (
+                    policy.retry_timeouts and isinstance(error, requests.Timeout)
+                )
+                if not (attempts_left and retryable):
+                    raise error
+                delay = self.backoff(attempt, policy)
+            elif attempts_left and response.status_code in policy.retry_statuses:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None and retry_after > policy.retry_after_max:
+                    return response
+                delay = retry_after if retry_after is not None else self.backoff(attempt, policy)
+                response.close()
+            else:
+                return response
+
+            with self._lock:
+                stats.retries += 1
+            attempt += 1
+            self.sleep(delay)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {host: stats.to_dict() for host, stats in self._metrics.items()}
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_default_client: HttpClient | None = None
+_default_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Process-wide client shared by every call site."""
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = HttpClient()
+    return _default_client
+
+
+__all__ = [
+    "HostMetrics",
+    "HttpClient",
+    "NO_RETRY",
+    "RetryPolicy",
+    "get_client",
+    "parse_retry_after",
+]
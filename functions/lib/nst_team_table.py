@@ -0,0 +1,283 @@
+"""Natural Stat Trick team-table parsing.
+
+`parse_team_table(html, fd, sit)` turns a teamtable.php page into the row dicts
+served by `/fetch_team_table`:
+
+  * Only the `<table id="teams">` fragment is parsed. It is sliced out of the page
+    text first, so the rest of the page (navigation, scripts, other tables) is
+    never tokenised; the whole document is parsed only when slicing fails.
+  * Header cells are cleaned once and mapped to (column index, converter) pairs for
+    the needed columns only. Rows then read just those cells instead of checking
+    every header for every cell.
+  * lxml is used when installed; otherwise BeautifulSoup's `html.parser`. Both
+    produce identical rows.
+
+Wire format (default): the endpoint's existing shape. Text is passed through, `-`
+becomes None, and `*Pct` columns are floats validated to 0–100. With `typed=True`,
+the other numeric columns are converted to int / float as well; Team and TOI stay
+text.
+
+`benchmark_parsers(pages)` times each available parser against the original
+whole-document parse over saved pages (tests/fixtures/nst/).
+`python -m lib.nst_team_table <page.html>...` prints the comparison.
+"""
+from __future__ import annotations
+
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup
+
+try:  # optional fast parser
+    import lxml.html as _lxml_html
+except ImportError:  # pragma: no cover - exercised where lxml is absent
+    _lxml_html = None
+
+NECESSARY_COLUMNS = frozenset({
+    "Team", "GP", "TOI", "W", "L", "OTL", "Points",
+    "CF", "CA", "CFPct", "FF", "FA", "FFPct",
+    "SF", "SA", "SFPct", "GF", "GA", "GFPct",
+    "xGF", "xGA", "xGFPct", "SCF", "SCA", "SCFPct",
+    "HDCF", "HDCA", "HDCFPct", "HDSF", "HDSA", "HDSFPct",
+    "HDGF", "HDGA", "HDGFPct", "SHPct", "SVPct", "PDO",
+})
+TEXT_COLUMNS = frozenset({"Team", "TOI"})
+PARSERS = ("lxml", "html.parser") if _lxml_html is not None else ("html.parser",)
+DEFAULT_PARSER = PARSERS[0]
+
+_TABLE_OPEN_RE = re.compile(r"""<table\b[^>]*\bid\s*=\s*["']?teams(?=["'\s>])""", re.IGNORECASE)
+_TABLE_CLOSE_RE = re.compile(r"</table\s*>", re.IGNORECASE)
+
+
+class TeamTableNotFound(LookupError):
+    """The page has no `table#teams` (e.g. an NST error or login page)."""
+
+
+def clean_header(header: str) -> str:
+    """
+    Replace '/60' with '_perSixty' and '%' with 'Pct' in the header names.
+    """
+    header = header.replace('/60', '_perSixty')  # Added underscore
+    header = header.replace('/GP', '_perGame')  # Added underscore
+    header = header.replace('%', 'Pct')
+    return header
+
+
+def validate_percentage(value):
+    try:
+        num = float(value)
+        if 0 <= num <= 100:
+            return num
+        else:
+            return None
+    except:
+        return None
+
+
+def _text(value: Optional[str]) -> Optional[str]:
+    return value if value != '-' else None
+
+
+def _pct(value: Optional[str]) -> Optional[float]:
+    return validate_percentage(_text(value))
+
+
+def _number(value: Optional[str]) -> Any:
+    if value is None or value in ('-', ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value.replace(',', ''))
+    except ValueError:
+        return value
+
+
+def column_plan(headers: Sequence[str], typed: bool = False) -> List[Tuple[str, int, Callable[[Optional[str]], Any]]]:
+    """(header, cell index, converter) for each needed column, in header order."""
+    plan = []
+    for i, name in enumerate(headers):
+        if name not in NECESSARY_COLUMNS:
+            continue
+        if name.endswith('Pct'):
+            convert = _pct
+        elif typed and name not in TEXT_COLUMNS:
+            convert = _number
+        else:
+            convert = _text
+        plan.append((name, i, convert))
+    return plan
+
+
+def _table_fragment(html: str) -> Optional[str]:
+    m = _TABLE_OPEN_RE.search(html)
+    if m is None:
+        return None
+    end = _TABLE_CLOSE_RE.search(html, m.end())
+    if end is None:
+        return None
+    return html[m.start():end.end()]
+
+
+def _lxml_text(el) -> str:
+    # Matches bs4's get_text(strip=True): strip every text node, then join
+    return ''.join(s.strip() for s in el.itertext())
+
+
+def _lxml_cells(html: str) -> Tuple[List[str], Iterable[List[Any]], Callable[[Any], str]]:
+    fragment = _table_fragment(html)
+    root = _lxml_html.fromstring(fragment if fragment is not None else html)
+    table = root if root.tag == 'table' and root.get('id') == 'teams' else None
+    if table is None:
+        found = root.xpath('//table[@id="teams"]')
+        if not found:
+            raise TeamTableNotFound("table#teams not found")
+        table = found[0]
+    thead = table.find('thead')
+    tbody = table.find('tbody')
+    if thead is None or tbody is None:
+        raise ValueError("table#teams has no thead/tbody")
+    headers = [_lxml_text(th) for th in thead.iter('th')]
+    rows = (list(tr.iterchildren('td')) for tr in tbody.iterchildren('tr'))
+    return headers, rows, _lxml_text
+
+
+def _bs4_text(el) -> str:
+    return el.get_text(strip=True)
+
+
+def _bs4_cells(html: str) -> Tuple[List[str], Iterable[List[Any]], Callable[[Any], str]]:
+    fragment = _table_fragment(html)
+    soup = BeautifulSoup(fragment if fragment is not None else html, 'html.parser')
+    table = soup.find('table', id='teams')
+    if not table:
+        raise TeamTableNotFound("table#teams not found")
+    headers = [th.get_text(strip=True) for th in table.find('thead').find_all('th')]
+    rows = (tr.find_all('td') for tr in table.find('tbody').find_all('tr'))
+    return headers, rows, _bs4_text
+
+
+def parse_team_table(
+    html: str,
+    fd: str = '',
+    sit: str = '',
+    parser: str | None = None,
+    typed: bool = False,
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Return (cleaned headers, rows) for the page's `table#teams`.
+
+    Raises TeamTableNotFound when the table is missing; other malformed markup
+    raises ValueError / AttributeError.
+    """
+    parser = parser or DEFAULT_PARSER
+    if parser == 'lxml':
+        if _lxml_html is None:
+            raise ValueError("lxml is not installed")
+        raw_headers, cell_rows, text = _lxml_cells(html)
+    elif parser == 'html.parser':
+        raw_headers, cell_rows, text = _bs4_cells(html)
+    else:
+        raise ValueError(f"unknown parser {parser!r}; available: {PARSERS}")
+
+    headers = [clean_header(h) for h in raw_headers]
+    plan = column_plan(headers, typed=typed)
+    rows = []
+    for cells in cell_rows:
+        n = len(cells)
+        row: Dict[str, Any] = {'date': fd, 'situation': sit}
+        for name, i, convert in plan:
+            row[name] = convert(text(cells[i])) if i < n else None
+        rows.append(row)
+    return headers, rows
+
+
+def _legacy_parse(html: str, fd: str = '', sit: str = '') -> Tuple[List[str], List[Dict[str, Any]]]:
+    """The original whole-document, per-cell parse; kept as the benchmark baseline."""
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', id='teams')
+    if not table:
+        raise TeamTableNotFound("table#teams not found")
+    headers = [clean_header(th.get_text(strip=True)) for th in table.find('thead').find_all('th')]
+    rows = []
+    for tr in table.find('tbody').find_all('tr'):
+        cells = tr.find_all('td')
+        row = {'date': fd, 'situation': sit}
+        for i, th in enumerate(headers):
+            if th not in NECESSARY_COLUMNS:
+                continue
+            if i < len(cells):
+                cell_text = cells[i].get_text(strip=True)
+                cell_text = cell_text if cell_text != '-' else None
+                if th.endswith('Pct'):
+                    cell_text = validate_percentage(cell_text)
+                row[th] = cell_text
+            else:
+                row[th] = None
+        rows.append(row)
+    return headers, rows
+
+
+def benchmark_parsers(pages: Sequence[str], repeats: int = 5, parsers: Sequence[str] | None = None) -> Dict[str, Any]:
+    """Best-of-`repeats` time per parser over `pages` (HTML strings).
+
+    "legacy" (the original parse) is always timed first as the baseline, and every
+    parser's rows must equal it.
+    """
+    names = ["legacy"] + [p for p in (parsers or PARSERS) if p != "legacy"]
+    results: Dict[str, Any] = {"pages": len(pages), "bytes": sum(len(p) for p in pages), "parsers": {}}
+    reference = None
+    for name in names:
+        parse = _legacy_parse if name == "legacy" else (lambda page, name=name: parse_team_table(page, parser=name))
+        best = float('inf')
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            parsed = [parse(page) for page in pages]
+            best = min(best, time.perf_counter() - t0)
+        if reference is None:
+            reference = parsed
+        elif parsed != reference:
+            raise AssertionError(f"{name} rows differ from the legacy parse")
+        results["parsers"][name] = {
+            "best_ms": round(best * 1000, 3),
+            "ms_per_page": round(best * 1000 / max(len(pages), 1), 3),
+        }
+    base = results["parsers"]["legacy"]["best_ms"]
+    for stats in results["parsers"].values():
+        stats["speedup"] = round(base / stats["best_ms"], 2) if stats["best_ms"] else None
+    return results
+
+
+def _main(argv: Sequence[str] | None = None) -> int:
+    import argparse
+    import json
+
+    ap = argparse.ArgumentParser(description="Benchmark NST team-table parsers over saved pages.")
+    ap.add_argument("pages", nargs="+", help="saved teamtable.php HTML files")
+    ap.add_argument("--repeats", type=int, default=5)
+    args = ap.parse_args(argv)
+    pages = []
+    for path in args.pages:
+        with open(path, encoding="utf-8") as fh:
+            pages.append(fh.read())
+    print(json.dumps(benchmark_parsers(pages, repeats=args.repeats), indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(_main())
+
+
+__all__ = [
+    "DEFAULT_PARSER",
+    "NECESSARY_COLUMNS",
+    "PARSERS",
+    "TeamTableNotFound",
+    "benchmark_parsers",
+    "clean_header",
+    "column_plan",
+    "parse_team_table",
+    "validate_percentage",
+]
@@ -0,0 +1,264 @@
+"""Keyed response cache with per-key TTLs, single-flight and stale-while-revalidate.
+
+Purpose:
+  Put a cache in front of slow upstream calls (e.g. Natural Stat Trick team tables)
+  so identical requests within a TTL skip the fetch entirely.
+
+Behaviour:
+  * `ResponseCache.get_or_load(key, loader, ttl=..., stale_ttl=...)` returns
+    `(value, status)` where status is one of "hit", "miss", "stale" or "coalesced".
+  * Fresh entries (younger than `ttl`) are returned directly.
+  * Entries past `ttl` but within `ttl + stale_ttl` are returned immediately while
+    one background thread refreshes them (stale-while-revalidate). A failed
+    refresh keeps the stale value.
+  * Concurrent misses for the same key share one loader call (single-flight); the
+    followers block on the leader's result instead of hitting upstream again.
+  * `should_cache(value)` decides whether a loaded value is stored (e.g. only
+    successful responses); values it rejects are still returned to every waiter.
+
+Backends:
+  * `MemoryBackend` – in-process LRU bounded by `max_entries` (default).
+  * `SQLiteBackend` – local file shared by processes on the same host.
+  Both store values as JSON text, so callers always receive an independent copy
+  and values must be JSON-serialisable.
+
+Counters for `/healthz` come from `ResponseCache.stats()`.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+@dataclass
+class CacheEntry:
+    data: str  # JSON text
+    stored_at: float
+    fresh_until: float
+    stale_until: float
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """Local SQLite file; expired rows are pruned on write."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "fresh_until REAL NOT NULL, stale_until REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit connection, closed after each call so long-lived workers don't leak handles
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data, stored_at, fresh_until, stale_until FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache WHERE stale_until < ?", (time.time(),))
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, data, stored_at, fresh_until, stale_until) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, entry.data, entry.stored_at, entry.fresh_until, entry.stale_until),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0])
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.data = ""  # JSON snapshot taken before the leader hands `value` back
+        self.error: BaseException | None = None
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        backend=None,
+        ttl: float = 60.0,
+        stale_ttl: float = 0.0,
+        should_cache: Callable[[Any], bool] | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.should_cache = should_cache or (lambda _value: True)
+        self.clock = clock
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "stale": 0, "coalesced": 0, "refreshes": 0, "errors": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _store(self, key: str, value: Any, data: str, ttl: float, stale_ttl: float) -> None:
+        if not self.should_cache(value):
+            return
+        now = self.clock()
+        self.backend.set(key, CacheEntry(data, now, now + ttl, now + ttl + stale_ttl))
+
+    def _load(self, key: str, loader: Callable[[], Any], ttl: float, stale_ttl: float) -> Tuple[Any, bool]:
+        """Run `loader` once per key at a time; returns (value, led) where led=False means coalesced."""
+        with self._lock:
+            flight = self._flights.get(key)
+            led = flight is None
+            if led:
+                flight = self._flights[key] = _Flight()
+        if not led:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return json.loads(flight.data), False
+        try:
+            flight.value = loader()
+            flight.data = json.dumps(flight.value)
+            self._store(key, flight.value, flight.data, ttl, stale_ttl)
+        except BaseException as exc:
+            flight.error = exc
+            self._count("errors")
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.value, True
+
+    def _refresh(self, key: str, loader: Callable[[], Any], ttl: float, stale_ttl: float) -> None:
+        with self._lock:
+            if key in self._flights:
+                return
+        self._count("refreshes")
+
+        def run() -> None:
+            try:
+                self._load(key, loader, ttl, stale_ttl)
+            except Exception:
+                pass  # keep serving the stale entry until it expires
+
+        threading.Thread(target=run, name=f"cache-refresh:{key[:40]}", daemon=True).start()
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: float | None = None,
+        stale_ttl: float | None = None,
+    ) -> Tuple[Any, str]:
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        entry = self.backend.get(key)
+        now = self.clock()
+        if entry is not None and now < entry.fresh_until:
+            self._count("hits")
+            return json.loads(entry.data), "hit"
+        if entry is not None and now < entry.stale_until:
+            self._count("stale")
+            self._refresh(key, loader, ttl, stale_ttl)
+            return json.loads(entry.data), "stale"
+        value, led = self._load(key, loader, ttl, stale_ttl)
+        self._count("misses" if led else "coalesced")
+        return value, ("miss" if led else "coalesced")
+
+    def invalidate(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            for name in self._counts:
+                self._counts[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        served = counts["hits"] + counts["stale"] + counts["coalesced"]
+        total = served + counts["misses"]
+        return {
+            "backend": self.backend.name,
+            "entries": len(self.backend),
+            **counts,
+            "hit_rate": round(served / total, 4) if total else None,
+        }
+
+
+__all__ = [
+    "CacheEntry",
+    "MemoryBackend",
+    "ResponseCache",
+    "SQLiteBackend",
+]
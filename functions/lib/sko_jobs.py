@@ -0,0 +1,359 @@
+"""Job-based sKO pipeline runner.
+
+`trigger_sko_step_forward` runs backfill → train → score → upload inside one HTTP
+request, holding a Flask worker for up to the sum of the step timeouts. This
+module runs the same steps in the background instead:
+
+  * `SkoJobRunner.submit(payload)` validates the request exactly like
+    `trigger_sko_step_forward` (fail-closed on missing endpoint/secret or unknown
+    steps), records a job in the SQLite `SkoJobStore` and returns its id at once.
+  * Steps run on a background thread pool. By default each requested step waits
+    for the requested steps before it in pipeline order, so the chain keeps its
+    sequential semantics. With `"parallel": true` in the payload, the caller
+    asserts the steps are independent (e.g. re-uploading while rescoring another
+    range) and they run concurrently.
+  * When a step fails, the steps that depend on it are marked "skipped" and the
+    job fails. Per-step status, HTTP status, message and duration are stored as
+    each step finishes, so `/sko/jobs/<id>` shows progress while a job runs.
+    Any unexpected error (e.g. a failed store write) fails the job with the
+    exception message rather than leaving it "running".
+  * A runner marks "running" jobs left behind by another process, older than
+    `stale_after_sec`, as failed ("interrupted"), so they are not reported as
+    running forever.
+
+Store path: SKO_JOB_STORE_PATH (default `<tmpdir>/sko_jobs.sqlite`).
+
+Background threads need a long-lived process: serverless instances are frozen
+once the response is sent and each has its own /tmp. The /sko/jobs routes are
+therefore off unless SKO_JOBS_ENABLED is set, and always off on Vercel.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from lib.sko_pipeline import DEFAULT_STEPS, STEP_TIMEOUTS, _post_step, prepare_sko_request
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+STEP_STATUSES = ("pending", "running", "ok", "error", "skipped")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sko_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    parallel INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    message TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS sko_job_steps (
+    job_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    depends_on TEXT NOT NULL,
+    status TEXT NOT NULL,
+    status_code INTEGER,
+    message TEXT,
+    response TEXT,
+    started_at REAL,
+    finished_at REAL,
+    duration_sec REAL,
+    PRIMARY KEY (job_id, step)
+);
+"""
+
+
+def _default_store_path() -> str:
+    return os.environ.get("SKO_JOB_STORE_PATH") or os.path.join(tempfile.gettempdir(), "sko_jobs.sqlite")
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def step_dependencies(steps: List[str], parallel: bool = False) -> Dict[str, List[str]]:
+    """Requested steps each step must wait for (earlier steps in pipeline order)."""
+    if parallel:
+        return {step: [] for step in steps}
+    order = {step: i for i, step in enumerate(DEFAULT_STEPS)}
+    ranked = sorted(steps, key=lambda s: order[s])
+    return {step: [s for s in ranked if order[s] < order[step]] for step in steps}
+
+
+class SkoJobStore:
+    """SQLite job + step state shared by the runner and the status endpoint."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or _default_store_path()
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def create(self, job_id: str, steps: List[str], deps: Dict[str, List[str]], parallel: bool, payload: Dict[str, Any], owner: str) -> None:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO sko_jobs (id, status, steps, parallel, payload, owner, created_at) VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, json.dumps(steps), int(parallel), json.dumps(payload), owner, time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO sko_job_steps (job_id, step, position, depends_on, status) VALUES (?, ?, ?, ?, 'pending')",
+                [(job_id, step, i, json.dumps(deps[step])) for i, step in enumerate(steps)],
+            )
+            conn.execute("COMMIT")
+
+    def update_job(self, job_id: str, **fields: Any) -> None:
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE sko_jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+
+    def update_step(self, job_id: str, step: str, **fields: Any) -> None:
+        if "response" in fields:
+            fields["response"] = json.dumps(fields["response"])
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE sko_job_steps SET {cols} WHERE job_id = ? AND step = ?", (*fields.values(), job_id, step))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            job = conn.execute("SELECT * FROM sko_jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            steps = conn.execute(
+                "SELECT * FROM sko_job_steps WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        finished = job["finished_at"]
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "message": job["message"],
+            "parallel": bool(job["parallel"]),
+            "created_at": _iso(job["created_at"]),
+            "started_at": _iso(job["started_at"]),
+            "finished_at": _iso(finished),
+            "total_duration_sec": round(finished - job["started_at"], 2) if finished and job["started_at"] else None,
+            "steps": [
+                {
+                    "step": row["step"],
+                    "status": row["status"],
+                    "depends_on": json.loads(row["depends_on"]),
+                    "status_code": row["status_code"],
+                    "message": row["message"],
+                    "response": json.loads(row["response"]) if row["response"] else None,
+                    "started_at": _iso(row["started_at"]),
+                    "finished_at": _iso(row["finished_at"]),
+                    "duration_sec": row["duration_sec"],
+                }
+                for row in steps
+            ],
+        }
+
+    def finish(self, job_id: str, status: str, message: str) -> None:
+        """Close out a job; steps still pending or running are marked skipped."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE sko_jobs SET status = ?, message = ?, finished_at = ? WHERE id = ?",
+                (status, message, time.time(), job_id),
+            )
+            conn.execute(
+                "UPDATE sko_job_steps SET status = 'skipped', message = COALESCE(message, ?) "
+                "WHERE job_id = ? AND status IN ('pending', 'running')",
+                (message, job_id),
+            )
+            conn.execute("COMMIT")
+
+    def fail_stale(self, owner: str, stale_after_sec: float) -> int:
+        """Fail queued/running jobs of other owners older than `stale_after_sec`."""
+        cutoff = time.time() - stale_after_sec
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            ids = [
+                r["id"]
+                for r in conn.execute(
+                    "SELECT id FROM sko_jobs WHERE status IN ('queued', 'running') AND owner != ? AND created_at < ?",
+                    (owner, cutoff),
+                )
+            ]
+            for job_id in ids:
+                conn.execute(
+                    "UPDATE sko_jobs SET status = 'failed', message = 'interrupted', finished_at = ? WHERE id = ?",
+                    (now, job_id),
+                )
+                conn.execute(
+                    "UPDATE sko_job_steps SET status = 'skipped', message = 'interrupted' "
+                    "WHERE job_id = ? AND status IN ('pending', 'running')",
+                    (job_id,),
+                )
+            conn.execute("COMMIT")
+        return len(ids)
+
+
+class SkoJobRunner:
+    def __init__(
+        self,
+        store: SkoJobStore | None = None,
+        max_workers: int = 4,
+        post_step: Callable[..., Dict[str, Any]] | None = None,
+        stale_after_sec: float | None = None,
+    ):
+        self.store = store or SkoJobStore()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sko-job")
+        self.post_step = post_step or _post_step
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stale_after_sec = stale_after_sec if stale_after_sec is not None else float(sum(STEP_TIMEOUTS.values()) + 60)
+        self._jobs: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.store.fail_stale(self.owner, self.stale_after_sec)
+
+    def submit(self, payload: Dict[str, Any] | None) -> Dict[str, Any]:
+        """Start a job; returns {"success", "job_id", "status", "steps"} or the fail-closed error."""
+        prepared = prepare_sko_request(payload)
+        if "error" in prepared:
+            return prepared["error"]
+        parallel = bool((payload or {}).get("parallel"))
+        steps = list(dict.fromkeys(prepared["steps"]))
+        deps = step_dependencies(steps, parallel=parallel)
+        outbound = {k: v for k, v in prepared["payload"].items() if k != "parallel"}
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, steps, deps, parallel, outbound, self.owner)
+        future = self.executor.submit(
+            self._run, job_id, prepared["endpoint"], prepared["headers"], outbound, steps, deps
+        )
+        with self._lock:
+            self._jobs[job_id] = future
+        # Runs at once if the job already finished; only in-flight jobs stay tracked
+        future.add_done_callback(lambda _f: self._forget(job_id))
+        return {"success": True, "job_id": job_id, "status": "queued", "steps": steps}
+
+    def _forget(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            future = self._jobs.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.store.get(job_id)
+
+    def _run_step(self, job_id: str, endpoint: str, headers: Dict[str, str], payload: Dict[str, Any], step: str) -> Dict[str, Any]:
+        started = time.time()
+        self.store.update_step(job_id, step, status="running", started_at=started)
+        try:
+            result = self.post_step(endpoint, headers, payload, step)
+        except Exception as exc:  # pragma: no cover - _post_step returns errors as results
+            result = {"status": "error", "message": f"{type(exc).__name__}: {exc}", "response": {}, "status_code": None}
+        finished = time.time()
+        self.store.update_step(
+            job_id,
+            step,
+            status="ok" if result.get("status") == "ok" else "error",
+            status_code=result.get("status_code"),
+            message=result.get("message"),
+            response=result.get("response") or {},
+            finished_at=finished,
+            duration_sec=result.get("duration_sec", round(finished - started, 2)),
+        )
+        return result
+
+    def _run(self, job_id: str, endpoint: str, headers: Dict[str, str], payload: Dict[str, Any], steps: List[str], deps: Dict[str, List[str]]) -> None:
+        outcome: Dict[str, str] = {}
+        error: Optional[str] = None
+        try:
+            self.store.update_job(job_id, status="running", started_at=time.time())
+            running: Dict[str, Future] = {}
+            # Step threads are separate from the job pool so a job never waits on its own pool
+            with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix=f"sko-{job_id[:8]}") as pool:
+                pending = list(steps)
+                while pending or running:
+                    progressed = False
+                    for step in list(pending):
+                        if any(outcome.get(d) in ("error", "skipped") for d in deps[step]):
+                            outcome[step] = "skipped"
+                            self.store.update_step(job_id, step, status="skipped", message="dependency failed")
+                        elif all(outcome.get(d) == "ok" for d in deps[step]):
+                            running[step] = pool.submit(self._run_step, job_id, endpoint, headers, payload, step)
+                        else:
+                            continue
+                        pending.remove(step)
+                        progressed = True
+                    if not running:
+                        if progressed:
+                            continue
+                        # Nothing running and nothing can start: the rest can never run
+                        for step in pending:
+                            outcome[step] = "skipped"
+                            self.store.update_step(job_id, step, status="skipped", message="dependency never ran")
+                        break
+                    wait(running.values(), return_when=FIRST_COMPLETED)
+                    for step, future in list(running.items()):
+                        if future.done():
+                            del running[step]
+                            outcome[step] = "ok" if future.result().get("status") == "ok" else "error"
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        finally:
+            failed = [s for s in steps if outcome.get(s) == "error"]
+            if error is not None:
+                status, message = "failed", error
+            elif failed:
+                status, message = "failed", f"{failed[0]} step failed"
+            elif any(outcome.get(s) != "ok" for s in steps):
+                status, message = "failed", "not every step ran"
+            else:
+                status, message = "succeeded", f"{steps[-1]} step completed"
+            self.store.finish(job_id, status, message)
+
+
+_default_runner: SkoJobRunner | None = None
+_default_lock = threading.Lock()
+
+
+def get_runner() -> SkoJobRunner:
+    """Process-wide runner used by the /sko/jobs endpoints."""
+    global _default_runner
+    if _default_runner is None:
+        with _default_lock:
+            if _default_runner is None:
+                _default_runner = SkoJobRunner()
+    return _default_runner
+
+
+__all__ = [
+    "SkoJobRunner",
+    "SkoJobStore",
+    "get_runner",
+    "step_dependencies",
+]
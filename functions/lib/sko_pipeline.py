@@ -8,6 +8,8 @@ from typing import Any, Dict, Iterable, List
 
 import requests
 
+from lib import http_client
+
 DEFAULT_STEPS: tuple[str, ...] = ("backfill", "train", "score", "upload")
 ALLOWED_STEPS = frozenset(DEFAULT_STEPS)
 STEP_TIMEOUTS: dict[str, int] = {
@@ -55,7 +57,8 @@ def _post_step(endpoint: str, headers: Dict[str, str], payload: Dict[str, Any],
     started = time.perf_counter()
 
     try:
-        response = requests.post(endpoint, json=envelope, headers=headers, timeout=timeout)
+        # Shared keep-alive client; POSTs trigger work, so they are never retried
+        response = http_client.get_client().post(endpoint, json=envelope, headers=headers, timeout=timeout)
         duration = time.perf_counter() - started
         try:
             data = response.json()
@@ -86,24 +89,28 @@ def _post_step(endpoint: str, headers: Dict[str, str], payload: Dict[str, Any],
         }
 
 
-def trigger_sko_step_forward(payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    """Invoke the sKO pipeline in segmented fashion to stay within runtime limits."""
+def prepare_sko_request(payload: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Validate configuration and steps for a pipeline run.
+
+    Returns {"endpoint", "headers", "steps", "payload"} or, when the run cannot
+    start, {"error": <fail-closed response>}.
+    """
 
     endpoint = (os.environ.get("SKO_PIPELINE_ENDPOINT") or "").strip()
     if not endpoint:
-        return {
+        return {"error": {
             "success": False,
             "message": "SKO_PIPELINE_ENDPOINT environment variable is not set.",
             "steps": [],
-        }
+        }}
 
     secret = (os.environ.get("SKO_PIPELINE_SECRET") or "").strip()
     if not secret:
-        return {
+        return {"error": {
             "success": False,
             "message": "SKO pipeline authentication is not configured.",
             "steps": [],
-        }
+        }}
 
     headers: Dict[str, str] = {
         "Content-Type": "application/json",
@@ -113,12 +120,27 @@ def trigger_sko_step_forward(payload: Dict[str, Any] | None = None) -> Dict[str,
     payload = payload or {}
     steps = _normalize_steps(payload)
     if any(step not in ALLOWED_STEPS for step in steps):
-        return {
+        return {"error": {
             "success": False,
             "message": "Unsupported SKO pipeline step requested.",
             "steps": [],
-        }
-    sanitized_payload = _sanitize_payload(payload)
+        }}
+    return {
+        "endpoint": endpoint,
+        "headers": headers,
+        "steps": steps,
+        "payload": _sanitize_payload(payload),
+    }
+
+
+def trigger_sko_step_forward(payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Invoke the sKO pipeline in segmented fashion to stay within runtime limits."""
+
+    prepared = prepare_sko_request(payload)
+    if "error" in prepared:
+        return prepared["error"]
+    endpoint, headers, steps = prepared["endpoint"], prepared["headers"], prepared["steps"]
+    sanitized_payload = prepared["payload"]
 
     results: list[Dict[str, Any]] = []
     overall_success = True
@@ -146,4 +168,4 @@ def trigger_sko_step_forward(payload: Dict[str, Any] | None = None) -> Dict[str,
     }
 
 
-__all__ = ["trigger_sko_step_forward"]
+__all__ = ["prepare_sko_request", "trigger_sko_step_forward"]
@@ -0,0 +1,344 @@
+"""Per-stage regression benchmark suite with a local JSON history (Task 4.12 follow-up).
+
+`benchmark.run_performance_benchmark` times one end-to-end run; this suite times
+each scoring stage on its own so an optimization (or a regression) shows up in the
+stage it touched:
+
+  windows, zscores, reliability, finishing, clipping, contributions, scoring,
+  components, snapshot, quintiles
+
+Method:
+  * Every scale ("small", "medium", "large" or custom (players, games) pairs) uses a
+    seeded synthetic season (`synthetic.py`), fixed priors and the fallback SD
+    constants, so the workload is identical run to run and fully offline. A score
+    checksum is recorded per scale to catch workload drift.
+  * The frame is prepared once through every stage; the stages are then re-run in
+    order, `repeats` rounds, on that frame (stages overwrite their own output
+    columns, so re-running is idempotent). GC is collected before and disabled
+    during each timed call. min / median ms and ns per row are reported.
+  * `components` times attaching the lazy view plus materializing every cell, since
+    attaching alone is O(1).
+
+History: `append_history` adds a run to a JSON file ({"version", "runs": [...]}),
+written atomically. `compare_runs` flags stages whose time grew by more than
+`threshold` (relative) and `min_delta_ms` (absolute noise floor). Comparisons use
+the per-stage minimum by default: on shared machines medians move by tens of
+percent between otherwise identical runs, minimums much less.
+
+Command line (exit status 1 when a regression is flagged):
+    python -m lib.sustainability.bench_suite run --history bench.json [--scales small,medium] [--fast]
+    python -m lib.sustainability.bench_suite compare --history bench.json [--baseline -2] [--threshold 0.15]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .clipping import apply_soft_clipping_frame
+from .components import attach_components_view_frame
+from .config_loader import SustainabilityConfig, load_config
+from .constants import FALLBACK_SD_CONSTANTS
+from .contributions import compute_contributions_frame
+from .distribution import assign_quintiles_frame, build_distribution_sketch_frame, build_distribution_snapshot_from_sketch
+from .finishing import annotate_finishing_residuals_frame
+from .frame import WindowFrame
+from .pipeline import _scoring_metrics
+from .prior_index import PriorIndex
+from .reliability import compute_reliability_frame
+from .scoring import apply_logistic_scoring_frame
+from .synthetic import SyntheticSeasonSpec, generate_season_games
+from .windows import build_window_frame
+from .zscores import annotate_zscores_frame
+
+SUITE_VERSION = 1
+HISTORY_VERSION = 1
+STAGES = (
+    "windows",
+    "zscores",
+    "reliability",
+    "finishing",
+    "clipping",
+    "contributions",
+    "scoring",
+    "components",
+    "snapshot",
+    "quintiles",
+)
+DEFAULT_SCALES: Dict[str, Tuple[int, int]] = {
+    "small": (100, 20),
+    "medium": (500, 40),
+    "large": (2000, 82),
+}
+FAST_SCALES: Dict[str, Tuple[int, int]] = {"small": (30, 8)}
+
+
+def _priors(n_players: int) -> List[Dict[str, Any]]:
+    return [
+        {"player_id": pid, "stat_code": m, "post_mean": mean}
+        for pid in range(1, n_players + 1)
+        for m, mean in (("sh_pct", 0.11), ("oish_pct", 0.08), ("ipp", 0.45))
+    ]
+
+
+def _stage_calls(
+    cfg: SustainabilityConfig,
+    games: List[Dict[str, Any]],
+    frame: WindowFrame,
+    priors: PriorIndex,
+) -> List[Tuple[str, Callable[[], Any]]]:
+    metrics = _scoring_metrics(cfg, None)
+    sd = FALLBACK_SD_CONSTANTS
+    state: Dict[str, Any] = {}
+
+    def snapshot() -> None:
+        sketch = build_distribution_sketch_frame(frame, window_type="GAME")
+        state["snapshot"] = build_distribution_snapshot_from_sketch(sketch, "GAME", cfg.model_version, cfg.config_hash)
+
+    def components() -> None:
+        attach_components_view_frame(
+            frame, metrics=metrics, weights=cfg.weights, extreme_threshold=cfg.constants.get("extreme_z_threshold", 4.0)
+        )
+        frame.column("components_json").to_list()
+
+    calls: List[Tuple[str, Callable[[], Any]]] = [
+        ("windows", lambda: build_window_frame(games, freshness_days=cfg.freshness_days)),
+        ("zscores", lambda: annotate_zscores_frame(frame, priors, sd)),
+        ("reliability", lambda: compute_reliability_frame(frame, cfg.k_r)),
+    ]
+    if cfg.toggles.get("use_finishing_residuals"):
+        calls.append(("finishing", lambda: annotate_finishing_residuals_frame(frame, sd)))
+    calls += [
+        ("clipping", lambda: apply_soft_clipping_frame(frame, metrics=metrics, c=cfg.constants.get("c", 3.0))),
+        ("contributions", lambda: compute_contributions_frame(frame, weights=cfg.weights, metrics=metrics, use_clipped=True)),
+        ("scoring", lambda: apply_logistic_scoring_frame(frame, guardrails=cfg.constants)),
+        ("components", components),
+        ("snapshot", snapshot),
+        ("quintiles", lambda: assign_quintiles_frame(frame, state.get("snapshot"), window_filter="GAME")),
+    ]
+    return calls
+
+
+def _time_ns(fn: Callable[[], Any]) -> int:
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t0 = time.perf_counter_ns()
+        fn()
+        return time.perf_counter_ns() - t0
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def run_stage_benchmarks(
+    scales: Dict[str, Tuple[int, int]] | None = None,
+    repeats: int = 5,
+    season_id: int = 2025,
+    seed: int = 2025,
+    cfg: SustainabilityConfig | None = None,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """Time every stage at every scale; returns one history record (not yet saved)."""
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if scales is None:
+        scales = FAST_SCALES if fast else DEFAULT_SCALES
+    if fast:
+        repeats = min(repeats, 2)
+    if repeats < 1:
+        raise ValueError("repeats must be >= 1")
+    cfg = cfg if cfg is not None else load_config()
+    results: Dict[str, Any] = {}
+    for scale, (n_players, n_games) in scales.items():
+        games = generate_season_games(SyntheticSeasonSpec(n_players=n_players, n_games=n_games, season_id=season_id, seed=seed))
+        priors = PriorIndex.coerce(_priors(n_players))
+        frame = build_window_frame(games, freshness_days=cfg.freshness_days)
+        calls = _stage_calls(cfg, games, frame, priors)
+        for _, fn in calls:  # prepare every stage's inputs (also the warm-up run)
+            fn()
+        n = len(frame)
+        # Round-robin repeats so a transient slowdown spreads across stages instead of hitting one
+        samples: Dict[str, List[int]] = {name: [] for name, _ in calls}
+        for _ in range(repeats):
+            for name, fn in calls:
+                samples[name].append(_time_ns(fn))
+        stages: Dict[str, Dict[str, float]] = {}
+        for name, times in samples.items():
+            median = statistics.median(times)
+            stages[name] = {
+                "median_ms": round(median / 1e6, 4),
+                "min_ms": round(min(times) / 1e6, 4),
+                "ns_per_row": round(median / n, 1) if n else None,
+            }
+        scores = [s for s in frame.get("score") if s is not None]
+        results[scale] = {
+            "players": n_players,
+            "games_per_player": n_games,
+            "rows": n,
+            "checksum": sum(scores),
+            "stages": stages,
+        }
+    return {
+        "suite_version": SUITE_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config_hash": cfg.config_hash,
+        "repeats": repeats,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def load_history(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"version": HISTORY_VERSION, "runs": []}
+    with open(path, "r", encoding="utf-8") as fh:
+        history = json.load(fh)
+    if history.get("version") != HISTORY_VERSION:
+        raise ValueError(f"Unsupported benchmark history version: {history.get('version')}")
+    return history
+
+
+def append_history(path: str, record: Dict[str, Any], label: str | None = None) -> Dict[str, Any]:
+    """Append `record` (with optional label) to the history file; returns the history."""
+    history = load_history(path)
+    history["runs"].append({**record, "label": label})
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(history, fh, indent=1)
+    os.replace(tmp, path)
+    return history
+
+
+def compare_runs(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.15,
+    min_delta_ms: float = 0.5,
+    stat: str = "min_ms",
+) -> Dict[str, Any]:
+    """Per (scale, stage) change from `baseline` to `current`.
+
+    A stage is a "regression" when it slowed by more than `threshold` (relative) and
+    `min_delta_ms` (absolute), an "improvement" for the mirror case, else "ok".
+    Scales whose row count or score checksum differ are listed in `workload_changed`.
+    """
+    rows: List[Dict[str, Any]] = []
+    workload_changed: List[str] = []
+    for scale, cur in current["results"].items():
+        base = baseline["results"].get(scale)
+        if base is None:
+            continue
+        if (base["rows"], base["checksum"]) != (cur["rows"], cur["checksum"]):
+            workload_changed.append(scale)
+        for stage, cur_stats in cur["stages"].items():
+            base_stats = base["stages"].get(stage)
+            if base_stats is None:
+                continue
+            before, after = base_stats[stat], cur_stats[stat]
+            delta = after - before
+            change = delta / before if before > 0 else 0.0
+            status = "ok"
+            if abs(delta) >= min_delta_ms and abs(change) > threshold:
+                status = "regression" if delta > 0 else "improvement"
+            rows.append({
+                "scale": scale,
+                "stage": stage,
+                "baseline_ms": before,
+                "current_ms": after,
+                "change": round(change, 4),
+                "status": status,
+            })
+    regressions = [r for r in rows if r["status"] == "regression"]
+    return {"stat": stat, "threshold": threshold, "rows": rows, "regressions": regressions, "workload_changed": workload_changed}
+
+
+def format_comparison(comparison: Dict[str, Any]) -> str:
+    lines = [f"{'scale':<8} {'stage':<14} {'baseline':>11} {'current':>11} {'change':>8}  status"]
+    for r in comparison["rows"]:
+        lines.append(
+            f"{r['scale']:<8} {r['stage']:<14} {r['baseline_ms']:>9.3f}ms {r['current_ms']:>9.3f}ms "
+            f"{r['change'] * 100:>+7.1f}%  {r['status']}"
+        )
+    if comparison["workload_changed"]:
+        lines.append(f"workload changed for: {', '.join(comparison['workload_changed'])}")
+    return "\n".join(lines)
+
+
+def _parse_scales(spec: str | None) -> Dict[str, Tuple[int, int]] | None:
+    # "small,medium" picks named scales; "300x40" adds a custom (players x games) scale
+    if not spec:
+        return None
+    scales: Dict[str, Tuple[int, int]] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if part in DEFAULT_SCALES:
+            scales[part] = DEFAULT_SCALES[part]
+        else:
+            players, _, games = part.partition("x")
+            scales[part] = (int(players), int(games))
+    return scales
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="bench_suite", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="run the suite and append it to the history")
+    run_p.add_argument("--history", required=True)
+    run_p.add_argument("--scales")
+    run_p.add_argument("--repeats", type=int, default=5)
+    run_p.add_argument("--label")
+    run_p.add_argument("--fast", action="store_true")
+    cmp_p = sub.add_parser("compare", help="compare two runs from the history")
+    cmp_p.add_argument("--history", required=True)
+    cmp_p.add_argument("--baseline", type=int, default=-2)
+    cmp_p.add_argument("--current", type=int, default=-1)
+    for p in (run_p, cmp_p):
+        p.add_argument("--threshold", type=float, default=0.15)
+        p.add_argument("--min-delta-ms", type=float, default=0.5)
+        p.add_argument("--stat", choices=("min_ms", "median_ms"), default="min_ms")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        record = run_stage_benchmarks(scales=_parse_scales(args.scales), repeats=args.repeats, fast=args.fast or None)
+        history = append_history(args.history, record, label=args.label)
+        runs = history["runs"]
+        if len(runs) < 2:
+            print(json.dumps(record["results"], indent=1))
+            return 0
+        baseline, current = runs[-2], runs[-1]
+    else:
+        runs = load_history(args.history)["runs"]
+        try:
+            baseline, current = runs[args.baseline], runs[args.current]
+        except IndexError:
+            print(f"history has {len(runs)} run(s); need two to compare", file=sys.stderr)
+            return 2
+    comparison = compare_runs(baseline, current, threshold=args.threshold, min_delta_ms=args.min_delta_ms, stat=args.stat)
+    print(format_comparison(comparison))
+    return 1 if comparison["regressions"] else 0
+
+
+__all__ = [
+    "DEFAULT_SCALES",
+    "STAGES",
+    "append_history",
+    "compare_runs",
+    "format_comparison",
+    "load_history",
+    "main",
+    "run_stage_benchmarks",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -8,72 +8,55 @@ Usage (programmatic):
     summary = run_performance_benchmark(n_players=5000, n_games=40)
 
 NOTES:
-  * Default synthetic generation aims to mimic distributions for:
-      shots ~ Poisson(3.2), goals ~ Binomial(shots, 0.11), on-ice shots for ~ Poisson(18),
-      on-ice goals for ~ Binomial(onice_shots_for, 0.08), points correlated with goals.
-  * ixG approximated as goals * U(0.6,1.1) + (shots-goals)*U(0.05,0.12)
-  * Position mix 70% F / 30% D (simple ratio).
+  * Synthetic seasons come from `synthetic.py` (seeded; Poisson/Binomial draws for
+    shots, goals, on-ice counts and points; ixG as summed per-shot uniforms; 70% F /
+    30% D by default). Same seed → identical games, so runs are reproducible.
+  * `fixture_dir` (or SUSTAIN_BENCH_FIXTURES) caches the generated season on disk;
+    generation/load time is reported separately and excluded from duration_total_ms,
+    which covers config load + pipeline only.
   * Season id fixed (e.g., 2025) for this benchmark.
   * Does not persist (persist=False) to avoid DB dependency in CI.
   * If environment variable SUSTAIN_BENCH_FAST=1 set, scales down to lighter run.
+  * `run_multi_season_benchmark` compares a per-season `run_full_scoring_pipeline` loop
+    with `run_multi_season_scoring` against an in-memory client that counts fetches
+    (optionally sleeping `fetch_latency_ms` per round trip to model DB latency).
+  * `run_kernel_benchmark` times the staged scoring stages against the fused kernel
+    (z-scores through logistic) on one window frame and reports ns per row.
+  * `run_windows_benchmark` times the reference per-game window builder against the
+    columnar builder on the same synthetic games and checks the outputs are identical.
+  * `run_columnar_export_benchmark` compares a JSON dump of `windows_scored` with the
+    columnar export (columnar_export.py): file size, write time, and load time for
+    one score column, a WindowFrame, and full row dicts.
 """
 from __future__ import annotations
 
+import json
 import os
 import random
+import tempfile
 import time
+from bisect import bisect_left, bisect_right
 from typing import Dict, Any, List
 
 from .orchestrator import orchestrate_full_run
 from .config_loader import load_config
+from .columnar_export import DEFAULT_EXPORT_FORMAT, EXPORT_SUFFIXES, export_scored_columns, open_scored_columns
+from .frame import WindowFrame
+from .pipeline import run_full_scoring_pipeline, score_window_frame
+from .constants import FALLBACK_SD_CONSTANTS
+from .windows import build_all_players_windows, build_all_players_windows_columnar, build_window_frame
+from .distribution import PERCENT_CUTS, _percentile
+from .quantiles import DEFAULT_K, QuantileSketch
+from .synthetic import SyntheticSeasonSpec, aggregate_season_rows, generate_season_games, load_or_generate
+from .multi_season import run_multi_season_scoring
+from .player_priors import compute_player_posteriors
+from .posterior_arrays import build_player_season_counts, posterior_columns_to_rows, sweep_player_posteriors
+from .priors import compute_league_beta_priors
+from .sweep import evaluate_configs, prepare_sweep, random_configs
 
 
-def _synthetic_games(n_players: int, n_games: int, season_id: int = 2025) -> List[Dict[str, Any]]:
-    games: List[Dict[str, Any]] = []
-    # Pre-generate per-player position
-    positions = {pid: ("F" if random.random() < 0.7 else "D") for pid in range(1, n_players + 1)}
-    # Game date spacing: assume 2-day increments
-    for g_idx in range(n_games):
-        game_date = f"2025-01-{1 + g_idx:02d}" if g_idx < 31 else f"2025-02-{(g_idx-30):02d}"
-        for pid in range(1, n_players + 1):
-            pos = positions[pid]
-            shots = random.poisson(3.2) if hasattr(random, 'poisson') else int(random.gauss(3.2, 1.2))
-            if shots < 0:
-                shots = 0
-            goals = 0
-            for _ in range(shots):
-                if random.random() < 0.11:
-                    goals += 1
-            onice_shots_for = max(shots + int(random.gauss(15, 4)), 0)
-            onice_goals_for = 0
-            for _ in range(onice_shots_for):
-                if random.random() < 0.08:
-                    onice_goals_for += 1
-            points = goals
-            # ixG approximation
-            ixg_goals = sum(random.uniform(0.6, 1.1) for _ in range(goals))
-            ixg_nongoals = sum(random.uniform(0.05, 0.12) for _ in range(max(shots - goals, 0)))
-            ixg = ixg_goals + ixg_nongoals
-            icf = shots + int(random.gauss(2, 1))
-            if icf < shots:
-                icf = shots
-            hdcf = max(int(goals + random.gauss(1.2, 0.8)), 0)
-            games.append({
-                'player_id': pid,
-                'season_id': season_id,
-                'position_code': pos,
-                'game_id': f"G{g_idx+1}",
-                'game_date': game_date,
-                'shots': shots,
-                'goals': goals,
-                'onice_shots_for': onice_shots_for,
-                'onice_goals_for': onice_goals_for,
-                'points': points,
-                'ixg': round(ixg, 3),
-                'icf': icf,
-                'hdcf': hdcf,
-            })
-    return games
+def _synthetic_games(n_players: int, n_games: int, season_id: int = 2025, seed: int = 2025) -> List[Dict[str, Any]]:
+    return generate_season_games(SyntheticSeasonSpec(n_players=n_players, n_games=n_games, season_id=season_id, seed=seed))
 
 
 def run_performance_benchmark(
@@ -81,6 +64,9 @@ def run_performance_benchmark(
     n_games: int = 40,
     season_id: int = 2025,
     fast: bool | None = None,
+    workers: int = 1,
+    seed: int = 2025,
+    fixture_dir: str | None = None,
 ) -> Dict[str, Any]:
     # Fast mode override for CI or local quick check
     if fast is None:
@@ -88,10 +74,13 @@ def run_performance_benchmark(
     if fast:
         n_players = min(n_players, 500)
         n_games = min(n_games, 15)
+    if fixture_dir is None:
+        fixture_dir = os.getenv("SUSTAIN_BENCH_FIXTURES") or None
 
-    t0 = time.perf_counter()
-    games = _synthetic_games(n_players=n_players, n_games=n_games, season_id=season_id)
-    t_gen = time.perf_counter()
+    t_start = time.perf_counter()
+    spec = SyntheticSeasonSpec(n_players=n_players, n_games=n_games, season_id=season_id, seed=seed)
+    games, fixture_hit = load_or_generate(spec, fixture_dir)
+    t0 = t_gen = time.perf_counter()
     cfg = load_config()  # fallback config acceptable for synthetic
     t_cfg = time.perf_counter()
     result = orchestrate_full_run(
@@ -101,14 +90,17 @@ def run_performance_benchmark(
         persist=False,
         build_snapshot=True,
         assign_tiers=True,
+        workers=workers,
     )
     t_pipe = time.perf_counter()
     total_ms = int((t_pipe - t0) * 1000)
     return {
         'players': n_players,
         'games_per_player': n_games,
+        'workers': workers,
         'rows_generated': len(games),
-        'duration_generate_ms': int((t_gen - t0) * 1000),
+        'fixture_cache_hit': fixture_hit,
+        'duration_generate_ms': int((t_gen - t_start) * 1000),
         'duration_config_ms': int((t_cfg - t_gen) * 1000),
         'duration_pipeline_ms': int((t_pipe - t_cfg) * 1000),
         'duration_total_ms': total_ms,
@@ -116,6 +108,475 @@ def run_performance_benchmark(
     }
 
 
+def run_windows_benchmark(
+    n_players: int = 900,
+    n_games: int = 40,
+    player_scale: int = 10,
+    season_id: int = 2025,
+    freshness_days: int = 45,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """Compare reference vs columnar window construction at `n_players * player_scale` players."""
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if fast:
+        n_players = min(n_players, 50)
+        n_games = min(n_games, 15)
+    total_players = n_players * max(player_scale, 1)
+
+    games = _synthetic_games(n_players=total_players, n_games=n_games, season_id=season_id)
+    t0 = time.perf_counter()
+    reference = build_all_players_windows(games, freshness_days=freshness_days)
+    t_ref = time.perf_counter()
+    columnar = build_all_players_windows_columnar(games, freshness_days=freshness_days)
+    t_col = time.perf_counter()
+    reference_ms = (t_ref - t0) * 1000
+    columnar_ms = (t_col - t_ref) * 1000
+    return {
+        'players': total_players,
+        'games_per_player': n_games,
+        'rows_generated': len(games),
+        'window_rows': len(columnar),
+        'outputs_identical': reference == columnar,
+        'duration_reference_ms': int(reference_ms),
+        'duration_columnar_ms': int(columnar_ms),
+        'speedup': round(reference_ms / columnar_ms, 2) if columnar_ms > 0 else None,
+    }
+
+
+def run_parallel_benchmark(
+    n_players: int = 5000,
+    n_games: int = 40,
+    worker_counts: tuple[int, ...] = (1, 2, 4),
+    season_id: int = 2025,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """Time the full scoring pipeline per worker count on one synthetic dataset.
+
+    Reports wall time, speedup vs the first worker count, and whether scored rows
+    and the snapshot match the first run exactly (sharding must be deterministic).
+    """
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if fast:
+        n_players = min(n_players, 500)
+        n_games = min(n_games, 15)
+    games = _synthetic_games(n_players=n_players, n_games=n_games, season_id=season_id)
+    cfg = load_config()
+    runs: List[Dict[str, Any]] = []
+    baseline = None
+    for workers in worker_counts:
+        t0 = time.perf_counter()
+        result = run_full_scoring_pipeline(
+            season_id=season_id,
+            games=games,
+            cfg=cfg,
+            materialize_rows=False,
+            workers=workers,
+        )
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        snapshot = {k: v for k, v in (result["snapshot"] or {}).items() if k != "created_at"}
+        if baseline is None:
+            baseline = (elapsed_ms, result["frame"].columns, snapshot)
+        runs.append({
+            'workers': workers,
+            'duration_ms': int(elapsed_ms),
+            'speedup': round(baseline[0] / elapsed_ms, 2) if elapsed_ms > 0 else None,
+            'identical': result["frame"].columns == baseline[1] and snapshot == baseline[2],
+        })
+    return {
+        'players': n_players,
+        'games_per_player': n_games,
+        'cpu_count': os.cpu_count(),
+        'runs': runs,
+    }
+
+
+def run_sketch_benchmark(
+    n_values: int = 200_000,
+    shards: int = 4,
+    k: int = DEFAULT_K,
+    seed: int = 7,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """Compare merged per-shard QuantileSketch cut points with the exact `_percentile`.
+
+    Uses continuous synthetic scores so the sketch leaves exact mode. Reports, per
+    snapshot cut, the observed normalized rank error next to the sketch's bound.
+    """
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if fast:
+        n_values = min(n_values, 20_000)
+    rng = random.Random(seed)
+    values = [min(max(rng.gauss(50.0, 15.0), 0.0), 100.0) for _ in range(n_values)]
+
+    t0 = time.perf_counter()
+    exact_sorted = sorted(values)
+    exact = [_percentile(exact_sorted, p) for p in PERCENT_CUTS]
+    t_exact = time.perf_counter()
+    merged = QuantileSketch(k=k)
+    for s in range(shards):
+        merged.merge(QuantileSketch(k=k).update(values[s::shards]))
+    approx = merged.quantiles(PERCENT_CUTS)
+    t_sketch = time.perf_counter()
+
+    cuts = []
+    for p, e, a in zip(PERCENT_CUTS, exact, approx):
+        target = int(round((n_values - 1) * p))
+        lo, hi = bisect_left(exact_sorted, a), bisect_right(exact_sorted, a)
+        miss = 0 if lo <= target < hi else min(abs(target - lo), abs(target - (hi - 1)))
+        cuts.append({'p': p, 'exact': e, 'sketch': a, 'rank_error': miss / n_values})
+    return {
+        'n': n_values,
+        'shards': shards,
+        'k': k,
+        'retained_items': merged.retained,
+        'rank_error_bound': merged.rank_error_bound(),
+        'max_rank_error': max(c['rank_error'] for c in cuts),
+        'cuts': cuts,
+        'duration_exact_ms': int((t_exact - t0) * 1000),
+        'duration_sketch_ms': int((t_sketch - t_exact) * 1000),
+    }
+
+
+def run_kernel_benchmark(
+    n_players: int = 5000,
+    n_games: int = 40,
+    season_id: int = 2025,
+    repeats: int = 3,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """Staged vs fused scoring (z-scores → logistic, no components) on the same window frame.
+
+    Each repeat scores a fresh copy of the window columns; the best run per kernel is reported.
+    """
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if fast:
+        n_players = min(n_players, 200)
+        n_games = min(n_games, 10)
+        repeats = 1
+    cfg = load_config()
+    games = _synthetic_games(n_players=n_players, n_games=n_games, season_id=season_id)
+    base = build_window_frame(games, freshness_days=cfg.freshness_days)
+    priors = [
+        {'player_id': pid, 'stat_code': m, 'post_mean': mean}
+        for pid in range(1, n_players + 1)
+        for m, mean in (('sh_pct', 0.11), ('oish_pct', 0.08), ('ipp', 0.45))
+    ]
+    n = len(base)
+    best: Dict[str, float] = {}
+    frames: Dict[str, WindowFrame] = {}
+    for kernel in ('staged', 'fused'):
+        for _ in range(max(repeats, 1)):
+            frame = WindowFrame.from_columns({k: list(v) for k, v in base.columns.items()})
+            t0 = time.perf_counter()
+            score_window_frame(frame, cfg, FALLBACK_SD_CONSTANTS, priors, include_components=False, kernel=kernel)
+            elapsed = time.perf_counter() - t0
+            best[kernel] = min(best.get(kernel, elapsed), elapsed)
+            frames[kernel] = frame
+    return {
+        'players': n_players,
+        'games_per_player': n_games,
+        'window_rows': n,
+        'duration_staged_ms': int(best['staged'] * 1000),
+        'duration_fused_ms': int(best['fused'] * 1000),
+        'ns_per_row_staged': int(best['staged'] * 1e9 / n) if n else None,
+        'ns_per_row_fused': int(best['fused'] * 1e9 / n) if n else None,
+        'speedup': round(best['staged'] / best['fused'], 2) if best['fused'] > 0 else None,
+        'identical': frames['staged'].column_names == frames['fused'].column_names
+        and frames['staged'].to_rows() == frames['fused'].to_rows(),
+    }
+
+
+class _InMemorySeasonClient:
+    """Serves league aggregates / player season rows from memory and counts round trips."""
+
+    def __init__(self, league_rows: List[Dict[str, Any]], player_rows: List[Dict[str, Any]], latency_ms: float = 0.0):
+        self.league_rows = league_rows
+        self.player_rows = player_rows
+        self.latency_s = latency_ms / 1000.0
+        self.calls = 0
+
+    def _round_trip(self) -> None:
+        self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def fetch_league_aggregates(self, season_id: int) -> List[Dict[str, Any]]:
+        self._round_trip()
+        return [r for r in self.league_rows if r['season_id'] == season_id]
+
+    def fetch_player_season_rows(self, season_ids: List[int]) -> List[Dict[str, Any]]:
+        self._round_trip()
+        wanted = set(season_ids)
+        return [r for r in self.player_rows if r['season_id'] in wanted]
+
+
+def run_multi_season_benchmark(
+    n_seasons: int = 5,
+    n_players: int = 1000,
+    n_games: int = 40,
+    first_season: int = 2021,
+    fetch_latency_ms: float = 0.0,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """Per-season pipeline loop vs one multi-season batch on the same synthetic seasons.
+
+    Two extra history seasons are generated so every target has a full blend window.
+    """
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if fast:
+        n_players = min(n_players, 200)
+        n_games = min(n_games, 10)
+    seasons = list(range(first_season, first_season + n_seasons))
+    games: List[Dict[str, Any]] = []
+    for sid in range(first_season - 2, first_season + n_seasons):
+        games.extend(generate_season_games(SyntheticSeasonSpec(
+            n_players=n_players, n_games=n_games, season_id=sid, seed=sid, start_date=f"{sid}-10-10", churn_rate=0.01,
+        )))
+    league_rows, player_rows = aggregate_season_rows(games)
+    cfg = load_config()
+
+    loop_client = _InMemorySeasonClient(league_rows, player_rows, fetch_latency_ms)
+    t0 = time.perf_counter()
+    loop_frames = []
+    loop_snapshots = []
+    for sid in seasons:
+        season_games = [g for g in games if g['season_id'] == sid]
+        res = run_full_scoring_pipeline(sid, season_games, db_client=loop_client, cfg=cfg, materialize_rows=False)
+        loop_frames.append(res['frame'])
+        loop_snapshots.append(res['snapshot'])
+    loop_ms = (time.perf_counter() - t0) * 1000
+
+    batch_client = _InMemorySeasonClient(league_rows, player_rows, fetch_latency_ms)
+    t1 = time.perf_counter()
+    batch = run_multi_season_scoring(seasons, games, db_client=batch_client, cfg=cfg)
+    batch_ms = (time.perf_counter() - t1) * 1000
+
+    def strip(snap):
+        return {k: v for k, v in (snap or {}).items() if k != 'created_at'}
+
+    identical = (
+        WindowFrame.concat(loop_frames).to_rows() == batch['frame'].to_rows()
+        and [strip(s) for s in loop_snapshots] == [strip(batch['seasons'][sid]['snapshot']) for sid in seasons]
+    )
+    return {
+        'seasons': seasons,
+        'players': n_players,
+        'games_per_player': n_games,
+        'rows_scored': len(batch['frame']),
+        'fetch_latency_ms': fetch_latency_ms,
+        'fetches_loop': loop_client.calls,
+        'fetches_batch': batch_client.calls,
+        'duration_loop_ms': int(loop_ms),
+        'duration_batch_ms': int(batch_ms),
+        'speedup': round(loop_ms / batch_ms, 2) if batch_ms > 0 else None,
+        'identical': identical,
+    }
+
+
+def run_posterior_sweep_benchmark(
+    n_players: int = 5000,
+    n_weight_vectors: int = 50,
+    target_season: int = 2025,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """Row-wise `compute_player_posteriors` per weight vector vs one column-wise sweep.
+
+    Player season rows are synthetic (three seasons, ~10% rookies); weight vectors
+    are random three-slot vectors with a positive target weight.
+    """
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if fast:
+        n_players = min(n_players, 200)
+        n_weight_vectors = min(n_weight_vectors, 5)
+    rng = random.Random(target_season)
+    cfg = load_config()
+    rows: List[Dict[str, Any]] = []
+    for pid in range(1, n_players + 1):
+        pos = 'D' if pid % 3 == 0 else 'F'
+        n_seasons = 1 if rng.random() < 0.1 else 3
+        for h in range(n_seasons):
+            shots = rng.randint(20, 250)
+            ogf = rng.randint(5, 80)
+            rows.append({
+                'player_id': pid, 'season_id': target_season - h, 'position_code': pos,
+                'sh_pct_successes': rng.randint(0, shots // 6), 'sh_pct_trials': shots,
+                'oish_pct_successes': ogf, 'oish_pct_trials': ogf * rng.randint(8, 12),
+                'ipp_successes': rng.randint(0, ogf), 'ipp_trials': ogf,
+            })
+    aggregates = [
+        {
+            'season_id': target_season, 'position_code': pos,
+            **{f'{m}_{part}': sum(r[f'{m}_{part}'] for r in rows if r['position_code'] == pos)
+               for m in ('sh_pct', 'oish_pct', 'ipp') for part in ('successes', 'trials')},
+        }
+        for pos in ('F', 'D')
+    ]
+    league = {(p.season_id, p.position_code, p.stat_code): p for p in compute_league_beta_priors(target_season, None, cfg, aggregates)}
+    vectors = [[rng.uniform(0.2, 1.0), rng.random(), rng.random()] for _ in range(n_weight_vectors)]
+
+    t0 = time.perf_counter()
+    loop_out = [compute_player_posteriors(target_season, league, cfg, rows=rows, season_weights=w) for w in vectors]
+    loop_ms = (time.perf_counter() - t0) * 1000
+
+    t1 = time.perf_counter()
+    counts = build_player_season_counts(rows, target_season, n_history=2)
+    sweep = sweep_player_posteriors(counts, league, vectors)
+    sweep_ms = (time.perf_counter() - t1) * 1000
+
+    identical = [posterior_columns_to_rows(counts, cols, cfg.model_version) for cols in sweep] == loop_out
+    return {
+        'players': n_players,
+        'weight_vectors': n_weight_vectors,
+        'duration_loop_ms': int(loop_ms),
+        'duration_sweep_ms': int(sweep_ms),
+        'speedup': round(loop_ms / sweep_ms, 2) if sweep_ms > 0 else None,
+        'identical': identical,
+    }
+
+
+def run_sweep_benchmark(
+    n_players: int = 900,
+    n_games: int = 82,
+    n_configs: int = 1000,
+    n_loop_configs: int = 3,
+    season_id: int = 2025,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """Per-config `run_full_scoring_pipeline` vs one prepared sweep over random config variants.
+
+    The pipeline loop runs only `n_loop_configs` variants and is reported per config;
+    the sweep evaluates all `n_configs`. Thresholds of the looped variants are compared.
+    """
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if fast:
+        n_players = min(n_players, 100)
+        n_games = min(n_games, 10)
+        n_configs = min(n_configs, 20)
+        n_loop_configs = min(n_loop_configs, 2)
+    cfg = load_config()
+    games = generate_season_games(SyntheticSeasonSpec(n_players=n_players, n_games=n_games, season_id=season_id, seed=season_id))
+    priors = [
+        {'player_id': pid, 'stat_code': m, 'post_mean': mean}
+        for pid in range(1, n_players + 1)
+        for m, mean in (('sh_pct', 0.11), ('oish_pct', 0.08), ('ipp', 0.45))
+    ]
+    configs = random_configs(cfg, n_configs, seed=season_id)
+    loop_configs = configs[:n_loop_configs]
+
+    t0 = time.perf_counter()
+    loop_thresholds = []
+    for variant in loop_configs:
+        res = run_full_scoring_pipeline(
+            season_id, games, cfg=variant, player_priors_rows=priors, include_components=False, materialize_rows=False
+        )
+        loop_thresholds.append({k: res['snapshot'][k] for k in ('t20', 't40', 't60', 't80')})
+    loop_ms = (time.perf_counter() - t0) * 1000
+
+    t1 = time.perf_counter()
+    base = prepare_sweep(season_id, games, cfg=cfg, player_priors_rows=priors)
+    prepare_ms = (time.perf_counter() - t1) * 1000
+    sweep = evaluate_configs(base, configs)
+    sweep_ms = (time.perf_counter() - t1) * 1000
+
+    per_loop = loop_ms / max(len(loop_configs), 1)
+    per_sweep = (sweep_ms - prepare_ms) / max(n_configs, 1)
+    return {
+        'players': n_players,
+        'games_per_player': n_games,
+        'sweep_rows': base.n,
+        'configs': n_configs,
+        'duration_prepare_ms': int(prepare_ms),
+        'duration_sweep_ms': int(sweep_ms),
+        'ms_per_config_loop': round(per_loop, 2),
+        'ms_per_config_sweep': round(per_sweep, 2),
+        'speedup_per_config': round(per_loop / per_sweep, 2) if per_sweep > 0 else None,
+        'identical': [r['thresholds'] for r in sweep['configs'][:n_loop_configs]] == loop_thresholds,
+    }
+
+
+def run_columnar_export_benchmark(
+    n_players: int = 900,
+    n_games: int = 82,
+    season_id: int = 2025,
+    fast: bool | None = None,
+) -> Dict[str, Any]:
+    """JSON vs columnar export of scored rows: size, write time and load time."""
+    if fast is None:
+        fast = os.getenv("SUSTAIN_BENCH_FAST") == "1"
+    if fast:
+        n_players = min(n_players, 100)
+        n_games = min(n_games, 10)
+    cfg = load_config()
+    games = generate_season_games(SyntheticSeasonSpec(n_players=n_players, n_games=n_games, season_id=season_id, seed=season_id))
+    result = run_full_scoring_pipeline(season_id, games, cfg=cfg)
+    rows = result['windows_scored']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'scored.json')
+        export_format = DEFAULT_EXPORT_FORMAT
+        col_path = os.path.join(tmp, 'scored' + EXPORT_SUFFIXES[export_format])
+        t0 = time.perf_counter()
+        with open(json_path, 'w', encoding='utf-8') as fh:
+            json.dump(rows, fh, default=str)
+        json_write_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        export_scored_columns(result['frame'], col_path, meta={'config_hash': cfg.config_hash})
+        col_write_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        with open(json_path, 'r', encoding='utf-8') as fh:
+            json.load(fh)
+        json_load_ms = (time.perf_counter() - t0) * 1000
+        with open_scored_columns(col_path) as cols:
+            t0 = time.perf_counter()
+            scores = cols.buffer('score')
+            score_sum = sum(scores)
+            scores.release()
+            col_score_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            cols.to_frame()
+            col_frame_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            loaded = cols.to_rows()
+            col_rows_ms = (time.perf_counter() - t0) * 1000
+        json_bytes = os.path.getsize(json_path)
+        col_bytes = os.path.getsize(col_path)
+
+    return {
+        'players': n_players,
+        'games_per_player': n_games,
+        'rows': len(rows),
+        'format': export_format,
+        'json_bytes': json_bytes,
+        'columnar_bytes': col_bytes,
+        'size_ratio': round(json_bytes / col_bytes, 2) if col_bytes else None,
+        'duration_json_write_ms': round(json_write_ms, 2),
+        'duration_columnar_write_ms': round(col_write_ms, 2),
+        'duration_json_load_ms': round(json_load_ms, 2),
+        'duration_columnar_score_column_ms': round(col_score_ms, 3),
+        'duration_columnar_frame_ms': round(col_frame_ms, 2),
+        'duration_columnar_rows_ms': round(col_rows_ms, 2),
+        'frame_load_speedup': round(json_load_ms / col_frame_ms, 2) if col_frame_ms > 0 else None,
+        'score_sum': score_sum,
+        'identical': loaded == rows,
+    }
+
+
 __all__ = [
     'run_performance_benchmark',
+    'run_windows_benchmark',
+    'run_parallel_benchmark',
+    'run_sketch_benchmark',
+    'run_multi_season_benchmark',
+    'run_kernel_benchmark',
+    'run_posterior_sweep_benchmark',
+    'run_sweep_benchmark',
+    'run_columnar_export_benchmark',
 ]
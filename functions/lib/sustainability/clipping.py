@@ -16,6 +16,8 @@ from __future__ import annotations
 from math import tanh
 from typing import Iterable, Dict, Any, List, Iterable
 
+from .frame import WindowFrame
+
 
 def apply_soft_clipping(
     rows: Iterable[Dict[str, Any]],
@@ -43,4 +45,26 @@ def apply_soft_clipping(
     return out
 
 
-__all__ = ["apply_soft_clipping"]
+def _clip(z_val: Any, c: float) -> float | None:
+    if z_val is None:
+        return None
+    try:
+        return tanh(float(z_val) / c)
+    except Exception:
+        return None
+
+
+def apply_soft_clipping_frame(
+    frame: WindowFrame,
+    metrics: Iterable[str],
+    c: float = 3.0,
+) -> WindowFrame:
+    """Column variant of `apply_soft_clipping`; adds zc_<metric> columns in place."""
+    if c <= 0:
+        raise ValueError("c must be > 0 for soft clipping")
+    for m in list(metrics):
+        frame.set_column(f"zc_{m}", [_clip(z_val, c) for z_val in frame.get(f"z_{m}")])
+    return frame
+
+
+__all__ = ["apply_soft_clipping", "apply_soft_clipping_frame"]
@@ -0,0 +1,689 @@
+"""Columnar binary export of scored barometer rows (Task 4.7 follow-up).
+
+`windows_scored` leaves the pipeline as row dicts with a nested `components_json`
+per row, which the TypeScript side re-parses as JSON. `export_scored_columns` writes
+the same rows as one column file instead, and `open_scored_columns` reads it back:
+
+  * Format: Arrow IPC (`.arrow`, readable with apache-arrow's `tableFromIPC`) by
+    default, or Parquet (`.parquet`); both need pyarrow (a listed requirement). The
+    SBAR layout below is opt-in only (`format="sbar"` or a `.sbar` path). The format
+    follows the path suffix (`.arrow` / `.feather` / `.parquet` / `.sbar`); any other
+    suffix gets `DEFAULT_EXPORT_FORMAT`. Arrow / Parquet without pyarrow raise
+    ImportError rather than silently writing SBAR.
+  * Each column has a fixed logical dtype: "f8" float64, "i8" int64, "bool",
+    "date" (int32 days since 1970-01-01), "str" (dictionary-encoded int32 codes),
+    "json" (fallback JSON for mixed values) or "null". Known scored columns
+    (window stats, exp_/z_/zc_/r_/contrib_ columns, scores, tiers) use the dtypes
+    in `SCORED_COLUMN_DTYPES`; other columns are inferred from their values.
+  * `components_json` is a struct column: per metric a presence mask plus one child
+    column per field (weight, z, zc, r, contrib, obs, exp, n, extreme, rookie).
+
+Arrow / Parquet: dtypes map to float64 / int64 / bool / date32 /
+dictionary<int32, utf8> / utf8 (one JSON text per cell) / null, and
+`components_json` is struct<metric: struct<field>>. Each field's logical dtype is
+in its field metadata ("dtype") and the `meta` dict in the schema metadata. Arrow
+has no "key absent" state: absent cells are null, and a column with absent keys
+gets a bool companion column `__absent__.<name>` so `to_rows()` restores them.
+Readers that only want values can skip the `__absent__.` columns.
+
+SBAR (explicit opt-in, no pyarrow needed): a small self-describing layout.
+  * Storage is "plain" (packed values), "const" (one value in the header, e.g.
+    season_id or a metric weight) or "dict" (strings). A per-row state byte
+    (0 = None, 1 = value, 2 = key absent) is stored only when a column has gaps, so
+    sparse columns such as `quintile` round-trip exactly.
+  * Identical blobs are stored once, so components_json child columns that repeat
+    top-level columns (z_<m>, r_<m>, ...) cost nothing.
+  * Every blob is little-endian and 8-byte aligned, so a reader can map it straight
+    into typed arrays (`buffer()` does this with memoryview casts).
+
+SBAR file layout:
+  b"SBAR" | version u32 | header length u32 | header JSON | padding | blobs
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+try:  # optional: Arrow IPC / Parquet output
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised where pyarrow is absent
+    pa = None
+    pq = None
+
+from .frame import MISSING, LazyColumn, WindowFrame
+from .windows import _COUNT_FIELDS
+
+EXPORT_MAGIC = b"SBAR"
+EXPORT_VERSION = 1
+COMPONENTS_FIELD = "components_json"
+EXPORT_FORMATS = ("arrow", "parquet", "sbar")
+DEFAULT_EXPORT_FORMAT = "arrow"
+EXPORT_SUFFIXES = {"arrow": ".arrow", "parquet": ".parquet", "sbar": ".sbar"}
+ABSENT_PREFIX = "__absent__."
+_SUFFIX_FORMATS = {".arrow": "arrow", ".feather": "arrow", ".parquet": "parquet", ".sbar": "sbar"}
+_ARROW_MAGIC = b"ARROW1"
+_PARQUET_MAGIC = b"PAR1"
+_ALIGN = 8
+_EPOCH = date(1970, 1, 1)
+
+# State bytes (only stored when a column is not fully valid)
+STATE_NULL, STATE_VALUE, STATE_ABSENT = 0, 1, 2
+
+SCORED_COLUMN_DTYPES: Dict[str, str] = {
+    "player_id": "i8",
+    "season_id": "i8",
+    "position_code": "str",
+    "game_date": "date",
+    "window_type": "str",
+    "n_games": "i8",
+    **{f: "i8" for f in _COUNT_FIELDS},
+    "ixg": "f8",
+    "sh_pct": "f8",
+    "oish_pct": "f8",
+    "ipp": "f8",
+    "freshness_applied": "bool",
+    "contrib_total": "f8",
+    "score_raw": "f8",
+    "score": "i8",
+    "quintile": "i8",
+    "provisional_tier": "bool",
+}
+SCORED_PREFIX_DTYPES: Tuple[Tuple[str, str], ...] = (
+    ("exp_", "f8"),
+    ("delta_", "f8"),
+    ("z_", "f8"),
+    ("zc_", "f8"),
+    ("r_", "f8"),
+    ("contrib_", "f8"),
+    ("finish_res_", "f8"),
+)
+COMPONENT_FIELD_DTYPES: Dict[str, str] = {
+    "weight": "f8",
+    "z": "f8",
+    "zc": "f8",
+    "r": "f8",
+    "contrib": "f8",
+    "obs": "f8",
+    "exp": "f8",
+    "n": "i8",
+    "extreme": "bool",
+    "rookie": "bool",
+}
+
+_TYPECODES = {"f8": "d", "i8": "q", "bool": "B", "date": "i", "str": "i"}
+# Python value types each fixed dtype accepts without changing the value
+_ACCEPTS = {"f8": {float, int}, "i8": {int}, "bool": {bool}, "date": {date}, "str": {str}}
+
+
+def _declared_dtype(name: str) -> str | None:
+    dtype = SCORED_COLUMN_DTYPES.get(name)
+    if dtype is None:
+        dtype = next((d for prefix, d in SCORED_PREFIX_DTYPES if name.startswith(prefix)), None)
+    return dtype
+
+
+def _infer_dtype(kinds: set) -> str:
+    if not kinds:
+        return "null"
+    for dtype in ("bool", "i8", "f8", "date", "str"):
+        if kinds <= _ACCEPTS[dtype]:
+            return dtype
+    return "json"
+
+
+def _column_dtype(kinds: set, declared: str | None) -> str:
+    if declared is not None and kinds and kinds <= _ACCEPTS[declared]:
+        return declared
+    return _infer_dtype(kinds)
+
+
+def _packed(values: array) -> bytes:
+    if sys.byteorder == "big":  # pragma: no cover (little-endian on disk)
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _json_blob(values: Sequence[Any]) -> bytes:
+    payload = [None if v is MISSING else v for v in values]
+    return json.dumps(payload, separators=(",", ":"), default=str).encode()
+
+
+def _encode_column(values: Sequence[Any], declared: str | None) -> Tuple[Dict[str, Any], bytes, bytes]:
+    """(spec, value blob, state blob) for one column; MISSING marks absent keys."""
+    valid = [v for v in values if v is not None and v is not MISSING]
+    kinds = {type(v) for v in valid}
+    dtype = _column_dtype(kinds, declared)
+    states = b""
+    if len(valid) != len(values):
+        states = bytes(STATE_NULL if v is None else STATE_ABSENT if v is MISSING else STATE_VALUE for v in values)
+    if dtype == "null":
+        return {"dtype": dtype, "encoding": "const", "value": None}, b"", states
+    if dtype != "json" and len(kinds) == 1 and len(set(valid)) == 1:
+        value = valid[0].isoformat() if dtype == "date" else valid[0]
+        return {"dtype": dtype, "encoding": "const", "value": value}, b"", states
+    if dtype == "json":
+        return {"dtype": dtype, "encoding": "plain"}, _json_blob(values), states
+    accepted = _ACCEPTS[dtype]
+    if dtype == "str":
+        dictionary: Dict[str, int] = {}
+        codes = [dictionary.setdefault(v, len(dictionary)) if type(v) is str else -1 for v in values]
+        return {"dtype": dtype, "encoding": "dict", "dictionary": list(dictionary)}, _packed(array("i", codes)), states
+    if dtype == "date":
+        packed = [(v - _EPOCH).days if type(v) is date else 0 for v in values]
+    else:
+        packed = [v if type(v) in accepted else 0 for v in values]
+    try:
+        blob = _packed(array(_TYPECODES[dtype], packed))
+    except OverflowError:
+        return {"dtype": "json", "encoding": "plain"}, _json_blob(values), states
+    return {"dtype": dtype, "encoding": "plain"}, blob, states
+
+
+class _BlobWriter:
+    """Collects 8-byte aligned blobs; identical blobs are stored once."""
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+        self.size = 0
+        self._offsets: Dict[bytes, int] = {}
+
+    def add(self, blob: bytes) -> int | None:
+        if not blob:
+            return None
+        offset = self._offsets.get(blob)
+        if offset is None:
+            offset = self._offsets[blob] = self.size
+            pad = -len(blob) % _ALIGN
+            self.parts.append(blob + b"\0" * pad)
+            self.size += len(blob) + pad
+        return offset
+
+
+def _column_spec(name: str, values: Sequence[Any], declared: str | None, writer: _BlobWriter) -> Dict[str, Any]:
+    spec, blob, states = _encode_column(values, declared)
+    return {"name": name, **spec, "data": writer.add(blob), "data_len": len(blob), "states": writer.add(states)}
+
+
+def _struct_spec(name: str, values: Sequence[Any], writer: _BlobWriter) -> Dict[str, Any]:
+    metrics: Dict[str, Dict[str, None]] = {}
+    for comp in values:
+        if type(comp) is dict:
+            for m, cell in comp.items():
+                fields = metrics.setdefault(m, {})
+                for f in cell:
+                    fields.setdefault(f, None)
+    states = b""
+    if any(type(c) is not dict for c in values):
+        states = bytes(STATE_NULL if c is None else STATE_ABSENT if c is MISSING else STATE_VALUE for c in values)
+    specs = []
+    for m, fields in metrics.items():
+        cells = [c.get(m) if type(c) is dict else None for c in values]
+        # Rows without the metric hold None (not MISSING) so children match the top-level z_/r_/... blobs
+        children = [
+            _column_spec(f, [cell.get(f) if cell is not None else None for cell in cells], COMPONENT_FIELD_DTYPES.get(f), writer)
+            for f in fields
+        ]
+        present = _column_spec("present", [cell is not None for cell in cells], "bool", writer)
+        specs.append({"name": m, "present": present, "fields": children})
+    return {"name": name, "dtype": "struct", "states": writer.add(states), "metrics": specs}
+
+
+ScoredSource = Union[WindowFrame, Iterable[Dict[str, Any]]]
+
+
+def _source_columns(source: ScoredSource) -> Tuple[int, Dict[str, Sequence[Any]]]:
+    if isinstance(source, WindowFrame):
+        return len(source), {
+            name: list(values) if isinstance(values, LazyColumn) else values for name, values in source.columns.items()
+        }
+    rows = source if isinstance(source, list) else list(source)
+    names: Dict[str, None] = {}
+    for r in rows:
+        for k in r:
+            names.setdefault(k, None)
+    return len(rows), {name: [r.get(name, MISSING) for r in rows] for name in names}
+
+
+def encode_scored_columns(source: ScoredSource, meta: Dict[str, Any] | None = None) -> bytes:
+    """Encode scored rows (row dicts, a row view, or a WindowFrame) to the SBAR layout."""
+    n, columns = _source_columns(source)
+    writer = _BlobWriter()
+    specs = []
+    for name, values in columns.items():
+        if name == COMPONENTS_FIELD and any(type(v) is dict for v in values):
+            specs.append(_struct_spec(name, values, writer))
+        else:
+            specs.append(_column_spec(name, values, _declared_dtype(name), writer))
+    header = json.dumps({"n_rows": n, "columns": specs, "meta": meta or {}}, separators=(",", ":")).encode()
+    prefix = EXPORT_MAGIC + struct.pack("<II", EXPORT_VERSION, len(header)) + header
+    return prefix + b"\0" * (-len(prefix) % _ALIGN) + b"".join(writer.parts)
+
+
+def _resolve_format(path: str, format: str | None) -> str:
+    if format is None:
+        format = _SUFFIX_FORMATS.get(os.path.splitext(path)[1].lower(), DEFAULT_EXPORT_FORMAT)
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format {format!r}; available: {EXPORT_FORMATS}")
+    if format != "sbar" and pa is None:
+        raise ImportError(
+            f"writing {format} scored columns requires pyarrow (see functions/requirements.txt); "
+            'pass format="sbar" to write the dependency-free SBAR layout instead'
+        )
+    return format
+
+
+def export_scored_columns(
+    source: ScoredSource,
+    path: str,
+    meta: Dict[str, Any] | None = None,
+    format: str | None = None,
+) -> Dict[str, Any]:
+    """Write scored rows to `path` atomically (tmp file + rename).
+
+    `format` is "arrow", "parquet" or "sbar"; by default it follows the path suffix,
+    falling back to `DEFAULT_EXPORT_FORMAT` ("arrow"). SBAR is only written when asked
+    for. Returns path, format, rows and bytes.
+    """
+    format = _resolve_format(path, format)
+    tmp = f"{path}.tmp"
+    if format == "sbar":
+        payload = encode_scored_columns(source, meta=meta)
+        with open(tmp, "wb") as fh:
+            fh.write(payload)
+        (head_len,) = struct.unpack_from("<I", payload, 8)
+        n_rows = json.loads(payload[12:12 + head_len])["n_rows"]
+    else:
+        table = scored_columns_table(source, meta=meta)
+        if format == "arrow":
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            pq.write_table(table, tmp)
+        n_rows = table.num_rows
+    os.replace(tmp, path)
+    return {"path": path, "format": format, "rows": n_rows, "bytes": os.path.getsize(path)}
+
+
+def _arrow_type(dtype: str) -> Any:
+    return {
+        "f8": pa.float64(),
+        "i8": pa.int64(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+        "str": pa.string(),
+        "json": pa.string(),
+        "null": pa.null(),
+    }[dtype]
+
+
+def _arrow_json(values: Sequence[Any]) -> Any:
+    return pa.array(
+        [None if v is None or v is MISSING else json.dumps(v, separators=(",", ":"), default=str) for v in values],
+        pa.string(),
+    )
+
+
+def _arrow_column(values: Sequence[Any], declared: str | None) -> Tuple[str, Any]:
+    """(logical dtype, Arrow array) for one column; absent cells become null."""
+    kinds = {type(v) for v in values if v is not None and v is not MISSING}
+    dtype = _column_dtype(kinds, declared)
+    if dtype == "json":
+        return dtype, _arrow_json(values)
+    try:
+        arr = pa.array([None if v is MISSING else v for v in values], _arrow_type(dtype))
+    except (pa.ArrowInvalid, OverflowError):  # e.g. ints beyond int64
+        return "json", _arrow_json(values)
+    return dtype, arr.dictionary_encode() if dtype == "str" else arr
+
+
+def _arrow_struct(values: Sequence[Any]) -> Any:
+    metrics: Dict[str, Dict[str, None]] = {}
+    for comp in values:
+        if type(comp) is dict:
+            for m, cell in comp.items():
+                fields = metrics.setdefault(m, {})
+                for f in cell:
+                    fields.setdefault(f, None)
+    metric_arrays, metric_fields = [], []
+    for m, fields in metrics.items():
+        cells = [c.get(m) if type(c) is dict else None for c in values]
+        children, child_fields = [], []
+        for f in fields:
+            dtype, arr = _arrow_column([cell.get(f) if cell is not None else None for cell in cells], COMPONENT_FIELD_DTYPES.get(f))
+            children.append(arr)
+            child_fields.append(pa.field(f, arr.type, metadata={"dtype": dtype}))
+        arr = pa.StructArray.from_arrays(children, fields=child_fields, mask=pa.array([cell is None for cell in cells]))
+        metric_arrays.append(arr)
+        metric_fields.append(pa.field(m, arr.type))
+    return pa.StructArray.from_arrays(
+        metric_arrays, fields=metric_fields, mask=pa.array([type(c) is not dict for c in values])
+    )
+
+
+def scored_columns_table(source: ScoredSource, meta: Dict[str, Any] | None = None) -> Any:
+    """Build the pyarrow Table that `export_scored_columns` writes as Arrow / Parquet."""
+    if pa is None:
+        raise ImportError("building an Arrow table requires pyarrow")
+    n, columns = _source_columns(source)
+    arrays, fields = [], []
+    for name, values in columns.items():
+        if name == COMPONENTS_FIELD and any(type(v) is dict and v for v in values):
+            dtype, arr = "struct", _arrow_struct(values)
+        else:
+            dtype, arr = _arrow_column(values, _declared_dtype(name))
+        arrays.append(arr)
+        fields.append(pa.field(name, arr.type, metadata={"dtype": dtype}))
+        if any(v is MISSING for v in values):
+            arrays.append(pa.array([v is MISSING for v in values], pa.bool_()))
+            fields.append(pa.field(ABSENT_PREFIX + name, pa.bool_(), metadata={"dtype": "bool"}))
+    schema = pa.schema(fields, metadata={"scored_columns_version": str(EXPORT_VERSION), "meta": json.dumps(meta or {})})
+    if not arrays:
+        return schema.empty_table()
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class StructColumn(LazyColumn):
+    """Lazy components_json column over decoded child columns; dicts are built on access."""
+
+    def __init__(
+        self,
+        metrics: List[Tuple[str, List[bool], List[Tuple[str, List[Any]]]]],
+        states: bytes | None,
+        n_rows: int,
+    ):
+        self.metrics = metrics  # (metric, present, [(field, values)])
+        self.states = states
+        self._n = n_rows
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _cell(self, i: int) -> Any:
+        if self.states is not None and self.states[i] != STATE_VALUE:
+            return None if self.states[i] == STATE_NULL else MISSING
+        return {m: {f: col[i] for f, col in fields} for m, present, fields in self.metrics if present[i]}
+
+    def __iter__(self) -> Iterator[Any]:
+        # Full materialization: build each metric's cells column-wise, then stitch rows
+        cells = []
+        for m, present, fields in self.metrics:
+            names = [f for f, _ in fields]
+            rows = zip(*(c for _, c in fields)) if fields else ((),) * self._n
+            cells.append((m, [dict(zip(names, vals)) if p else None for p, vals in zip(present, rows)]))
+        for i in range(self._n):
+            if self.states is not None and self.states[i] != STATE_VALUE:
+                yield None if self.states[i] == STATE_NULL else MISSING
+                continue
+            yield {m: col[i] for m, col in cells if col[i] is not None}
+
+
+class ScoredColumns:
+    """Memory-mapped reader for files written by `export_scored_columns`.
+
+    Columns are decoded on access and `components_json` decodes to a lazy
+    `StructColumn`; `buffer()` hands out zero-copy typed views over plain numeric
+    columns (release them before `close()`).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._fh.close()
+            raise ValueError(f"{path} is not a scored columns file")
+        if self._mm[:4] != EXPORT_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a scored columns file")
+        version, head_len = struct.unpack_from("<II", self._mm, 4)
+        if version != EXPORT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported scored columns version: {version}")
+        header = json.loads(self._mm[12:12 + head_len])
+        self._base = 12 + head_len + (-(12 + head_len) % _ALIGN)
+        self.n_rows: int = header["n_rows"]
+        self.meta: Dict[str, Any] = header["meta"]
+        self._specs: Dict[str, Dict[str, Any]] = {spec["name"]: spec for spec in header["columns"]}
+        # Struct children usually share blobs with top-level columns; decode each blob once
+        self._decoded: Dict[str, List[Any]] = {}
+
+    def __enter__(self) -> "ScoredColumns":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            self._mm.close()
+        self._fh.close()
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._specs)
+
+    @property
+    def dtypes(self) -> Dict[str, str]:
+        return {name: spec["dtype"] for name, spec in self._specs.items()}
+
+    def buffer(self, name: str) -> memoryview:
+        """Zero-copy typed view over a plain f8 / i8 / bool / date column's packed values."""
+        spec = self._specs[name]
+        if spec["dtype"] not in ("f8", "i8", "bool", "date") or spec["encoding"] != "plain":
+            raise ValueError(f"column '{name}' has no plain numeric buffer")
+        code = _TYPECODES[spec["dtype"]]
+        start = self._base + spec["data"]
+        with memoryview(self._mm) as mv:
+            return mv[start:start + spec["data_len"]].cast(code)
+
+    def _values(self, spec: Dict[str, Any]) -> List[Any]:
+        key = json.dumps({k: v for k, v in spec.items() if k != "name"}, sort_keys=True)
+        values = self._decoded.get(key)
+        if values is None:
+            values = self._decoded[key] = self._decode(spec)
+        return values
+
+    def _decode(self, spec: Dict[str, Any]) -> List[Any]:
+        n = self.n_rows
+        dtype = spec["dtype"]
+        if spec["encoding"] == "const":
+            value = spec["value"]
+            values = [date.fromisoformat(value) if dtype == "date" and value is not None else value] * n
+        else:
+            start = self._base + spec["data"]
+            raw = self._mm[start:start + spec["data_len"]]
+            if dtype == "json":
+                values = json.loads(raw)
+            else:
+                packed = array(_TYPECODES[dtype])
+                packed.frombytes(raw)
+                if sys.byteorder == "big":  # pragma: no cover
+                    packed.byteswap()
+                values = packed.tolist()
+                if dtype == "str":
+                    dictionary = spec["dictionary"]
+                    values = [dictionary[c] if c >= 0 else None for c in values]
+                elif dtype == "bool":
+                    values = [v == 1 for v in values]
+                elif dtype == "date":
+                    epoch = _EPOCH.toordinal()
+                    values = [date.fromordinal(epoch + v) for v in values]
+        return self._apply_states(spec, values)
+
+    def _states(self, spec: Dict[str, Any]) -> bytes | None:
+        if spec["states"] is None:
+            return None
+        start = self._base + spec["states"]
+        return self._mm[start:start + self.n_rows]
+
+    def _apply_states(self, spec: Dict[str, Any], values: List[Any]) -> List[Any]:
+        states = self._states(spec)
+        if states is None:
+            return values
+        return [v if s == STATE_VALUE else None if s == STATE_NULL else MISSING for v, s in zip(values, states)]
+
+    def _column(self, name: str) -> Sequence[Any]:
+        spec = self._specs[name]
+        if spec["dtype"] != "struct":
+            return self._values(spec)
+        metrics = [
+            (m["name"], self._values(m["present"]), [(f["name"], self._values(f)) for f in m["fields"]])
+            for m in spec["metrics"]
+        ]
+        return StructColumn(metrics, self._states(spec), self.n_rows)
+
+    def column(self, name: str) -> List[Any]:
+        """Decoded column (components_json materialized); absent cells read as None."""
+        return [None if v is MISSING else v for v in self._column(name)]
+
+    def to_frame(self, columns: Iterable[str] | None = None) -> WindowFrame:
+        names = self.column_names if columns is None else [c for c in columns if c in self._specs]
+        frame = WindowFrame(n=self.n_rows)
+        for name in names:
+            states = self._states(self._specs[name])
+            frame.set_column(name, self._column(name), sparse=states is not None and STATE_ABSENT in states)
+        return frame
+
+    def to_rows(self, columns: Iterable[str] | None = None) -> List[Dict[str, Any]]:
+        """Row dicts equal to the exported rows (absent keys stay absent)."""
+        return self.to_frame(columns).to_rows()
+
+
+class ArrowScoredColumns:
+    """Reader for Arrow IPC / Parquet files written by `export_scored_columns`.
+
+    Same interface as `ScoredColumns`; Arrow IPC files are memory-mapped. `buffer()`
+    covers f8 / i8 / date columns (Arrow packs bools as bits).
+    """
+
+    def __init__(self, path: str):
+        if pa is None:
+            raise ImportError("reading Arrow / Parquet scored columns requires pyarrow")
+        self.path = path
+        self._source = None
+        with open(path, "rb") as fh:
+            magic = fh.read(6)
+        if magic == _ARROW_MAGIC:
+            self._source = pa.memory_map(path, "r")
+            self._table = pa.ipc.open_file(self._source).read_all()
+        elif magic[:4] == _PARQUET_MAGIC:
+            self._table = pq.read_table(path)
+        else:
+            raise ValueError(f"{path} is not an Arrow / Parquet scored columns file")
+        schema_meta = self._table.schema.metadata or {}
+        if b"scored_columns_version" not in schema_meta:
+            self.close()
+            raise ValueError(f"{path} is not a scored columns file")
+        self.n_rows: int = self._table.num_rows
+        self.meta: Dict[str, Any] = json.loads(schema_meta.get(b"meta", b"{}"))
+        self._fields = {f.name: f for f in self._table.schema if not f.name.startswith(ABSENT_PREFIX)}
+
+    def __enter__(self) -> "ArrowScoredColumns":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._source is not None:
+            self._source.close()
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._fields)
+
+    @property
+    def dtypes(self) -> Dict[str, str]:
+        return {name: _field_dtype(f) for name, f in self._fields.items()}
+
+    def buffer(self, name: str) -> memoryview:
+        """Zero-copy typed view over an f8 / i8 / date column's values buffer."""
+        dtype = _field_dtype(self._fields[name])
+        if dtype not in ("f8", "i8", "date"):
+            raise ValueError(f"column '{name}' has no plain numeric buffer")
+        arr = self._table.column(name).combine_chunks()
+        code = _TYPECODES[dtype]
+        size = array(code).itemsize
+        with memoryview(arr.buffers()[1]) as mv:
+            return mv[arr.offset * size:(arr.offset + len(arr)) * size].cast(code)
+
+    def _column(self, name: str) -> List[Any]:
+        field = self._fields[name]
+        values = self._table.column(name).to_pylist()
+        dtype = _field_dtype(field)
+        if dtype == "json":
+            values = [None if v is None else json.loads(v) for v in values]
+        elif dtype == "struct":
+            json_children = {
+                (m.name, f.name) for m in field.type for f in m.type if _field_dtype(f) == "json"
+            }
+            values = [
+                None if comp is None else {
+                    m: {f: json.loads(v) if (m, f) in json_children and v is not None else v for f, v in cell.items()}
+                    for m, cell in comp.items() if cell is not None
+                }
+                for comp in values
+            ]
+        absent = ABSENT_PREFIX + name
+        if absent in self._table.column_names:
+            values = [MISSING if a else v for v, a in zip(values, self._table.column(absent).to_pylist())]
+        return values
+
+    def column(self, name: str) -> List[Any]:
+        """Decoded column; absent cells read as None."""
+        return [None if v is MISSING else v for v in self._column(name)]
+
+    def to_frame(self, columns: Iterable[str] | None = None) -> WindowFrame:
+        names = self.column_names if columns is None else [c for c in columns if c in self._fields]
+        frame = WindowFrame(n=self.n_rows)
+        for name in names:
+            frame.set_column(name, self._column(name), sparse=ABSENT_PREFIX + name in self._table.column_names)
+        return frame
+
+    def to_rows(self, columns: Iterable[str] | None = None) -> List[Dict[str, Any]]:
+        """Row dicts equal to the exported rows (absent keys stay absent)."""
+        return self.to_frame(columns).to_rows()
+
+
+def _field_dtype(field: Any) -> str:
+    return (field.metadata or {}).get(b"dtype", b"json").decode()
+
+
+def open_scored_columns(path: str) -> Union[ScoredColumns, ArrowScoredColumns]:
+    """Open an SBAR, Arrow IPC or Parquet scored columns file (detected by magic)."""
+    with open(path, "rb") as fh:
+        magic = fh.read(6)
+    if magic == _ARROW_MAGIC or magic[:4] == _PARQUET_MAGIC:
+        return ArrowScoredColumns(path)
+    return ScoredColumns(path)
+
+
+__all__ = [
+    "ArrowScoredColumns",
+    "COMPONENT_FIELD_DTYPES",
+    "DEFAULT_EXPORT_FORMAT",
+    "EXPORT_FORMATS",
+    "EXPORT_SUFFIXES",
+    "SCORED_COLUMN_DTYPES",
+    "ScoredColumns",
+    "StructColumn",
+    "encode_scored_columns",
+    "export_scored_columns",
+    "open_scored_columns",
+    "scored_columns_table",
+]
@@ -0,0 +1,263 @@
+"""Lazy components_json view & compact binary export (Task 4.7 follow-up).
+
+`attach_components_json_frame` builds one nested dict per metric per window row,
+usually the largest allocation of a run, while only rows a caller drills into are
+ever read. `ComponentsView` instead keeps references to the columns the payload is
+derived from (z_, zc_, r_, contrib_, exp_, observed value, trials, rookie_status)
+and builds each row's dict on access:
+
+  * view[i]           - components_json for row i (same dict `build_components_json` gives)
+  * iter / to_list()  - materialize every row (serialization)
+  * encode()          - compact columnar binary payload; `decode()` restores a view
+
+The view is a `LazyColumn`, so it can sit in a WindowFrame as the components_json
+column: row views and `to_rows()` materialize cells only when rows are read. The
+referenced columns are never rewritten by later stages, so the view stays valid.
+Cells are rebuilt on every access; mutating a returned dict does not change the view.
+
+Binary layout (little-endian):
+  b"SKCJ" | version u8 | flags u8 (bit 0 = zlib) | body
+  body = header length u32 | header JSON | column blobs
+  Each distinct source column is stored once (shared trials columns are deduplicated)
+  as one of: "d" float64 / "q" int64 (validity byte per row + packed values),
+  "n" all None (no payload), "j" JSON list (mixed types).
+"""
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .frame import LazyColumn, WindowFrame
+from .scoring import _trials_map
+
+ENCODING_MAGIC = b"SKCJ"
+ENCODING_VERSION = 1
+_FLAG_ZLIB = 1
+
+
+class ComponentsView(LazyColumn):
+    """Lazy components_json column derived from per-metric source columns."""
+
+    def __init__(
+        self,
+        metrics: List[str],
+        weights: Dict[str, float],
+        sources: List[Tuple[List[Any], ...]],
+        rookies: List[Any],
+        n_rows: int,
+        include_missing: bool = False,
+        extreme_threshold: float = 4.0,
+    ):
+        self.metrics = metrics
+        self.weights = weights
+        self.sources = sources  # per metric: (z, zc, r, contrib, obs, exp, n) columns
+        self.rookies = rookies
+        self.include_missing = include_missing
+        self.extreme_threshold = extreme_threshold
+        self._n = n_rows
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: WindowFrame,
+        metrics: Iterable[str],
+        weights: Dict[str, float],
+        include_missing: bool = False,
+        extreme_threshold: float = 4.0,
+    ) -> "ComponentsView":
+        trials_map = _trials_map()
+        none_col = [None] * len(frame)
+        metrics = list(metrics)
+        sources = []
+        for m in metrics:
+            trials_field = trials_map.get(m)
+            sources.append((
+                frame.get(f"z_{m}"),
+                frame.get(f"zc_{m}"),
+                frame.get(f"r_{m}"),
+                frame.get(f"contrib_{m}"),
+                frame.get(m),
+                frame.get(f"exp_{m}"),
+                frame.get(trials_field) if trials_field else none_col,
+            ))
+        return cls(
+            metrics,
+            {m: weights.get(m) for m in metrics},
+            sources,
+            frame.get("rookie_status"),
+            len(frame),
+            include_missing=include_missing,
+            extreme_threshold=extreme_threshold,
+        )
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _cell(self, i: int) -> Dict[str, Any]:
+        comp: Dict[str, Any] = {}
+        rookie = self.rookies[i]
+        thresh = self.extreme_threshold
+        for m, (zs, zcs, rs, contribs, obs, exps, ns) in zip(self.metrics, self.sources):
+            z, zc, r_val, contrib, obs_val = zs[i], zcs[i], rs[i], contribs[i], obs[i]
+            if not self.include_missing and contrib is None and r_val is None and z is None and zc is None and obs_val is None:
+                continue
+            comp[m] = {
+                "weight": self.weights[m],
+                "z": z,
+                "zc": zc,
+                "r": r_val,
+                "contrib": contrib,
+                "obs": obs_val,
+                "exp": exps[i],
+                "n": ns[i],
+                "extreme": bool(z is not None and abs(float(z)) >= thresh),
+                "rookie": rookie,
+            }
+        return comp
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        cell = self._cell
+        for i in range(self._n):
+            yield cell(i)
+
+    def take(self, indices: List[int]) -> "ComponentsView":
+        idx = list(indices)
+        cache: Dict[int, List[Any]] = {}
+
+        def pick(col: List[Any]) -> List[Any]:
+            key = id(col)
+            if key not in cache:
+                cache[key] = [col[i] for i in idx]
+            return cache[key]
+
+        return ComponentsView(
+            self.metrics,
+            self.weights,
+            [tuple(pick(c) for c in src) for src in self.sources],
+            pick(self.rookies),
+            len(idx),
+            include_missing=self.include_missing,
+            extreme_threshold=self.extreme_threshold,
+        )
+
+    def encode(self, compress: bool = True) -> bytes:
+        """Serialize the source columns (not the materialized dicts) to bytes."""
+        blobs: List[bytes] = []
+        specs: List[Dict[str, Any]] = []
+        slots: Dict[int, int] = {}
+
+        def slot(col: List[Any]) -> int:
+            key = id(col)
+            if key not in slots:
+                kind, blob = _encode_column(col)
+                slots[key] = len(specs)
+                specs.append({"kind": kind, "length": len(blob)})
+                blobs.append(blob)
+            return slots[key]
+
+        header = {
+            "n_rows": self._n,
+            "metrics": self.metrics,
+            "weights": [self.weights[m] for m in self.metrics],
+            "include_missing": self.include_missing,
+            "extreme_threshold": self.extreme_threshold,
+            "sources": [[slot(c) for c in src] for src in self.sources],
+            "rookies": slot(self.rookies),
+        }
+        header["columns"] = specs
+        head = json.dumps(header, separators=(",", ":")).encode()
+        body = struct.pack("<I", len(head)) + head + b"".join(blobs)
+        flags = 0
+        if compress:
+            body = zlib.compress(body, 6)
+            flags |= _FLAG_ZLIB
+        return ENCODING_MAGIC + struct.pack("<BB", ENCODING_VERSION, flags) + body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "ComponentsView":
+        if data[:4] != ENCODING_MAGIC:
+            raise ValueError("Not a components_json payload")
+        version, flags = struct.unpack_from("<BB", data, 4)
+        if version != ENCODING_VERSION:
+            raise ValueError(f"Unsupported components encoding version: {version}")
+        body = data[6:]
+        if flags & _FLAG_ZLIB:
+            body = zlib.decompress(body)
+        (head_len,) = struct.unpack_from("<I", body, 0)
+        header = json.loads(body[4:4 + head_len])
+        n = header["n_rows"]
+        columns: List[List[Any]] = []
+        offset = 4 + head_len
+        for spec in header["columns"]:
+            columns.append(_decode_column(spec["kind"], body[offset:offset + spec["length"]], n))
+            offset += spec["length"]
+        metrics = header["metrics"]
+        return cls(
+            metrics,
+            dict(zip(metrics, header["weights"])),
+            [tuple(columns[k] for k in src) for src in header["sources"]],
+            columns[header["rookies"]],
+            n,
+            include_missing=header["include_missing"],
+            extreme_threshold=header["extreme_threshold"],
+        )
+
+
+def _packed(values: array) -> bytes:
+    if sys.byteorder == "big":  # pragma: no cover (little-endian on disk)
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_column(col: List[Any]) -> Tuple[str, bytes]:
+    kinds = {type(v) for v in col if v is not None}
+    if not kinds:
+        return "n", b""
+    if kinds == {float} or kinds == {int}:
+        code = "d" if kinds == {float} else "q"
+        valid = bytes(v is not None for v in col)
+        fill = 0.0 if code == "d" else 0
+        try:
+            return code, valid + _packed(array(code, [fill if v is None else v for v in col]))
+        except OverflowError:
+            pass
+    return "j", json.dumps(col, separators=(",", ":")).encode()
+
+
+def _decode_column(kind: str, blob: bytes, n: int) -> List[Any]:
+    if kind == "n":
+        return [None] * n
+    if kind == "j":
+        return json.loads(blob)
+    values = array(kind)
+    values.frombytes(blob[n:])
+    if sys.byteorder == "big":  # pragma: no cover
+        values.byteswap()
+    return [v if ok else None for v, ok in zip(values.tolist(), blob[:n])]
+
+
+def attach_components_view_frame(
+    frame: WindowFrame,
+    metrics: Iterable[str],
+    weights: Dict[str, float],
+    field_name: str = "components_json",
+    include_missing: bool = False,
+    extreme_threshold: float = 4.0,
+) -> WindowFrame:
+    """Lazy variant of `attach_components_json_frame`: stores a `ComponentsView` column."""
+    view = ComponentsView.from_frame(
+        frame, metrics, weights, include_missing=include_missing, extreme_threshold=extreme_threshold
+    )
+    frame.set_column(field_name, view)
+    return frame
+
+
+__all__ = [
+    "ComponentsView",
+    "attach_components_view_frame",
+]
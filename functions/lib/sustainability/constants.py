@@ -56,20 +56,33 @@ FALLBACK_SD_CONSTANTS: Dict[str, Dict[str, float]] = {
 }
 
 
-def load_sd_constants(db_client=None, fallback: Dict[str, Dict[str, float]] | None = None) -> Dict[str, Dict[str, float]]:
+def fetch_sd_constant_rows(db_client) -> Iterable[dict]:
+    """Raw sustainability_sigma_constants rows ([] without a client or fetcher)."""
+    if db_client is None:
+        return []
+    return getattr(db_client, "fetch_sd_constants", lambda: [])()
+
+
+def load_sd_constants(
+    db_client=None,
+    fallback: Dict[str, Dict[str, float]] | None = None,
+    rows: Iterable[dict] | None = None,
+) -> Dict[str, Dict[str, float]]:
     """Load SD constants from DB or fallback.
 
     Returns mapping metric_code -> position_code -> sd_value.
-    If db_client is None or query fails/returns empty, fallback is used.
+    If db_client is None (and no pre-fetched `rows` are given) or the query
+    fails/returns empty, fallback is used.
     """
     if fallback is None:
         fallback = FALLBACK_SD_CONSTANTS
 
-    if db_client is None:
+    if db_client is None and rows is None:
         return fallback
 
     try:
-        rows: Iterable[dict] = getattr(db_client, "fetch_sd_constants", lambda: [])()
+        if rows is None:
+            rows = fetch_sd_constant_rows(db_client)
         data: Dict[str, Dict[str, float]] = {}
         for r in rows or []:
             m = r.get("metric_code")
@@ -95,5 +108,6 @@ __all__ = [
     "METRIC_CODES",
     "HUMAN_LABELS",
     "FALLBACK_SD_CONSTANTS",
+    "fetch_sd_constant_rows",
     "load_sd_constants",
 ]
@@ -14,6 +14,8 @@ from __future__ import annotations
 
 from typing import Iterable, Dict, Any, List
 
+from .frame import WindowFrame
+
 
 def compute_contributions(
     rows: Iterable[Dict[str, Any]],
@@ -51,4 +53,31 @@ def compute_contributions(
     return out
 
 
-__all__ = ["compute_contributions"]
+def compute_contributions_frame(
+    frame: WindowFrame,
+    weights: Dict[str, float],
+    metrics: Iterable[str],
+    use_clipped: bool = True,
+) -> WindowFrame:
+    """Column variant of `compute_contributions`; adds contrib_* columns in place."""
+    metrics = list(metrics)
+    totals = [0.0] * len(frame)
+    for m in metrics:
+        w = float(weights.get(m, 0.0))
+        z_vals = frame.get(f"z_{m}")
+        if use_clipped and f"zc_{m}" in frame:
+            z_vals = [zc if zc is not None else z for zc, z in zip(frame.get(f"zc_{m}"), z_vals)]
+        out: List[Any] = []
+        for i, (r_val, z_source) in enumerate(zip(frame.get(f"r_{m}"), z_vals)):
+            if r_val is None or z_source is None:
+                out.append(None)
+                continue
+            contrib = w * r_val * z_source
+            out.append(contrib)
+            totals[i] += contrib
+        frame.set_column(f"contrib_{m}", out)
+    frame.set_column("contrib_total", totals)
+    return frame
+
+
+__all__ = ["compute_contributions", "compute_contributions_frame"]
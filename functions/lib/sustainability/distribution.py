@@ -18,6 +18,31 @@ Design Notes:
         else → quintile=5
   * Provisional assignment: if no snapshot available we set row['quintile']=None and row['provisional_tier']=True
 
+Batch tiering:
+  * `tier_scores` applies the rule to a score column with a binary search per distinct
+    score: quintile = 5 - bisect_right([t20, t40, t60, t80], score), so a score equal to
+    a threshold lands in the higher tier exactly as the if/elif chain does. NaN scores
+    compare false against every threshold and map to 5, as before; snapshots with
+    non-ascending thresholds fall back to the chain.
+  * `tier_scores_by_window` tiers every window type in one pass given snapshots keyed by
+    window type; `assign_quintiles_by_window_frame` is the frame wrapper.
+
+Streaming snapshots:
+  * `build_distribution_sketch*` fold scores into a mergeable `QuantileSketch`
+    (quantiles.py); `build_distribution_snapshot_from_sketch` reads the same four cut
+    points. Sketches from shards or days can be merged before building the snapshot,
+    and `sketch.to_dict()` is stored alongside `DistributionSnapshot.to_dict()`.
+
+Grouped snapshots:
+  * `build_grouped_sketches_frame` folds every row into a per-group sketch in one scan;
+    groups are (window_type, position_code, season_id) with position / season set to
+    None when that split is off (position_code None reads as "F", as in scoring).
+    `build_grouped_snapshots` turns them into snapshots keyed the same way, and
+    `merge_group_sketches` rebuilds a coarser sketch (e.g. GAME over both positions)
+    without rescanning; in exact mode (integer scores) the merge is exact.
+  * `tier_scores_grouped` / `assign_quintiles_grouped_frame` tier each row against its
+    own group's snapshot; rows whose group has no snapshot entry stay MISSING.
+
 Persistence (DB):
   * Production snapshot persistence belongs to the canonical TypeScript/Supabase pipeline.
   * This module remains pure and in-memory for offline comparison and testing.
@@ -25,8 +50,12 @@ Persistence (DB):
 from __future__ import annotations
 
 from dataclasses import dataclass, asdict
+from bisect import bisect_right
 from datetime import datetime, date, timezone
-from typing import List, Dict, Any, Iterable, Optional
+from typing import List, Dict, Any, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+from .frame import MISSING, WindowFrame
+from .quantiles import QuantileSketch
 
 
 @dataclass
@@ -40,6 +69,8 @@ class DistributionSnapshot:
     t60: float
     t80: float
     created_at: str  # ISO timestamp
+    position_code: Optional[str] = None  # set on grouped snapshots (None = all positions)
+    season_id: Optional[int] = None  # set on grouped snapshots split by season
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -66,6 +97,31 @@ def build_distribution_snapshot(
     config_hash: str,
 ) -> Optional[DistributionSnapshot]:
     scores = [float(r.get("score")) for r in rows if r.get("window_type") == window_type and r.get("score") is not None]
+    return _snapshot_from_scores(scores, window_type, model_version, config_hash)
+
+
+def build_distribution_snapshot_frame(
+    frame: WindowFrame,
+    window_type: str,
+    model_version: int,
+    config_hash: str,
+    score_field: str = "score",
+) -> Optional[DistributionSnapshot]:
+    """Column variant of `build_distribution_snapshot`."""
+    scores = [
+        float(s)
+        for wt, s in zip(frame.get("window_type"), frame.get(score_field))
+        if wt == window_type and s is not None
+    ]
+    return _snapshot_from_scores(scores, window_type, model_version, config_hash)
+
+
+def _snapshot_from_scores(
+    scores: List[float],
+    window_type: str,
+    model_version: int,
+    config_hash: str,
+) -> Optional[DistributionSnapshot]:
     if not scores:
         return None
     scores.sort()
@@ -84,6 +140,57 @@ def build_distribution_snapshot(
     return snap
 
 
+def build_distribution_sketch(
+    rows: Iterable[Dict[str, Any]],
+    window_type: str,
+    score_field: str = "score",
+    sketch: Optional[QuantileSketch] = None,
+) -> QuantileSketch:
+    """Fold scores of `window_type` rows into `sketch` (a new one if not given)."""
+    sketch = sketch if sketch is not None else QuantileSketch()
+    for r in rows:
+        if r.get("window_type") == window_type and r.get(score_field) is not None:
+            sketch.add(float(r.get(score_field)))
+    return sketch
+
+
+def build_distribution_sketch_frame(
+    frame: WindowFrame,
+    window_type: str,
+    score_field: str = "score",
+    sketch: Optional[QuantileSketch] = None,
+) -> QuantileSketch:
+    sketch = sketch if sketch is not None else QuantileSketch()
+    sketch.update(
+        float(s)
+        for wt, s in zip(frame.get("window_type"), frame.get(score_field))
+        if wt == window_type and s is not None
+    )
+    return sketch
+
+
+def build_distribution_snapshot_from_sketch(
+    sketch: QuantileSketch,
+    window_type: str,
+    model_version: int,
+    config_hash: str,
+) -> Optional[DistributionSnapshot]:
+    if sketch.n == 0:
+        return None
+    t20, t40, t60, t80 = sketch.quantiles(PERCENT_CUTS)
+    return DistributionSnapshot(
+        window_type=window_type,
+        model_version=model_version,
+        config_hash=config_hash,
+        n=sketch.n,
+        t20=t20,
+        t40=t40,
+        t60=t60,
+        t80=t80,
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+
+
 def assign_quintiles(
     rows: Iterable[Dict[str, Any]],
     snapshot: Optional[DistributionSnapshot],
@@ -91,37 +198,261 @@ def assign_quintiles(
     score_field: str = "score",
     quintile_field: str = "quintile",
 ) -> List[Dict[str, Any]]:
+    rows = rows if isinstance(rows, list) else list(rows)
+    quintiles, provisional = tier_scores_by_window(
+        [r.get("window_type") for r in rows], [r.get(score_field) for r in rows], {window_filter: snapshot}
+    )
     out: List[Dict[str, Any]] = []
-    for r in rows:
+    for r, q, p in zip(rows, quintiles, provisional):
         new_r = r.copy()
-        if r.get("window_type") != window_filter:
-            out.append(new_r)
+        if q is not MISSING:
+            new_r[quintile_field] = q
+            new_r["provisional_tier"] = p
+        out.append(new_r)
+    return out
+
+
+def _quintile(score: float, snapshot: DistributionSnapshot) -> int:
+    # Assignment: compare against thresholds ascending
+    if score >= snapshot.t80:
+        return 1
+    elif score >= snapshot.t60:
+        return 2
+    elif score >= snapshot.t40:
+        return 3
+    elif score >= snapshot.t20:
+        return 4
+    return 5
+
+
+# Scores are 0-100 integers, so tiering each distinct value once and mapping the
+# column through a dict beats per-row comparisons; mostly-distinct float columns
+# fall back to one bisect per row.
+_LOOKUP_MAX_DISTINCT = 4096
+
+
+def _thresholds(snapshot: DistributionSnapshot) -> Optional[Tuple[float, ...]]:
+    ts = (snapshot.t20, snapshot.t40, snapshot.t60, snapshot.t80)
+    if ts[0] <= ts[1] <= ts[2] <= ts[3]:
+        return ts
+    return None
+
+
+def tier_scores(
+    scores: Sequence[Any],
+    snapshot: Optional[DistributionSnapshot],
+) -> Tuple[List[Optional[int]], List[bool]]:
+    """Tier a score column against one snapshot.
+
+    Returns (quintiles, provisional) lists aligned with `scores`; None scores (or a
+    missing snapshot) give (None, True), matching `assign_quintiles`.
+    """
+    if snapshot is None:
+        return [None] * len(scores), [True] * len(scores)
+    ts = _thresholds(snapshot)
+
+    def tier(score: Any) -> Optional[int]:
+        if score is None:
+            return None
+        if ts is None:
+            return _quintile(score, snapshot)
+        return 5 - bisect_right(ts, score) if score == score else 5
+
+    distinct = set(scores)
+    if len(distinct) > _LOOKUP_MAX_DISTINCT and len(distinct) * 4 > len(scores):
+        quintiles = [tier(s) for s in scores]
+        return quintiles, [q is None for q in quintiles]
+    lookup = {s: tier(s) for s in distinct}
+    flags = {s: q is None for s, q in lookup.items()}
+    return list(map(lookup.__getitem__, scores)), list(map(flags.__getitem__, scores))
+
+
+SnapshotSet = Union[Mapping[str, Optional[DistributionSnapshot]], Iterable[DistributionSnapshot]]
+
+
+def _snapshots_by_window(snapshots: SnapshotSet) -> Dict[str, Optional[DistributionSnapshot]]:
+    if isinstance(snapshots, Mapping):
+        return dict(snapshots)
+    return {snap.window_type: snap for snap in snapshots}
+
+
+def tier_scores_by_window(
+    window_types: Sequence[Any],
+    scores: Sequence[Any],
+    snapshots: SnapshotSet,
+) -> Tuple[List[Any], List[Any]]:
+    """Tier rows of every window type in one pass.
+
+    `snapshots` maps window_type -> snapshot (None = tier provisionally), or is a
+    sequence of snapshots keyed by their own `window_type`. Rows whose window type is
+    not a key are left untiered and hold `MISSING` in both output lists.
+    """
+    by_window = _snapshots_by_window(snapshots)
+    buckets: Dict[Any, List[int]] = {wt: [] for wt in by_window}
+    for i, wt in enumerate(window_types):
+        bucket = buckets.get(wt)
+        if bucket is not None:
+            bucket.append(i)
+    quintiles: List[Any] = [MISSING] * len(scores)
+    provisional: List[Any] = [MISSING] * len(scores)
+    for wt, idx in buckets.items():
+        if not idx:
             continue
-        score = r.get(score_field)
-        if snapshot is None or score is None:
-            new_r[quintile_field] = None
-            new_r["provisional_tier"] = True
-            out.append(new_r)
+        q, p = tier_scores([scores[i] for i in idx], by_window[wt])
+        for i, qv, pv in zip(idx, q, p):
+            quintiles[i] = qv
+            provisional[i] = pv
+    return quintiles, provisional
+
+
+def assign_quintiles_by_window_frame(
+    frame: WindowFrame,
+    snapshots: SnapshotSet,
+    score_field: str = "score",
+    quintile_field: str = "quintile",
+) -> WindowFrame:
+    """Tier all window types present in `snapshots` in one pass; other rows keep prior values."""
+    quintiles, provisional = tier_scores_by_window(frame.get("window_type"), frame.get(score_field), snapshots)
+    return _set_tier_columns(frame, quintiles, provisional, quintile_field)
+
+
+def _set_tier_columns(
+    frame: WindowFrame,
+    quintiles: List[Any],
+    provisional: List[Any],
+    quintile_field: str,
+) -> WindowFrame:
+    # MISSING entries keep the frame's prior values (or stay MISSING). New lists are
+    # swapped in; the previous columns stay untouched for views taken earlier.
+    prev_q = frame.columns.get(quintile_field)
+    prev_p = frame.columns.get("provisional_tier")
+    if prev_q is not None:
+        quintiles = [p if q is MISSING else q for q, p in zip(quintiles, prev_q)]
+    if prev_p is not None:
+        provisional = [p if v is MISSING else v for v, p in zip(provisional, prev_p)]
+    frame.set_column(quintile_field, quintiles, sparse=True)
+    frame.set_column("provisional_tier", provisional, sparse=True)
+    return frame
+
+
+def assign_quintiles_frame(
+    frame: WindowFrame,
+    snapshot: Optional[DistributionSnapshot],
+    window_filter: str = "GAME",
+    score_field: str = "score",
+    quintile_field: str = "quintile",
+) -> WindowFrame:
+    """Column variant of `assign_quintiles`; rows outside `window_filter` keep prior values (or MISSING)."""
+    return assign_quintiles_by_window_frame(
+        frame, {window_filter: snapshot}, score_field=score_field, quintile_field=quintile_field
+    )
+
+
+GroupKey = Tuple[Any, Optional[str], Optional[int]]
+
+
+def _group_keys(
+    frame: WindowFrame,
+    by_position: bool,
+    by_season: bool,
+) -> Iterable[GroupKey]:
+    n = len(frame)
+    positions = [p or "F" for p in frame.get("position_code")] if by_position else [None] * n
+    seasons = frame.get("season_id") if by_season else [None] * n
+    return zip(frame.get("window_type"), positions, seasons)
+
+
+def build_grouped_sketches_frame(
+    frame: WindowFrame,
+    by_position: bool = True,
+    by_season: bool = False,
+    window_types: Optional[Iterable[str]] = None,
+    score_field: str = "score",
+    sketches: Optional[Dict[GroupKey, QuantileSketch]] = None,
+) -> Dict[GroupKey, QuantileSketch]:
+    """One scan over `frame`: each score goes straight into its (window_type, position, season) sketch.
+
+    No per-group value lists are gathered, so memory per group is bounded by its sketch.
+    Pass `sketches` to keep folding into the sketches of earlier frames (e.g. per player).
+    """
+    wanted = set(window_types) if window_types is not None else None
+    sketches = sketches if sketches is not None else {}
+    for key, s in zip(_group_keys(frame, by_position, by_season), frame.get(score_field)):
+        if s is None or (wanted is not None and key[0] not in wanted):
             continue
-        # Assignment: compare against thresholds ascending
-        if score >= snapshot.t80:
-            q = 1
-        elif score >= snapshot.t60:
-            q = 2
-        elif score >= snapshot.t40:
-            q = 3
-        elif score >= snapshot.t20:
-            q = 4
-        else:
-            q = 5
-        new_r[quintile_field] = q
-        new_r["provisional_tier"] = False
-        out.append(new_r)
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = QuantileSketch()
+        sketch.add(s)
+    return sketches
+
+
+def merge_group_sketches(
+    sketches: Mapping[GroupKey, QuantileSketch],
+    window_type: str,
+    season_id: Optional[int] = None,
+) -> QuantileSketch:
+    """One sketch for `window_type` (and `season_id` when given) over every matching group."""
+    merged = QuantileSketch()
+    for (wt, _, sid), sketch in sketches.items():
+        if wt == window_type and (season_id is None or sid == season_id):
+            merged.merge(sketch)
+    return merged
+
+
+def build_grouped_snapshots(
+    sketches: Mapping[GroupKey, QuantileSketch],
+    model_version: int,
+    config_hash: str,
+) -> Dict[GroupKey, DistributionSnapshot]:
+    out: Dict[GroupKey, DistributionSnapshot] = {}
+    for key, sketch in sketches.items():
+        snap = build_distribution_snapshot_from_sketch(sketch, key[0], model_version, config_hash)
+        if snap is not None:
+            snap.position_code, snap.season_id = key[1], key[2]
+            out[key] = snap
     return out
 
 
+def tier_scores_grouped(
+    keys: Sequence[GroupKey],
+    scores: Sequence[Any],
+    snapshots: Mapping[GroupKey, Optional[DistributionSnapshot]],
+) -> Tuple[List[Any], List[Any]]:
+    """`tier_scores_by_window` keyed by group instead of window type."""
+    return tier_scores_by_window(keys, scores, snapshots)
+
+
+def assign_quintiles_grouped_frame(
+    frame: WindowFrame,
+    snapshots: Mapping[GroupKey, Optional[DistributionSnapshot]],
+    by_position: bool = True,
+    by_season: bool = False,
+    score_field: str = "score",
+    quintile_field: str = "quintile",
+) -> WindowFrame:
+    """Tier every row against its group's snapshot; rows of other groups keep prior values."""
+    keys = list(_group_keys(frame, by_position, by_season))
+    quintiles, provisional = tier_scores_grouped(keys, frame.get(score_field), snapshots)
+    return _set_tier_columns(frame, quintiles, provisional, quintile_field)
+
+
 __all__ = [
     "DistributionSnapshot",
     "build_distribution_snapshot",
+    "build_distribution_snapshot_frame",
+    "build_distribution_sketch",
+    "build_distribution_sketch_frame",
+    "build_distribution_snapshot_from_sketch",
     "assign_quintiles",
+    "assign_quintiles_frame",
+    "assign_quintiles_by_window_frame",
+    "tier_scores",
+    "tier_scores_by_window",
+    "GroupKey",
+    "build_grouped_sketches_frame",
+    "build_grouped_snapshots",
+    "merge_group_sketches",
+    "tier_scores_grouped",
+    "assign_quintiles_grouped_frame",
 ]
@@ -32,6 +32,8 @@ from __future__ import annotations
 
 from typing import Iterable, Dict, Any, List
 
+from .frame import WindowFrame
+
 FINISHING_COUNT_METRIC = "finish_res_cnt"
 FINISHING_RATE_METRIC = "finish_res_rate"
 FINISHING_METRICS = [FINISHING_RATE_METRIC, FINISHING_COUNT_METRIC]
@@ -82,9 +84,55 @@ def annotate_finishing_residuals(
     return out
 
 
+def finishing_residual_columns(
+    frame: WindowFrame,
+    sd_constants: Dict[str, Dict[str, float]],
+) -> Dict[str, List[Any]]:
+    """Residual columns for `frame` (name -> values, in output order) without attaching them."""
+    positions = [p or "F" for p in frame.get("position_code")]
+    res_cnt = [(g or 0) - float(x or 0.0) for g, x in zip(frame.get("goals"), frame.get("ixg"))]
+    sd_cnt_by_pos = sd_constants.get(FINISHING_COUNT_METRIC, {})
+    z_cnt: List[Any] = []
+    for res, pos in zip(res_cnt, positions):
+        sd_cnt = sd_cnt_by_pos.get(pos)
+        z_cnt.append(res / sd_cnt if sd_cnt and sd_cnt > 0 else None)
+
+    res_rate = [res / s if (s or 0) > 0 else None for res, s in zip(res_cnt, frame.get("shots"))]
+    sd_rate_by_pos = sd_constants.get(FINISHING_RATE_METRIC, {})
+    z_rate: List[Any] = []
+    for res, pos in zip(res_rate, positions):
+        sd_rate = sd_rate_by_pos.get(pos)
+        z_rate.append(res / sd_rate if res is not None and sd_rate and sd_rate > 0 else None)
+
+    return {
+        FINISHING_COUNT_METRIC: res_cnt,
+        f"delta_{FINISHING_COUNT_METRIC}": list(res_cnt),
+        f"exp_{FINISHING_COUNT_METRIC}": [0.0] * len(frame),
+        f"z_{FINISHING_COUNT_METRIC}": z_cnt,
+        FINISHING_RATE_METRIC: res_rate,
+        f"delta_{FINISHING_RATE_METRIC}": list(res_rate),
+        f"exp_{FINISHING_RATE_METRIC}": [0.0 if v is not None else None for v in res_rate],
+        f"z_{FINISHING_RATE_METRIC}": z_rate,
+        f"r_{FINISHING_COUNT_METRIC}": [1.0 if z is not None else 0.0 for z in z_cnt],
+        f"r_{FINISHING_RATE_METRIC}": [1.0 if z is not None else 0.0 for z in z_rate],
+    }
+
+
+def annotate_finishing_residuals_frame(
+    frame: WindowFrame,
+    sd_constants: Dict[str, Dict[str, float]],
+) -> WindowFrame:
+    """Column variant of `annotate_finishing_residuals`; adds residual columns in place."""
+    for name, values in finishing_residual_columns(frame, sd_constants).items():
+        frame.set_column(name, values)
+    return frame
+
+
 __all__ = [
     "FINISHING_METRICS",
     "FINISHING_COUNT_METRIC",
     "FINISHING_RATE_METRIC",
     "annotate_finishing_residuals",
+    "annotate_finishing_residuals_frame",
+    "finishing_residual_columns",
 ]
@@ -0,0 +1,255 @@
+"""Struct-of-arrays window table (WindowFrame).
+
+Holds one list per column instead of one dict per window row. Scoring stages
+add their output columns to the frame (`set_column`), so a full pipeline run keeps
+a single copy of the window data regardless of how many stages execute.
+
+Column lists are never mutated in place. A stage that recomputes an existing
+column (e.g. re-tiering writes new `quintile` / `provisional_tier` columns) builds
+a new list and swaps it in with `set_column`. Row views and lazy columns hold the
+column objects they were built over, so a view taken earlier keeps its values.
+
+Adapters:
+  * `to_rows()`   - materialize list-of-dict rows (current public API shape)
+  * `rows_view()` - lazy read-only Sequence of dict rows over a column subset
+
+Lazy columns:
+  A column may be a `LazyColumn` (e.g. the components_json view in components.py):
+  a read-only Sequence that derives each cell from other columns on access. Frames
+  store it as-is; row adapters build cells as rows are read, and `to_rows()` builds
+  them all (serialization).
+
+Sparse columns:
+  Some stages only annotate a subset of rows (e.g. quintiles for one window type).
+  Those cells hold the `MISSING` sentinel and the key is omitted from the row dict,
+  matching the list-of-dict stages that never set the key on those rows.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:  # pragma: no cover (debug helper)
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+class LazyColumn(Sequence):
+    """Read-only column whose cells are computed on access; subclasses implement `_cell`."""
+
+    def _cell(self, i: int) -> Any:  # pragma: no cover (abstract)
+        raise NotImplementedError
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self._cell(k) for k in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("row index out of range")
+        return self._cell(i)
+
+    def __iter__(self) -> Iterator[Any]:
+        cell = self._cell
+        for i in range(len(self)):
+            yield cell(i)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LazyColumn)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def take(self, indices: List[int]) -> List[Any]:
+        return [self._cell(i) for i in indices]
+
+    def to_list(self) -> List[Any]:
+        return list(self)
+
+
+class WindowFrame:
+    """Column-oriented container for window rows."""
+
+    __slots__ = ("columns", "sparse", "_n")
+
+    def __init__(self, columns: Dict[str, List[Any]] | None = None, n: int | None = None):
+        self.columns: Dict[str, List[Any]] = {}
+        self.sparse: set[str] = set()
+        self._n = n
+        for name, values in (columns or {}).items():
+            self.set_column(name, values)
+        if self._n is None:
+            self._n = 0
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]]) -> "WindowFrame":
+        return cls(columns)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "WindowFrame":
+        rows = list(rows)
+        names: Dict[str, None] = {}
+        for r in rows:
+            for k in r:
+                names.setdefault(k, None)
+        frame = cls(n=len(rows))
+        for name in names:
+            values = [r.get(name, MISSING) for r in rows]
+            frame.set_column(name, values, sparse=any(v is MISSING for v in values))
+        return frame
+
+    @classmethod
+    def concat(cls, frames: Iterable["WindowFrame"]) -> "WindowFrame":
+        """Stack frames row-wise; columns absent from a frame read as MISSING (sparse)."""
+        frames = list(frames)
+        names: Dict[str, None] = {}
+        for f in frames:
+            for name in f.columns:
+                names.setdefault(name, None)
+        out = cls(n=sum(len(f) for f in frames))
+        for name in names:
+            values: List[Any] = []
+            sparse = False
+            for f in frames:
+                col = f.columns.get(name)
+                if col is None:
+                    values.extend([MISSING] * len(f))
+                    sparse = True
+                else:
+                    values.extend(col)
+                    sparse = sparse or name in f.sparse
+            out.set_column(name, values, sparse=sparse)
+        return out
+
+    def __len__(self) -> int:
+        return self._n or 0
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns.keys())
+
+    def column(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def get(self, name: str, default: Any = None) -> List[Any]:
+        """Return column values, or a constant column of `default` if absent.
+
+        Sparse cells read as `default`, mirroring `row.get(name, default)`.
+        """
+        values = self.columns.get(name)
+        if values is None:
+            return [default] * len(self)
+        if name in self.sparse:
+            return [default if v is MISSING else v for v in values]
+        return values
+
+    def set_column(self, name: str, values: List[Any], sparse: bool = False) -> None:
+        if not isinstance(values, (list, LazyColumn)):
+            values = list(values)
+        if self._n is None:
+            self._n = len(values)
+        elif len(values) != self._n:
+            raise ValueError(f"column '{name}' has {len(values)} values, expected {self._n}")
+        self.columns[name] = values
+        if sparse:
+            self.sparse.add(name)
+        else:
+            self.sparse.discard(name)
+
+    def take(self, indices: Iterable[int]) -> "WindowFrame":
+        """Return a new frame with the rows at `indices` (in the order given)."""
+        idx = list(indices)
+        out = WindowFrame(n=len(idx))
+        for name, values in self.columns.items():
+            taken = values.take(idx) if isinstance(values, LazyColumn) else [values[i] for i in idx]
+            out.set_column(name, taken, sparse=name in self.sparse)
+        return out
+
+    def _names(self, columns: Iterable[str] | None) -> List[str]:
+        if columns is None:
+            return list(self.columns.keys())
+        return [c for c in columns if c in self.columns]
+
+    def to_rows(self, columns: Iterable[str] | None = None) -> List[Dict[str, Any]]:
+        names = self._names(columns)
+        if not names:
+            return [{} for _ in range(len(self))]
+        rows = [dict(zip(names, values)) for values in zip(*(self.columns[n] for n in names))]
+        sparse = [n for n in names if n in self.sparse]
+        if sparse:
+            for r in rows:
+                for n in sparse:
+                    if r[n] is MISSING:
+                        del r[n]
+        return rows
+
+    def rows_view(self, columns: Iterable[str] | None = None) -> "FrameRowsView":
+        return FrameRowsView(self, self._names(columns))
+
+
+class FrameRowsView(Sequence):
+    """Lazy, read-only row view; each access builds a fresh dict.
+
+    Holds the frame's column objects as of `rows_view()`, so columns replaced later
+    (e.g. re-tiering) do not change rows read through this view.
+    """
+
+    __slots__ = ("_names", "_columns", "_sparse", "_n")
+
+    def __init__(self, frame: WindowFrame, names: List[str]):
+        self._names = names
+        self._columns = [frame.columns[n] for n in names]
+        self._sparse = [n for n in names if n in frame.sparse]
+        self._n = len(frame)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        row = {n: col[i] for n, col in zip(self._names, self._columns)}
+        for n in self._sparse:
+            if row[n] is MISSING:
+                del row[n]
+        return row
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self._row(k) for k in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("row index out of range")
+        return self._row(i)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        frame = WindowFrame(n=self._n)
+        for name, col in zip(self._names, self._columns):
+            frame.set_column(name, col, sparse=name in self._sparse)
+        return frame.to_rows()
+
+
+__all__ = [
+    "MISSING",
+    "LazyColumn",
+    "WindowFrame",
+    "FrameRowsView",
+]
@@ -0,0 +1,188 @@
+"""Fused scoring kernel: z → reliability → clip → contribution → logistic (Task 4.4–4.7 follow-up).
+
+The staged frame path runs one column pass per stage (zscores, reliability,
+clipping, contributions, logistic). Every pass re-reads its inputs through
+`frame.get`, builds an intermediate list per metric and rebuilds the
+f"z_{metric}"-style column names. `score_frame_fused` produces the same columns
+in one pass per metric plus one logistic pass:
+
+  * Player prior slots are resolved once per frame (`PriorIndex.slots`), each
+    metric's expectations are a gather over the index, and SD constants are
+    resolved once per position.
+  * r depends only on the trials count, so it is computed once per distinct count.
+  * exp/delta/z/r/zc/contrib for a metric are built back to back as column
+    expressions, with no intermediate frame writes or key rebuilding.
+    contrib_total is accumulated in scoring-metric order, as in
+    `compute_contributions_frame`.
+  * Weighted metrics with no z column (not produced by any stage) are all-None
+    without touching rows.
+  * Finishing residual columns come from `finishing_residual_columns` and feed the
+    loop directly.
+
+Output equals the staged path: same float operations in the same order, and the
+same columns in the same order. `run_full_scoring_pipeline(kernel="fused")`
+selects it.
+"""
+from __future__ import annotations
+
+from math import tanh
+from typing import Any, Dict, Iterable, List, Mapping
+
+from .clipping import _clip
+from .finishing import finishing_residual_columns
+from .frame import WindowFrame
+from .reliability import RELIABILITY_METRICS, reliability_factor
+from .scoring import _guardrail_span, _score_contrib
+from .prior_index import PriorIndex
+from .zscores import RATE_METRICS
+
+
+def _rate_metrics(metrics: Iterable[str] | None) -> List[str]:
+    return [m for m in (metrics if metrics is not None else RATE_METRICS) if m in RATE_METRICS]
+
+
+def _reliability_metrics(metrics: Iterable[str] | None) -> List[str]:
+    return [m for m in (metrics if metrics is not None else RELIABILITY_METRICS.keys()) if m in RELIABILITY_METRICS]
+
+
+def fused_pre_scoring_columns(metrics: Iterable[str] | None = None) -> List[str]:
+    """Columns the staged z-score + reliability stages add, in order (the 'enriched' set)."""
+    metrics = list(metrics) if metrics is not None else None
+    names = [f"{prefix}_{m}" for m in _rate_metrics(metrics) for prefix in ("exp", "delta", "z")]
+    return names + [f"r_{m}" for m in _reliability_metrics(metrics)]
+
+
+def score_frame_fused(
+    frame: WindowFrame,
+    player_priors: PriorIndex | Iterable[Dict[str, Any]] | Mapping,
+    sd_constants: Dict[str, Dict[str, float]],
+    k_r: Dict[str, int | float],
+    c: float,
+    weights: Dict[str, float],
+    guardrails: Dict[str, float],
+    scoring_metrics: Iterable[str],
+    metrics: Iterable[str] | None = None,
+    use_finishing_residuals: bool = False,
+    scale: int = 100,
+) -> WindowFrame:
+    """Add every z/r/zc/contrib/score column to `frame` in place.
+
+    Parameters:
+      metrics: rate-metric subset for z-scores + reliability (as `annotate_zscores_frame`).
+      scoring_metrics: metrics clipped and weighted (the pipeline's `_scoring_metrics`).
+      c, k_r, weights, guardrails: as passed to the staged stage functions.
+    """
+    if c <= 0:
+        raise ValueError("c must be > 0 for soft clipping")
+    metrics = list(metrics) if metrics is not None else None
+    rate = _rate_metrics(metrics)
+    rel = _reliability_metrics(metrics)
+    scoring_metrics = list(scoring_metrics)
+    n = len(frame)
+
+    positions = [p or "F" for p in frame.get("position_code")]
+    index = PriorIndex.coerce(player_priors)
+    slots = index.slots(frame.get("player_id"))
+    finishing = finishing_residual_columns(frame, sd_constants) if use_finishing_residuals else {}
+    out: Dict[str, List[Any]] = {}
+    totals = [0.0] * n
+    nones: List[Any] = [None] * n
+
+    def accumulate(contribs: List[Any]) -> None:
+        totals[:] = [t if x is None else t + x for t, x in zip(totals, contribs)]
+
+    def rate_pass(m: str, w: float | None) -> None:
+        # exp/delta/z (+ r when reliability covers m, + zc/contrib when scored) as column expressions.
+        exps = index.gather(slots, m)
+        sd_by_pos = sd_constants.get(m, {})
+        sd_ok = {pos: sd for pos in set(positions) if (sd := sd_by_pos.get(pos)) is not None and sd > 0}
+        sds = list(map(sd_ok.get, positions))
+        deltas = [
+            None if o is None or e is None or sd is None else o - e
+            for o, e, sd in zip(frame.get(m), exps, sds)
+        ]
+        zs = [None if d is None else d / sd for d, sd in zip(deltas, sds)]
+        out[f"exp_{m}"] = exps
+        out[f"delta_{m}"] = deltas
+        out[f"z_{m}"] = zs
+        if m in rel:
+            # r depends only on the trials count: one factor per distinct count.
+            k_val = float(k_r.get(m, 0))
+            trials = frame.get(RELIABILITY_METRICS[m])
+            table = {t: reliability_factor(t, k_val) for t in set(trials)}
+            rs = out[f"r_{m}"] = list(map(table.__getitem__, trials))
+        else:
+            rs = frame.get(f"r_{m}")
+        if w is None:
+            return
+        zcs = out[f"zc_{m}"] = [None if z is None else tanh(z / c) for z in zs]
+        contribs = out[f"contrib_{m}"] = [
+            None if zc is None or r_val is None else w * r_val * zc for zc, r_val in zip(zcs, rs)
+        ]
+        accumulate(contribs)
+
+    def source(name: str) -> List[Any] | None:
+        if name in out:
+            return out[name]
+        if name in finishing:
+            return finishing[name]
+        return frame.get(name) if name in frame else None
+
+    def generic_pass(m: str, w: float) -> None:
+        z_col = source(f"z_{m}")
+        if z_col is None:
+            # No z column at all: every zc / contrib is None.
+            out[f"zc_{m}"] = list(nones)
+            out[f"contrib_{m}"] = list(nones)
+            return
+        zcs = out[f"zc_{m}"] = [_clip(z, c) for z in z_col]
+        r_col = source(f"r_{m}") or nones
+        contribs = out[f"contrib_{m}"] = [
+            None if r_val is None or (src := (zc if zc is not None else z)) is None else w * r_val * src
+            for r_val, zc, z in zip(r_col, zcs, z_col)
+        ]
+        accumulate(contribs)
+
+    # Scored metrics first, in scoring order (fixes the contrib_total summation order).
+    for m in scoring_metrics:
+        w = float(weights.get(m, 0.0))
+        if m in rate and f"z_{m}" not in out:
+            rate_pass(m, w)
+        else:
+            generic_pass(m, w)
+    for m in rate:
+        if f"z_{m}" not in out:
+            rate_pass(m, None)
+    # Reliability-only metrics (not in the z-score subset) still get r_ columns.
+    for m in rel:
+        if f"r_{m}" not in out:
+            k_val = float(k_r.get(m, 0))
+            out[f"r_{m}"] = [reliability_factor(t, k_val) for t in frame.get(RELIABILITY_METRICS[m])]
+
+    lower, span = _guardrail_span(guardrails)
+    pairs = [_score_contrib(total, lower, span, scale) for total in totals]
+    scores_raw = [p for p, _ in pairs]
+    scores = [sc for _, sc in pairs]
+
+    # Attach in the staged column order.
+    for m in rate:
+        for prefix in ("exp", "delta", "z"):
+            frame.set_column(f"{prefix}_{m}", out[f"{prefix}_{m}"])
+    for m in rel:
+        frame.set_column(f"r_{m}", out[f"r_{m}"])
+    for name, values in finishing.items():
+        frame.set_column(name, values)
+    for m in scoring_metrics:
+        frame.set_column(f"zc_{m}", out[f"zc_{m}"])
+    for m in scoring_metrics:
+        frame.set_column(f"contrib_{m}", out[f"contrib_{m}"])
+    frame.set_column("contrib_total", totals)
+    frame.set_column("score_raw", scores_raw)
+    frame.set_column("score", scores)
+    return frame
+
+
+__all__ = [
+    "score_frame_fused",
+    "fused_pre_scoring_columns",
+]
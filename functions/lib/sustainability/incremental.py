@@ -0,0 +1,372 @@
+"""Offline incremental window state & scoring (Task 5.x: new game detection).
+
+Keeps a per-player rolling state on local disk so a nightly run only touches
+players that appeared in the new slate:
+
+  * recent  - last 10 games (serves GAME / G5 / G10 windows)
+  * fresh   - freshness deque of games within `freshness_days` of the latest game (STD)
+  * std sums - running count sums over `fresh`, plus a running ixG total
+
+Given only the new day's game rows, `IncrementalWindowState.update` appends the
+GAME/G5/G10/STD rows for each new game (identical to what `build_window_columns`
+would emit for the same date over the full history) and `run_incremental_scoring`
+scores just those rows. Unchanged players produce no rows.
+
+Constraints:
+  * Games must arrive in date order per player (game_date >= last processed date).
+    Late corrections require a full rebuild; they raise `IncrementalOrderError`.
+  * Each player remembers the game_ids processed on its last date, so a replayed
+    or retried slate (or a game repeated within a slate) is skipped instead of
+    being counted twice. Rows without a game_id cannot be deduplicated.
+  * The state file is plain JSON written atomically (tmp file + rename). It is local
+    working state for offline runs; production persistence remains fail-closed.
+  * The state also keeps one QuantileSketch of scores per window type, folded in as
+    each slate is scored (a GAME row is scored exactly once, on its own slate). With
+    `build_snapshot=True` the snapshot comes from the merged sketch, so it matches the
+    one a full rebuild over the same games would build, and the new rows are tiered
+    against it. A caller-supplied snapshot (e.g. from the last full run) takes
+    precedence; with neither, rows are provisional exactly like `assign_quintiles`.
+    Sketches only mix scores of one config: a state scored under another
+    config_hash requires a rebuild.
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from .config_loader import SustainabilityConfig
+from .distribution import (
+    DistributionSnapshot,
+    assign_quintiles_frame,
+    build_distribution_sketch_frame,
+    build_distribution_snapshot_from_sketch,
+)
+from .frame import WindowFrame
+from .pipeline import _resolve_inputs, score_window_frame
+from .prior_cache import PriorCache
+from .profiling import StageProfiler, resolve_profiler
+from .prior_index import PriorIndex
+from .priors import LeaguePriorRow
+from .quantiles import QuantileSketch
+from .windows import WINDOW_COLUMNS, WINDOW_TYPES, _COUNT_FIELDS, _ROLLING_SIZES, _float_sum, _to_date
+
+STATE_VERSION = 2
+RECENT_GAMES = max(size for size, _ in _ROLLING_SIZES)
+
+
+class IncrementalOrderError(ValueError):
+    """Raised when a new game predates a player's last processed game."""
+
+
+def _game_stats(g: Dict[str, Any], game_date: date) -> List[Any]:
+    # [date, *counts, ixg] — counts in _COUNT_FIELDS order
+    return [game_date, *(g.get(f, 0) or 0 for f in _COUNT_FIELDS), float(g.get("ixg", 0.0) or 0.0)]
+
+
+_IXG = len(_COUNT_FIELDS) + 1
+
+
+@dataclass
+class PlayerWindowState:
+    player_id: Any
+    last_date: date
+    n_games: int = 0
+    recent: Deque[List[Any]] = field(default_factory=lambda: deque(maxlen=RECENT_GAMES))
+    fresh: Deque[List[Any]] = field(default_factory=deque)
+    std_sums: List[Any] = field(default_factory=lambda: [0] * len(_COUNT_FIELDS))
+    std_ixg: float = 0.0  # sequential total; only used until the first eviction
+    evicted: bool = False
+    last_game_ids: List[Any] = field(default_factory=list)  # game_ids processed on last_date
+
+    def to_dict(self) -> Dict[str, Any]:
+        def enc(games: Iterable[List[Any]]) -> List[List[Any]]:
+            return [[g[0].isoformat(), *g[1:]] for g in games]
+
+        return {
+            "player_id": self.player_id,
+            "last_date": self.last_date.isoformat(),
+            "n_games": self.n_games,
+            "recent": enc(self.recent),
+            "fresh": enc(self.fresh),
+            "std_sums": self.std_sums,
+            "std_ixg": self.std_ixg,
+            "evicted": self.evicted,
+            "last_game_ids": self.last_game_ids,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PlayerWindowState":
+        def dec(games: Iterable[List[Any]]) -> List[List[Any]]:
+            return [[_to_date(g[0]), *g[1:]] for g in games]
+
+        return cls(
+            player_id=d["player_id"],
+            last_date=_to_date(d["last_date"]),
+            n_games=int(d["n_games"]),
+            recent=deque(dec(d["recent"]), maxlen=RECENT_GAMES),
+            fresh=deque(dec(d["fresh"])),
+            std_sums=list(d["std_sums"]),
+            std_ixg=float(d["std_ixg"]),
+            evicted=bool(d["evicted"]),
+            last_game_ids=list(d.get("last_game_ids", [])),
+        )
+
+
+def _span_values(games: List[List[Any]]) -> List[Any]:
+    sums = [0] * len(_COUNT_FIELDS)
+    for g in games:
+        for k in range(len(_COUNT_FIELDS)):
+            sums[k] += g[k + 1]
+    return sums
+
+
+class IncrementalWindowState:
+    """Per-player rolling window state, persisted as JSON on local disk."""
+
+    def __init__(
+        self,
+        freshness_days: int = 45,
+        players: Dict[int, PlayerWindowState] | None = None,
+        score_sketches: Dict[str, QuantileSketch] | None = None,
+        config_hash: str | None = None,
+    ):
+        self.freshness_days = freshness_days
+        self.players: Dict[int, PlayerWindowState] = players or {}
+        # Scores of every row emitted so far, per window type (see `add_scores`)
+        self.score_sketches: Dict[str, QuantileSketch] = score_sketches or {}
+        self.config_hash = config_hash  # config the sketched scores were computed with
+        self.duplicates_skipped = 0  # games already processed, from the last `update`
+
+    @classmethod
+    def load(cls, path: str, freshness_days: int = 45) -> "IncrementalWindowState":
+        """Load state from `path`; a missing file yields an empty state (bootstrap run)."""
+        if not os.path.exists(path):
+            return cls(freshness_days=freshness_days)
+        with open(path, "r", encoding="utf-8") as fh:
+            raw = json.load(fh)
+        if raw.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported incremental state version: {raw.get('version')}")
+        if int(raw.get("freshness_days")) != int(freshness_days):
+            raise ValueError(
+                f"State built with freshness_days={raw.get('freshness_days')}, config has {freshness_days}; rebuild required"
+            )
+        players = {int(pid): PlayerWindowState.from_dict(p) for pid, p in raw.get("players", {}).items()}
+        sketches = {wt: QuantileSketch.from_dict(s) for wt, s in raw.get("score_sketches", {}).items()}
+        return cls(freshness_days=freshness_days, players=players, score_sketches=sketches, config_hash=raw.get("config_hash"))
+
+    def save(self, path: str) -> None:
+        payload = {
+            "version": STATE_VERSION,
+            "freshness_days": self.freshness_days,
+            "players": {str(pid): st.to_dict() for pid, st in self.players.items()},
+            "config_hash": self.config_hash,
+            "score_sketches": {wt: sk.to_dict() for wt, sk in sorted(self.score_sketches.items())},
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def update(self, new_games: Iterable[Dict[str, Any]]) -> WindowFrame:
+        """Advance state with new games; return a frame holding only the new window rows.
+
+        Games already applied (same player, date and game_id) are skipped and counted
+        in `duplicates_skipped`.
+        """
+        by_player: Dict[int, List[Dict[str, Any]]] = {}
+        for g in new_games:
+            pid = g.get("player_id")
+            if pid is None:
+                continue
+            by_player.setdefault(int(pid), []).append(g)
+
+        # Validate ordering up front so a bad slate leaves state untouched.
+        for pid, games in by_player.items():
+            st = self.players.get(pid)
+            if st is None:
+                continue
+            earliest = min(_to_date(g["game_date"]) for g in games)
+            if earliest < st.last_date:
+                raise IncrementalOrderError(
+                    f"player {pid}: game dated {earliest} precedes last processed {st.last_date}; rebuild required"
+                )
+
+        cols: Dict[str, List[Any]] = {name: [] for name in WINDOW_COLUMNS}
+        self.duplicates_skipped = 0
+        for pid, games in by_player.items():
+            dated = sorted(((_to_date(g["game_date"]), g) for g in games), key=lambda x: x[0])
+            for game_date, g in dated:
+                st = self.players.get(pid)
+                if st is None:
+                    st = self.players[pid] = PlayerWindowState(player_id=g["player_id"], last_date=game_date)
+                game_id = g.get("game_id")
+                if game_id is not None and game_date == st.last_date and game_id in st.last_game_ids:
+                    self.duplicates_skipped += 1
+                    continue
+                self._advance(st, g, game_date, cols)
+        return WindowFrame.from_columns(cols)
+
+    def add_scores(self, frame: WindowFrame, config_hash: str) -> None:
+        """Fold the scores of a freshly scored `update` frame into the per-window sketches."""
+        if self.config_hash is not None and self.config_hash != config_hash and self.score_sketches:
+            raise ValueError(
+                f"State scored with config_hash={self.config_hash}, config has {config_hash}; rebuild required"
+            )
+        self.config_hash = config_hash
+        for wt in WINDOW_TYPES:
+            sketch = self.score_sketches.get(wt) or QuantileSketch()
+            build_distribution_sketch_frame(frame, window_type=wt, sketch=sketch)
+            if sketch.n:
+                self.score_sketches[wt] = sketch
+
+    def snapshot(self, window_type: str, model_version: int) -> Optional[DistributionSnapshot]:
+        """Snapshot of every `window_type` score seen so far (None before any)."""
+        sketch = self.score_sketches.get(window_type)
+        if sketch is None or self.config_hash is None:
+            return None
+        return build_distribution_snapshot_from_sketch(
+            sketch, window_type=window_type, model_version=model_version, config_hash=self.config_hash
+        )
+
+    def _advance(self, st: PlayerWindowState, g: Dict[str, Any], game_date: date, cols: Dict[str, List[Any]]) -> None:
+        stats = _game_stats(g, game_date)
+        if game_date != st.last_date:
+            st.last_game_ids = []
+        if g.get("game_id") is not None:
+            st.last_game_ids.append(g["game_id"])
+        st.n_games += 1
+        st.last_date = game_date
+        st.recent.append(stats)
+        st.fresh.append(stats)
+        for k in range(len(_COUNT_FIELDS)):
+            st.std_sums[k] += stats[k + 1]
+        st.std_ixg += stats[_IXG]
+        while st.fresh and (game_date - st.fresh[0][0]).days > self.freshness_days:
+            old = st.fresh.popleft()
+            for k in range(len(_COUNT_FIELDS)):
+                st.std_sums[k] -= old[k + 1]
+            st.evicted = True
+
+        recent = list(st.recent)
+        spans: List[tuple] = [(recent[-1:], None)]
+        for size, _label in _ROLLING_SIZES:
+            spans.append((recent[-size:], None))
+        fresh = list(st.fresh)
+        ixg_std = _float_sum([x[_IXG] for x in fresh], 0, len(fresh)) if st.evicted else st.std_ixg
+        spans.append((fresh, (list(st.std_sums), ixg_std)))
+
+        for label, (games, precomputed) in zip(WINDOW_TYPES, spans):
+            if precomputed is None:
+                sums = _span_values(games)
+                ixg = _float_sum([x[_IXG] for x in games], 0, len(games))
+            else:
+                sums, ixg = precomputed
+            shots, goals, ogf, osf, points = sums[0], sums[1], sums[2], sums[3], sums[4]
+            cols["player_id"].append(g["player_id"])
+            cols["season_id"].append(g["season_id"])
+            cols["position_code"].append(g.get("position_code"))
+            cols["game_date"].append(game_date)
+            cols["window_type"].append(label)
+            cols["game_id"].append(None if label == "STD" else g.get("game_id"))
+            cols["n_games"].append(len(games))
+            for f, v in zip(_COUNT_FIELDS, sums):
+                cols[f].append(v)
+            cols["ixg"].append(ixg)
+            cols["sh_pct"].append(goals / shots if shots > 0 else None)
+            cols["oish_pct"].append(ogf / osf if osf > 0 else None)
+            cols["ipp"].append(points / ogf if ogf > 0 else None)
+            cols["freshness_applied"].append(label == "STD" and st.evicted)
+
+
+def run_incremental_scoring(
+    new_games: Iterable[Dict[str, Any]],
+    state_path: str,
+    season_id: int | None = None,
+    cfg: SustainabilityConfig | None = None,
+    db_client=None,
+    league_priors: List[LeaguePriorRow] | None = None,
+    player_priors_rows: List[Dict[str, Any]] | PriorIndex | None = None,
+    metrics: Iterable[str] | None = None,
+    snapshot: Optional[DistributionSnapshot] = None,
+    snapshot_window_type: str = "GAME",
+    build_snapshot: bool = True,
+    assign_tiers: bool = True,
+    include_components: bool = True,
+    save_state: bool = True,
+    profiler: StageProfiler | None = None,
+    prior_cache: PriorCache | None = None,
+) -> Dict[str, Any]:
+    """Update local window state with a new slate and score only the changed rows.
+
+    Priors follow `run_pre_scoring_pipeline`: when `player_priors_rows` is None they are
+    computed for `season_id` (league priors likewise unless injected), memoized in
+    `prior_cache` when given. Passing the `prior_index` returned by a previous call
+    skips rebuilding it on the next slate.
+
+    Tiers: `snapshot` when given, else (with `build_snapshot`) the snapshot of every
+    `snapshot_window_type` score in the state including this slate.
+
+    Returns dict with keys:
+      cfg, windows_scored (new rows only), players_updated, state_players,
+      duplicates_skipped, frame, prior_index, snapshot (dict or None)
+    """
+    if player_priors_rows is None and season_id is None:
+        raise ValueError("season_id required when player_priors_rows is not supplied")
+    if player_priors_rows is not None and league_priors is None:
+        league_priors = []  # only needed to compute posteriors
+    pre = _resolve_inputs(
+        season_id, db_client, cfg, league_priors, player_priors_rows, profiler=profiler, prior_cache=prior_cache
+    )
+    cfg, sd_constants, prior_index = pre["cfg"], pre["sd_constants"], pre["prior_index"]
+    prof = resolve_profiler(profiler)
+    with prof.stage("state_load") as st:
+        state = IncrementalWindowState.load(state_path, freshness_days=cfg.freshness_days)
+        st.rows_out = len(state.players)
+    new_games = new_games if isinstance(new_games, list) else list(new_games)
+    with prof.stage("windows", rows_in=len(new_games)) as st:
+        frame = state.update(new_games)
+        st.rows_out = len(frame)
+    score_window_frame(
+        frame,
+        cfg,
+        sd_constants,
+        prior_index,
+        metrics=metrics,
+        include_components=include_components,
+        profiler=profiler,
+    )
+    with prof.stage("snapshot", rows_in=len(frame)) as st:
+        state.add_scores(frame, cfg.config_hash)
+        if snapshot is None and build_snapshot:
+            snapshot = state.snapshot(snapshot_window_type, cfg.model_version)
+        st.rows_out = snapshot.n if snapshot else 0
+    if assign_tiers:
+        with prof.stage("tiers", rows_in=len(frame)) as st:
+            assign_quintiles_frame(frame, snapshot, window_filter=snapshot_window_type)
+            st.rows_out = len(frame)
+    if save_state:
+        with prof.stage("state_save", rows_in=len(state.players)):
+            state.save(state_path)
+    players_updated = sorted({int(pid) for pid in frame.get("player_id")})
+    return {
+        "cfg": cfg,
+        "windows_scored": frame.to_rows(),
+        "players_updated": players_updated,
+        "state_players": len(state.players),
+        "duplicates_skipped": state.duplicates_skipped,
+        "frame": frame,
+        "prior_index": prior_index,
+        "snapshot": snapshot.to_dict() if snapshot else None,
+    }
+
+
+__all__ = [
+    "IncrementalOrderError",
+    "IncrementalWindowState",
+    "PlayerWindowState",
+    "run_incremental_scoring",
+]
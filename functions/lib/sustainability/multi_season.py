@@ -0,0 +1,181 @@
+"""Multi-season batch scoring (Task 5.x: retro recompute support).
+
+Rescoring several seasons after a config change used to mean one full pipeline per
+season, each re-fetching league aggregates and player season rows and re-parsing
+the overlapping three-season blend windows. `run_multi_season_scoring` does it as
+one batch:
+
+  1. Config and SD constants are loaded once.
+  2. League aggregates for every season are fetched once
+     (`compute_league_beta_priors_multi`).
+  3. Player season rows for the union of all blend windows are fetched and grouped
+     once; each player-season's counts are parsed once and shared by every target
+     season whose window covers it (`compute_player_posteriors_multi`).
+  4. Game rows are partitioned by season in a single scan. Windows and z-scores run
+     per season (both depend on the season's own games and priors), then the
+     season frames are stacked and every row-wise stage (reliability → components)
+     runs once over the combined frame.
+  5. Snapshots and quintiles stay per season, over each season's row range.
+
+Output per season is identical to `run_full_scoring_pipeline(season_id, season_games)`
+given the same inputs; `frame` holds every season's rows in `season_ids` order and
+`seasons[sid]["row_range"]` locates them.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .config_loader import load_config, SustainabilityConfig
+from .constants import load_sd_constants
+from .distribution import (
+    build_distribution_snapshot_from_sketch,
+    tier_scores_by_window,
+)
+from .frame import WindowFrame
+from .pipeline import _annotate_scores, _league_priors_map
+from .player_priors import compute_player_posteriors_multi
+from .priors import compute_league_beta_priors_multi, LeaguePriorRow
+from .profiling import StageProfiler, resolve_profiler
+from .quantiles import QuantileSketch
+from .reliability import compute_reliability_frame
+from .windows import build_window_frame
+from .zscores import annotate_zscores_frame
+
+
+def _partition_by_season(games: Iterable[Dict[str, Any]], season_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    by_season: Dict[int, List[Dict[str, Any]]] = {sid: [] for sid in season_ids}
+    for g in games:
+        bucket = by_season.get(g.get("season_id"))
+        if bucket is not None:
+            bucket.append(g)
+    return by_season
+
+
+def run_multi_season_scoring(
+    season_ids: Iterable[int],
+    games: Iterable[Dict[str, Any]],
+    db_client=None,
+    cfg: SustainabilityConfig | None = None,
+    league_aggregates: Iterable[Dict[str, Any]] | None = None,
+    player_season_rows: Iterable[Dict[str, Any]] | None = None,
+    league_priors: List[LeaguePriorRow] | None = None,
+    player_priors_by_season: Dict[int, List[Dict[str, Any]]] | None = None,
+    metrics: Iterable[str] | None = None,
+    include_components: bool = True,
+    build_snapshot: bool = True,
+    assign_tiers: bool = True,
+    snapshot_window_type: str = "GAME",
+    profiler: StageProfiler | None = None,
+) -> Dict[str, Any]:
+    """Score several seasons in one batch.
+
+    Returns dict with keys:
+      cfg, league_priors, player_priors (by season), sd_constants, frame (all seasons),
+      seasons: {season_id: {row_range, windows_scored, snapshot, snapshot_sketch}}
+    """
+    prof = resolve_profiler(profiler)
+    season_ids = list(dict.fromkeys(season_ids))
+    metrics = list(metrics) if metrics is not None else None
+
+    if cfg is None:
+        with prof.stage("config"):
+            cfg = load_config(db_client=db_client)
+    with prof.stage("sd_constants"):
+        sd_constants = load_sd_constants(db_client if cfg.sd_mode != "fixed" else None)
+    if league_priors is None:
+        with prof.stage("league_priors") as st:
+            league_priors = compute_league_beta_priors_multi(season_ids, db_client, cfg, aggregates=league_aggregates)
+            st.rows_out = len(league_priors)
+    if player_priors_by_season is None:
+        with prof.stage("player_priors") as st:
+            player_priors_by_season = compute_player_posteriors_multi(
+                season_ids,
+                _league_priors_map(league_priors),
+                cfg,
+                db_client=db_client,
+                rows=player_season_rows,
+            )
+            st.rows_out = sum(len(v) for v in player_priors_by_season.values())
+
+    games = games if isinstance(games, list) else list(games)
+    with prof.stage("partition", rows_in=len(games)) as st:
+        by_season = _partition_by_season(games, season_ids)
+        st.rows_out = sum(len(v) for v in by_season.values())
+
+    season_frames: List[WindowFrame] = []
+    ranges: Dict[int, Tuple[int, int]] = {}
+    offset = 0
+    for sid in season_ids:
+        season_games = by_season[sid]
+        with prof.stage("windows", rows_in=len(season_games)) as st:
+            frame = build_window_frame(season_games, freshness_days=cfg.freshness_days)
+            st.rows_out = len(frame)
+        with prof.stage("zscores", rows_in=len(frame)) as st:
+            annotate_zscores_frame(frame, player_priors_by_season.get(sid, []), sd_constants, metrics=metrics)
+            st.rows_out = len(frame)
+        ranges[sid] = (offset, offset + len(frame))
+        offset += len(frame)
+        season_frames.append(frame)
+
+    with prof.stage("concat", rows_in=offset) as st:
+        frame = WindowFrame.concat(season_frames)
+        st.rows_out = len(frame)
+    with prof.stage("reliability", rows_in=len(frame)) as st:
+        compute_reliability_frame(frame, cfg.k_r, metrics=metrics)
+        st.rows_out = len(frame)
+    _annotate_scores(frame, cfg, sd_constants, metrics=metrics, include_components=include_components, profiler=profiler)
+
+    window_types = frame.get("window_type")
+    scores = frame.get("score")
+    seasons: Dict[int, Dict[str, Any]] = {}
+    quintiles: List[Any] = []
+    provisional: List[Any] = []
+    for sid in season_ids:
+        lo, hi = ranges[sid]
+        snapshot = None
+        sketch = None
+        if build_snapshot:
+            with prof.stage("snapshot", rows_in=hi - lo) as st:
+                sketch = QuantileSketch().update(
+                    float(s) for wt, s in zip(window_types[lo:hi], scores[lo:hi]) if wt == snapshot_window_type and s is not None
+                )
+                snapshot = build_distribution_snapshot_from_sketch(
+                    sketch, window_type=snapshot_window_type, model_version=cfg.model_version, config_hash=cfg.config_hash
+                )
+                st.rows_out = sketch.n
+        if assign_tiers:
+            with prof.stage("tiers", rows_in=hi - lo) as st:
+                q, p = tier_scores_by_window(window_types[lo:hi], scores[lo:hi], {snapshot_window_type: snapshot})
+                quintiles.extend(q)
+                provisional.extend(p)
+                st.rows_out = hi - lo
+        seasons[sid] = {
+            "row_range": (lo, hi),
+            "windows_scored": hi - lo,
+            "snapshot": snapshot.to_dict() if snapshot else None,
+            "snapshot_sketch": sketch.to_dict() if snapshot else None,
+        }
+    if assign_tiers:
+        frame.set_column("quintile", quintiles, sparse=True)
+        frame.set_column("provisional_tier", provisional, sparse=True)
+
+    return {
+        "cfg": cfg,
+        "league_priors": league_priors,
+        "player_priors": player_priors_by_season,
+        "sd_constants": sd_constants,
+        "frame": frame,
+        "seasons": seasons,
+    }
+
+
+def season_frame(result: Dict[str, Any], season_id: int) -> WindowFrame:
+    """Rows of one season from a `run_multi_season_scoring` result (copied columns)."""
+    lo, hi = result["seasons"][season_id]["row_range"]
+    return result["frame"].take(range(lo, hi))
+
+
+__all__ = [
+    "run_multi_season_scoring",
+    "season_frame",
+]
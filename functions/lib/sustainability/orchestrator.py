@@ -9,10 +9,50 @@ Scope (initial implementation):
   * (Optional) persist barometer rows (controlled by `persist` flag)
   * Return structured run summary with timings & counts
 
+Profiling:
+  * `profile=True` (default) wraps every pipeline stage in a `StageProfiler`; per-stage
+    wall/CPU time and row counts land in phases[<pipeline phase>]["stages"]. Cost is a
+    pair of clock reads per stage, so it stays on. `profile_memory=True` adds
+    tracemalloc peaks (noticeably slower), and `trace_path` writes a Chrome-trace
+    (default) or speedscope JSON file for the run.
+
+Snapshots:
+  * `snapshot_window_type` keeps its single snapshot (`snapshot_n` / `snapshot_thresholds`).
+    With `grouped_snapshots=True` (off by default) the same scan also yields one snapshot per
+    (window_type, position[, season]) group, returned as `OrchestratorResult.snapshots`;
+    `tier_by_group=True` tiers every row against its group's snapshot.
+
+Prior cache:
+  * `prior_cache` (a PriorCache kept by the caller) or `prior_cache_dir` (a disk-backed
+    cache under that directory) memoizes SD constants, league priors and player
+    posteriors by config_hash + input digest. Hit/miss counters for the run and the
+    per-kind outcome land in phases["prior_cache"].
+
+Offline incremental mode:
+  * `incremental=True` with `incremental_state_path` updates a local per-player window
+    state (see incremental.py) and scores only the new slate's rows. Without a state
+    path `incremental` still fails closed (DB-backed detection is retired).
+  * As in the full path, `build_snapshot` / `assign_tiers` / `snapshot_window_type` and
+    `prior_cache` / `prior_cache_dir` apply: the snapshot is built from the score
+    sketches kept in the state (every slate so far, this one included), so it matches
+    a full rebuild over the same games. A slate is scored in-process, so `workers` > 1
+    and grouped snapshots raise ValueError instead of being ignored.
+
+Streaming mode:
+  * `streaming_input_path` (player-sorted JSONL / Parquet games) with
+    `streaming_output_path` scores one player at a time via streaming.py and writes
+    scored rows to that JSONL file; `games` is ignored. Memory stays bounded by the
+    largest single player history; counts land in phases["streaming"].
+
+Local retro queue:
+  * `retro_queue_path` with `previous_config_hash` enqueues a `config_change` job in a
+    local RetroJobStore (retro_queue.py) when the config hash changed; `RetroWorker`
+    drains it as one coalesced season rebuild. This applies to the incremental and
+    streaming modes as well. Without the path, passing `previous_config_hash` still
+    fails closed.
+
 Deferred (future subtasks 5.x):
-  * New game detection (incremental processing)
   * Distribution snapshot persistence & reuse across runs
-  * Retro recompute queue & worker
   * DB locking / concurrency guard
   * Run log persistence table (sustainability_run_logs)
 
@@ -28,6 +68,11 @@ from .pipeline import run_full_scoring_pipeline
 from .offline import OFFLINE_PERSISTENCE_MESSAGE, OfflinePersistenceDisabledError
 from .config_loader import load_config, SustainabilityConfig
 from .distribution import assign_quintiles
+from .incremental import run_incremental_scoring
+from .retro_queue import RetroJobStore
+from .prior_cache import PriorCache
+from .profiling import StageProfiler
+from .streaming import run_streaming_scoring
 
 
 @dataclass
@@ -41,6 +86,7 @@ class OrchestratorResult:
     snapshot_thresholds: Dict[str, float] | None
     duration_ms: int
     phases: Dict[str, Dict[str, Any]]
+    snapshots: List[Dict[str, Any]] | None = None  # one per (window_type, position[, season]) group
 
     def to_dict(self) -> Dict[str, Any]:  # Serialization helper
         return asdict(self)
@@ -63,14 +109,28 @@ def orchestrate_full_run(
     reuse_snapshot: bool = True,
     enqueue_retro_on_config_change: bool = True,
     previous_config_hash: str | None = None,
+    incremental_state_path: str | None = None,
+    workers: int = 1,
+    profile: bool = True,
+    profile_memory: bool = False,
+    trace_path: str | None = None,
+    trace_format: str = "chrome",
+    prior_cache: PriorCache | None = None,
+    prior_cache_dir: str | None = None,
+    grouped_snapshots: bool = False,
+    snapshot_by_season: bool = False,
+    tier_by_group: bool = False,
+    streaming_input_path: str | None = None,
+    streaming_output_path: str | None = None,
+    retro_queue_path: str | None = None,
 ) -> OrchestratorResult:
     if (
         persist
-        or incremental
+        or (incremental and incremental_state_path is None)
         or persist_snapshot
         or use_lock
         or log_run
-        or previous_config_hash is not None
+        or (previous_config_hash is not None and retro_queue_path is None)
     ):
         raise OfflinePersistenceDisabledError(OFFLINE_PERSISTENCE_MESSAGE)
 
@@ -98,6 +158,39 @@ def orchestrate_full_run(
         cfg = load_config(db_client=db_client)
     phases["config"] = {"duration_ms": int((time.time() - t_cfg) * 1000)}
 
+    profiler = StageProfiler(track_memory=profile_memory) if (profile or profile_memory or trace_path) else None
+
+    if prior_cache is None and prior_cache_dir is not None:
+        prior_cache = PriorCache(cache_dir=prior_cache_dir)
+
+    if incremental:
+        if workers != 1:
+            raise ValueError("incremental mode scores one slate in-process; workers must be 1")
+        if grouped_snapshots or tier_by_group:
+            raise ValueError("incremental mode builds only the snapshot_window_type snapshot; grouped snapshots are not supported")
+        result_obj = _orchestrate_incremental(
+            season_id, games, cfg, db_client, incremental_state_path, phases, t0,
+            build_snapshot=build_snapshot, assign_tiers=assign_tiers, snapshot_window_type=snapshot_window_type,
+            profiler=profiler, trace_path=trace_path, trace_format=trace_format, prior_cache=prior_cache,
+        )
+        if enqueue_retro_on_config_change:
+            _enqueue_local_config_change(retro_queue_path, previous_config_hash, cfg, season_id, phases)
+        return result_obj
+
+    if streaming_input_path is not None:
+        if streaming_output_path is None:
+            raise ValueError("streaming_output_path is required with streaming_input_path")
+        result_obj = _orchestrate_streaming(
+            season_id, streaming_input_path, streaming_output_path, cfg, db_client, phases, t0,
+            build_snapshot=build_snapshot, assign_tiers=assign_tiers, snapshot_window_type=snapshot_window_type,
+            profiler=profiler, trace_path=trace_path, trace_format=trace_format, prior_cache=prior_cache,
+            grouped_snapshots=grouped_snapshots and build_snapshot, snapshot_by_season=snapshot_by_season,
+            tier_by_group=tier_by_group,
+        )
+        if enqueue_retro_on_config_change:
+            _enqueue_local_config_change(retro_queue_path, previous_config_hash, cfg, season_id, phases)
+        return result_obj
+
     # Incremental filter: if enabled and DB accessible, drop games with game_date <= last processed
     game_list = list(games)
     if incremental and persist:
@@ -110,6 +203,8 @@ def orchestrate_full_run(
             game_list = [g for g in game_list if g.get("game_date") > last_date]
             phases["incremental_filter"] = {"last_processed": last_date, "games_after_filter": len(game_list)}
 
+    cache_before = prior_cache.snapshot() if prior_cache is not None else None
+
     t_pipeline = time.time()
     result = run_full_scoring_pipeline(
         season_id=season_id,
@@ -120,12 +215,22 @@ def orchestrate_full_run(
         build_snapshot=build_snapshot,
         assign_tiers=assign_tiers,
         snapshot_window_type=snapshot_window_type,
+        materialize_rows=False,  # summary only needs counts; rows stay columnar
+        workers=workers,
+        profiler=profiler,
+        prior_cache=prior_cache,
+        grouped_snapshots=grouped_snapshots and build_snapshot,
+        snapshot_by_season=snapshot_by_season,
+        tier_by_group=tier_by_group,
     )
+    _record_prior_cache(phases, prior_cache, cache_before)
     phases["scoring_pipeline"] = {
         "duration_ms": int((time.time() - t_pipeline) * 1000),
+        "workers": workers,
         "windows": len(result.get("windows", [])),
         "windows_scored": len(result.get("windows_scored", [])),
     }
+    _record_profile(phases, "scoring_pipeline", profiler, trace_path, trace_format)
 
     snapshot = result.get("snapshot")
     snapshot_n = snapshot.get("n") if snapshot else None
@@ -177,6 +282,7 @@ def orchestrate_full_run(
         snapshot_thresholds=snapshot_thresholds,
         duration_ms=total_ms,
         phases=phases,
+        snapshots=result.get("snapshots"),
     )
     # Run log persistence
     if log_run and persist:
@@ -217,7 +323,147 @@ def orchestrate_full_run(
                 phases["retro_enqueue"] = {"status": "ok", "reason": "config_change"}
             except Exception as e:  # pragma: no cover
                 phases.setdefault("retro_enqueue", {"status": "error", "error": str(e)})
+    if enqueue_retro_on_config_change:
+        _enqueue_local_config_change(retro_queue_path, previous_config_hash, cfg, season_id, phases)
     return result_obj
 
 
+def _enqueue_local_config_change(
+    retro_queue_path: str | None,
+    previous_config_hash: str | None,
+    cfg: SustainabilityConfig,
+    season_id: int,
+    phases: Dict[str, Dict[str, Any]],
+) -> None:
+    # Shared by every run mode so a config change is never silently dropped
+    if retro_queue_path and previous_config_hash and previous_config_hash != cfg.config_hash:
+        job_id = RetroJobStore(retro_queue_path).enqueue("config_change", season_id)
+        phases["retro_enqueue"] = {"status": "ok", "reason": "config_change", "store": "local", "job_id": job_id}
+
+
+def _orchestrate_incremental(
+    season_id: int,
+    games: Iterable[Dict[str, Any]],
+    cfg: SustainabilityConfig,
+    db_client,
+    state_path: str,
+    phases: Dict[str, Dict[str, Any]],
+    t0: float,
+    build_snapshot: bool = True,
+    assign_tiers: bool = True,
+    snapshot_window_type: str = "GAME",
+    profiler: StageProfiler | None = None,
+    trace_path: str | None = None,
+    trace_format: str = "chrome",
+    prior_cache: PriorCache | None = None,
+) -> OrchestratorResult:
+    cache_before = prior_cache.snapshot() if prior_cache is not None else None
+    t_inc = time.time()
+    result = run_incremental_scoring(
+        games, state_path, season_id=season_id, cfg=cfg, db_client=db_client,
+        snapshot_window_type=snapshot_window_type, build_snapshot=build_snapshot, assign_tiers=assign_tiers,
+        profiler=profiler, prior_cache=prior_cache,
+    )
+    _record_prior_cache(phases, prior_cache, cache_before)
+    phases["incremental"] = {
+        "duration_ms": int((time.time() - t_inc) * 1000),
+        "players_updated": len(result["players_updated"]),
+        "state_players": result["state_players"],
+        "windows_scored": len(result["windows_scored"]),
+    }
+    _record_profile(phases, "incremental", profiler, trace_path, trace_format)
+    snapshot = result["snapshot"]
+    return OrchestratorResult(
+        season_id=season_id,
+        model_version=cfg.model_version,
+        config_hash=cfg.config_hash,
+        total_rows_scored=len(result["windows_scored"]),
+        persisted_count=0,
+        snapshot_n=snapshot.get("n") if snapshot else None,
+        snapshot_thresholds={k: snapshot[k] for k in ("t20", "t40", "t60", "t80") if k in snapshot} if snapshot else None,
+        duration_ms=int((time.time() - t0) * 1000),
+        phases=phases,
+    )
+
+
+def _orchestrate_streaming(
+    season_id: int,
+    input_path: str,
+    output_path: str,
+    cfg: SustainabilityConfig,
+    db_client,
+    phases: Dict[str, Dict[str, Any]],
+    t0: float,
+    build_snapshot: bool = True,
+    assign_tiers: bool = True,
+    snapshot_window_type: str = "GAME",
+    profiler: StageProfiler | None = None,
+    trace_path: str | None = None,
+    trace_format: str = "chrome",
+    prior_cache: PriorCache | None = None,
+    grouped_snapshots: bool = False,
+    snapshot_by_season: bool = False,
+    tier_by_group: bool = False,
+) -> OrchestratorResult:
+    t_stream = time.time()
+    result = run_streaming_scoring(
+        season_id, input_path, output_path, db_client=db_client, cfg=cfg,
+        build_snapshot=build_snapshot, assign_tiers=assign_tiers, snapshot_window_type=snapshot_window_type,
+        profiler=profiler, prior_cache=prior_cache, grouped_snapshots=grouped_snapshots,
+        snapshot_by_season=snapshot_by_season, tier_by_group=tier_by_group,
+    )
+    phases["streaming"] = {
+        "duration_ms": int((time.time() - t_stream) * 1000),
+        "output_path": output_path,
+        "players": result["players"],
+        "games_read": result["games_read"],
+        "windows_scored": result["rows_written"],
+        "max_player_games": result["max_player_games"],
+    }
+    _record_profile(phases, "streaming", profiler, trace_path, trace_format)
+    snapshot = result["snapshot"]
+    return OrchestratorResult(
+        season_id=season_id,
+        model_version=cfg.model_version,
+        config_hash=cfg.config_hash,
+        total_rows_scored=result["rows_written"],
+        persisted_count=0,
+        snapshot_n=snapshot.get("n") if snapshot else None,
+        snapshot_thresholds={k: snapshot[k] for k in ("t20", "t40", "t60", "t80") if k in snapshot} if snapshot else None,
+        duration_ms=int((time.time() - t0) * 1000),
+        phases=phases,
+        snapshots=result["snapshots"],
+    )
+
+
+def _record_prior_cache(
+    phases: Dict[str, Dict[str, Any]],
+    prior_cache: PriorCache | None,
+    before: Dict[str, int] | None,
+) -> None:
+    if prior_cache is None:
+        return
+    after = prior_cache.snapshot()
+    phases["prior_cache"] = {
+        **{k: after[k] - before.get(k, 0) for k in after},
+        "lookups": dict(prior_cache.lookups),
+        "entries": len(prior_cache),
+    }
+
+
+def _record_profile(
+    phases: Dict[str, Dict[str, Any]],
+    phase: str,
+    profiler: StageProfiler | None,
+    trace_path: str | None,
+    trace_format: str,
+) -> None:
+    if profiler is None:
+        return
+    profiler.close()
+    phases[phase]["stages"] = profiler.to_phases()
+    if trace_path:
+        phases[phase]["trace_path"] = profiler.export_trace(trace_path, fmt=trace_format)
+
+
 __all__ = ["orchestrate_full_run", "OrchestratorResult"]
@@ -14,94 +14,464 @@ Steps:
 
 Returns list of enriched window rows ready for soft clipping / contribution
 weighting & final scoring (next tasks 4.4+).
+
+Internally every stage runs on one WindowFrame (struct-of-arrays) and adds its
+columns in place; list-of-dict rows are produced only at the API boundary.
+
+Scoring kernels: `kernel="staged"` (default) runs one frame pass per stage;
+`kernel="fused"` runs z-scores through logistic scores in `fused.score_frame_fused`
+(one loop per metric, identical output).
+
+Prior cache: with `prior_cache` (prior_cache.PriorCache), steps 2–4 are memoized by
+config_hash plus a digest of their input rows; inputs are still fetched, but a hit
+skips the computation.
+
+Profiling: every step runs inside `profiler.stage(...)` (profiling.py). The default
+is the no-op `NULL_PROFILER`; pass a `StageProfiler` to collect per-stage wall/CPU
+time, row counts and (optionally) peak traced memory.
 """
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Iterable, Tuple, Optional
 
 from .config_loader import load_config, SustainabilityConfig
 from .constants import load_sd_constants
 from .priors import compute_league_beta_priors, LeaguePriorRow
 from .player_priors import compute_player_posteriors
-from .windows import build_all_players_windows
-from .zscores import annotate_zscores
-from .reliability import compute_reliability
-from .clipping import apply_soft_clipping
-from .contributions import compute_contributions
-from .scoring import apply_logistic_scoring, attach_components_json
-from .finishing import annotate_finishing_residuals, FINISHING_METRICS
-from .distribution import build_distribution_snapshot, assign_quintiles
+from .frame import WindowFrame
+from .prior_index import PriorIndex
+from .prior_cache import PriorCache, cached_league_priors, cached_player_posteriors, cached_sd_constants
+from .windows import build_window_frame
+from .zscores import annotate_zscores_frame
+from .reliability import compute_reliability_frame
+from .clipping import apply_soft_clipping_frame
+from .contributions import compute_contributions_frame
+from .scoring import apply_logistic_scoring_frame
+from .components import attach_components_view_frame
+from .fused import fused_pre_scoring_columns, score_frame_fused
+from .finishing import annotate_finishing_residuals_frame, FINISHING_METRICS
+from .distribution import (
+    assign_quintiles_frame,
+    assign_quintiles_grouped_frame,
+    build_distribution_sketch_frame,
+    build_distribution_snapshot_from_sketch,
+    build_grouped_sketches_frame,
+    build_grouped_snapshots,
+    merge_group_sketches,
+)
 from .offline import OFFLINE_PERSISTENCE_MESSAGE, OfflinePersistenceDisabledError
+from .sharding import merge_shard_columns, partition_games
+from .profiling import StageProfiler, resolve_profiler
 
 
 def _league_priors_map(priors: List[LeaguePriorRow]) -> Dict[Tuple[int, str, str], LeaguePriorRow]:
     return {(p.season_id, p.position_code, p.stat_code): p for p in priors}
 
 
-def run_pre_scoring_pipeline(
+def _annotate_pre_scoring(
+    frame: WindowFrame,
+    cfg: SustainabilityConfig,
+    sd_constants: Dict[str, Dict[str, float]],
+    player_priors_rows: Iterable[Dict[str, Any]],
+    metrics: Iterable[str] | None = None,
+    profiler: StageProfiler | None = None,
+) -> WindowFrame:
+    prof = resolve_profiler(profiler)
+    n = len(frame)
+    # 6. Z-scores
+    with prof.stage("zscores", rows_in=n) as st:
+        annotate_zscores_frame(frame, player_priors_rows, sd_constants, metrics=metrics)
+        st.rows_out = n
+    # 7. Reliability
+    with prof.stage("reliability", rows_in=n) as st:
+        compute_reliability_frame(frame, cfg.k_r, metrics=metrics)
+        st.rows_out = n
+    return frame
+
+
+def _annotate_scores(
+    frame: WindowFrame,
+    cfg: SustainabilityConfig,
+    sd_constants: Dict[str, Dict[str, float]],
+    metrics: Iterable[str] | None = None,
+    include_components: bool = True,
+    profiler: StageProfiler | None = None,
+) -> List[str]:
+    """Finishing residuals → clipping → contributions → logistic → components; returns metrics used."""
+    prof = resolve_profiler(profiler)
+    n = len(frame)
+    metrics_list = _scoring_metrics(cfg, metrics)
+    # Optionally add finishing residual z annotations prior to clipping
+    if cfg.toggles.get("use_finishing_residuals"):
+        with prof.stage("finishing", rows_in=n) as st:
+            annotate_finishing_residuals_frame(frame, sd_constants)
+            st.rows_out = n
+
+    # Soft clipping
+    with prof.stage("clipping", rows_in=n) as st:
+        apply_soft_clipping_frame(frame, metrics=metrics_list, c=cfg.constants.get("c", 3.0))
+        st.rows_out = n
+    # Contributions
+    with prof.stage("contributions", rows_in=n) as st:
+        compute_contributions_frame(frame, weights=cfg.weights, metrics=metrics_list, use_clipped=True)
+        st.rows_out = n
+    # Logistic scoring
+    with prof.stage("logistic", rows_in=n) as st:
+        apply_logistic_scoring_frame(frame, guardrails=cfg.constants)
+        st.rows_out = n
+    # Components JSON
+    if include_components:
+        _attach_components(frame, cfg, metrics_list, prof)
+    return metrics_list
+
+
+def _scoring_metrics(cfg: SustainabilityConfig, metrics: Iterable[str] | None) -> List[str]:
+    metrics_list = list(metrics) if metrics is not None else list(cfg.weights.keys())
+    if cfg.toggles.get("use_finishing_residuals"):
+        # Ensure metrics list includes finishing metrics if they have weights
+        for fm in FINISHING_METRICS:
+            if fm in cfg.weights and fm not in metrics_list:
+                metrics_list.append(fm)
+    return metrics_list
+
+
+def _attach_components(frame: WindowFrame, cfg: SustainabilityConfig, metrics_list: List[str], prof) -> None:
+    # Lazy view over the scored columns; dicts are built only when rows are read.
+    extreme_thresh = cfg.constants.get("extreme_z_threshold", 4.0)
+    with prof.stage("components_json", rows_in=len(frame)) as st:
+        attach_components_view_frame(frame, metrics=metrics_list, weights=cfg.weights, extreme_threshold=extreme_thresh)
+        st.rows_out = len(frame)
+
+
+KERNELS = ("staged", "fused")
+
+
+def _annotate_fused(
+    frame: WindowFrame,
+    cfg: SustainabilityConfig,
+    sd_constants: Dict[str, Dict[str, float]],
+    player_priors_rows: Iterable[Dict[str, Any]],
+    metrics: Iterable[str] | None = None,
+    include_components: bool = True,
+    profiler: StageProfiler | None = None,
+) -> List[str]:
+    """Fused z-scores → logistic (one stage) then components; returns metrics used."""
+    prof = resolve_profiler(profiler)
+    metrics_list = _scoring_metrics(cfg, metrics)
+    with prof.stage("fused_scoring", rows_in=len(frame)) as st:
+        score_frame_fused(
+            frame,
+            player_priors_rows,
+            sd_constants,
+            k_r=cfg.k_r,
+            c=cfg.constants.get("c", 3.0),
+            weights=cfg.weights,
+            guardrails=cfg.constants,
+            scoring_metrics=metrics_list,
+            metrics=metrics,
+            use_finishing_residuals=bool(cfg.toggles.get("use_finishing_residuals")),
+        )
+        st.rows_out = len(frame)
+    if include_components:
+        _attach_components(frame, cfg, metrics_list, prof)
+    return metrics_list
+
+
+def _score_frame(
+    frame: WindowFrame,
+    cfg: SustainabilityConfig,
+    sd_constants: Dict[str, Dict[str, float]],
+    player_priors_rows: Iterable[Dict[str, Any]],
+    metrics: Iterable[str] | None = None,
+    include_components: bool = True,
+    kernel: str = "staged",
+    profiler: StageProfiler | None = None,
+) -> List[str]:
+    """Z-scores through components with the chosen kernel; returns the enriched column names."""
+    if kernel == "fused":
+        window_columns = frame.column_names
+        _annotate_fused(frame, cfg, sd_constants, player_priors_rows, metrics=metrics, include_components=include_components, profiler=profiler)
+        added = set(fused_pre_scoring_columns(metrics))
+        return window_columns + [c for c in frame.column_names if c in added and c not in window_columns]
+    if kernel != "staged":
+        raise ValueError(f"Unknown scoring kernel: {kernel}")
+    _annotate_pre_scoring(frame, cfg, sd_constants, player_priors_rows, metrics=metrics, profiler=profiler)
+    enriched_columns = frame.column_names
+    _annotate_scores(frame, cfg, sd_constants, metrics=metrics, include_components=include_components, profiler=profiler)
+    return enriched_columns
+
+
+def score_window_frame(
+    frame: WindowFrame,
+    cfg: SustainabilityConfig,
+    sd_constants: Dict[str, Dict[str, float]],
+    player_priors_rows: Iterable[Dict[str, Any]],
+    metrics: Iterable[str] | None = None,
+    include_components: bool = True,
+    profiler: StageProfiler | None = None,
+    kernel: str = "staged",
+) -> WindowFrame:
+    """Run every per-row scoring stage (z-scores through components) on a window frame in place.
+
+    Snapshot building and tiering are left to the caller because they need the
+    full score distribution, not just the rows in this frame.
+    """
+    _score_frame(frame, cfg, sd_constants, player_priors_rows, metrics=metrics, include_components=include_components, kernel=kernel, profiler=profiler)
+    return frame
+
+
+def _resolve_inputs(
     season_id: int,
-    games: Iterable[Dict[str, Any]],
     db_client=None,
     cfg: SustainabilityConfig | None = None,
     league_priors: List[LeaguePriorRow] | None = None,
-    player_priors_rows: List[Dict[str, Any]] | None = None,
-    metrics: Iterable[str] | None = None,
+    player_priors_rows: List[Dict[str, Any]] | PriorIndex | None = None,
+    profiler: StageProfiler | None = None,
+    prior_cache: PriorCache | None = None,
 ) -> Dict[str, Any]:
-    """Run the combined pipeline returning enriched window rows & metadata.
-
-    Parameters:
-      season_id: target season for priors & player posteriors.
-      games: iterable of raw per-game player stat dicts.
-      db_client: optional DB adapter for config / priors (stubs tolerated).
-      cfg: preloaded config (skips load if provided).
-      league_priors: optional precomputed league priors list.
-      player_priors_rows: optional precomputed player posterior rows.
-      metrics: optional subset of rate metrics for z-score + reliability.
-
-    Returns dict with keys:
-      cfg, league_priors, player_priors, windows (raw), windows_enriched (with z & r)
-    """
+    """Steps 1–4: config, SD constants, league priors, player priors (+ their PriorIndex)."""
+    prof = resolve_profiler(profiler)
+    if prior_cache is not None:
+        prior_cache.lookups.clear()
     # 1. Config
     if cfg is None:
-        cfg = load_config(db_client=db_client)
+        with prof.stage("config"):
+            cfg = load_config(db_client=db_client)
 
     # 2. SD constants
-    sd_constants = load_sd_constants(db_client if cfg.sd_mode != "fixed" else None)
+    with prof.stage("sd_constants"):
+        if prior_cache is not None:
+            sd_constants = cached_sd_constants(prior_cache, cfg, db_client)
+        else:
+            sd_constants = load_sd_constants(db_client if cfg.sd_mode != "fixed" else None)
 
     # 3. League priors
     if league_priors is None:
-        league_priors = compute_league_beta_priors(season_id, db_client, cfg)
+        with prof.stage("league_priors") as st:
+            if prior_cache is not None:
+                league_priors = cached_league_priors(prior_cache, season_id, cfg, db_client)
+            else:
+                league_priors = compute_league_beta_priors(season_id, db_client, cfg)
+            st.rows_out = len(league_priors)
     league_map = _league_priors_map(league_priors)
 
     # 4. Player priors
     if player_priors_rows is None:
-        player_priors_rows = compute_player_posteriors(
-            target_season=season_id,
-            league_priors=league_map,
-            cfg=cfg,
-            db_client=db_client,
-        )
+        with prof.stage("player_priors") as st:
+            if prior_cache is not None:
+                player_priors_rows = cached_player_posteriors(prior_cache, season_id, league_map, cfg, db_client)
+            else:
+                player_priors_rows = compute_player_posteriors(
+                    target_season=season_id,
+                    league_priors=league_map,
+                    cfg=cfg,
+                    db_client=db_client,
+                )
+            st.rows_out = len(player_priors_rows)
 
-    # 5. Windows
-    windows = build_all_players_windows(games, freshness_days=cfg.freshness_days)
-
-    # 6. Z-scores
-    windows_z = annotate_zscores(windows, player_priors_rows, sd_constants, metrics=metrics)
-
-    # 7. Reliability
-    windows_enriched = compute_reliability(windows_z, cfg.k_r, metrics=metrics)
+    # Dense prior index, built once and shared by every scoring stage / shard
+    with prof.stage("prior_index") as st:
+        prior_index = PriorIndex.coerce(player_priors_rows)
+        st.rows_out = len(prior_index)
 
     return {
         "cfg": cfg,
         "league_priors": league_priors,
         "player_priors": player_priors_rows,
+        "prior_index": prior_index,
+        "sd_constants": sd_constants,
+    }
+
+
+def _run_pre_scoring_frame(
+    season_id: int,
+    games: Iterable[Dict[str, Any]],
+    db_client=None,
+    cfg: SustainabilityConfig | None = None,
+    league_priors: List[LeaguePriorRow] | None = None,
+    player_priors_rows: List[Dict[str, Any]] | PriorIndex | None = None,
+    metrics: Iterable[str] | None = None,
+    profiler: StageProfiler | None = None,
+    kernel: str | None = None,
+    include_components: bool = True,
+    prior_cache: PriorCache | None = None,
+) -> Dict[str, Any]:
+    """Steps 1–7 on a WindowFrame; stages add columns in place (no row copies).
+
+    With `kernel` set, scoring (through components) runs too using that kernel.
+    """
+    prof = resolve_profiler(profiler)
+    pre = _resolve_inputs(
+        season_id, db_client, cfg, league_priors, player_priors_rows, profiler=profiler, prior_cache=prior_cache
+    )
+    cfg = pre["cfg"]
+
+    # 5. Windows
+    games = games if isinstance(games, list) else list(games)
+    with prof.stage("windows", rows_in=len(games)) as st:
+        frame = build_window_frame(games, freshness_days=cfg.freshness_days)
+        st.rows_out = len(frame)
+    window_columns = frame.column_names
+
+    # 6–7. Z-scores & reliability (+ scoring when a kernel is given)
+    if kernel is None:
+        _annotate_pre_scoring(frame, cfg, pre["sd_constants"], pre["prior_index"], metrics=metrics, profiler=profiler)
+        enriched_columns = frame.column_names
+    else:
+        enriched_columns = _score_frame(
+            frame, cfg, pre["sd_constants"], pre["prior_index"], metrics=metrics,
+            include_components=include_components, kernel=kernel, profiler=profiler,
+        )
+
+    return {
+        **pre,
+        "frame": frame,
+        "window_columns": window_columns,
+        "enriched_columns": enriched_columns,
+    }
+
+
+def _score_shard(payload: Tuple[Any, ...]) -> Dict[str, Any] | None:
+    """Process-pool worker: windows through components for one player shard."""
+    games, cfg, sd_constants, priors, metrics, kernel, track = payload
+    if not games:
+        return None
+    # track: None = no profiling, else the track_memory flag for a worker-local profiler
+    profiler = StageProfiler(track_memory=track) if track is not None else None
+    prof = resolve_profiler(profiler)
+    with prof.stage("windows", rows_in=len(games)) as st:
+        frame = build_window_frame(games, freshness_days=cfg.freshness_days)
+        st.rows_out = len(frame)
+    window_columns = frame.column_names
+    # components_json is a lazy view over the scored columns; the parent attaches it after merging
+    enriched_columns = _score_frame(
+        frame, cfg, sd_constants, priors, metrics=metrics, include_components=False, kernel=kernel, profiler=profiler
+    )
+    records = []
+    if profiler is not None:
+        profiler.close()
+        records = [r.to_dict() for r in profiler.records]
+    return {
+        "columns": frame.columns,
+        "window_columns": window_columns,
+        "enriched_columns": enriched_columns,
+        "profile": records,
+    }
+
+
+def _run_sharded_frame(
+    season_id: int,
+    games: Iterable[Dict[str, Any]],
+    workers: int,
+    db_client=None,
+    cfg: SustainabilityConfig | None = None,
+    league_priors: List[LeaguePriorRow] | None = None,
+    player_priors_rows: List[Dict[str, Any]] | PriorIndex | None = None,
+    metrics: Iterable[str] | None = None,
+    include_components: bool = True,
+    profiler: StageProfiler | None = None,
+    kernel: str = "staged",
+    prior_cache: PriorCache | None = None,
+) -> Dict[str, Any]:
+    """Score player shards across a process pool and merge them in serial row order."""
+    prof = resolve_profiler(profiler)
+    pre = _resolve_inputs(
+        season_id, db_client, cfg, league_priors, player_priors_rows, profiler=profiler, prior_cache=prior_cache
+    )
+    cfg = pre["cfg"]
+    metrics = list(metrics) if metrics is not None else None
+    with prof.stage("partition") as st:
+        shard_games, layout = partition_games(games, workers)
+        st.rows_out = sum(len(g) for g in shard_games)
+
+    # Every shard gets the same prebuilt index (pickled as ids + one float buffer).
+    track = prof.track_memory if prof.enabled else None
+    payloads = [
+        (shard_games[s], cfg, pre["sd_constants"], pre["prior_index"], metrics, kernel, track)
+        for s in range(workers)
+    ]
+    with prof.stage("shards", rows_in=sum(len(g) for g in shard_games)) as st:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_shard, payloads))
+        for s, r in enumerate(results):
+            if r:
+                prof.absorb(r["profile"], tid=s + 1)
+
+    with prof.stage("merge_shards") as st:
+        frame = merge_shard_columns([r["columns"] if r else None for r in results], layout)
+        st.rows_out = len(frame)
+    if include_components:
+        _attach_components(frame, cfg, _scoring_metrics(cfg, metrics), prof)
+    first = next((r for r in results if r), None)
+    return {
+        **pre,
+        "frame": frame,
+        "window_columns": first["window_columns"] if first else [],
+        "enriched_columns": first["enriched_columns"] if first else [],
+    }
+
+
+def run_pre_scoring_pipeline(
+    season_id: int,
+    games: Iterable[Dict[str, Any]],
+    db_client=None,
+    cfg: SustainabilityConfig | None = None,
+    league_priors: List[LeaguePriorRow] | None = None,
+    player_priors_rows: List[Dict[str, Any]] | PriorIndex | None = None,
+    metrics: Iterable[str] | None = None,
+    profiler: StageProfiler | None = None,
+    prior_cache: PriorCache | None = None,
+) -> Dict[str, Any]:
+    """Run the combined pipeline returning enriched window rows & metadata.
+
+    Parameters:
+      season_id: target season for priors & player posteriors.
+      games: iterable of raw per-game player stat dicts.
+      db_client: optional DB adapter for config / priors (stubs tolerated).
+      cfg: preloaded config (skips load if provided).
+      league_priors: optional precomputed league priors list.
+      player_priors_rows: optional precomputed player posterior rows, or a PriorIndex
+        from an earlier run (reused as-is).
+      metrics: optional subset of rate metrics for z-score + reliability.
+      profiler: optional StageProfiler collecting per-stage timings.
+      prior_cache: optional PriorCache memoizing SD constants, league priors and
+        player posteriors by config_hash + input digest; keep one across runs.
+
+    Returns dict with keys:
+      cfg, league_priors, player_priors, prior_index (reusable PriorIndex), windows (raw),
+      windows_enriched (with z & r), frame (the underlying WindowFrame)
+    """
+    prof = resolve_profiler(profiler)
+    pre = _run_pre_scoring_frame(
+        season_id=season_id,
+        games=games,
+        db_client=db_client,
+        cfg=cfg,
+        league_priors=league_priors,
+        player_priors_rows=player_priors_rows,
+        metrics=metrics,
+        profiler=profiler,
+        prior_cache=prior_cache,
+    )
+    frame: WindowFrame = pre["frame"]
+    with prof.stage("materialize_rows", rows_in=len(frame)) as st:
+        windows = frame.to_rows(pre["window_columns"])
+        windows_enriched = frame.to_rows()
+        st.rows_out = len(windows) + len(windows_enriched)
+    return {
+        "cfg": pre["cfg"],
+        "league_priors": pre["league_priors"],
+        "player_priors": pre["player_priors"],
+        "prior_index": pre["prior_index"],
         "windows": windows,
         "windows_enriched": windows_enriched,
-        "sd_constants": sd_constants,
+        "sd_constants": pre["sd_constants"],
+        "frame": frame,
     }
 
 
-__all__ = ["run_pre_scoring_pipeline"]
+__all__ = ["run_pre_scoring_pipeline", "score_window_frame"]
 
 
 def run_full_scoring_pipeline(
@@ -110,7 +480,7 @@ def run_full_scoring_pipeline(
     db_client=None,
     cfg: SustainabilityConfig | None = None,
     league_priors: List[LeaguePriorRow] | None = None,
-    player_priors_rows: List[Dict[str, Any]] | None = None,
+    player_priors_rows: List[Dict[str, Any]] | PriorIndex | None = None,
     metrics: Iterable[str] | None = None,
     persist: bool = False,
     include_components: bool = True,
@@ -118,62 +488,133 @@ def run_full_scoring_pipeline(
     build_snapshot: bool = True,
     assign_tiers: bool = True,
     snapshot_window_type: str = "GAME",
+    materialize_rows: bool = True,
+    workers: int = 1,
+    profiler: StageProfiler | None = None,
+    kernel: str = "staged",
+    prior_cache: PriorCache | None = None,
+    grouped_snapshots: bool = False,
+    snapshot_by_position: bool = True,
+    snapshot_by_season: bool = False,
+    tier_by_group: bool = False,
 ) -> Dict[str, Any]:
     """End‑to‑end scoring pipeline through barometer persistence (Task integration 4.4–4.7).
 
     Parameters mirror `run_pre_scoring_pipeline` plus:
       persist: retired; True fails closed because TypeScript owns production writes
-      include_components: attach components_json diagnostic payload
+      include_components: attach components_json diagnostic payload (a lazy
+        ComponentsView column; dicts are built when rows are read or materialized)
       dry_run: legacy alias (if provided overrides persist=False when True)
+      materialize_rows: when False, windows_scored is a lazy row view (callers that only
+        need counts / the snapshot skip building row dicts)
+      workers: >1 scores player shards (hash of player_id) in a process pool; the
+        snapshot and quintiles run on the merged frame, so output is identical for
+        any worker count
+      profiler: optional StageProfiler; shard stages land on their own trace tracks
+      kernel: "staged" (one pass per stage) or "fused" (`fused.score_frame_fused`:
+        z-scores through logistic in one stage; identical output)
+      prior_cache: optional PriorCache for SD constants / league priors / posteriors
+      grouped_snapshots: one scan builds a snapshot per (window_type, position,
+        season) group (`snapshot_by_position` / `snapshot_by_season` pick the splits);
+        the `snapshot_window_type` snapshot is then merged from its group sketches
+      tier_by_group: with grouped snapshots, tier every row against its own group's
+        snapshot instead of tiering `snapshot_window_type` rows against one snapshot
+
+    All stages run on a single WindowFrame. `windows` and `windows_enriched` are
+    lazy row views over the columns present after those stages.
 
     Returns dict with extended keys: all pre-scoring keys plus
       windows_scored: list of rows with score fields
       persisted_count: int (if persist True)
+      snapshot / snapshot_sketch: thresholds plus the mergeable QuantileSketch payload
+      snapshots: grouped snapshot dicts (None unless grouped_snapshots)
     """
     if persist and dry_run is not True:
         raise OfflinePersistenceDisabledError(OFFLINE_PERSISTENCE_MESSAGE)
     if dry_run is True:
         persist = False
-    pre = run_pre_scoring_pipeline(
-        season_id=season_id,
-        games=games,
-        db_client=db_client,
-        cfg=cfg,
-        league_priors=league_priors,
-        player_priors_rows=player_priors_rows,
-        metrics=metrics,
-    )
-    cfg = pre["cfg"]
-    metrics_list = list(metrics) if metrics is not None else list(cfg.weights.keys())
-    # Optionally add finishing residual z annotations prior to clipping
-    enriched = pre["windows_enriched"]
-    if cfg.toggles.get("use_finishing_residuals"):
-        enriched = annotate_finishing_residuals(enriched, pre["sd_constants"])
-        # Ensure metrics list includes finishing metrics if they have weights
-        for fm in FINISHING_METRICS:
-            if fm in cfg.weights and fm not in metrics_list:
-                metrics_list.append(fm)
-
-    # Soft clipping
-    clipped = apply_soft_clipping(enriched, metrics=metrics_list, c=cfg.constants.get("c", 3.0))
-    # Contributions
-    contrib = compute_contributions(clipped, weights=cfg.weights, metrics=metrics_list, use_clipped=True)
-    # Logistic scoring
-    scored = apply_logistic_scoring(contrib, guardrails=cfg.constants)
-    # Components JSON
-    if include_components:
-        extreme_thresh = cfg.constants.get("extreme_z_threshold", 4.0)
-        scored = attach_components_json(scored, metrics=metrics_list, weights=cfg.weights, extreme_threshold=extreme_thresh)
+    if kernel not in KERNELS:
+        raise ValueError(f"Unknown scoring kernel: {kernel}")
+    prof = resolve_profiler(profiler)
+    if workers > 1:
+        pre = _run_sharded_frame(
+            season_id=season_id,
+            games=games,
+            workers=workers,
+            db_client=db_client,
+            cfg=cfg,
+            league_priors=league_priors,
+            player_priors_rows=player_priors_rows,
+            metrics=metrics,
+            include_components=include_components,
+            profiler=profiler,
+            kernel=kernel,
+            prior_cache=prior_cache,
+        )
+        cfg = pre["cfg"]
+        frame: WindowFrame = pre["frame"]
+    else:
+        pre = _run_pre_scoring_frame(
+            season_id=season_id,
+            games=games,
+            db_client=db_client,
+            cfg=cfg,
+            league_priors=league_priors,
+            player_priors_rows=player_priors_rows,
+            metrics=metrics,
+            profiler=profiler,
+            kernel=kernel,
+            include_components=include_components,
+            prior_cache=prior_cache,
+        )
+        cfg = pre["cfg"]
+        frame = pre["frame"]
 
     snapshot = None
+    sketch = None
+    group_sketches = None
+    grouped = None
+    if grouped_snapshots:
+        with prof.stage("grouped_snapshots", rows_in=len(frame)) as st:
+            group_sketches = build_grouped_sketches_frame(frame, by_position=snapshot_by_position, by_season=snapshot_by_season)
+            grouped = build_grouped_snapshots(group_sketches, model_version=cfg.model_version, config_hash=cfg.config_hash)
+            st.rows_out = len(grouped)
     if build_snapshot:
-        snapshot = build_distribution_snapshot(scored, window_type=snapshot_window_type, model_version=cfg.model_version, config_hash=cfg.config_hash)
+        with prof.stage("snapshot", rows_in=len(frame)) as st:
+            if group_sketches is not None:
+                sketch = merge_group_sketches(group_sketches, snapshot_window_type)
+            else:
+                sketch = build_distribution_sketch_frame(frame, window_type=snapshot_window_type)
+            snapshot = build_distribution_snapshot_from_sketch(sketch, window_type=snapshot_window_type, model_version=cfg.model_version, config_hash=cfg.config_hash)
+            st.rows_out = sketch.n
     if assign_tiers:
-        scored = assign_quintiles(scored, snapshot, window_filter=snapshot_window_type)
+        with prof.stage("tiers", rows_in=len(frame)) as st:
+            if tier_by_group and grouped is not None:
+                assign_quintiles_grouped_frame(frame, grouped, by_position=snapshot_by_position, by_season=snapshot_by_season)
+            else:
+                assign_quintiles_frame(frame, snapshot, window_filter=snapshot_window_type)
+            st.rows_out = len(frame)
 
     persisted_count = 0
+    with prof.stage("materialize_rows", rows_in=len(frame)) as st:
+        windows_scored = frame.to_rows() if materialize_rows else frame.rows_view()
+        st.rows_out = len(windows_scored) if materialize_rows else 0
 
-    return {**pre, "windows_scored": scored, "persisted_count": persisted_count, "snapshot": snapshot.to_dict() if snapshot else None}
+    return {
+        "cfg": cfg,
+        "league_priors": pre["league_priors"],
+        "player_priors": pre["player_priors"],
+        "prior_index": pre["prior_index"],
+        "windows": frame.rows_view(pre["window_columns"]),
+        "windows_enriched": frame.rows_view(pre["enriched_columns"]),
+        "sd_constants": pre["sd_constants"],
+        "frame": frame,
+        "windows_scored": windows_scored,
+        "persisted_count": persisted_count,
+        "snapshot": snapshot.to_dict() if snapshot else None,
+        "snapshot_sketch": sketch.to_dict() if snapshot else None,
+        "snapshots": [snap.to_dict() for snap in grouped.values()] if grouped is not None else None,
+    }
 
 
 __all__.append("run_full_scoring_pipeline")
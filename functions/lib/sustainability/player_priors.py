@@ -73,33 +73,13 @@ def _season_order(target_season: int) -> List[int]:
     return [target_season, target_season - 1, target_season - 2]
 
 
-def compute_player_posteriors(
-    target_season: int,
-    league_priors: Dict[Tuple[int, str, str], LeaguePriorRow],
-    cfg: SustainabilityConfig,
-    db_client=None,
-    rows: Iterable[Dict[str, Any]] | None = None,
-    season_weights: List[float] | None = None,
-) -> List[Dict[str, Any]]:
-    """Compute player posterior means for target season.
-
-    Parameters:
-        target_season: season for which priors will be written.
-        league_priors: mapping keyed by (season_id, position_code, stat_code).
-        cfg: loaded config (for model_version, maybe future toggles).
-        db_client: optional client to fetch season rows if rows not given.
-        rows: optional pre-fetched iterable for testing.
-        season_weights: optional override weight list (len up to 3).
-    """
+def _prepare_season_weights(season_weights: List[float] | None) -> List[float]:
     if season_weights is None:
         season_weights = DEFAULT_SEASON_WEIGHTS
-    season_weights = season_weights[:3] + [0] * (3 - len(season_weights[:3]))
+    return season_weights[:3] + [0] * (3 - len(season_weights[:3]))
 
-    target_and_history = _season_order(target_season)
-    needed_seasons = set(target_and_history)
-    if rows is None:
-        rows = fetch_player_season_rows(db_client, list(needed_seasons))
 
+def _group_player_rows(rows: Iterable[Dict[str, Any]]) -> DefaultDict[int, Dict[int, Dict[str, Any]]]:
     # Group by player -> season
     by_player: DefaultDict[int, Dict[int, Dict[str, Any]]] = defaultdict(dict)
     for r in rows:
@@ -108,7 +88,32 @@ def compute_player_posteriors(
         if pid is None or season is None:
             continue
         by_player[int(pid)][int(season)] = r
+    return by_player
 
+
+def _row_counts(
+    counts: Dict[Tuple[int, int], List[Tuple[int, int]]],
+    player_id: int,
+    season: int,
+    row: Dict[str, Any],
+) -> List[Tuple[int, int]]:
+    # (successes, trials) per PLAYER_PRIOR_METRICS entry, parsed once per player-season
+    key = (player_id, season)
+    cached = counts.get(key)
+    if cached is None:
+        cached = counts[key] = [_metric_counts(row, metric) for metric in PLAYER_PRIOR_METRICS]
+    return cached
+
+
+def _posteriors_for_target(
+    target_season: int,
+    by_player: Dict[int, Dict[int, Dict[str, Any]]],
+    league_priors: Dict[Tuple[int, str, str], LeaguePriorRow],
+    model_version: int,
+    season_weights: List[float],
+    counts: Dict[Tuple[int, int], List[Tuple[int, int]]],
+) -> List[Dict[str, Any]]:
+    target_and_history = _season_order(target_season)
     results: List[Dict[str, Any]] = []
     for player_id, season_map in by_player.items():
         target_row = season_map.get(target_season)
@@ -117,28 +122,28 @@ def compute_player_posteriors(
             continue
         position_code = target_row.get("position_code") or "F"
         # Build weights for available seasons in order
-        avail_rows: List[Tuple[float, Dict[str, Any]]] = []
+        avail: List[Tuple[float, int, Dict[str, Any]]] = []
         weight_positions: List[float] = []
         for idx, season in enumerate(target_and_history):
             row = season_map.get(season)
             w = season_weights[idx] if row else 0.0
             if row and w > 0:
-                avail_rows.append((w, row))
+                avail.append((w, season, row))
                 weight_positions.append(w)
-        if not avail_rows:
+        if not avail:
             continue
         norm = _normalize_weights(weight_positions)
-        for i in range(len(avail_rows)):
-            w, r = avail_rows[i]
-            avail_rows[i] = (norm[i], r)
+        avail_counts = [
+            (norm[i], _row_counts(counts, player_id, season, row)) for i, (_, season, row) in enumerate(avail)
+        ]
 
         rookie_status = len([s for s in season_map.keys() if s < target_season and season_map[s]]) == 0
 
-        for metric in PLAYER_PRIOR_METRICS:
+        for m_idx, metric in enumerate(PLAYER_PRIOR_METRICS):
             successes_blend = 0.0
             trials_blend = 0.0
-            for w, r in avail_rows:
-                suc, tri = _metric_counts(r, metric)
+            for w, row_counts in avail_counts:
+                suc, tri = row_counts[m_idx]
                 successes_blend += w * suc
                 trials_blend += w * tri
             # Beta posterior with league prior
@@ -164,9 +169,13 @@ def compute_player_posteriors(
                     "trials_blend": trials_blend,
                     "post_mean": post_mean,
                     "rookie_status": rookie_status,
-                    "model_version": cfg.model_version,
+                    "model_version": model_version,
                 }
             )
+    return results
+
+
+def _log_computed(by_player: Dict[int, Any], results: List[Dict[str, Any]], target_season: int) -> None:
     logger.debug(
         "player_posteriors_computed players=%s rows=%s rookies=%s target_season=%s",
         len(by_player),
@@ -174,9 +183,64 @@ def compute_player_posteriors(
         sum(1 for r in results if r["rookie_status"]),
         target_season,
     )
+
+
+def compute_player_posteriors(
+    target_season: int,
+    league_priors: Dict[Tuple[int, str, str], LeaguePriorRow],
+    cfg: SustainabilityConfig,
+    db_client=None,
+    rows: Iterable[Dict[str, Any]] | None = None,
+    season_weights: List[float] | None = None,
+) -> List[Dict[str, Any]]:
+    """Compute player posterior means for target season.
+
+    Parameters:
+        target_season: season for which priors will be written.
+        league_priors: mapping keyed by (season_id, position_code, stat_code).
+        cfg: loaded config (for model_version, maybe future toggles).
+        db_client: optional client to fetch season rows if rows not given.
+        rows: optional pre-fetched iterable for testing.
+        season_weights: optional override weight list (len up to 3).
+    """
+    season_weights = _prepare_season_weights(season_weights)
+    if rows is None:
+        rows = fetch_player_season_rows(db_client, list(set(_season_order(target_season))))
+    by_player = _group_player_rows(rows)
+    results = _posteriors_for_target(target_season, by_player, league_priors, cfg.model_version, season_weights, {})
+    _log_computed(by_player, results, target_season)
     return results
 
 
+def compute_player_posteriors_multi(
+    target_seasons: Iterable[int],
+    league_priors: Dict[Tuple[int, str, str], LeaguePriorRow],
+    cfg: SustainabilityConfig,
+    db_client=None,
+    rows: Iterable[Dict[str, Any]] | None = None,
+    season_weights: List[float] | None = None,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Posteriors for several target seasons from one fetch of player season rows.
+
+    Rows for the union of every target's blend window are fetched once and grouped
+    once; each player-season's counts are parsed once and shared by every target
+    whose three-season window covers it. Per-target output equals
+    `compute_player_posteriors(target, ..., rows=rows)`.
+    """
+    targets = list(dict.fromkeys(target_seasons))
+    season_weights = _prepare_season_weights(season_weights)
+    if rows is None:
+        needed = sorted({s for t in targets for s in _season_order(t)})
+        rows = fetch_player_season_rows(db_client, needed)
+    by_player = _group_player_rows(rows)
+    counts: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    out: Dict[int, List[Dict[str, Any]]] = {}
+    for target in targets:
+        out[target] = _posteriors_for_target(target, by_player, league_priors, cfg.model_version, season_weights, counts)
+        _log_computed(by_player, out[target], target)
+    return out
+
+
 def upsert_player_priors(db_client, rows: List[Dict[str, Any]]) -> int:
     """Reject legacy Python prior persistence; TypeScript owns production writes."""
     if not rows:
@@ -210,6 +274,7 @@ def log_player_posteriors_summary(rows: List[Dict[str, Any]]) -> None:
 __all__ = [
     "PLAYER_PRIOR_METRICS",
     "compute_player_posteriors",
+    "compute_player_posteriors_multi",
     "fetch_player_season_rows",
     "upsert_player_priors",
 ]
@@ -0,0 +1,271 @@
+"""Column-wise league priors and player posteriors (Tasks 3.1 / 3.4–3.7 follow-up).
+
+`compute_player_posteriors` walks players × seasons × metrics in Python, rebuilding
+weight lists and a (season, position, stat) key per metric. This module lays the
+same inputs out as columns once and then works a whole column at a time:
+
+  * `build_player_season_counts` groups the player season rows into a
+    `PlayerSeasonCounts`: one row per player with a target-season row, and per
+    season slot h (0 = target, h = target - h) a presence column plus successes /
+    trials columns per metric. Any number of history seasons is supported.
+  * `compute_posterior_columns` takes one weight vector (any length up to the
+    number of season slots), re-normalizes it per player over the seasons
+    present, and produces blended counts and Beta posterior means per metric.
+  * `sweep_player_posteriors` runs many weight vectors over the same counts and
+    prior gathers, for prior sensitivity sweeps.
+  * `compute_league_beta_priors_columns` is the column form of
+    `compute_league_beta_priors`.
+
+numpy is not available in this tree, so columns are flat float64 `array`s and the
+per-season steps are C-level `map`s over them. With the default three-slot weights,
+`posterior_columns_to_rows` returns exactly what `compute_player_posteriors` does,
+in the same order and with the same floats.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from itertools import repeat
+from operator import add, mul
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .config_loader import SustainabilityConfig
+from .player_priors import DEFAULT_SEASON_WEIGHTS, PLAYER_PRIOR_METRICS, _group_player_rows
+from .priors import LEAGUE_PRIOR_METRICS, LeaguePriorRow, fetch_league_aggregates
+
+
+@dataclass
+class PlayerSeasonCounts:
+    """Per-player per-season successes/trials for one target season, stored by column."""
+
+    target_season: int
+    metrics: List[str]
+    player_ids: List[int]
+    position_codes: List[str]
+    rookie: List[bool]
+    present: List[array]  # [season slot] -> 1.0 / 0.0 per player
+    successes: List[List[array]]  # [season slot][metric] -> count per player
+    trials: List[List[array]]
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @property
+    def n_seasons(self) -> int:
+        return len(self.present)
+
+    @property
+    def season_ids(self) -> List[int]:
+        return [self.target_season - h for h in range(self.n_seasons)]
+
+
+def _count_column(season_rows: List[Dict[str, Any] | None], field: str) -> array:
+    return array("d", [int(r.get(field, 0) or 0) if r else 0 for r in season_rows])
+
+
+def build_player_season_counts(
+    rows: Iterable[Dict[str, Any]],
+    target_season: int,
+    n_history: int = 2,
+    metrics: Sequence[str] = PLAYER_PRIOR_METRICS,
+) -> PlayerSeasonCounts:
+    """Group player season rows into columns for `target_season` and `n_history` prior seasons.
+
+    Players without a target-season row are dropped, as in `compute_player_posteriors`.
+    Rookie status looks at every earlier season present in `rows`, not only the window.
+    """
+    if n_history < 0:
+        raise ValueError("n_history must be >= 0")
+    metrics = list(metrics)
+    by_player = _group_player_rows(rows)
+    player_ids: List[int] = []
+    season_maps: List[Dict[int, Dict[str, Any]]] = []
+    for pid, season_map in by_player.items():
+        if season_map.get(target_season) is not None:
+            player_ids.append(pid)
+            season_maps.append(season_map)
+    present: List[array] = []
+    successes: List[List[array]] = []
+    trials: List[List[array]] = []
+    for h in range(n_history + 1):
+        season = target_season - h
+        season_rows = [m.get(season) for m in season_maps]
+        present.append(array("d", [1.0 if r else 0.0 for r in season_rows]))
+        successes.append([_count_column(season_rows, f"{metric}_successes") for metric in metrics])
+        trials.append([_count_column(season_rows, f"{metric}_trials") for metric in metrics])
+    return PlayerSeasonCounts(
+        target_season=target_season,
+        metrics=metrics,
+        player_ids=player_ids,
+        position_codes=[m[target_season].get("position_code") or "F" for m in season_maps],
+        rookie=[not any(s < target_season and m[s] for s in m) for m in season_maps],
+        present=present,
+        successes=successes,
+        trials=trials,
+    )
+
+
+def _gather_priors(
+    counts: PlayerSeasonCounts,
+    league_priors: Dict[Tuple[int, str, str], LeaguePriorRow],
+) -> List[List[LeaguePriorRow | None]]:
+    # [metric] -> prior per player; positions are few, so resolve each once per metric
+    out: List[List[LeaguePriorRow | None]] = []
+    for metric in counts.metrics:
+        by_pos = {pos: league_priors.get((counts.target_season, pos, metric)) for pos in set(counts.position_codes)}
+        out.append([by_pos[pos] for pos in counts.position_codes])
+    return out
+
+
+def _season_weights(counts: PlayerSeasonCounts, season_weights: Sequence[float] | None) -> List[float]:
+    weights = list(DEFAULT_SEASON_WEIGHTS if season_weights is None else season_weights)
+    if len(weights) > counts.n_seasons:
+        raise ValueError(
+            f"{len(weights)} season weights but counts hold {counts.n_seasons} seasons; "
+            "build counts with a larger n_history"
+        )
+    return weights
+
+
+def _posterior_columns(
+    counts: PlayerSeasonCounts,
+    priors: List[List[LeaguePriorRow | None]],
+    weights: List[float],
+) -> Dict[str, List[Any]]:
+    n = len(counts)
+    # Effective weight per season: the slot weight where that season is present (non-positive slots drop out)
+    effective = [(h, array("d", map(mul, repeat(float(w), n), counts.present[h]))) for h, w in enumerate(weights) if w > 0]
+    total = array("d", bytes(8 * n))
+    for _, eff in effective:
+        total = array("d", map(add, total, eff))
+    norm = [(h, [e / t if t > 0 else 0.0 for e, t in zip(eff, total)]) for h, eff in effective]
+
+    cols: Dict[str, List[Any]] = {
+        "player_id": counts.player_ids,
+        "position_code": counts.position_codes,
+        "rookie_status": counts.rookie,
+        "has_weight": [t > 0 for t in total],
+    }
+    for m_idx, metric in enumerate(counts.metrics):
+        s_blend = array("d", bytes(8 * n))
+        t_blend = array("d", bytes(8 * n))
+        for h, w in norm:
+            s_blend = array("d", map(add, s_blend, map(mul, w, counts.successes[h][m_idx])))
+            t_blend = array("d", map(add, t_blend, map(mul, w, counts.trials[h][m_idx])))
+        post: List[float | None] = []
+        append = post.append
+        for prior, sb, tb in zip(priors[m_idx], s_blend, t_blend):
+            if prior is None:
+                append(None)
+                continue
+            alpha_post = prior.alpha0 + sb
+            denom = alpha_post + (prior.beta0 + max(tb - sb, 0))
+            append(prior.league_mu if denom <= 0 else alpha_post / denom)
+        cols[f"{metric}_successes_blend"] = s_blend.tolist()
+        cols[f"{metric}_trials_blend"] = t_blend.tolist()
+        cols[f"{metric}_post_mean"] = post
+    return cols
+
+
+def compute_posterior_columns(
+    counts: PlayerSeasonCounts,
+    league_priors: Dict[Tuple[int, str, str], LeaguePriorRow],
+    season_weights: Sequence[float] | None = None,
+) -> Dict[str, List[Any]]:
+    """Blended counts and Beta posterior means for every player, one column per metric field.
+
+    `season_weights[h]` weights season `target - h`; shorter vectors leave older slots
+    unweighted. `has_weight` is False for players with no weighted season present
+    (the row-wise path skips them); `<metric>_post_mean` is None where the league
+    prior for the player's position is missing.
+    """
+    weights = _season_weights(counts, season_weights)
+    return _posterior_columns(counts, _gather_priors(counts, league_priors), weights)
+
+
+def sweep_player_posteriors(
+    counts: PlayerSeasonCounts,
+    league_priors: Dict[Tuple[int, str, str], LeaguePriorRow],
+    weight_vectors: Iterable[Sequence[float]],
+) -> List[Dict[str, List[Any]]]:
+    """`compute_posterior_columns` for each weight vector, sharing counts and prior gathers."""
+    priors = _gather_priors(counts, league_priors)
+    return [_posterior_columns(counts, priors, _season_weights(counts, w)) for w in weight_vectors]
+
+
+def posterior_columns_to_rows(
+    counts: PlayerSeasonCounts,
+    cols: Dict[str, List[Any]],
+    model_version: int,
+) -> List[Dict[str, Any]]:
+    """Row dicts in `compute_player_posteriors` shape and order."""
+    results: List[Dict[str, Any]] = []
+    per_metric = [
+        (metric, cols[f"{metric}_successes_blend"], cols[f"{metric}_trials_blend"], cols[f"{metric}_post_mean"])
+        for metric in counts.metrics
+    ]
+    for i, keep in enumerate(cols["has_weight"]):
+        if not keep:
+            continue
+        for metric, s_blend, t_blend, post in per_metric:
+            if post[i] is None:
+                continue
+            results.append(
+                {
+                    "player_id": counts.player_ids[i],
+                    "season_id": counts.target_season,
+                    "position_code": counts.position_codes[i],
+                    "stat_code": metric,
+                    "successes_blend": s_blend[i],
+                    "trials_blend": t_blend[i],
+                    "post_mean": post[i],
+                    "rookie_status": counts.rookie[i],
+                    "model_version": model_version,
+                }
+            )
+    return results
+
+
+def compute_league_beta_priors_columns(
+    season_id: int,
+    db_client,
+    cfg: SustainabilityConfig,
+    aggregates: Iterable[Dict[str, Any]] | None = None,
+) -> List[LeaguePriorRow]:
+    """Column form of `compute_league_beta_priors`; same rows in the same order."""
+    if aggregates is None:
+        aggregates = fetch_league_aggregates(db_client, season_id)
+    kept = [r for r in aggregates if r.get("position_code")]
+    positions = [r["position_code"] for r in kept]
+    per_metric: List[List[LeaguePriorRow]] = []
+    for metric in LEAGUE_PRIOR_METRICS:
+        k = float(cfg.k_r.get(metric, 1))
+        successes = [int(r.get(f"{metric}_successes", 0) or 0) for r in kept]
+        trials = [int(r.get(f"{metric}_trials", 0) or 0) for r in kept]
+        # Guard: successes > trials (e.g., points vs goals for IPP) expands the denominator
+        trials = [s if s > t and t > 0 else t for s, t in zip(successes, trials)]
+        mu = [min(max(s / t, 0.0), 1.0) if t > 0 else 0.0 for s, t in zip(successes, trials)]
+        rows: List[LeaguePriorRow] = []
+        for pos, t, m in zip(positions, trials, mu):
+            if t <= 0:
+                alpha0, beta0 = 1.0, 1.0
+            else:
+                alpha0 = m * k
+                beta0 = (1.0 - m) * k
+                if alpha0 <= 0:
+                    alpha0 = 0.5
+                if beta0 <= 0:
+                    beta0 = 0.5
+            rows.append(LeaguePriorRow(season_id, pos, metric, alpha0, beta0, k, m))
+        per_metric.append(rows)
+    return [row for group in zip(*per_metric) for row in group]
+
+
+__all__ = [
+    "PlayerSeasonCounts",
+    "build_player_season_counts",
+    "compute_posterior_columns",
+    "sweep_player_posteriors",
+    "posterior_columns_to_rows",
+    "compute_league_beta_priors_columns",
+]
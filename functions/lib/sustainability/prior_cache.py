@@ -0,0 +1,180 @@
+"""Content-addressed cache for SD constants, league priors and player posteriors.
+
+Rescoring several times a day usually runs with the same config and the same
+season aggregates, yet `_resolve_inputs` recomputed `load_sd_constants`,
+`compute_league_beta_priors` and `compute_player_posteriors` every time.
+`PriorCache` memoizes all three:
+
+  * Keys are a SHA256 over (kind, config_hash, season_id, input digest). The input
+    digest covers the raw rows each step reads (SD constant rows, league aggregate
+    rows, player season rows) and, for posteriors, the league priors they shrink
+    toward. A changed config or any changed aggregate row is a new key; stale
+    entries are never read, only evicted.
+  * Inputs are still fetched on every run (they are what the digest covers); a hit
+    skips the computation and, on a miss, the fetched rows are handed straight to
+    the compute function so nothing is fetched twice.
+  * Layer 1 is an in-process LRU (`max_entries`). Layer 2, when `cache_dir` is set,
+    is one JSON file per key written atomically (tmp file + rename), so entries
+    survive across processes. Disk hits are promoted into the LRU.
+  * `stats` counts memory hits, disk hits, misses and stores; `lookups` records the
+    outcome ("memory" / "disk" / "miss") per kind for the latest resolve.
+
+Like the incremental state file, the disk layer is local offline working state;
+production persistence remains fail-closed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from .config_loader import SustainabilityConfig
+from .constants import fetch_sd_constant_rows, load_sd_constants
+from .player_priors import _season_order, compute_player_posteriors, fetch_player_season_rows
+from .priors import LeaguePriorRow, compute_league_beta_priors, fetch_league_aggregates
+
+CACHE_KINDS = ("sd_constants", "league_priors", "player_priors")
+
+
+def digest_rows(rows: Iterable[Any]) -> str:
+    """Order-sensitive SHA256 over JSON-encoded rows (non-JSON values via str())."""
+    h = hashlib.sha256()
+    for row in rows:
+        h.update(json.dumps(row, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def cache_key(kind: str, config_hash: str, season_id: int | None, inputs_digest: str) -> str:
+    payload = json.dumps([kind, config_hash, season_id, inputs_digest], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PriorCache:
+    """In-process LRU over an optional on-disk JSON store, keyed by content digests."""
+
+    def __init__(self, max_entries: int = 32, cache_dir: str | None = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.stats: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self.lookups: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Tuple[str, Any]:
+        """(outcome, value) with outcome "memory", "disk" or "miss" (value None)."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return "memory", self._entries[key]
+        if self.cache_dir is not None and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as fh:
+                    value = json.load(fh)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                self.stats["disk_hits"] += 1
+                return "disk", value
+        self.stats["misses"] += 1
+        return "miss", None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value in memory (and on disk when configured)."""
+        self._remember(key, value)
+        self.stats["stores"] += 1
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{self._path(key)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(value, fh, separators=(",", ":"))
+        os.replace(tmp, self._path(key))
+
+    def get_or_compute(self, kind: str, key: str, compute: Callable[[], Any]) -> Any:
+        outcome, value = self.get(key)
+        self.lookups[kind] = outcome
+        if outcome == "miss":
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop the in-process layer (the disk layer is left in place)."""
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+
+def cached_sd_constants(cache: PriorCache, cfg: SustainabilityConfig, db_client=None) -> Dict[str, Dict[str, float]]:
+    """`load_sd_constants` for this config, keyed by config_hash + the raw SD rows."""
+    client = db_client if cfg.sd_mode != "fixed" else None
+    try:
+        rows = list(fetch_sd_constant_rows(client) or [])
+    except Exception:
+        rows = []
+    key = cache_key("sd_constants", cfg.config_hash, None, digest_rows(rows))
+    return cache.get_or_compute("sd_constants", key, lambda: load_sd_constants(client, rows=rows))
+
+
+def cached_league_priors(
+    cache: PriorCache, season_id: int, cfg: SustainabilityConfig, db_client=None
+) -> List[LeaguePriorRow]:
+    """`compute_league_beta_priors`, keyed by config_hash + the season's aggregate rows."""
+    aggregates = list(fetch_league_aggregates(db_client, season_id))
+    key = cache_key("league_priors", cfg.config_hash, season_id, digest_rows(aggregates))
+    stored = cache.get_or_compute(
+        "league_priors",
+        key,
+        lambda: [asdict(p) for p in compute_league_beta_priors(season_id, db_client, cfg, aggregates=aggregates)],
+    )
+    return [LeaguePriorRow(**p) for p in stored]
+
+
+def cached_player_posteriors(
+    cache: PriorCache,
+    season_id: int,
+    league_map: Dict[Tuple[int, str, str], LeaguePriorRow],
+    cfg: SustainabilityConfig,
+    db_client=None,
+) -> List[Dict[str, Any]]:
+    """`compute_player_posteriors`, keyed by config_hash + player season rows + league priors."""
+    rows = list(fetch_player_season_rows(db_client, list(set(_season_order(season_id)))))
+    league_digest = digest_rows(asdict(league_map[k]) for k in sorted(league_map))
+    key = cache_key("player_priors", cfg.config_hash, season_id, digest_rows(rows) + league_digest)
+    stored = cache.get_or_compute(
+        "player_priors",
+        key,
+        lambda: compute_player_posteriors(season_id, league_map, cfg, db_client=db_client, rows=rows),
+    )
+    # Callers own the returned rows; never hand out the cached objects themselves
+    return [dict(r) for r in stored]
+
+
+__all__ = [
+    "CACHE_KINDS",
+    "PriorCache",
+    "cache_key",
+    "cached_league_priors",
+    "cached_player_posteriors",
+    "cached_sd_constants",
+    "digest_rows",
+]
@@ -0,0 +1,141 @@
+"""Dense player prior index for z-score lookups (Task 4.2 follow-up).
+
+`zscores._build_prior_lookup` keys a dict by (player_id, stat_code) tuples and the
+z-score stage probes it with a fresh tuple per row per metric. `PriorIndex`
+instead assigns dense integer slots:
+
+  * player_id  -> player slot (0..P-1; slot P is an all-missing row)
+  * stat_code  -> stat slot   (0..S-1)
+  * values     -> one float64 `array` of S * (P + 1) cells, stat-major, NaN = missing
+
+A frame resolves each row's player slot once (`slots(player_ids)`); each metric's
+expected values are then a gather over that stat's column (`gather(slots, stat)`),
+done with a C-level `map` over a zero-copy memoryview.
+
+The index pickles as (player ids, stat codes, float buffer), so it can be built
+once and shipped to process-pool shards or kept between incremental runs.
+
+Semantics match `_build_prior_lookup`: rows missing player_id / stat_code /
+post_mean are skipped, ids are coerced with int(), later rows win. Missing cells
+read back as None (a NaN post_mean is treated as missing).
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+_NAN = math.nan
+
+
+class PriorIndex:
+    """player_id × stat_code → post_mean, stored as a dense float64 matrix."""
+
+    __slots__ = ("player_ids", "stat_codes", "values", "_player_slot", "_stat_slot", "_stride")
+
+    def __init__(self, player_ids: List[Any], stat_codes: List[str], values: array):
+        stride = len(player_ids) + 1
+        if len(values) != stride * len(stat_codes):
+            raise ValueError("values length does not match player/stat slot counts")
+        self.player_ids = list(player_ids)
+        self.stat_codes = list(stat_codes)
+        self.values = values
+        self._stride = stride
+        self._player_slot = {pid: i for i, pid in enumerate(self.player_ids)}
+        self._stat_slot = {stat: j for j, stat in enumerate(self.stat_codes)}
+
+    @classmethod
+    def from_mapping(cls, lookup: Mapping[Tuple[Any, str], float]) -> "PriorIndex":
+        players: Dict[Any, int] = {}
+        stats: Dict[str, int] = {}
+        cells: List[Tuple[int, int, float]] = []
+        for (pid, stat), mean in lookup.items():
+            p = players.setdefault(pid, len(players))
+            s = stats.setdefault(stat, len(stats))
+            cells.append((s, p, float(mean)))
+        stride = len(players) + 1
+        values = array("d", [_NAN]) * (stride * len(stats))
+        for s, p, mean in cells:
+            values[s * stride + p] = mean
+        return cls(list(players), list(stats), values)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "PriorIndex":
+        lookup: Dict[Tuple[int, str], float] = {}
+        for r in rows:
+            pid = r.get("player_id")
+            stat = r.get("stat_code")
+            mean = r.get("post_mean")
+            if pid is None or stat is None or mean is None:
+                continue
+            lookup[(int(pid), str(stat))] = float(mean)
+        return cls.from_mapping(lookup)
+
+    @classmethod
+    def coerce(cls, priors: "PriorIndex | Iterable[Dict[str, Any]] | Mapping") -> "PriorIndex":
+        """Accept an index, prior rows, or a {(player_id, stat_code): mean} mapping."""
+        if isinstance(priors, PriorIndex):
+            return priors
+        if isinstance(priors, dict):
+            sample_key = next(iter(priors.keys()), None)
+            if sample_key is None:
+                return cls([], [], array("d"))
+            if isinstance(sample_key, tuple) and len(sample_key) == 2:
+                return cls.from_mapping(priors)
+        return cls.from_rows(priors)
+
+    def __reduce__(self):
+        return (PriorIndex, (self.player_ids, self.stat_codes, self.values))
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PriorIndex):
+            return NotImplemented
+        return self.to_mapping() == other.to_mapping()
+
+    @property
+    def missing_slot(self) -> int:
+        return self._stride - 1
+
+    def slots(self, player_ids: Iterable[Any]) -> List[int]:
+        """Player slot per row (the all-missing slot for players without priors)."""
+        get = self._player_slot.get
+        missing = self._stride - 1
+        return [get(pid, missing) for pid in player_ids]
+
+    def column(self, stat_code: str) -> memoryview | None:
+        s = self._stat_slot.get(stat_code)
+        if s is None:
+            return None
+        start = s * self._stride
+        return memoryview(self.values)[start:start + self._stride]
+
+    def gather(self, slots: List[int], stat_code: str) -> List[float | None]:
+        """post_mean per row for `stat_code` (None where missing)."""
+        col = self.column(stat_code)
+        if col is None:
+            return [None] * len(slots)
+        return [None if v != v else v for v in map(col.__getitem__, slots)]
+
+    def get(self, player_id: Any, stat_code: str) -> float | None:
+        p = self._player_slot.get(player_id)
+        s = self._stat_slot.get(stat_code)
+        if p is None or s is None:
+            return None
+        v = self.values[s * self._stride + p]
+        return None if v != v else v
+
+    def to_mapping(self) -> Dict[Tuple[Any, str], float]:
+        out: Dict[Tuple[Any, str], float] = {}
+        for stat, s in self._stat_slot.items():
+            base = s * self._stride
+            for pid, p in self._player_slot.items():
+                v = self.values[base + p]
+                if v == v:
+                    out[(pid, stat)] = v
+        return out
+
+
+__all__ = ["PriorIndex"]
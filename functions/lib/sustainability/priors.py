@@ -146,10 +146,53 @@ def compute_league_beta_priors(
     return out
 
 
+def fetch_league_aggregates_multi(db_client, season_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Aggregate rows for several seasons, keyed by season_id.
+
+    Uses a `fetch_league_aggregates_multi(season_ids)` client method when available
+    (one round trip), otherwise one `fetch_league_aggregates` call per season.
+    """
+    out: Dict[int, List[Dict[str, Any]]] = {sid: [] for sid in season_ids}
+    getter = getattr(db_client, "fetch_league_aggregates_multi", None) if db_client is not None else None
+    if callable(getter):
+        for row in getter(list(season_ids)):
+            sid = row.get("season_id")
+            if sid is not None and int(sid) in out:
+                out[int(sid)].append(row)
+        return out
+    for sid in season_ids:
+        out[sid] = list(fetch_league_aggregates(db_client, sid))
+    return out
+
+
+def compute_league_beta_priors_multi(
+    season_ids: Iterable[int],
+    db_client,
+    cfg: SustainabilityConfig,
+    aggregates: Iterable[Dict[str, Any]] | None = None,
+) -> List[LeaguePriorRow]:
+    """League priors for several seasons; `aggregates` rows are split by their season_id."""
+    season_ids = list(dict.fromkeys(season_ids))
+    if aggregates is None:
+        by_season = fetch_league_aggregates_multi(db_client, season_ids)
+    else:
+        by_season = {sid: [] for sid in season_ids}
+        for row in aggregates:
+            sid = row.get("season_id")
+            if sid is not None and int(sid) in by_season:
+                by_season[int(sid)].append(row)
+    out: List[LeaguePriorRow] = []
+    for sid in season_ids:
+        out.extend(compute_league_beta_priors(sid, db_client, cfg, aggregates=by_season[sid]))
+    return out
+
+
 __all__ = [
     "LeaguePriorRow",
     "LEAGUE_PRIOR_METRICS",
     "compute_league_beta_priors",
+    "compute_league_beta_priors_multi",
     "fetch_league_aggregates",
+    "fetch_league_aggregates_multi",
     "upsert_league_priors",
 ]
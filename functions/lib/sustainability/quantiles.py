@@ -0,0 +1,210 @@
+"""Mergeable streaming quantile sketch for distribution snapshots (Task 4.9 follow-up).
+
+`QuantileSketch` lets snapshot thresholds be built without holding every score in
+memory, and lets partial sketches (per shard, per day) be merged.
+
+Modes:
+  * exact  - value -> count map while the number of distinct values stays within
+             `exact_limit`. Barometer scores are 0–100 integers, so in practice
+             snapshots stay exact and quantiles equal `distribution._percentile`.
+  * kll    - once distinct values exceed `exact_limit` the counts convert into a
+             KLL-style compactor stack (level h items carry weight 2**h). Compaction
+             keeps alternating halves of a sorted level (deterministic, no RNG), so
+             results are reproducible run to run.
+
+Quantile rule matches `_percentile`: the item at rank round((n - 1) * p) of the
+sorted (weighted) values. `rank_error_bound()` returns a deterministic bound on
+the normalized rank error: every compaction at level h moves any rank by at
+most 2**h, and those moves are accumulated.
+
+Serialization: `to_dict()` / `from_dict()` produce JSON-safe payloads stored next to
+`DistributionSnapshot.to_dict()`.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SKETCH_VERSION = 1
+DEFAULT_K = 256
+DEFAULT_EXACT_LIMIT = 4096
+
+
+class QuantileSketch:
+    """Exact-then-KLL quantile sketch; mergeable and serializable."""
+
+    def __init__(self, k: int = DEFAULT_K, exact_limit: int = DEFAULT_EXACT_LIMIT):
+        if k < 8:
+            raise ValueError("k must be >= 8")
+        self.k = k
+        self.exact_limit = exact_limit
+        self.n = 0
+        self.counts: Optional[Dict[float, int]] = {}
+        self.levels: List[List[float]] = []
+        self._coin = 0
+        self._rank_error = 0
+
+    @property
+    def is_exact(self) -> bool:
+        return self.counts is not None
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        self.n += 1
+        if self.counts is not None:
+            self.counts[value] = self.counts.get(value, 0) + 1
+            if len(self.counts) > self.exact_limit:
+                self._to_kll()
+            return
+        self.levels[0].append(value)
+        if len(self.levels[0]) > self._capacity(0):
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> "QuantileSketch":
+        for v in values:
+            self.add(v)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold `other` into this sketch (in place) and return self."""
+        self.n += other.n
+        if self.counts is not None and other.counts is not None:
+            for v, c in other.counts.items():
+                self.counts[v] = self.counts.get(v, 0) + c
+            if len(self.counts) > self.exact_limit:
+                self._to_kll()
+            return self
+        if self.counts is not None:
+            self._to_kll()
+        other_levels = other.levels if other.counts is None else _levels_from_counts(other.counts)
+        while len(self.levels) < len(other_levels):
+            self.levels.append([])
+        for h, items in enumerate(other_levels):
+            self.levels[h].extend(items)
+        self._rank_error += other._rank_error
+        self._compress()
+        return self
+
+    def _to_kll(self) -> None:
+        assert self.counts is not None
+        self.levels = _levels_from_counts(self.counts) or [[]]
+        self.counts = None
+        self._compress()
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels)
+        return max(int(self.k * (2.0 / 3.0) ** (depth - 1 - h)), 2)
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                buf = sorted(self.levels[h])
+                keep: List[float] = []
+                if len(buf) % 2:
+                    keep.append(buf.pop())
+                self.levels[h + 1].extend(buf[self._coin::2])
+                self._coin ^= 1
+                self.levels[h] = keep
+                self._rank_error += 1 << h
+            h += 1
+
+    def _weighted_items(self) -> List[Tuple[float, int]]:
+        if self.counts is not None:
+            return sorted(self.counts.items())
+        items = [(v, 1 << h) for h, level in enumerate(self.levels) for v in level]
+        items.sort()
+        return items
+
+    def quantiles(self, probs: Iterable[float]) -> List[float]:
+        probs = list(probs)
+        if self.n == 0:
+            return [0.0 for _ in probs]
+        items = self._weighted_items()
+        out: List[float] = []
+        for p in probs:
+            if p <= 0:
+                out.append(float(items[0][0]))
+                continue
+            if p >= 1:
+                out.append(float(items[-1][0]))
+                continue
+            target = int(round((self.n - 1) * p))
+            cum = 0
+            value = items[-1][0]
+            for v, w in items:
+                cum += w
+                if cum > target:
+                    value = v
+                    break
+            out.append(float(value))
+        return out
+
+    def quantile(self, p: float) -> float:
+        return self.quantiles([p])[0]
+
+    @property
+    def retained(self) -> int:
+        """Number of stored items (distinct values in exact mode)."""
+        if self.counts is not None:
+            return len(self.counts)
+        return sum(len(level) for level in self.levels)
+
+    def rank_error_bound(self) -> float:
+        """Upper bound on |sketch rank - true rank| / n for any query (0.0 when exact)."""
+        if self.counts is not None or self.n == 0:
+            return 0.0
+        return self._rank_error / self.n
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "version": SKETCH_VERSION,
+            "k": self.k,
+            "exact_limit": self.exact_limit,
+            "n": self.n,
+            "rank_error": self._rank_error,
+            "coin": self._coin,
+        }
+        if self.counts is not None:
+            payload["counts"] = [[v, c] for v, c in sorted(self.counts.items())]
+        else:
+            payload["levels"] = [sorted(level) for level in self.levels]
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "QuantileSketch":
+        if payload.get("version") != SKETCH_VERSION:
+            raise ValueError(f"Unsupported sketch version: {payload.get('version')}")
+        sketch = cls(k=int(payload["k"]), exact_limit=int(payload["exact_limit"]))
+        sketch.n = int(payload["n"])
+        sketch._rank_error = int(payload.get("rank_error", 0))
+        sketch._coin = int(payload.get("coin", 0))
+        if "counts" in payload:
+            sketch.counts = {float(v): int(c) for v, c in payload["counts"]}
+        else:
+            sketch.counts = None
+            sketch.levels = [[float(v) for v in level] for level in payload["levels"]]
+        return sketch
+
+
+def _levels_from_counts(counts: Dict[float, int]) -> List[List[float]]:
+    # Binary decomposition keeps weights exact: count c places v at every set bit h of c.
+    levels: List[List[float]] = []
+    for v, c in sorted(counts.items()):
+        h = 0
+        while c:
+            if c & 1:
+                while len(levels) <= h:
+                    levels.append([])
+                levels[h].append(v)
+            c >>= 1
+            h += 1
+    return levels
+
+
+__all__ = [
+    "QuantileSketch",
+    "DEFAULT_K",
+    "DEFAULT_EXACT_LIMIT",
+]
@@ -18,6 +18,8 @@ from __future__ import annotations
 from math import sqrt
 from typing import Iterable, Dict, Any, List
 
+from .frame import WindowFrame
+
 RELIABILITY_METRICS = {
     "sh_pct": "shots",          # trials denominator
     "oish_pct": "onice_shots_for",
@@ -62,4 +64,28 @@ def compute_reliability(
     return out
 
 
-__all__ = ["compute_reliability", "RELIABILITY_METRICS"]
+def reliability_factor(trials_val: Any, k_val: float) -> float:
+    """r for one trials count (None / negative counts read as 0)."""
+    if trials_val is None or trials_val < 0:
+        trials_val = 0
+    if k_val <= 0:
+        return 1.0 if trials_val > 0 else 0.0
+    return sqrt(trials_val / (trials_val + k_val)) if (trials_val + k_val) > 0 else 0.0
+
+
+def compute_reliability_frame(
+    frame: WindowFrame,
+    k_r: Dict[str, int | float],
+    metrics: Iterable[str] | None = None,
+) -> WindowFrame:
+    """Column variant of `compute_reliability`; adds r_<metric> columns in place."""
+    if metrics is None:
+        metrics = RELIABILITY_METRICS.keys()
+    metrics = [m for m in metrics if m in RELIABILITY_METRICS]
+    for metric in metrics:
+        k_val = float(k_r.get(metric, 0))
+        frame.set_column(f"r_{metric}", [reliability_factor(t, k_val) for t in frame.get(RELIABILITY_METRICS[metric])])
+    return frame
+
+
+__all__ = ["compute_reliability", "compute_reliability_frame", "reliability_factor", "RELIABILITY_METRICS"]
@@ -0,0 +1,415 @@
+"""Local retro recompute queue and batched worker (Task 5.6).
+
+A config change (or a stats correction) used to mean one rescoring run per request.
+This module keeps the requests in a local SQLite job table and drains them in
+coalesced batches:
+
+  * `RetroJobStore.enqueue(reason, season_id, player_id=None)` records one request;
+    an identical pending request (same season and player) is not inserted twice.
+    `enqueue_retro_task` has the signature of the orchestrator's DB hook.
+  * `claim_batches` collapses every pending job of a season into one batch: if any
+    job covers the whole season (player_id NULL, e.g. `config_change`) the batch is
+    a full-season rebuild, otherwise it rescores the union of the requested players.
+  * `RetroWorker.run_once` resolves config / SD constants / priors per season in the
+    parent, then runs the batches inline or across a process pool. Each batch
+    records progress checkpoints (loading → scoring → writing → done) in the store
+    and writes its scored rows with `columnar_export` under `output_dir` as
+    Arrow IPC.
+  * Player batches are tiered against the snapshot of the season's latest full
+    rebuild (provisional when there is none), so a correction does not shift the
+    season's thresholds.
+  * Each claimed batch records its worker (`owner`) and a heartbeat that every
+    checkpoint refreshes. `recover()` (run at the start of `run_once`) only returns
+    batches whose heartbeat is older than `stale_after_sec` to the queue, so
+    workers sharing one store never re-run each other's live batches. A batch
+    recovered while its worker was merely slow is not overwritten by that
+    worker's late `complete()`. Jobs that fail `max_attempts` times stay "failed".
+
+Like the incremental state file this is local offline working state; the DB-backed
+retro queue remains fail-closed.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .columnar_export import DEFAULT_EXPORT_FORMAT, EXPORT_SUFFIXES, export_scored_columns
+from .config_loader import SustainabilityConfig, load_config
+from .distribution import DistributionSnapshot, assign_quintiles_frame, build_distribution_sketch_frame, build_distribution_snapshot_from_sketch
+from .pipeline import _resolve_inputs, score_window_frame
+from .prior_cache import PriorCache
+from .windows import build_window_frame
+
+JOB_STATUSES = ("pending", "running", "done", "failed")
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_STALE_AFTER_SEC = 1800.0  # no checkpoint for this long = the claiming worker is gone
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS retro_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    reason TEXT NOT NULL,
+    season_id INTEGER NOT NULL,
+    player_id INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    batch_id INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS retro_jobs_status ON retro_jobs (status, season_id);
+CREATE TABLE IF NOT EXISTS retro_batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    season_id INTEGER NOT NULL,
+    player_ids TEXT,
+    reasons TEXT NOT NULL,
+    jobs INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+"""
+# Columns added after the first release; stores created earlier get them on open
+_BATCH_COLUMNS = {"owner": "TEXT", "heartbeat_at": "REAL"}
+
+
+class RetroJobStore:
+    """SQLite-backed retro job table; safe to open from several processes.
+
+    Claimed batches record their owner and a heartbeat (refreshed by every
+    checkpoint), so `recover` only re-queues batches whose worker went quiet.
+    """
+
+    def __init__(self, path: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            have = {r["name"] for r in conn.execute("PRAGMA table_info(retro_batches)")}
+            for name, sql_type in _BATCH_COLUMNS.items():
+                if name not in have:
+                    conn.execute(f"ALTER TABLE retro_batches ADD COLUMN {name} {sql_type}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(self, reason: str, season_id: int, player_id: int | None = None) -> int:
+        """Add a pending job (or return the id of an identical pending one)."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM retro_jobs WHERE status = 'pending' AND season_id = ? AND player_id IS ?",
+                (season_id, player_id),
+            ).fetchone()
+            if row is not None:
+                return int(row["id"])
+            cur = conn.execute(
+                "INSERT INTO retro_jobs (reason, season_id, player_id, enqueued_at) VALUES (?, ?, ?, ?)",
+                (reason, season_id, player_id, time.time()),
+            )
+            return int(cur.lastrowid)
+
+    def enqueue_retro_task(self, reason: str, player_id: int | None = None, season_id: int | None = None) -> int:
+        """Orchestrator hook signature (`db_client.enqueue_retro_task`)."""
+        if season_id is None:
+            raise ValueError("season_id required for a local retro job")
+        return self.enqueue(reason, season_id, player_id=player_id)
+
+    def claim_batches(self, season_ids: Iterable[int] | None = None, owner: str | None = None) -> List[Dict[str, Any]]:
+        """Coalesce pending jobs into one running batch per season, owned by `owner`; returns the batches."""
+        wanted = set(season_ids) if season_ids is not None else None
+        batches: List[Dict[str, Any]] = []
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, reason, season_id, player_id FROM retro_jobs WHERE status = 'pending' ORDER BY id"
+            ).fetchall()
+            by_season: Dict[int, List[sqlite3.Row]] = {}
+            for r in rows:
+                if wanted is None or r["season_id"] in wanted:
+                    by_season.setdefault(int(r["season_id"]), []).append(r)
+            for season_id, jobs in by_season.items():
+                full = any(j["player_id"] is None for j in jobs)
+                player_ids = None if full else sorted({int(j["player_id"]) for j in jobs})
+                reasons = sorted({j["reason"] for j in jobs})
+                now = time.time()
+                cur = conn.execute(
+                    "INSERT INTO retro_batches (season_id, player_ids, reasons, jobs, status, created_at, owner, heartbeat_at) "
+                    "VALUES (?, ?, ?, ?, 'running', ?, ?, ?)",
+                    (season_id, json.dumps(player_ids), json.dumps(reasons), len(jobs), now, owner, now),
+                )
+                batch_id = int(cur.lastrowid)
+                conn.executemany(
+                    "UPDATE retro_jobs SET status = 'running', batch_id = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(batch_id, j["id"]) for j in jobs],
+                )
+                batches.append({
+                    "id": batch_id,
+                    "season_id": season_id,
+                    "player_ids": player_ids,
+                    "reasons": reasons,
+                    "jobs": len(jobs),
+                    "owner": owner,
+                })
+        return batches
+
+    def checkpoint(self, batch_id: int, stage: str, **info: Any) -> None:
+        """Record progress; also the batch's heartbeat."""
+        now = time.time()
+        progress = {"stage": stage, "at": now, **info}
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE retro_batches SET progress = ?, heartbeat_at = ? WHERE id = ?",
+                (json.dumps(progress), now, batch_id),
+            )
+
+    def complete(self, batch_id: int, result: Dict[str, Any]) -> bool:
+        """Mark a running batch done; False if it was recovered meanwhile (result dropped)."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE retro_batches SET status = 'done', result = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                (json.dumps(result), time.time(), batch_id),
+            )
+            if cur.rowcount == 0:
+                return False
+            conn.execute("UPDATE retro_jobs SET status = 'done' WHERE batch_id = ?", (batch_id,))
+        return True
+
+    def fail(self, batch_id: int, error: str) -> bool:
+        """Mark a running batch failed; its jobs go back to pending until `max_attempts`."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE retro_batches SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                (error, time.time(), batch_id),
+            )
+            if cur.rowcount == 0:
+                return False
+            conn.execute(
+                "UPDATE retro_jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, batch_id = NULL WHERE batch_id = ?",
+                (self.max_attempts, error, batch_id),
+            )
+        return True
+
+    def recover(self, stale_after_sec: float = DEFAULT_STALE_AFTER_SEC, owner: str | None = None) -> int:
+        """Fail running batches with no heartbeat for `stale_after_sec` (their worker is gone).
+
+        Batches owned by `owner` (the caller) are left alone. Returns how many were recovered.
+        """
+        cutoff = time.time() - stale_after_sec
+        with self._connect() as conn:
+            ids = [
+                int(r["id"])
+                for r in conn.execute(
+                    "SELECT id FROM retro_batches WHERE status = 'running' "
+                    "AND COALESCE(heartbeat_at, created_at) <= ? AND owner IS NOT ?",
+                    (cutoff, owner),
+                )
+            ]
+        return sum(1 for batch_id in ids if self.fail(batch_id, "worker interrupted"))
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM retro_jobs GROUP BY status").fetchall()
+        out = {s: 0 for s in JOB_STATUSES}
+        out.update({r["status"]: int(r["n"]) for r in rows})
+        return out
+
+    def jobs(self, status: str | None = None) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM retro_jobs" + (" WHERE status = ?" if status else "") + " ORDER BY id"
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(query, (status,) if status else ())]
+
+    def batches(self, status: str | None = None) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM retro_batches" + (" WHERE status = ?" if status else "") + " ORDER BY id"
+        with self._connect() as conn:
+            out = []
+            for r in conn.execute(query, (status,) if status else ()):
+                row = dict(r)
+                for key in ("player_ids", "reasons", "progress", "result"):
+                    row[key] = json.loads(row[key]) if row[key] is not None else None
+                out.append(row)
+            return out
+
+    def latest_season_snapshot(self, season_id: int) -> Optional[Dict[str, Any]]:
+        """Snapshot of the newest completed full-season batch for `season_id`."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result FROM retro_batches WHERE season_id = ? AND status = 'done' AND player_ids = 'null' "
+                "ORDER BY id DESC LIMIT 1",
+                (season_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row["result"]).get("snapshot")
+
+
+def _run_batch(payload: tuple) -> Dict[str, Any]:
+    """Score one claimed batch and write its rows; runs inline or in a pool worker."""
+    store_path, batch, games, cfg, sd_constants, prior_index, output_dir, season_snapshot = payload
+    store = RetroJobStore(store_path)
+    batch_id = batch["id"]
+    t0 = time.time()
+    store.checkpoint(batch_id, "scoring", games=len(games))
+    frame = build_window_frame(games, freshness_days=cfg.freshness_days)
+    score_window_frame(frame, cfg, sd_constants, prior_index)
+    if batch["player_ids"] is None:
+        sketch = build_distribution_sketch_frame(frame, window_type="GAME")
+        snapshot = build_distribution_snapshot_from_sketch(
+            sketch, window_type="GAME", model_version=cfg.model_version, config_hash=cfg.config_hash
+        )
+    else:
+        snapshot = DistributionSnapshot(**season_snapshot) if season_snapshot else None
+    assign_quintiles_frame(frame, snapshot, window_filter="GAME")
+    store.checkpoint(batch_id, "writing", rows=len(frame))
+    suffix = EXPORT_SUFFIXES[DEFAULT_EXPORT_FORMAT]
+    path = os.path.join(output_dir, f"retro_{batch['season_id']}_{batch_id}{suffix}")
+    export_scored_columns(frame, path, meta={"batch_id": batch_id, "season_id": batch["season_id"], "config_hash": cfg.config_hash})
+    return {
+        "path": path,
+        "rows": len(frame),
+        "games": len(games),
+        "snapshot": snapshot.to_dict() if snapshot else None,
+        "duration_ms": int((time.time() - t0) * 1000),
+    }
+
+
+class RetroWorker:
+    """Drains a RetroJobStore: one coalesced batch per season, inline or in a process pool.
+
+    `load_games(season_id)` returns that season's game rows (e.g. `streaming.read_game_rows`
+    over a season file); partial batches keep only the requested players' games.
+    """
+
+    def __init__(
+        self,
+        store: RetroJobStore,
+        load_games: Callable[[int], Iterable[Dict[str, Any]]],
+        output_dir: str,
+        cfg: SustainabilityConfig | None = None,
+        db_client=None,
+        workers: int = 1,
+        prior_cache: PriorCache | None = None,
+        league_priors: List[Dict[str, Any]] | None = None,
+        player_priors_rows: List[Dict[str, Any]] | None = None,
+        stale_after_sec: float = DEFAULT_STALE_AFTER_SEC,
+    ):
+        self.store = store
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stale_after_sec = stale_after_sec
+        self.load_games = load_games
+        self.output_dir = output_dir
+        self.cfg = cfg
+        self.db_client = db_client
+        self.workers = workers
+        self.prior_cache = prior_cache
+        self.league_priors = league_priors
+        self.player_priors_rows = player_priors_rows
+
+    def _payload(self, batch: Dict[str, Any], cfg: SustainabilityConfig) -> tuple:
+        season_id = batch["season_id"]
+        self.store.checkpoint(batch["id"], "loading")
+        games = self.load_games(season_id)
+        if batch["player_ids"] is not None:
+            wanted = set(batch["player_ids"])
+            games = [g for g in games if g.get("player_id") is not None and int(g["player_id"]) in wanted]
+        games = games if isinstance(games, list) else list(games)
+        pre = _resolve_inputs(
+            season_id,
+            self.db_client,
+            cfg,
+            league_priors=self.league_priors,
+            player_priors_rows=self.player_priors_rows,
+            prior_cache=self.prior_cache,
+        )
+        snapshot = self.store.latest_season_snapshot(season_id) if batch["player_ids"] is not None else None
+        return (self.store.path, batch, games, cfg, pre["sd_constants"], pre["prior_index"], self.output_dir, snapshot)
+
+    def run_once(self, season_ids: Iterable[int] | None = None) -> Dict[str, Any]:
+        """Claim and run every pending batch (optionally only `season_ids`); returns a summary."""
+        t0 = time.time()
+        recovered = self.store.recover(self.stale_after_sec, owner=self.owner)
+        batches = self.store.claim_batches(season_ids, owner=self.owner)
+        if not batches:
+            return {"batches": [], "recovered": recovered, "counts": self.store.counts(), "duration_ms": 0}
+        os.makedirs(self.output_dir, exist_ok=True)
+        cfg = self.cfg if self.cfg is not None else load_config(db_client=self.db_client)
+        results: List[Dict[str, Any]] = []
+
+        def failed(batch: Dict[str, Any], exc: Exception) -> None:
+            self.store.fail(batch["id"], f"{type(exc).__name__}: {exc}")
+            results.append({**batch, "status": "failed", "error": str(exc)})
+
+        def record(batch: Dict[str, Any], run: Callable[[], Dict[str, Any]]) -> None:
+            try:
+                result = run()
+            except Exception as exc:
+                failed(batch, exc)
+                return
+            if not self.store.complete(batch["id"], result):
+                # Recovered as stale while running; its jobs were re-queued for another run
+                results.append({**batch, "status": "lost", **result})
+                return
+            self.store.checkpoint(batch["id"], "done", rows=result["rows"])
+            results.append({**batch, "status": "done", **result})
+
+        # Full-season rebuilds run first: player batches tier against their snapshots
+        full = [b for b in batches if b["player_ids"] is None]
+        partial = [b for b in batches if b["player_ids"] is not None]
+        if self.workers > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for group in (full, partial):
+                    futures = []
+                    for batch in group:
+                        try:
+                            payload = self._payload(batch, cfg)
+                        except Exception as exc:
+                            failed(batch, exc)
+                            continue
+                        futures.append((batch, pool.submit(_run_batch, payload)))
+                    for batch, fut in futures:
+                        record(batch, fut.result)
+        else:
+            for batch in full + partial:
+                record(batch, lambda batch=batch: _run_batch(self._payload(batch, cfg)))
+        return {
+            "batches": results,
+            "recovered": recovered,
+            "counts": self.store.counts(),
+            "duration_ms": int((time.time() - t0) * 1000),
+        }
+
+
+__all__ = [
+    "RetroJobStore",
+    "RetroWorker",
+]
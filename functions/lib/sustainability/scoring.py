@@ -3,7 +3,8 @@
 Takes rows with contribution totals and produces:
   * score_raw: probability-like value in (0,1) after guardrails
   * score: 0–100 integer scaled from score_raw
-  * components_json: per-metric diagnostic payload (optional builder)
+  * components_json: per-metric diagnostic payload (optional builder; the pipeline
+    uses the lazy `ComponentsView` in components.py)
 
 Formula:
     p = 1 / (1 + exp(-contrib_total))
@@ -18,6 +19,7 @@ from math import exp
 from typing import Iterable, Dict, Any, List, Iterable
 from .reliability import RELIABILITY_METRICS as _REL_MAP
 from .finishing import FINISHING_METRICS, FINISHING_COUNT_METRIC, FINISHING_RATE_METRIC
+from .frame import WindowFrame
 
 
 def logistic(x: float) -> float:
@@ -33,6 +35,30 @@ def logistic(x: float) -> float:
         return 0.0 if x < 0 else 1.0
 
 
+def _guardrail_span(guardrails: Dict[str, float]) -> tuple[float, float]:
+    lower = float(guardrails.get("lower_raw", 0.01))
+    upper = float(guardrails.get("upper_raw", 0.99))
+    if not (0 < lower < upper < 1):  # safety fallback
+        lower, upper = 0.01, 0.99
+    return lower, upper - lower
+
+
+def _score_contrib(contrib: Any, lower: float, span: float, scale: int) -> tuple[float | None, int | None]:
+    if contrib is None:
+        return None, None
+    p_g = lower + span * logistic(float(contrib))
+    if p_g < 0:
+        p_g = 0.0
+    elif p_g > 1:
+        p_g = 1.0
+    score = int(round(scale * p_g))
+    if score < 0:
+        score = 0
+    elif score > scale:
+        score = scale
+    return p_g, score
+
+
 def apply_logistic_scoring(
     rows: Iterable[Dict[str, Any]],
     guardrails: Dict[str, float],
@@ -41,11 +67,7 @@ def apply_logistic_scoring(
     score_raw_field: str = "score_raw",
     score_field: str = "score",
 ) -> List[Dict[str, Any]]:
-    lower = float(guardrails.get("lower_raw", 0.01))
-    upper = float(guardrails.get("upper_raw", 0.99))
-    if not (0 < lower < upper < 1):  # safety fallback
-        lower, upper = 0.01, 0.99
-    span = upper - lower
+    lower, span = _guardrail_span(guardrails)
     out: List[Dict[str, Any]] = []
     for r in rows:
         new_r = r.copy()
@@ -71,6 +93,15 @@ def apply_logistic_scoring(
     return out
 
 
+def _trials_map() -> Dict[str, str]:
+    # Trials (n) mapping for rate metrics
+    trials_map = dict(_REL_MAP)
+    # Finishing residuals special handling
+    trials_map[FINISHING_RATE_METRIC] = "shots"
+    trials_map[FINISHING_COUNT_METRIC] = "shots"  # treat shots as exposure context
+    return trials_map
+
+
 def build_components_json(
     row: Dict[str, Any],
     metrics: Iterable[str],
@@ -79,11 +110,7 @@ def build_components_json(
     extreme_threshold: float = 4.0,
 ) -> Dict[str, Any]:
     comp: Dict[str, Any] = {}
-    # Trials (n) mapping for rate metrics
-    trials_map = dict(_REL_MAP)
-    # Finishing residuals special handling
-    trials_map[FINISHING_RATE_METRIC] = "shots"
-    trials_map[FINISHING_COUNT_METRIC] = "shots"  # treat shots as exposure context
+    trials_map = _trials_map()
     for m in metrics:
         z = row.get(f"z_{m}")
         zc = row.get(f"zc_{m}")
@@ -135,8 +162,78 @@ def attach_components_json(
     return out
 
 
+def apply_logistic_scoring_frame(
+    frame: WindowFrame,
+    guardrails: Dict[str, float],
+    scale: int = 100,
+    contrib_field: str = "contrib_total",
+    score_raw_field: str = "score_raw",
+    score_field: str = "score",
+) -> WindowFrame:
+    """Column variant of `apply_logistic_scoring`; adds score columns in place."""
+    lower, span = _guardrail_span(guardrails)
+    pairs = [_score_contrib(c, lower, span, scale) for c in frame.get(contrib_field)]
+    frame.set_column(score_raw_field, [p for p, _ in pairs])
+    frame.set_column(score_field, [s for _, s in pairs])
+    return frame
+
+
+def attach_components_json_frame(
+    frame: WindowFrame,
+    metrics: Iterable[str],
+    weights: Dict[str, float],
+    field_name: str = "components_json",
+    include_missing: bool = False,
+    extreme_threshold: float = 4.0,
+) -> WindowFrame:
+    """Column variant of `attach_components_json` (same payload per row)."""
+    trials_map = _trials_map()
+    n_rows = len(frame)
+    none_col = [None] * n_rows
+    per_metric = []
+    for m in metrics:
+        trials_field = trials_map.get(m)
+        per_metric.append((
+            m,
+            weights.get(m),
+            frame.get(f"z_{m}"),
+            frame.get(f"zc_{m}"),
+            frame.get(f"r_{m}"),
+            frame.get(f"contrib_{m}"),
+            frame.get(m),
+            frame.get(f"exp_{m}"),
+            frame.get(trials_field) if trials_field else none_col,
+        ))
+    rookies = frame.get("rookie_status")
+    out: List[Dict[str, Any]] = []
+    for i in range(n_rows):
+        comp: Dict[str, Any] = {}
+        rookie = rookies[i]
+        for m, weight, zs, zcs, rs, contribs, obs, exps, ns in per_metric:
+            z, zc, r_val, contrib, obs_val = zs[i], zcs[i], rs[i], contribs[i], obs[i]
+            if not include_missing and contrib is None and r_val is None and z is None and zc is None and obs_val is None:
+                continue
+            comp[m] = {
+                "weight": weight,
+                "z": z,
+                "zc": zc,
+                "r": r_val,
+                "contrib": contrib,
+                "obs": obs_val,
+                "exp": exps[i],
+                "n": ns[i],
+                "extreme": bool(z is not None and abs(float(z)) >= extreme_threshold),
+                "rookie": rookie,
+            }
+        out.append(comp)
+    frame.set_column(field_name, out)
+    return frame
+
+
 __all__ = [
     "apply_logistic_scoring",
     "build_components_json",
     "attach_components_json",
+    "apply_logistic_scoring_frame",
+    "attach_components_json_frame",
 ]
@@ -0,0 +1,74 @@
+"""Player sharding helpers for parallel window scoring.
+
+Players are independent until the distribution snapshot, so the per-row
+stages (windows → z-scores → reliability → clipping → contributions → logistic
+scoring → components) can run per shard. These helpers:
+
+  * partition games by a stable hash of player_id (`shard_of`), keeping each
+    player's games together and preserving first-seen player order per shard;
+  * merge shard column maps back into the exact row order a serial run emits,
+    so results do not depend on the worker count.
+
+Shard workers themselves live in pipeline.py (`_score_shard`).
+"""
+from __future__ import annotations
+
+import zlib
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .frame import WindowFrame
+from .windows import WINDOW_TYPES, _group_by_player
+
+
+def shard_of(player_id: int, shards: int) -> int:
+    # crc32 rather than hash(): stable across interpreters and PYTHONHASHSEED.
+    return zlib.crc32(str(int(player_id)).encode("ascii")) % shards
+
+
+def partition_games(
+    games: Iterable[Dict[str, Any]],
+    shards: int,
+) -> Tuple[List[List[Dict[str, Any]]], List[Tuple[int, int]]]:
+    """Split games into `shards` lists.
+
+    Returns (shard_games, layout) where layout lists (shard, n_window_rows) per
+    player in global first-seen order, which is what `merge_shard_columns` needs.
+    """
+    shard_games: List[List[Dict[str, Any]]] = [[] for _ in range(shards)]
+    layout: List[Tuple[int, int]] = []
+    for pid, player_games in _group_by_player(games).items():
+        s = shard_of(pid, shards)
+        shard_games[s].extend(player_games)
+        layout.append((s, len(player_games) * len(WINDOW_TYPES)))
+    return shard_games, layout
+
+
+def merge_shard_columns(
+    shard_columns: List[Dict[str, List[Any]] | None],
+    layout: List[Tuple[int, int]],
+) -> WindowFrame:
+    """Interleave per-shard columns back into serial (global player) order."""
+    names: List[str] = []
+    for cols in shard_columns:
+        if cols:
+            names = list(cols.keys())
+            break
+    offsets = [0] * len(shard_columns)
+    spans: List[Tuple[int, int, int]] = []
+    for s, n_rows in layout:
+        spans.append((s, offsets[s], offsets[s] + n_rows))
+        offsets[s] += n_rows
+    merged: Dict[str, List[Any]] = {}
+    for name in names:
+        out: List[Any] = []
+        for s, lo, hi in spans:
+            out.extend(shard_columns[s][name][lo:hi])
+        merged[name] = out
+    return WindowFrame.from_columns(merged)
+
+
+__all__ = [
+    "shard_of",
+    "partition_games",
+    "merge_shard_columns",
+]
@@ -0,0 +1,282 @@
+"""Out-of-core scoring over player-sorted game files (Task 4.x follow-up).
+
+`run_full_scoring_pipeline` holds every game, window and scored row in one frame,
+which is fine for a season but not for multi-season historical recomputes.
+`run_streaming_scoring` reads games lazily from a local file and processes one
+player at a time:
+
+  1. Config, SD constants and priors are resolved once (`pipeline._resolve_inputs`,
+     including the optional PriorCache).
+  2. Games are read row by row (JSONL, gzip'd JSONL, or Parquet when pyarrow is
+     installed) and grouped into consecutive runs of one player_id. Input must be
+     sorted (or at least grouped) by player; a player appearing again after another
+     player raises `StreamOrderError`.
+  3. Each player's games go through windows and `score_window_frame`; the scored
+     rows are appended to the output JSONL and their scores folded into the
+     snapshot QuantileSketch (plus grouped sketches when requested). The frame is
+     then dropped.
+  4. With `assign_tiers`, a second streaming pass reads the scored rows back in
+     batches and tiers them against the final snapshot(s).
+
+Peak memory is therefore bounded by the largest single player history (plus one
+tiering batch and the sketches), not by the input size. Output is written to a
+temporary file and renamed into place once complete, so a failed run never leaves
+a truncated file at `output_path`.
+
+Rows, snapshot and tiers equal `run_full_scoring_pipeline` on the same games; dates
+are written as ISO strings.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from datetime import date
+from itertools import groupby, islice
+from typing import Any, Dict, IO, Iterable, Iterator, List, Tuple
+
+from .config_loader import SustainabilityConfig
+from .distribution import (
+    GroupKey,
+    assign_quintiles_frame,
+    assign_quintiles_grouped_frame,
+    build_distribution_sketch_frame,
+    build_distribution_snapshot_from_sketch,
+    build_grouped_sketches_frame,
+    build_grouped_snapshots,
+    merge_group_sketches,
+)
+from .frame import WindowFrame
+from .pipeline import KERNELS, _resolve_inputs, score_window_frame
+from .prior_cache import PriorCache
+from .prior_index import PriorIndex
+from .priors import LeaguePriorRow
+from .profiling import StageProfiler, resolve_profiler
+from .quantiles import QuantileSketch
+from .windows import build_window_frame
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+DEFAULT_BATCH_SIZE = 4096
+
+
+class StreamOrderError(ValueError):
+    """Raised when a player's games are not contiguous in the input stream."""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _open_text(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with _open_text(path, "r") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _iter_parquet(path: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover (pyarrow is optional)
+        raise ImportError("reading Parquet game files requires pyarrow") from exc
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def read_game_rows(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """Lazily yield game rows from a JSONL (optionally .gz) or Parquet file."""
+    if path.endswith(PARQUET_SUFFIXES):
+        return _iter_parquet(path, batch_size)
+    return _iter_jsonl(path)
+
+
+def iter_player_games(rows: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Group consecutive rows by player_id; rows without a player_id are skipped.
+
+    Only one player's games are held at a time. Raises StreamOrderError when a
+    player_id reappears after another player's run.
+    """
+    seen: set[int] = set()
+    keyed = ((g.get("player_id"), g) for g in rows)
+    for pid, run in groupby((kg for kg in keyed if kg[0] is not None), key=lambda kg: int(kg[0])):
+        if pid in seen:
+            raise StreamOrderError(f"games for player {pid} are not contiguous; sort the input by player_id")
+        seen.add(pid)
+        yield pid, [g for _, g in run]
+
+
+def _write_rows(fh: IO[str], rows: Iterable[Dict[str, Any]]) -> int:
+    n = 0
+    for row in rows:
+        fh.write(json.dumps(row, default=_json_default, separators=(",", ":")))
+        fh.write("\n")
+        n += 1
+    return n
+
+
+def _tier_file(
+    src: str,
+    dst: str,
+    snapshot,
+    grouped,
+    snapshot_window_type: str,
+    tier_by_group: bool,
+    by_position: bool,
+    by_season: bool,
+    batch_size: int,
+) -> int:
+    n = 0
+    with _open_text(src, "r") as fin, _open_text(dst, "w") as fout:
+        rows = (json.loads(line) for line in fin if line.strip())
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            frame = WindowFrame.from_rows(batch)
+            if tier_by_group and grouped is not None:
+                assign_quintiles_grouped_frame(frame, grouped, by_position=by_position, by_season=by_season)
+            else:
+                assign_quintiles_frame(frame, snapshot, window_filter=snapshot_window_type)
+            n += _write_rows(fout, frame.to_rows())
+    return n
+
+
+def run_streaming_scoring(
+    season_id: int,
+    input_path: str | None,
+    output_path: str,
+    db_client=None,
+    cfg: SustainabilityConfig | None = None,
+    league_priors: List[LeaguePriorRow] | None = None,
+    player_priors_rows: List[Dict[str, Any]] | PriorIndex | None = None,
+    metrics: Iterable[str] | None = None,
+    include_components: bool = True,
+    build_snapshot: bool = True,
+    assign_tiers: bool = True,
+    snapshot_window_type: str = "GAME",
+    kernel: str = "staged",
+    profiler: StageProfiler | None = None,
+    prior_cache: PriorCache | None = None,
+    grouped_snapshots: bool = False,
+    snapshot_by_position: bool = True,
+    snapshot_by_season: bool = False,
+    tier_by_group: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    games: Iterable[Dict[str, Any]] | None = None,
+) -> Dict[str, Any]:
+    """Score `input_path` one player at a time and write scored rows to `output_path` (JSONL).
+
+    Parameters mirror `run_full_scoring_pipeline`; `games` may replace the file read
+    with any (player-grouped) iterable, e.g. a database cursor. Tiering needs the
+    final snapshot, so `assign_tiers` costs one more sequential pass over the output.
+
+    Returns dict with keys:
+      cfg, prior_index, sd_constants, output_path, players, games_read, rows_written,
+      max_player_games, snapshot / snapshot_sketch, snapshots (grouped, or None)
+    """
+    if kernel not in KERNELS:
+        raise ValueError(f"Unknown scoring kernel: {kernel}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    if input_path is None and games is None:
+        raise ValueError("input_path or games is required")
+    prof = resolve_profiler(profiler)
+    pre = _resolve_inputs(
+        season_id, db_client, cfg, league_priors, player_priors_rows, profiler=profiler, prior_cache=prior_cache
+    )
+    cfg = pre["cfg"]
+    metrics = list(metrics) if metrics is not None else None
+    source = games if games is not None else read_game_rows(input_path, batch_size=batch_size)
+
+    sketch = QuantileSketch()
+    group_sketches: Dict[GroupKey, QuantileSketch] = {}
+    players = games_read = rows_written = max_player_games = 0
+    # Temp files keep the output's .gz suffix so `_open_text` compresses them too
+    gz = ".gz" if output_path.endswith(".gz") else ""
+    scored_path = f"{output_path}.scored.tmp{gz}"
+    tiered_path = f"{output_path}.tiered.tmp{gz}"
+    try:
+        with prof.stage("stream_score") as st:
+            with _open_text(scored_path, "w") as fout:
+                for _, player_games in iter_player_games(source):
+                    frame = build_window_frame(player_games, freshness_days=cfg.freshness_days)
+                    score_window_frame(
+                        frame, cfg, pre["sd_constants"], pre["prior_index"], metrics=metrics,
+                        include_components=include_components, kernel=kernel,
+                    )
+                    if build_snapshot and grouped_snapshots:
+                        build_grouped_sketches_frame(
+                            frame, by_position=snapshot_by_position, by_season=snapshot_by_season,
+                            sketches=group_sketches,
+                        )
+                    elif build_snapshot:
+                        build_distribution_sketch_frame(frame, window_type=snapshot_window_type, sketch=sketch)
+                    rows_written += _write_rows(fout, frame.to_rows())
+                    players += 1
+                    games_read += len(player_games)
+                    max_player_games = max(max_player_games, len(player_games))
+            st.rows_in = games_read
+            st.rows_out = rows_written
+
+        snapshot = None
+        grouped = None
+        if build_snapshot:
+            with prof.stage("snapshot") as st:
+                if grouped_snapshots:
+                    grouped = build_grouped_snapshots(group_sketches, model_version=cfg.model_version, config_hash=cfg.config_hash)
+                    sketch = merge_group_sketches(group_sketches, snapshot_window_type)
+                snapshot = build_distribution_snapshot_from_sketch(
+                    sketch, window_type=snapshot_window_type, model_version=cfg.model_version, config_hash=cfg.config_hash
+                )
+                st.rows_out = sketch.n
+
+        if assign_tiers:
+            with prof.stage("tiers", rows_in=rows_written) as st:
+                st.rows_out = _tier_file(
+                    scored_path, tiered_path, snapshot, grouped, snapshot_window_type, tier_by_group,
+                    snapshot_by_position, snapshot_by_season, batch_size,
+                )
+            os.replace(tiered_path, output_path)
+        else:
+            os.replace(scored_path, output_path)
+    finally:
+        # The scored file is an intermediate once tiers are written; drop leftovers on failure too
+        for tmp in (scored_path, tiered_path):
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    return {
+        "cfg": cfg,
+        "prior_index": pre["prior_index"],
+        "sd_constants": pre["sd_constants"],
+        "output_path": output_path,
+        "players": players,
+        "games_read": games_read,
+        "rows_written": rows_written,
+        "max_player_games": max_player_games,
+        "snapshot": snapshot.to_dict() if snapshot else None,
+        "snapshot_sketch": sketch.to_dict() if snapshot else None,
+        "snapshots": [snap.to_dict() for snap in grouped.values()] if grouped is not None else None,
+    }
+
+
+def read_scored_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily yield scored rows written by `run_streaming_scoring`."""
+    return _iter_jsonl(path)
+
+
+__all__ = [
+    "StreamOrderError",
+    "iter_player_games",
+    "read_game_rows",
+    "read_scored_rows",
+    "run_streaming_scoring",
+]
@@ -0,0 +1,366 @@
+"""Weight / constant sweep over one season's z-scores (calibration support).
+
+Calibrating `weights_json`, `c` and `k_r` by calling `run_full_scoring_pipeline`
+once per candidate rebuilds windows, priors and z-scores every time, although only
+clipping, reliability, contributions and the logistic map depend on those values.
+
+  * `prepare_sweep` runs the config-independent stages once (config-dependent
+    inputs come from the base config: priors, SD constants, windows, z-scores,
+    finishing residuals) and keeps, for the snapshot window type only, the z
+    columns, reliability trials counts and fixed r columns in a `SweepBase`.
+  * `evaluate_configs` scores every variant against that base. The rows × metrics
+    z-source block is clipped once per distinct `c`, r once per distinct
+    (metric, k_r), and each config's contrib_total is the weighted sum of its
+    metric columns (one C-level `map` pass per metric, i.e. the metrics × configs
+    weight matrix is applied column by column; numpy is not available in this
+    tree, so there is no BLAS matmul). Scores, snapshot thresholds and
+    tiers then follow the pipeline's rules.
+  * Per config the result holds the snapshot thresholds, tier counts and tier
+    stability versus a reference config (the base config unless given):
+    agreement rate, mean absolute tier shift and share of rows moving 2+ tiers.
+
+Scores equal the staged pipeline's for the same config: the same float operations
+in the same order ((w * r) * z_source, summed in scoring-metric order).
+
+Limits: variants may change weights, `c`, `k_r` and guardrails. Changing
+freshness_days, sd_mode or use_finishing_residuals changes the cached stages and
+raises ValueError. League priors use k_r as their prior strength; the sweep keeps
+the base config's priors and z-scores, so a k_r variant changes reliability only.
+"""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, replace
+from itertools import product, repeat
+from math import exp, tanh
+from collections import Counter
+from operator import add, mul, neg, sub, truediv
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from .config_loader import SustainabilityConfig, build_config_hash_payload, compute_hash
+from .distribution import PERCENT_CUTS, _percentile, DistributionSnapshot, tier_scores
+from .finishing import finishing_residual_columns
+from .pipeline import _run_pre_scoring_frame, _scoring_metrics
+from .prior_cache import PriorCache
+from .priors import LeaguePriorRow
+from .profiling import StageProfiler
+from .reliability import RELIABILITY_METRICS, reliability_factor
+from .scoring import _guardrail_span
+
+# Reliability memo bound; random k_r samples would otherwise keep one column per config
+_R_MEMO_MAX = 64
+
+
+def config_variant(
+    base: SustainabilityConfig,
+    weights: Mapping[str, float] | None = None,
+    c: float | None = None,
+    k_r: Mapping[str, float] | None = None,
+    guardrails: Mapping[str, float] | None = None,
+) -> SustainabilityConfig:
+    """Copy of `base` with overridden weights / c / k_r / guardrails and a recomputed config_hash.
+
+    `weights` and `k_r` are merged over the base values.
+    """
+    constants = dict(base.constants)
+    if c is not None:
+        constants["c"] = c
+    if k_r is not None:
+        constants["k_r"] = {**base.k_r, **k_r}
+    if guardrails is not None:
+        constants["guardrails"] = {**base.guardrails, **guardrails}
+    new_weights = {**base.weights, **weights} if weights is not None else dict(base.weights)
+    payload = build_config_hash_payload(
+        {
+            "model_version": base.model_version,
+            "weights_json": new_weights,
+            "toggles_json": base.toggles,
+            "constants_json": constants,
+            "sd_mode": base.sd_mode,
+            "freshness_days": base.freshness_days,
+        }
+    )
+    return replace(base, weights=new_weights, constants=constants, config_hash=compute_hash(payload))
+
+
+def grid_configs(
+    base: SustainabilityConfig,
+    weights: Mapping[str, Sequence[float]] | None = None,
+    c: Sequence[float] | None = None,
+    k_r: Mapping[str, Sequence[float]] | None = None,
+) -> List[SustainabilityConfig]:
+    """Cartesian product of per-metric weight values, c values and per-metric k_r values."""
+    weights = weights or {}
+    k_r = k_r or {}
+    w_keys, k_keys = list(weights), list(k_r)
+    out: List[SustainabilityConfig] = []
+    for w_vals, c_val, k_vals in product(
+        product(*(weights[m] for m in w_keys)),
+        list(c) if c is not None else [None],
+        product(*(k_r[m] for m in k_keys)),
+    ):
+        out.append(
+            config_variant(
+                base,
+                weights=dict(zip(w_keys, w_vals)) if w_keys else None,
+                c=c_val,
+                k_r=dict(zip(k_keys, k_vals)) if k_keys else None,
+            )
+        )
+    return out
+
+
+def random_configs(
+    base: SustainabilityConfig,
+    n: int,
+    seed: int = 0,
+    weight_jitter: float = 0.25,
+    c_range: Tuple[float, float] | None = (2.0, 4.0),
+    k_r_jitter: float = 0.25,
+) -> List[SustainabilityConfig]:
+    """`n` seeded variants: each weight and k_r scaled by U(1 - jitter, 1 + jitter), c ~ U(c_range)."""
+    rng = random.Random(seed)
+    out: List[SustainabilityConfig] = []
+    for _ in range(n):
+        weights = {m: w * rng.uniform(1 - weight_jitter, 1 + weight_jitter) for m, w in base.weights.items()}
+        k_r = {m: k * rng.uniform(1 - k_r_jitter, 1 + k_r_jitter) for m, k in base.k_r.items()} if k_r_jitter else None
+        c_val = rng.uniform(*c_range) if c_range is not None else None
+        out.append(config_variant(base, weights=weights, c=c_val, k_r=k_r))
+    return out
+
+
+def _score_column(totals: List[float], lower: float, span: float, scale: int) -> List[int]:
+    # `_score_contrib` for a whole column. exp(-|t|) is exp(-t) for t >= 0 and exp(t) below,
+    # so `logistic`'s two branches are reproduced exactly. `_guardrail_span` keeps
+    # 0 < lower < upper < 1, so the p_g / score clamps never bind.
+    e = list(map(exp, map(neg, map(abs, totals))))
+    p = [1.0 / (1.0 + x) if t >= 0 else x / (1.0 + x) for t, x in zip(totals, e)]
+    p_g = map(add, repeat(lower), map(mul, repeat(span), p))
+    return list(map(round, map(mul, repeat(scale), p_g)))
+
+
+@dataclass
+class SweepBase:
+    """Config-independent stage outputs for the snapshot window rows of one season."""
+
+    season_id: int
+    cfg: SustainabilityConfig
+    window_type: str
+    n: int
+    z: Dict[str, List[Any]]  # metric -> z column (rate metrics + finishing residuals)
+    trials: Dict[str, List[Any]]  # reliability metric -> trials column
+    fixed_r: Dict[str, List[Any]]  # metric -> r column not driven by k_r (finishing)
+
+    def __post_init__(self) -> None:
+        self._z_filled = {m: [0.0 if z is None else float(z) for z in col] for m, col in self.z.items()}
+        self._z_source: Dict[Tuple[str, float], List[float]] = {}
+        self._r: Dict[Tuple[str, float], List[float]] = {}
+
+    def check_compatible(self, cfg: SustainabilityConfig) -> None:
+        base = self.cfg
+        if (
+            cfg.freshness_days != base.freshness_days
+            or cfg.sd_mode != base.sd_mode
+            or bool(cfg.toggles.get("use_finishing_residuals")) != bool(base.toggles.get("use_finishing_residuals"))
+        ):
+            raise ValueError(
+                f"config {cfg.config_hash[:12]} changes windows / SD mode / finishing residuals; "
+                "it needs its own prepare_sweep"
+            )
+
+    def z_source(self, metric: str, c: float) -> List[float] | None:
+        """tanh(z / c) per row (0.0 where z is missing); None without a z column."""
+        z_col = self._z_filled.get(metric)
+        if z_col is None:
+            return None
+        key = (metric, c)
+        col = self._z_source.get(key)
+        if col is None:
+            # Missing z reads as 0.0 and tanh(0.0 / c) == 0.0, so (w * r) * 0.0 adds nothing to the total
+            col = self._z_source[key] = list(map(tanh, map(truediv, z_col, repeat(c, self.n))))
+        return col
+
+    def reliability(self, metric: str, k_r: Mapping[str, Any]) -> List[float]:
+        """r per row (0.0 where missing), from k_r for reliability metrics."""
+        if metric not in RELIABILITY_METRICS:
+            key = (metric, 0.0)
+            col = self._r.get(key)
+            if col is None:
+                fixed = self.fixed_r.get(metric) or [None] * self.n
+                col = self._r[key] = [0.0 if r is None else r for r in fixed]
+            return col
+        k_val = float(k_r.get(metric, 0))
+        key = (metric, k_val)
+        col = self._r.get(key)
+        if col is None:
+            if len(self._r) >= _R_MEMO_MAX:
+                self._r.clear()
+            trials = self.trials[metric]
+            table = {t: reliability_factor(t, k_val) for t in set(trials)}
+            col = self._r[key] = list(map(table.__getitem__, trials))
+        return col
+
+    def clear_clip_cache(self) -> None:
+        self._z_source.clear()
+
+    def scores(self, cfg: SustainabilityConfig, scale: int = 100) -> List[int]:
+        """Barometer score per snapshot row under `cfg`."""
+        self.check_compatible(cfg)
+        c = cfg.constants.get("c", 3.0)
+        if c <= 0:
+            raise ValueError("c must be > 0 for soft clipping")
+        n = self.n
+        totals = [0.0] * n
+        for m in _scoring_metrics(cfg, None):
+            src = self.z_source(m, c)
+            if src is None:
+                continue
+            w = float(cfg.weights.get(m, 0.0))
+            weighted_r = map(mul, repeat(w, n), self.reliability(m, cfg.k_r))
+            totals = list(map(add, totals, map(mul, weighted_r, src)))
+        lower, span = _guardrail_span(cfg.constants)
+        return _score_column(totals, lower, span, scale)
+
+
+def prepare_sweep(
+    season_id: int,
+    games: Iterable[Dict[str, Any]],
+    db_client=None,
+    cfg: SustainabilityConfig | None = None,
+    league_priors: List[LeaguePriorRow] | None = None,
+    player_priors_rows: List[Dict[str, Any]] | None = None,
+    window_type: str = "GAME",
+    profiler: StageProfiler | None = None,
+    prior_cache: PriorCache | None = None,
+) -> SweepBase:
+    """Windows, priors and z-scores once; keeps the `window_type` rows' sweep inputs."""
+    pre = _run_pre_scoring_frame(
+        season_id=season_id,
+        games=games,
+        db_client=db_client,
+        cfg=cfg,
+        league_priors=league_priors,
+        player_priors_rows=player_priors_rows,
+        profiler=profiler,
+        prior_cache=prior_cache,
+    )
+    cfg = pre["cfg"]
+    frame = pre["frame"]
+    idx = [i for i, wt in enumerate(frame.get("window_type")) if wt == window_type]
+
+    def pick(col: List[Any]) -> List[Any]:
+        return [col[i] for i in idx]
+
+    z = {name[2:]: pick(frame.get(name)) for name in frame.column_names if name.startswith("z_")}
+    fixed_r: Dict[str, List[Any]] = {}
+    if cfg.toggles.get("use_finishing_residuals"):
+        for name, values in finishing_residual_columns(frame, pre["sd_constants"]).items():
+            if name.startswith("z_"):
+                z[name[2:]] = pick(values)
+            elif name.startswith("r_"):
+                fixed_r[name[2:]] = pick(values)
+    trials = {m: pick(frame.get(field)) for m, field in RELIABILITY_METRICS.items()}
+    return SweepBase(
+        season_id=season_id,
+        cfg=cfg,
+        window_type=window_type,
+        n=len(idx),
+        z=z,
+        trials=trials,
+        fixed_r=fixed_r,
+    )
+
+
+def _snapshot(scores: List[int], base: SweepBase, cfg: SustainabilityConfig) -> DistributionSnapshot | None:
+    if not scores:
+        return None
+    ordered = sorted(scores)
+    t20, t40, t60, t80 = (_percentile(ordered, p) for p in PERCENT_CUTS)
+    return DistributionSnapshot(
+        window_type=base.window_type,
+        model_version=cfg.model_version,
+        config_hash=cfg.config_hash,
+        n=len(ordered),
+        t20=t20,
+        t40=t40,
+        t60=t60,
+        t80=t80,
+        created_at="",
+    )
+
+
+def _evaluate(base: SweepBase, cfg: SustainabilityConfig) -> Tuple[DistributionSnapshot | None, List[Any]]:
+    scores = base.scores(cfg)
+    snapshot = _snapshot(scores, base, cfg)
+    tiers, _ = tier_scores(scores, snapshot)
+    return snapshot, tiers
+
+
+def _stability(tiers: List[Any], ref_tiers: List[Any]) -> Dict[str, Any]:
+    n = len(tiers)
+    if not n:
+        return {"tier_agreement": None, "mean_abs_tier_shift": None, "moved_2plus": None}
+    shifts = Counter(map(abs, map(sub, tiers, ref_tiers)))
+    return {
+        "tier_agreement": shifts[0] / n,
+        "mean_abs_tier_shift": sum(s * k for s, k in shifts.items()) / n,
+        "moved_2plus": sum(k for s, k in shifts.items() if s >= 2) / n,
+    }
+
+
+def evaluate_configs(
+    base: SweepBase,
+    configs: Iterable[SustainabilityConfig],
+    reference: SustainabilityConfig | None = None,
+) -> Dict[str, Any]:
+    """Snapshot thresholds, tier counts and tier stability for every config.
+
+    Configs are evaluated grouped by `c` (so each clipped block is built once) and
+    reported in input order. Stability compares each config's tiers with the
+    reference config's tiers on the same rows.
+    """
+    t0 = time.perf_counter()
+    configs = list(configs)
+    reference = reference if reference is not None else base.cfg
+    ref_snapshot, ref_tiers = _evaluate(base, reference)
+    results: List[Dict[str, Any] | None] = [None] * len(configs)
+    order = sorted(range(len(configs)), key=lambda i: float(configs[i].constants.get("c", 3.0)))
+    current_c = None
+    for i in order:
+        cfg = configs[i]
+        c = configs[i].constants.get("c", 3.0)
+        if current_c is not None and c != current_c:
+            base.clear_clip_cache()
+        current_c = c
+        snapshot, tiers = _evaluate(base, cfg)
+        by_tier = Counter(tiers)
+        results[i] = {
+            "config_hash": cfg.config_hash,
+            "c": c,
+            "weights": dict(cfg.weights),
+            "k_r": dict(cfg.k_r),
+            "thresholds": {k: getattr(snapshot, k) for k in ("t20", "t40", "t60", "t80")} if snapshot else None,
+            "tier_counts": [by_tier[q] for q in range(1, 6)],
+            **_stability(tiers, ref_tiers),
+        }
+    base.clear_clip_cache()
+    return {
+        "season_id": base.season_id,
+        "window_type": base.window_type,
+        "rows": base.n,
+        "reference_config_hash": reference.config_hash,
+        "reference_thresholds": {k: getattr(ref_snapshot, k) for k in ("t20", "t40", "t60", "t80")} if ref_snapshot else None,
+        "configs": results,
+        "duration_ms": int((time.perf_counter() - t0) * 1000),
+    }
+
+
+__all__ = [
+    "SweepBase",
+    "config_variant",
+    "evaluate_configs",
+    "grid_configs",
+    "prepare_sweep",
+    "random_configs",
+]
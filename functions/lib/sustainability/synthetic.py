@@ -0,0 +1,260 @@
+"""Seeded synthetic season generator for benchmarks (Task 4.12 follow-up).
+
+Produces player game rows shaped like `fetch_player_game_rows` output so the
+pipeline benchmarks can run without a database.
+
+Distributions (per player-game):
+  shots            ~ Poisson(shot_rate)
+  goals            ~ Binomial(shots, sh_pct)
+  onice_shots_for  = shots + Poisson(onice_shot_rate)
+  onice_goals_for  = goals + Binomial(onice_shots_for - shots, onice_sh_pct)
+  points           = goals + Binomial(onice_goals_for - goals, assist_rate)
+  icf              = shots + Poisson(missed_rate)
+  hdcf             = Binomial(shots, hd_share) + goals (capped at shots)
+  ixg              = sum over goals of U(0.6, 1.1) + sum over non-goals of U(0.05, 0.12)
+
+Design Notes:
+  * Draws are column-at-a-time: one uniform per draw mapped through a precomputed
+    CDF table with `bisect_right` (inverse-transform sampling). Binomial tables are
+    cached per (n, p) and indexed by n, so per-draw cost is one RNG call plus one C-level bisect.
+    Uniforms come from `starmap(rng.random, ...)`, so whole columns are drawn without
+    a Python-level loop. Distributions are exact (not gauss stand-ins), and a
+    `random.Random(seed)` instance makes the output identical run to run.
+  * Season shape: `n_games` slates `days_between_games` apart from `start_date`.
+    Roster churn replaces each roster slot with a new player id with probability
+    `churn_rate` per slate (call-ups, trades); `forward_share` sets the F/D mix.
+  * Fixtures: `load_or_generate(spec, cache_dir)` stores the season as a columnar
+    JSON file named by the spec hash, so repeated benchmark runs skip generation.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import random
+from bisect import bisect_right
+from dataclasses import dataclass, asdict
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import accumulate, repeat, starmap
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+FIXTURE_VERSION = 1
+
+GAME_COLUMNS = [
+    "player_id",
+    "season_id",
+    "position_code",
+    "game_id",
+    "game_date",
+    "shots",
+    "goals",
+    "onice_shots_for",
+    "onice_goals_for",
+    "points",
+    "ixg",
+    "icf",
+    "hdcf",
+]
+
+
+@dataclass(frozen=True)
+class SyntheticSeasonSpec:
+    n_players: int = 5000
+    n_games: int = 40
+    season_id: int = 2025
+    seed: int = 2025
+    start_date: str = "2025-01-01"
+    days_between_games: int = 1
+    forward_share: float = 0.7
+    churn_rate: float = 0.0
+    shot_rate: float = 3.2
+    sh_pct: float = 0.11
+    onice_shot_rate: float = 15.0
+    onice_sh_pct: float = 0.08
+    assist_rate: float = 0.45
+    missed_rate: float = 2.0
+    hd_share: float = 0.25
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @property
+    def fixture_key(self) -> str:
+        raw = json.dumps({"version": FIXTURE_VERSION, **self.to_dict()}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+_TAIL = 1e-15
+
+
+def _finish_cdf(pmf: List[float]) -> Tuple[float, ...]:
+    cdf: List[float] = []
+    acc = 0.0
+    for p in pmf:
+        acc += p
+        cdf.append(acc)
+    cdf[-1] = 1.0  # draws never fall past the table
+    return tuple(cdf)
+
+
+@lru_cache(maxsize=None)
+def _poisson_cdf(lam: float) -> Tuple[float, ...]:
+    pmf = [math.exp(-lam)]
+    k = 0
+    while sum(pmf) < 1.0 - _TAIL and k < 10 * lam + 50:
+        k += 1
+        pmf.append(pmf[-1] * lam / k)
+    return _finish_cdf(pmf)
+
+
+@lru_cache(maxsize=None)
+def _binomial_cdf(n: int, p: float) -> Tuple[float, ...]:
+    if n <= 0 or p <= 0.0:
+        return (1.0,)
+    return _finish_cdf([math.comb(n, k) * p**k * (1.0 - p) ** (n - k) for k in range(n + 1)])
+
+
+def _uniforms(rng: random.Random, size: int) -> Iterator[float]:
+    return starmap(rng.random, repeat((), size))
+
+
+def _poisson(rng: random.Random, lam: float, size: int) -> List[int]:
+    return list(map(bisect_right, repeat(_poisson_cdf(lam)), _uniforms(rng, size)))
+
+
+def _binomial(rng: random.Random, trials: List[int], p: float) -> List[int]:
+    tables = [_binomial_cdf(n, p) for n in range(max(trials, default=0) + 1)]
+    return list(map(bisect_right, map(tables.__getitem__, trials), _uniforms(rng, len(trials))))
+
+
+def _uniform_sums(rng: random.Random, counts: List[int], lo: float, hi: float) -> List[float]:
+    # Sum of c draws from U(lo, hi) = c * lo + (hi - lo) * (sum of c U(0, 1) draws).
+    acc = [0.0, *accumulate(_uniforms(rng, sum(counts)))]
+    ends = list(accumulate(counts))
+    span = hi - lo
+    return [c * lo + span * (acc[e] - acc[e - c]) for c, e in zip(counts, ends)]
+
+
+def generate_season_columns(spec: SyntheticSeasonSpec) -> Dict[str, List[Any]]:
+    """Generate a synthetic season as game columns (slate-major, roster order within a slate)."""
+    rng = random.Random(spec.seed)
+    roster = list(range(1, spec.n_players + 1))
+    positions = {pid: ("F" if rng.random() < spec.forward_share else "D") for pid in roster}
+    next_id = spec.n_players + 1
+    start = date.fromisoformat(spec.start_date)
+    cols: Dict[str, List[Any]] = {name: [] for name in GAME_COLUMNS}
+
+    for g_idx in range(spec.n_games):
+        if g_idx and spec.churn_rate > 0:
+            for slot in range(len(roster)):
+                if rng.random() < spec.churn_rate:
+                    roster[slot] = next_id
+                    positions[next_id] = "F" if rng.random() < spec.forward_share else "D"
+                    next_id += 1
+        m = len(roster)
+        shots = _poisson(rng, spec.shot_rate, m)
+        goals = _binomial(rng, shots, spec.sh_pct)
+        onice_sf = [s + x for s, x in zip(shots, _poisson(rng, spec.onice_shot_rate, m))]
+        extra_sf = [o - s for o, s in zip(onice_sf, shots)]
+        onice_gf = [g + x for g, x in zip(goals, _binomial(rng, extra_sf, spec.onice_sh_pct))]
+        assists = _binomial(rng, [o - g for o, g in zip(onice_gf, goals)], spec.assist_rate)
+        ixg_goal = _uniform_sums(rng, goals, 0.6, 1.1)
+        ixg_miss = _uniform_sums(rng, [s - g for s, g in zip(shots, goals)], 0.05, 0.12)
+        icf = [s + x for s, x in zip(shots, _poisson(rng, spec.missed_rate, m))]
+        hdcf = [min(h + g, s) for h, g, s in zip(_binomial(rng, shots, spec.hd_share), goals, shots)]
+
+        game_id = f"G{g_idx + 1}"
+        game_date = (start + timedelta(days=g_idx * spec.days_between_games)).isoformat()
+        cols["player_id"].extend(roster)
+        cols["season_id"].extend([spec.season_id] * m)
+        cols["position_code"].extend(positions[pid] for pid in roster)
+        cols["game_id"].extend([game_id] * m)
+        cols["game_date"].extend([game_date] * m)
+        cols["shots"].extend(shots)
+        cols["goals"].extend(goals)
+        cols["onice_shots_for"].extend(onice_sf)
+        cols["onice_goals_for"].extend(onice_gf)
+        cols["points"].extend(g + a for g, a in zip(goals, assists))
+        cols["ixg"].extend(round(a + b, 3) for a, b in zip(ixg_goal, ixg_miss))
+        cols["icf"].extend(icf)
+        cols["hdcf"].extend(hdcf)
+    return cols
+
+
+def columns_to_games(cols: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    names = [n for n in GAME_COLUMNS if n in cols]
+    return [dict(zip(names, values)) for values in zip(*(cols[n] for n in names))]
+
+
+def generate_season_games(spec: SyntheticSeasonSpec) -> List[Dict[str, Any]]:
+    return columns_to_games(generate_season_columns(spec))
+
+
+def aggregate_season_rows(games: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Derive (league aggregate rows, player season rows) shaped for the priors fetchers."""
+    pairs = (("sh_pct", "goals", "shots"), ("oish_pct", "onice_goals_for", "onice_shots_for"), ("ipp", "points", "onice_goals_for"))
+    league: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    players: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    for g in games:
+        pos = g.get("position_code")
+        lg = league.setdefault((g["season_id"], pos), {"season_id": g["season_id"], "position_code": pos})
+        pl = players.setdefault(
+            (g["player_id"], g["season_id"]),
+            {"player_id": g["player_id"], "season_id": g["season_id"], "position_code": pos},
+        )
+        for metric, succ, trials in pairs:
+            for row in (lg, pl):
+                row[f"{metric}_successes"] = row.get(f"{metric}_successes", 0) + g[succ]
+                row[f"{metric}_trials"] = row.get(f"{metric}_trials", 0) + g[trials]
+    return list(league.values()), list(players.values())
+
+
+def fixture_path(spec: SyntheticSeasonSpec, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"synthetic_season_{spec.fixture_key}.json")
+
+
+def save_fixture(path: str, spec: SyntheticSeasonSpec, cols: Dict[str, List[Any]]) -> None:
+    payload = {"version": FIXTURE_VERSION, "spec": spec.to_dict(), "columns": cols}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_fixture(path: str) -> Tuple[SyntheticSeasonSpec, Dict[str, List[Any]]]:
+    with open(path, "r", encoding="utf-8") as fh:
+        raw = json.load(fh)
+    if raw.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version: {raw.get('version')}")
+    return SyntheticSeasonSpec(**raw["spec"]), raw["columns"]
+
+
+def load_or_generate(spec: SyntheticSeasonSpec, cache_dir: str | None = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """Return (games, cache_hit). With `cache_dir`, reuse or write the fixture file."""
+    if cache_dir is None:
+        return generate_season_games(spec), False
+    path = fixture_path(spec, cache_dir)
+    if os.path.exists(path):
+        cached_spec, cols = load_fixture(path)
+        if cached_spec == spec:
+            return columns_to_games(cols), True
+    cols = generate_season_columns(spec)
+    os.makedirs(cache_dir, exist_ok=True)
+    save_fixture(path, spec, cols)
+    return columns_to_games(cols), False
+
+
+__all__ = [
+    "SyntheticSeasonSpec",
+    "GAME_COLUMNS",
+    "generate_season_columns",
+    "generate_season_games",
+    "columns_to_games",
+    "aggregate_season_rows",
+    "fixture_path",
+    "save_fixture",
+    "load_fixture",
+    "load_or_generate",
+]
@@ -19,16 +19,53 @@ Freshness Logic:
   For STD windows we exclude any game where (current_game_date - game_date).days > freshness_days.
   GAME / G5 / G10 ignore freshness (their recency is implicit) but still carry freshness_applied=False.
 
+Columnar Builder:
+  `build_window_columns` produces the same windows as a struct-of-arrays mapping
+  (column name -> list). Games are grouped into per-player arrays once; count sums
+  come from prefix-sum differences and the STD freshness cutoff is a two-pointer
+  scan, so each player costs O(games) instead of O(games²). Float ixG sums are
+  accumulated in the same left-to-right order as `_aggregate_games` so results are
+  bit-identical to `build_all_players_windows`.
+
 This module only assembles windows; scoring & reliability weighting happen later.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, datetime
+from itertools import accumulate
 from typing import List, Dict, Iterable, Any, Optional
 
+from .frame import WindowFrame
+
 WINDOW_TYPES = ["GAME", "G5", "G10", "STD"]
 
+# Column order of every emitted window row (matches build_player_windows key order).
+WINDOW_COLUMNS = [
+    "player_id",
+    "season_id",
+    "position_code",
+    "game_date",
+    "window_type",
+    "game_id",
+    "n_games",
+    "shots",
+    "goals",
+    "onice_goals_for",
+    "onice_shots_for",
+    "points",
+    "ixg",
+    "icf",
+    "hdcf",
+    "sh_pct",
+    "oish_pct",
+    "ipp",
+    "freshness_applied",
+]
+
+_COUNT_FIELDS = ["shots", "goals", "onice_goals_for", "onice_shots_for", "points", "icf", "hdcf"]
+_ROLLING_SIZES = [(5, "G5"), (10, "G10")]
+
 
 def _to_date(d: Any) -> date:
     if isinstance(d, date):
@@ -146,24 +183,136 @@ def build_player_windows(
     return out
 
 
-def build_all_players_windows(
-    all_games: Iterable[Dict[str, Any]],
-    freshness_days: int = 45,
-) -> List[Dict[str, Any]]:
+def _group_by_player(all_games: Iterable[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
     by_player: Dict[int, List[Dict[str, Any]]] = {}
     for g in all_games:
         pid = g.get("player_id")
         if pid is None:
             continue
         by_player.setdefault(int(pid), []).append(g)
+    return by_player
+
+
+def build_all_players_windows(
+    all_games: Iterable[Dict[str, Any]],
+    freshness_days: int = 45,
+) -> List[Dict[str, Any]]:
     out: List[Dict[str, Any]] = []
-    for pid, games in by_player.items():
+    for pid, games in _group_by_player(all_games).items():
         out.extend(build_player_windows(games, freshness_days=freshness_days))
     return out
 
 
+def _float_sum(values: List[float], lo: int, hi: int) -> float:
+    # Plain left-to-right accumulation (builtin sum() may compensate on newer Pythons).
+    total = 0.0
+    for k in range(lo, hi):
+        total += values[k]
+    return total
+
+
+def _repeat(values: List[Any], times: int) -> List[Any]:
+    return [v for v in values for _ in range(times)]
+
+
+def _append_player_window_columns(
+    cols: Dict[str, List[Any]],
+    player_games: List[Dict[str, Any]],
+    freshness_days: int,
+) -> None:
+    dates = [_to_date(g["game_date"]) for g in player_games]
+    order = sorted(range(len(player_games)), key=dates.__getitem__)  # stable, like list.sort
+    games = [player_games[i] for i in order]
+    dates = [dates[i] for i in order]
+    n = len(games)
+    per_game = len(WINDOW_TYPES)
+
+    # Window spans [lo, hi) per emitted row, in GAME, G5, G10, STD order.
+    los: List[int] = []
+    std_lo = 0  # two-pointer freshness cutoff (dates ascending -> cutoff only moves forward)
+    std_applied: List[bool] = []
+    for i in range(n):
+        hi = i + 1
+        current_date = dates[i]
+        while std_lo < hi and (current_date - dates[std_lo]).days > freshness_days:
+            std_lo += 1
+        los.append(i)
+        for size, _label in _ROLLING_SIZES:
+            los.append(hi - size if hi > size else 0)
+        los.append(std_lo)
+        std_applied.append(std_lo > 0)
+    his = _repeat(list(range(1, n + 1)), per_game)
+    spans = list(zip(los, his))
+
+    cols["player_id"].extend(_repeat([g["player_id"] for g in games], per_game))
+    cols["season_id"].extend(_repeat([g["season_id"] for g in games], per_game))
+    cols["position_code"].extend(_repeat([g.get("position_code") for g in games], per_game))
+    cols["game_date"].extend(_repeat(dates, per_game))
+    cols["window_type"].extend(WINDOW_TYPES * n)
+    game_ids = [g.get("game_id") for g in games]
+    cols["game_id"].extend([v for gid in game_ids for v in (gid, gid, gid, None)])
+    cols["n_games"].extend([hi - lo for lo, hi in spans])
+
+    sums: Dict[str, List[Any]] = {}
+    for f in _COUNT_FIELDS:
+        pre = list(accumulate((g.get(f, 0) or 0 for g in games), initial=0))
+        sums[f] = [pre[hi] - pre[lo] for lo, hi in spans]
+        cols[f].extend(sums[f])
+    ixg_vals = [float(g.get("ixg", 0.0) or 0.0) for g in games]
+    ixg_prefix = list(accumulate(ixg_vals, initial=0.0))
+    # Prefix sums from 0 reproduce the sequential float sum exactly; offset spans re-sum.
+    cols["ixg"].extend([
+        ixg_prefix[hi] if lo == 0 else _float_sum(ixg_vals, lo, hi) for lo, hi in spans
+    ])
+
+    ogf = sums["onice_goals_for"]
+    cols["sh_pct"].extend([g / s if s > 0 else None for g, s in zip(sums["goals"], sums["shots"])])
+    cols["oish_pct"].extend([g / s if s > 0 else None for g, s in zip(ogf, sums["onice_shots_for"])])
+    cols["ipp"].extend([p / g if g > 0 else None for p, g in zip(sums["points"], ogf)])
+    cols["freshness_applied"].extend([v for applied in std_applied for v in (False, False, False, applied)])
+
+
+def build_window_columns(
+    all_games: Iterable[Dict[str, Any]],
+    freshness_days: int = 45,
+) -> Dict[str, List[Any]]:
+    """Build all players' windows as columns (struct-of-arrays).
+
+    Row k across every column equals row k of `build_all_players_windows` for the same input.
+    """
+    cols: Dict[str, List[Any]] = {name: [] for name in WINDOW_COLUMNS}
+    for pid, games in _group_by_player(all_games).items():
+        _append_player_window_columns(cols, games, freshness_days)
+    return cols
+
+
+def window_columns_to_rows(cols: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    names = list(cols.keys())
+    return [dict(zip(names, values)) for values in zip(*cols.values())]
+
+
+def build_window_frame(
+    all_games: Iterable[Dict[str, Any]],
+    freshness_days: int = 45,
+) -> WindowFrame:
+    return WindowFrame.from_columns(build_window_columns(all_games, freshness_days=freshness_days))
+
+
+def build_all_players_windows_columnar(
+    all_games: Iterable[Dict[str, Any]],
+    freshness_days: int = 45,
+) -> List[Dict[str, Any]]:
+    """Drop-in replacement for `build_all_players_windows` backed by `build_window_columns`."""
+    return window_columns_to_rows(build_window_columns(all_games, freshness_days=freshness_days))
+
+
 __all__ = [
     "WINDOW_TYPES",
+    "WINDOW_COLUMNS",
     "build_player_windows",
     "build_all_players_windows",
+    "build_window_columns",
+    "build_window_frame",
+    "window_columns_to_rows",
+    "build_all_players_windows_columnar",
 ]
@@ -12,7 +12,8 @@ Inputs:
   sd_constants: mapping metric_code -> position_code -> sd_value (constants.load_sd_constants)
 
 Process:
-  1. Build lookup prior_mean[(player_id, stat_code)] = post_mean.
+  1. Build lookup prior_mean[(player_id, stat_code)] = post_mean
+     (the frame variant uses a dense `PriorIndex`, see prior_index.py).
   2. For each window row, compute observed metric value (already present on window).
   3. z = (observed - expected) / sd  (if all pieces available & sd>0)
   4. Attach to row keys: z_<metric>, delta_<metric>, exp_<metric>
@@ -23,6 +24,9 @@ from __future__ import annotations
 
 from typing import Iterable, Dict, Any, Tuple, List, Mapping
 
+from .frame import WindowFrame
+from .prior_index import PriorIndex
+
 RATE_METRICS = ["sh_pct", "oish_pct", "ipp"]
 
 
@@ -82,7 +86,43 @@ def annotate_zscores(
     return out
 
 
+def annotate_zscores_frame(
+    frame: WindowFrame,
+    player_priors: PriorIndex | Iterable[Dict[str, Any]] | Mapping,
+    sd_constants: Dict[str, Dict[str, float]],
+    metrics: Iterable[str] | None = None,
+) -> WindowFrame:
+    """Column variant of `annotate_zscores`; adds exp_/delta_/z_ columns in place.
+
+    Priors may be a prebuilt `PriorIndex`; player slots are resolved once per frame
+    and each metric's expectations are a gather over the index.
+    """
+    index = PriorIndex.coerce(player_priors)
+    if metrics is None:
+        metrics = RATE_METRICS
+    metrics = [m for m in metrics if m in RATE_METRICS]
+
+    slots = index.slots(frame.get("player_id"))
+    positions = [p or "F" for p in frame.get("position_code")]
+    for metric in metrics:
+        exps = index.gather(slots, metric)
+        sd_by_pos = sd_constants.get(metric, {})
+        # Usable SDs per position (None when missing or <= 0).
+        sd_ok = {pos: sd for pos in set(positions) if (sd := sd_by_pos.get(pos)) is not None and sd > 0}
+        sds = list(map(sd_ok.get, positions))
+        deltas: List[Any] = [
+            None if observed is None or exp is None or sd_val is None else observed - exp
+            for observed, exp, sd_val in zip(frame.get(metric), exps, sds)
+        ]
+        zs: List[Any] = [None if delta is None else delta / sd_val for delta, sd_val in zip(deltas, sds)]
+        frame.set_column(f"exp_{metric}", exps)
+        frame.set_column(f"delta_{metric}", deltas)
+        frame.set_column(f"z_{metric}", zs)
+    return frame
+
+
 __all__ = [
     "RATE_METRICS",
     "annotate_zscores",
+    "annotate_zscores_frame",
 ]
@@ -0,0 +1,51 @@
+import copy
+import json
+
+from lib.sustainability.bench_suite import STAGES, append_history, compare_runs, load_history, main, run_stage_benchmarks
+
+
+def _record():
+    return run_stage_benchmarks(scales={'tiny': (12, 6)}, repeats=2, fast=True)
+
+
+def test_run_stage_benchmarks_times_every_stage_deterministically():
+    first, second = _record(), _record()
+    tiny = first['results']['tiny']
+    assert tiny['rows'] == 12 * 6 * 4
+    assert list(tiny['stages']) == list(STAGES)
+    assert all(s['min_ms'] <= s['median_ms'] for s in tiny['stages'].values())
+    assert tiny['checksum'] == second['results']['tiny']['checksum']
+
+
+def test_history_round_trip_and_compare(tmp_path):
+    path = str(tmp_path / 'bench.json')
+    assert load_history(path)['runs'] == []
+    base = _record()
+    slow = copy.deepcopy(base)
+    slow['results']['tiny']['stages']['zscores']['min_ms'] += 5.0
+    slow['results']['tiny']['stages']['clipping']['min_ms'] = base['results']['tiny']['stages']['clipping']['min_ms'] * 1.5 + 0.1
+    append_history(path, base, label='before')
+    history = append_history(path, slow, label='after')
+    assert [r['label'] for r in history['runs']] == ['before', 'after']
+    assert json.loads((tmp_path / 'bench.json').read_text()) == history
+
+    cmp = compare_runs(history['runs'][0], history['runs'][1], threshold=0.10, min_delta_ms=0.05)
+    assert [r['stage'] for r in cmp['regressions']] == ['zscores', 'clipping']
+    assert cmp['workload_changed'] == []
+    # Below the absolute noise floor nothing is flagged
+    assert compare_runs(history['runs'][0], history['runs'][1], min_delta_ms=100.0)['regressions'] == []
+
+
+def test_cli_exit_status_flags_regressions(tmp_path, capsys):
+    path = str(tmp_path / 'bench.json')
+    base = _record()
+    append_history(path, base)
+    assert main(['compare', '--history', path]) == 2
+    append_history(path, base)
+    assert main(['compare', '--history', path]) == 0
+    slow = copy.deepcopy(base)
+    for stage in slow['results']['tiny']['stages'].values():
+        stage['min_ms'] = stage['min_ms'] * 3 + 1.0
+    append_history(path, slow)
+    assert main(['compare', '--history', path]) == 1
+    assert 'regression' in capsys.readouterr().out
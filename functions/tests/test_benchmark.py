@@ -1,4 +1,14 @@
-from lib.sustainability.benchmark import run_performance_benchmark
+from lib.sustainability.benchmark import (
+    run_columnar_export_benchmark,
+    run_kernel_benchmark,
+    run_multi_season_benchmark,
+    run_parallel_benchmark,
+    run_posterior_sweep_benchmark,
+    run_performance_benchmark,
+    run_sketch_benchmark,
+    run_sweep_benchmark,
+    run_windows_benchmark,
+)
 
 
 def test_run_performance_benchmark_fast_mode():
@@ -10,3 +20,55 @@ def test_run_performance_benchmark_fast_mode():
     assert 'total_rows_scored' in pipe
     # Sanity: total_rows_scored should be > 0
     assert pipe['total_rows_scored'] > 0
+
+
+def test_run_windows_benchmark_outputs_identical():
+    summary = run_windows_benchmark(n_players=20, n_games=12, player_scale=2, fast=True)
+    assert summary['players'] == 40
+    assert summary['outputs_identical'] is True
+    assert summary['window_rows'] == 40 * 12 * 4
+
+
+def test_run_parallel_benchmark_is_deterministic():
+    summary = run_parallel_benchmark(n_players=30, n_games=6, worker_counts=(1, 2), fast=True)
+    assert [r['workers'] for r in summary['runs']] == [1, 2]
+    assert all(r['identical'] for r in summary['runs'])
+
+
+def test_run_sketch_benchmark_within_bound():
+    summary = run_sketch_benchmark(n_values=20000, fast=True)
+    assert summary['retained_items'] < summary['n']
+    assert summary['max_rank_error'] <= summary['rank_error_bound']
+
+
+def test_run_multi_season_benchmark_single_fetch_per_table():
+    summary = run_multi_season_benchmark(n_seasons=3, n_players=20, n_games=6, fast=True)
+    assert summary['identical'] is True
+    # loop: league + player fetch per season; batch: one league fetch per season + one player fetch
+    assert summary['fetches_loop'] == 6
+    assert summary['fetches_batch'] == 4
+
+
+def test_run_kernel_benchmark_fused_matches_staged():
+    summary = run_kernel_benchmark(n_players=30, n_games=8, fast=True)
+    assert summary['identical'] is True
+    assert summary['window_rows'] == 30 * 8 * 4
+
+
+def test_run_posterior_sweep_benchmark_matches_row_wise():
+    summary = run_posterior_sweep_benchmark(n_players=40, n_weight_vectors=3, fast=True)
+    assert summary['identical'] is True
+    assert summary['weight_vectors'] == 3
+
+
+def test_run_sweep_benchmark_matches_pipeline_thresholds():
+    summary = run_sweep_benchmark(n_players=30, n_games=8, n_configs=6, n_loop_configs=2, fast=True)
+    assert summary['identical'] is True
+    assert summary['sweep_rows'] == 30 * 8
+
+
+def test_run_columnar_export_benchmark_round_trips():
+    summary = run_columnar_export_benchmark(n_players=20, n_games=6, fast=True)
+    assert summary['identical'] is True
+    assert summary['rows'] == 20 * 6 * 4
+    assert summary['columnar_bytes'] < summary['json_bytes']
@@ -0,0 +1,160 @@
+from datetime import date
+
+import pytest
+
+from lib.sustainability import columnar_export
+from lib.sustainability.columnar_export import (
+    ArrowScoredColumns,
+    DEFAULT_EXPORT_FORMAT,
+    ScoredColumns,
+    StructColumn,
+    encode_scored_columns,
+    export_scored_columns,
+    open_scored_columns,
+    scored_columns_table,
+)
+from lib.sustainability.config_loader import load_config
+from lib.sustainability.pipeline import run_full_scoring_pipeline
+from lib.sustainability.synthetic import SyntheticSeasonSpec, generate_season_games
+
+
+def _scored():
+    cfg = load_config(db_client=None, allow_fallback=True)
+    games = generate_season_games(SyntheticSeasonSpec(n_players=20, n_games=12, season_id=2025, seed=5))
+    priors = [
+        {'player_id': pid, 'stat_code': m, 'post_mean': mean}
+        for pid in range(1, 21)
+        for m, mean in (('sh_pct', 0.1), ('oish_pct', 0.09), ('ipp', 0.5))
+    ]
+    return run_full_scoring_pipeline(2025, games, cfg=cfg, player_priors_rows=priors)
+
+
+def test_export_round_trips_rows_and_frame(tmp_path):
+    result = _scored()
+    rows = result['windows_scored']
+    path = str(tmp_path / 'scored.sbar')
+    info = export_scored_columns(result['frame'], path, meta={'model_version': 1})
+    assert info['rows'] == len(rows)
+    assert encode_scored_columns(rows, meta={'model_version': 1}) == (tmp_path / 'scored.sbar').read_bytes()
+
+    with open_scored_columns(path) as cols:
+        assert cols.meta == {'model_version': 1}
+        assert cols.to_rows() == rows
+        # quintile is absent (not None) on non-GAME rows
+        assert [('quintile' in r) for r in cols.to_rows()] == [('quintile' in r) for r in rows]
+        assert isinstance(cols.to_frame().column('components_json'), StructColumn)
+        assert cols.column('game_date')[0] == rows[0]['game_date']
+        assert cols.column('components_json') == [r['components_json'] for r in rows]
+
+
+def test_fixed_dtypes_and_zero_copy_buffers(tmp_path):
+    result = _scored()
+    rows = result['windows_scored']
+    path = str(tmp_path / 'scored.sbar')
+    export_scored_columns(rows, path)
+    with ScoredColumns(path) as cols:
+        dtypes = cols.dtypes
+        assert dtypes['score'] == 'i8' and dtypes['score_raw'] == 'f8'
+        assert dtypes['game_date'] == 'date' and dtypes['window_type'] == 'str'
+        assert dtypes['provisional_tier'] == 'bool' and dtypes['components_json'] == 'struct'
+        scores = cols.buffer('score')
+        assert scores.format == 'q' and list(scores) == [r['score'] for r in rows]
+        scores.release()
+        with pytest.raises(ValueError):
+            cols.buffer('window_type')
+
+
+def test_mixed_and_sparse_columns(tmp_path):
+    rows = [
+        {'player_id': 1, 'game_date': date(2025, 1, 2), 'tag': 'a', 'extra': {'k': 1}, 'score': 50},
+        {'player_id': 2, 'game_date': None, 'tag': 'a', 'extra': [1, 2], 'score': 51.5},
+        {'player_id': 2 ** 70, 'tag': None, 'score': None},
+    ]
+    path = str(tmp_path / 'mixed.sbar')
+    export_scored_columns(rows, path)
+    with ScoredColumns(path) as cols:
+        assert cols.to_rows() == rows
+        assert cols.dtypes == {'player_id': 'json', 'game_date': 'date', 'tag': 'str', 'extra': 'json', 'score': 'f8'}
+        assert cols.column('extra') == [{'k': 1}, [1, 2], None]
+
+
+def test_components_children_share_top_level_blobs():
+    result = _scored()
+    frame = result['frame']
+    with_components = encode_scored_columns(frame)
+    without = encode_scored_columns(frame.to_rows([c for c in frame.column_names if c != 'components_json']))
+    # Only presence masks, obs / n / rookie children and weights add to the payload
+    assert len(with_components) - len(without) < len(frame) * 8 * 4
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / 'bad.bin'
+    path.write_bytes(b'not a scored file')
+    with pytest.raises(ValueError):
+        ScoredColumns(str(path))
+
+
+@pytest.mark.parametrize('suffix', ['arrow', 'parquet'])
+def test_arrow_and_parquet_round_trip_rows(tmp_path, suffix):
+    pytest.importorskip('pyarrow')
+    result = _scored()
+    rows = result['windows_scored']
+    path = str(tmp_path / f'scored.{suffix}')
+    info = export_scored_columns(result['frame'], path, meta={'model_version': 1})
+    assert info['format'] == suffix and info['rows'] == len(rows)
+
+    with open_scored_columns(path) as cols:
+        assert isinstance(cols, ArrowScoredColumns)
+        assert cols.meta == {'model_version': 1}
+        assert cols.to_rows() == rows
+        assert [('quintile' in r) for r in cols.to_rows()] == [('quintile' in r) for r in rows]
+        assert cols.dtypes['score'] == 'i8' and cols.dtypes['components_json'] == 'struct'
+        assert cols.column('components_json') == [r['components_json'] for r in rows]
+
+
+def test_arrow_schema_is_typed_for_non_python_readers(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    result = _scored()
+    rows = result['windows_scored']
+    table = scored_columns_table(rows)
+    assert table.schema.field('score').type == pa.int64()
+    assert table.schema.field('game_date').type == pa.date32()
+    assert pa.types.is_dictionary(table.schema.field('window_type').type)
+    assert pa.types.is_struct(table.schema.field('components_json').type)
+    assert '__absent__.quintile' in table.column_names
+
+    path = str(tmp_path / 'scored.arrow')
+    assert export_scored_columns(rows, path)['format'] == DEFAULT_EXPORT_FORMAT == 'arrow'
+    with open_scored_columns(path) as cols:
+        scores = cols.buffer('score')
+        assert scores.format == 'q' and list(scores) == [r['score'] for r in rows]
+        scores.release()
+        with pytest.raises(ValueError):
+            cols.buffer('window_type')
+
+
+def test_arrow_mixed_and_sparse_columns(tmp_path):
+    pytest.importorskip('pyarrow')
+    rows = [
+        {'player_id': 1, 'game_date': date(2025, 1, 2), 'tag': 'a', 'extra': {'k': 1}, 'score': 50},
+        {'player_id': 2, 'game_date': None, 'tag': 'a', 'extra': [1, 2], 'score': 51.5},
+        {'player_id': 2 ** 70, 'tag': None, 'score': None},
+    ]
+    path = str(tmp_path / 'mixed.arrow')
+    export_scored_columns(rows, path)
+    with open_scored_columns(path) as cols:
+        assert cols.to_rows() == rows
+        assert cols.dtypes == {'player_id': 'json', 'game_date': 'date', 'tag': 'str', 'extra': 'json', 'score': 'f8'}
+
+
+def test_without_pyarrow_sbar_is_opt_in_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar_export, 'pa', None)
+    rows = [{'player_id': 1, 'score': 50}]
+    for path in ('scored.out', 'scored.arrow', 'scored.parquet'):
+        with pytest.raises(ImportError, match='requires pyarrow'):
+            export_scored_columns(rows, str(tmp_path / path))
+        assert not (tmp_path / path).exists()
+    info = export_scored_columns(rows, str(tmp_path / 'scored.out'), format='sbar')
+    assert info['format'] == 'sbar'
+    with open_scored_columns(info['path']) as cols:
+        assert isinstance(cols, ScoredColumns) and cols.to_rows() == rows
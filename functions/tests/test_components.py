@@ -0,0 +1,71 @@
+import pickle
+
+from lib.sustainability.components import ComponentsView, attach_components_view_frame
+from lib.sustainability.config_loader import DEFAULT_CONFIG, SustainabilityConfig
+from lib.sustainability.frame import WindowFrame
+from lib.sustainability.pipeline import run_full_scoring_pipeline
+from lib.sustainability.scoring import attach_components_json_frame
+from lib.sustainability.synthetic import SyntheticSeasonSpec, generate_season_games
+
+
+def _fake_cfg():
+    return SustainabilityConfig(
+        model_version=DEFAULT_CONFIG['model_version'],
+        weights=DEFAULT_CONFIG['weights_json'],
+        toggles=DEFAULT_CONFIG['toggles_json'],
+        constants=DEFAULT_CONFIG['constants_json'],
+        sd_mode='fixed',
+        freshness_days=DEFAULT_CONFIG['freshness_days'],
+        config_hash='testhash',
+        source='default',
+    )
+
+
+def _scored_frame():
+    games = generate_season_games(SyntheticSeasonSpec(n_players=15, n_games=8))
+    cfg = _fake_cfg()
+    result = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, player_priors_rows=[], materialize_rows=False)
+    return result['frame'], cfg
+
+
+def test_lazy_view_matches_eager_components():
+    frame, cfg = _scored_frame()
+    view = frame.column('components_json')
+    assert isinstance(view, ComponentsView)
+    metrics = view.metrics
+    eager = WindowFrame.from_columns({k: list(v) for k, v in frame.columns.items() if k != 'components_json'})
+    attach_components_json_frame(eager, metrics=metrics, weights=cfg.weights, extreme_threshold=view.extreme_threshold)
+    expected = eager.column('components_json')
+    assert view.to_list() == expected
+    assert view[-1] == expected[-1] and view[2:5] == expected[2:5]
+    # rows read through the frame materialize the same payload
+    assert frame.rows_view()[3]['components_json'] == expected[3]
+    assert frame.take([5, 1]).column('components_json').to_list() == [expected[5], expected[1]]
+
+
+def test_binary_encoding_round_trip():
+    frame, _ = _scored_frame()
+    view = frame.column('components_json')
+    for compress in (True, False):
+        decoded = ComponentsView.decode(view.encode(compress=compress))
+        assert decoded.to_list() == view.to_list()
+    assert len(view.encode()) < len(pickle.dumps(view.to_list()))
+
+
+def test_mixed_type_columns_round_trip():
+    frame = WindowFrame.from_columns({
+        'sh_pct': [0.1, None, 3, 0.0],
+        'z_sh_pct': [1.5, None, -4.2, float('inf')],
+        'r_sh_pct': [None, None, None, None],
+        'contrib_sh_pct': [0.2, None, -0.3, 0.0],
+        'shots': [10, 0, 2**62, 1],
+        'rookie_status': [True, None, 'R', False],
+    })
+    attach_components_view_frame(frame, metrics=['sh_pct'], weights={'sh_pct': 0.5}, include_missing=False)
+    view = frame.column('components_json')
+    rows = view.to_list()
+    assert rows[1] == {}
+    assert rows[2]['sh_pct']['extreme'] is True and rows[2]['sh_pct']['obs'] == 3
+    decoded = ComponentsView.decode(view.encode()).to_list()
+    assert decoded == rows
+    assert type(decoded[2]['sh_pct']['obs']) is int and type(decoded[0]['sh_pct']['obs']) is float
@@ -23,3 +23,98 @@ def test_assign_quintiles_provisional_when_no_snapshot():
     assigned = assign_quintiles(rows, snapshot=None, window_filter='GAME')
     assert assigned[0]['quintile'] is None
     assert assigned[0]['provisional_tier'] is True
+
+
+def _snap(window_type, t20, t40, t60, t80):
+    from lib.sustainability.distribution import DistributionSnapshot
+    return DistributionSnapshot(window_type, 1, 'h', 10, t20, t40, t60, t80, '2025-01-01T00:00:00+00:00')
+
+
+def test_tier_scores_matches_rule_at_thresholds():
+    from lib.sustainability.distribution import _quintile, tier_scores
+    snaps = [_snap('GAME', 20.0, 40.0, 60.0, 80.0), _snap('GAME', 30.0, 30.0, 70.0, 70.0), _snap('GAME', 50.0, 40.0, 90.0, 10.0)]
+    scores = [0, 19.999, 20, 30, 40, 40.0001, 59, 60, 70, 80, 100, float('nan'), None, float('inf')]
+    for snap in snaps:
+        quintiles, provisional = tier_scores(scores, snap)
+        expected = [None if s is None else _quintile(s, snap) for s in scores]
+        assert quintiles == expected
+        assert provisional == [s is None for s in scores]
+    assert tier_scores([10, None], None) == ([None, None], [True, True])
+    # mostly-distinct float column takes the per-row path
+    import random
+    rng = random.Random(1)
+    floats = [rng.uniform(0, 100) for _ in range(10000)] + [20.0, 80.0, None]
+    snap = snaps[0]
+    assert tier_scores(floats, snap)[0] == [None if s is None else _quintile(s, snap) for s in floats]
+
+
+def test_tier_all_window_types_in_one_pass():
+    from lib.sustainability.distribution import assign_quintiles_by_window_frame
+    from lib.sustainability.frame import WindowFrame
+    rows = []
+    for wt in ('GAME', 'G5', 'G10', 'STD'):
+        for i, s in enumerate([10, 25, 40, 55, 70, 85, None], start=1):
+            rows.append({'player_id': i, 'window_type': wt, 'score': s})
+    snaps = {wt: build_distribution_snapshot(rows, wt, 1, 'h') for wt in ('GAME', 'G5', 'G10')}
+    snaps['STD'] = None
+    expected = rows
+    for wt, snap in snaps.items():
+        expected = assign_quintiles(expected, snap, window_filter=wt)
+    frame = assign_quintiles_by_window_frame(WindowFrame.from_rows(rows), snaps)
+    assert frame.to_rows() == expected
+    frame = assign_quintiles_by_window_frame(WindowFrame.from_rows(rows), [s for s in snaps.values() if s])
+    assert frame.to_rows() == [r if r['window_type'] != 'STD' else {k: v for k, v in r.items() if k not in ('quintile', 'provisional_tier')} for r in expected]
+
+
+def test_grouped_snapshots_and_tiers_match_per_group_calls():
+    from lib.sustainability.distribution import (
+        assign_quintiles_grouped_frame,
+        build_grouped_sketches_frame,
+        build_grouped_snapshots,
+        merge_group_sketches,
+    )
+    from lib.sustainability.frame import WindowFrame
+    rows = []
+    for sid in (2024, 2025):
+        for wt in ('GAME', 'STD'):
+            for i in range(1, 21):
+                pos = 'D' if i % 3 == 0 else ('F' if i % 5 else None)
+                rows.append({'player_id': i, 'season_id': sid, 'position_code': pos, 'window_type': wt,
+                             'score': None if i == 7 else (i * 7 + sid) % 101})
+    frame = WindowFrame.from_rows(rows)
+    sketches = build_grouped_sketches_frame(frame, by_position=True, by_season=True)
+    snaps = build_grouped_snapshots(sketches, 1, 'h')
+    assert set(snaps) == {(wt, pos, sid) for wt in ('GAME', 'STD') for pos in ('F', 'D') for sid in (2024, 2025)}
+    for (wt, pos, sid), snap in snaps.items():
+        group = [r for r in rows if r['window_type'] == wt and (r['position_code'] or 'F') == pos and r['season_id'] == sid]
+        direct = build_distribution_snapshot(group, wt, 1, 'h')
+        assert (snap.t20, snap.t40, snap.t60, snap.t80, snap.n) == (direct.t20, direct.t40, direct.t60, direct.t80, direct.n)
+        assert (snap.position_code, snap.season_id) == (pos, sid)
+        tiered = assign_quintiles(group, direct, window_filter=wt)
+        by_id = {r['player_id']: r for r in tiered}
+        out = assign_quintiles_grouped_frame(WindowFrame.from_rows(group), snaps, by_season=True).to_rows()
+        assert [r['quintile'] for r in out] == [by_id[r['player_id']]['quintile'] for r in group]
+    game = build_distribution_snapshot(rows, 'GAME', 1, 'h')
+    merged = merge_group_sketches(sketches, 'GAME').quantiles([0.2, 0.4, 0.6, 0.8])
+    assert merged == [game.t20, game.t40, game.t60, game.t80]
+
+
+def test_grouped_sketches_fold_frames_without_buffering_values():
+    from lib.sustainability.distribution import build_grouped_sketches_frame
+    from lib.sustainability.frame import WindowFrame
+    frames = [
+        WindowFrame.from_rows([
+            {'window_type': 'GAME', 'position_code': 'F', 'score': (p * 1000 + i) / 7}
+            for i in range(1000)
+        ])
+        for p in range(10)
+    ]
+    sketches = {}
+    for frame in frames:
+        assert build_grouped_sketches_frame(frame, sketches=sketches) is sketches
+    sketch = sketches[('GAME', 'F', None)]
+    assert sketch.n == 10000
+    # Past the exact limit the group is held as a bounded KLL sketch, not its 10000 values
+    assert not sketch.is_exact and sum(len(level) for level in sketch.levels) < 10000
+    whole = build_grouped_sketches_frame(WindowFrame.from_rows([r for f in frames for r in f.to_rows()]))
+    assert whole[('GAME', 'F', None)].n == sketch.n
@@ -1,8 +1,10 @@
 from unittest.mock import Mock
 
+import pytest
 import requests
 
 from api import fetch_team_table as team_table_module
+from lib import http_client
 from api.fetch_team_table import app as standalone_app
 from api.index import app as aggregate_app
 
@@ -28,6 +30,19 @@ TEAM_TABLE_HTML = """
 """
 
 
+@pytest.fixture(autouse=True)
+def _empty_team_table_cache(monkeypatch):
+    if team_table_module.team_table_cache is not None:
+        team_table_module.team_table_cache.clear()
+    monkeypatch.setattr(http_client, "_default_client", http_client.HttpClient(sleep=lambda _s: None))
+    yield
+
+
+def _upstream(monkeypatch, request):
+    # Every upstream call goes through the shared client's session
+    monkeypatch.setattr(http_client.get_client().session, "request", request)
+
+
 def _responses(path: str):
     standalone_response = standalone_app.test_client().get(
         f"/api/fetch_team_table?{path}"
@@ -52,7 +67,7 @@ def test_both_entrypoints_serialize_one_success_payload(monkeypatch):
     upstream = Mock(status_code=200, text=TEAM_TABLE_HTML)
     upstream.raise_for_status.return_value = None
     get = Mock(return_value=upstream)
-    monkeypatch.setattr(team_table_module.requests, "get", get)
+    _upstream(monkeypatch, get)
 
     payload = _assert_same_json_response(_responses(QUERY), 200)
 
@@ -69,7 +84,27 @@ def test_both_entrypoints_serialize_one_success_payload(monkeypatch):
     assert payload["debug"]["Resolved from_season"] == "20252026"
     assert payload["debug"]["Resolved thru_season"] == "20252026"
     assert "error" not in payload
+    # The second entrypoint is served from the shared response cache
+    assert get.call_count == 1
+
+
+def test_repeated_requests_are_served_from_cache(monkeypatch):
+    monkeypatch.setenv("NST_KEY", "test-key")
+    upstream = Mock(status_code=200, text=TEAM_TABLE_HTML)
+    upstream.raise_for_status.return_value = None
+    get = Mock(return_value=upstream)
+    _upstream(monkeypatch, get)
+    client = aggregate_app.test_client()
+
+    first = client.get(f"/fetch_team_table?{QUERY}")
+    second = client.get(f"/fetch_team_table?{QUERY}")
+    other = client.get(f"/fetch_team_table?{QUERY.replace('sit=5v5', 'sit=pk')}")
+
+    assert (first.headers["X-Cache"], second.headers["X-Cache"], other.headers["X-Cache"]) == ("miss", "hit", "miss")
+    assert first.get_json() == second.get_json()
     assert get.call_count == 2
+    stats = client.get("/healthz").get_json()["cache"]["team_table"]
+    assert (stats["hits"], stats["misses"]) == (1, 2)
 
 
 def test_both_entrypoints_return_the_same_invalid_request_shape():
@@ -90,7 +125,7 @@ def test_missing_dependency_is_not_embedded_in_http_200(monkeypatch):
         lambda _keys: None,
     )
     get = Mock()
-    monkeypatch.setattr(team_table_module.requests, "get", get)
+    _upstream(monkeypatch, get)
 
     payload = _assert_same_json_response(_responses(QUERY), 503)
 
@@ -100,15 +135,14 @@ def test_missing_dependency_is_not_embedded_in_http_200(monkeypatch):
 
 def test_upstream_timeout_is_a_named_gateway_timeout(monkeypatch):
     monkeypatch.setenv("NST_KEY", "test-key")
-    monkeypatch.setattr(
-        team_table_module.requests,
-        "get",
-        Mock(side_effect=requests.exceptions.Timeout("timed out")),
-    )
+    get = Mock(side_effect=requests.exceptions.Timeout("timed out"))
+    _upstream(monkeypatch, get)
 
     payload = _assert_same_json_response(_responses(QUERY), 504)
 
     assert payload["error"]["code"] == "upstream_timeout"
+    # Failures are not cached: each entrypoint retried upstream
+    assert get.call_count == 2
 
 
 def test_upstream_http_failure_is_a_named_bad_gateway(monkeypatch):
@@ -117,7 +151,7 @@ def test_upstream_http_failure_is_a_named_bad_gateway(monkeypatch):
     upstream.raise_for_status.side_effect = requests.exceptions.HTTPError(
         response=upstream
     )
-    monkeypatch.setattr(team_table_module.requests, "get", Mock(return_value=upstream))
+    _upstream(monkeypatch, Mock(return_value=upstream))
 
     payload = _assert_same_json_response(_responses(QUERY), 502)
 
@@ -129,7 +163,7 @@ def test_missing_upstream_table_is_a_named_parser_failure(monkeypatch):
     monkeypatch.setenv("NST_KEY", "test-key")
     upstream = Mock(status_code=200, text="<html><body>No table</body></html>")
     upstream.raise_for_status.return_value = None
-    monkeypatch.setattr(team_table_module.requests, "get", Mock(return_value=upstream))
+    _upstream(monkeypatch, Mock(return_value=upstream))
 
     payload = _assert_same_json_response(_responses(QUERY), 502)
 
@@ -141,10 +175,10 @@ def test_parser_exception_is_a_named_bad_gateway(monkeypatch):
     monkeypatch.setenv("NST_KEY", "test-key")
     upstream = Mock(status_code=200, text=TEAM_TABLE_HTML)
     upstream.raise_for_status.return_value = None
-    monkeypatch.setattr(team_table_module.requests, "get", Mock(return_value=upstream))
+    _upstream(monkeypatch, Mock(return_value=upstream))
     monkeypatch.setattr(
         team_table_module,
-        "BeautifulSoup",
+        "parse_team_table",
         Mock(side_effect=ValueError("invalid markup")),
     )
 
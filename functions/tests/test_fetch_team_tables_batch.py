@@ -0,0 +1,127 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from api import fetch_team_table as team_table_module
+from api.fetch_team_table import app as standalone_app
+from api.index import app as aggregate_app
+from lib import http_client
+
+TEAM_TABLE_HTML = """
+<table id="teams">
+  <thead><tr><th>Team</th><th>GP</th><th>CF%</th></tr></thead>
+  <tbody><tr><td>Boston Bruins</td><td>10</td><td>52.5</td></tr></tbody>
+</table>
+"""
+
+BODY = {
+    "from_season": "20252026",
+    "thru_season": "20252026",
+    "specs": [
+        {"sit": sit, "rate": "n", "fd": "2026-01-14", "td": "2026-01-14"}
+        for sit in ("pk", "pp", "5v5", "all")
+    ],
+}
+
+
+class SlowSession:
+    """Stands in for the shared client's requests.Session: each request takes `delay` seconds."""
+
+    def __init__(self, delay=0.2, fail_sits=()):
+        self.delay = delay
+        self.fail_sits = fail_sits
+        self.urls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, timeout=None):
+        with self._lock:
+            self.urls.append(url)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if any(f"sit={sit}&" in url for sit in self.fail_sits):
+            raise requests.exceptions.Timeout("timed out")
+        upstream = Mock(status_code=200, text=TEAM_TABLE_HTML)
+        upstream.raise_for_status.return_value = None
+        return upstream
+
+
+@pytest.fixture(autouse=True)
+def _env(monkeypatch):
+    monkeypatch.setenv("NST_KEY", "test-key")
+    if team_table_module.team_table_cache is not None:
+        team_table_module.team_table_cache.clear()
+    yield
+
+
+def _use_session(monkeypatch, session):
+    monkeypatch.setattr(http_client, "_default_client", http_client.HttpClient(sleep=lambda _s: None))
+    monkeypatch.setattr(http_client.get_client(), "session", session)
+
+
+def test_batch_fetches_specs_concurrently_over_shared_client(monkeypatch):
+    session = SlowSession(delay=0.2)
+    _use_session(monkeypatch, session)
+
+    t0 = time.perf_counter()
+    response = aggregate_app.test_client().post("/fetch_team_tables", json=BODY)
+    elapsed = time.perf_counter() - t0
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert [entry["spec"]["sit"] for entry in payload["data"]] == ["pk", "pp", "5v5", "all"]
+    assert all(entry["status_code"] == 200 and entry["cache"] == "miss" for entry in payload["data"])
+    assert payload["data"][2]["data"] == [
+        {"date": "2026-01-14", "situation": "5v5", "Team": "Boston Bruins", "GP": "10", "CFPct": 52.5}
+    ]
+    assert payload["debug"]["Succeeded"] == 4
+    assert len(session.urls) == 4 and session.max_active > 1
+    assert elapsed < 0.2 * 4 * 0.75
+    metrics = http_client.get_client().metrics()["data.naturalstattrick.com"]
+    assert metrics["requests"] == 4 and metrics["max_in_flight"] > 1
+
+
+def test_both_entrypoints_return_the_same_batch_payload(monkeypatch):
+    _use_session(monkeypatch, SlowSession(delay=0))
+    standalone = standalone_app.test_client().post("/api/fetch_team_table/batch", json=BODY)
+    aggregate = aggregate_app.test_client().post("/fetch_team_tables", json=BODY)
+
+    assert standalone.status_code == aggregate.status_code == 200
+    first, second = standalone.get_json(), aggregate.get_json()
+    first["debug"].pop("Duration ms")
+    second["debug"].pop("Duration ms")
+    assert [e["cache"] for e in second["data"]] == ["hit"] * 4
+    for entry in first["data"] + second["data"]:
+        entry.pop("cache")
+    assert first == second
+
+
+def test_partial_and_total_failures_report_per_spec_status(monkeypatch):
+    _use_session(monkeypatch, SlowSession(delay=0, fail_sits=("pp",)))
+    partial = aggregate_app.test_client().post("/fetch_team_tables", json=BODY)
+    assert partial.status_code == 207
+    by_sit = {e["spec"]["sit"]: e for e in partial.get_json()["data"]}
+    assert by_sit["pp"]["status_code"] == 504
+    assert by_sit["pp"]["error"]["code"] == "upstream_timeout"
+    assert by_sit["pk"]["status_code"] == 200 and "error" not in by_sit["pk"]
+
+    team_table_module.team_table_cache.clear()
+    _use_session(monkeypatch, SlowSession(delay=0, fail_sits=("pk", "pp", "5v5", "all")))
+    failed = aggregate_app.test_client().post("/fetch_team_tables", json=BODY)
+    assert failed.status_code == 502
+    assert failed.get_json()["error"]["code"] == "batch_failed"
+
+
+@pytest.mark.parametrize("body", [None, {"specs": []}, {"specs": [{"sit": "pk"}]}, {"specs": [{"sit": "pk", "rate": "n"}] * 17}])
+def test_invalid_batch_bodies_are_rejected(monkeypatch, body):
+    _use_session(monkeypatch, SlowSession(delay=0))
+    response = aggregate_app.test_client().post("/fetch_team_tables", json=body)
+    assert response.status_code == 400
+    assert response.get_json()["error"]["code"] == "invalid_request"
@@ -0,0 +1,50 @@
+import pytest
+
+from lib.sustainability.frame import MISSING, WindowFrame
+
+
+def test_frame_round_trips_rows_with_sparse_keys():
+    rows = [
+        {'player_id': 1, 'window_type': 'GAME', 'score': 55, 'quintile': 2},
+        {'player_id': 1, 'window_type': 'G5', 'score': 60},
+    ]
+    frame = WindowFrame.from_rows(rows)
+    assert len(frame) == 2
+    assert frame.column('quintile') == [2, MISSING]
+    assert frame.get('quintile') == [2, None]
+    assert frame.to_rows() == rows
+
+
+def test_set_column_adds_in_place_and_checks_length():
+    frame = WindowFrame.from_columns({'player_id': [1, 2, 3]})
+    frame.set_column('z_sh_pct', [0.1, None, -0.2])
+    assert 'z_sh_pct' in frame
+    assert frame.get('missing_col') == [None, None, None]
+    with pytest.raises(ValueError):
+        frame.set_column('bad', [1])
+
+
+def test_rows_view_is_lazy_and_limited_to_columns():
+    frame = WindowFrame.from_columns({'player_id': [1, 2], 'score': [10, 20]})
+    view = frame.rows_view(['player_id'])
+    frame.set_column('extra', ['a', 'b'])
+    assert len(view) == 2
+    assert view[-1] == {'player_id': 2}
+    assert list(view) == [{'player_id': 1}, {'player_id': 2}]
+    assert frame.take([1]).to_rows() == [{'player_id': 2, 'score': 20, 'extra': 'b'}]
+
+
+def test_rows_view_keeps_columns_replaced_after_it_was_taken():
+    from lib.sustainability.distribution import DistributionSnapshot, assign_quintiles_frame
+    frame = WindowFrame.from_columns({'window_type': ['GAME', 'GAME', 'G5'], 'score': [10, 90, 50]})
+    low = DistributionSnapshot(window_type='GAME', model_version=1, config_hash='h', t20=20, t40=40, t60=60, t80=80, n=100, created_at='')
+    assign_quintiles_frame(frame, low)
+    before = frame.rows_view()
+    first = before.to_list()
+
+    high = DistributionSnapshot(window_type='GAME', model_version=1, config_hash='h', t20=95, t40=96, t60=97, t80=98, n=100, created_at='')
+    assign_quintiles_frame(frame, high)
+
+    assert list(before) == first == before.to_list()
+    assert 'quintile' not in before[2]
+    assert [r.get('quintile') for r in frame.rows_view()] != [r.get('quintile') for r in first]
@@ -3,6 +3,15 @@ import pytest
 from lib.sustainability.pipeline import OfflinePersistenceDisabledError, run_full_scoring_pipeline
 from lib.sustainability.config_loader import DEFAULT_CONFIG, SustainabilityConfig
 from lib.sustainability.priors import LeaguePriorRow
+from lib.sustainability.constants import FALLBACK_SD_CONSTANTS
+from lib.sustainability.windows import build_all_players_windows
+from lib.sustainability.zscores import annotate_zscores
+from lib.sustainability.reliability import compute_reliability
+from lib.sustainability.finishing import annotate_finishing_residuals
+from lib.sustainability.clipping import apply_soft_clipping
+from lib.sustainability.contributions import compute_contributions
+from lib.sustainability.scoring import apply_logistic_scoring, attach_components_json
+from lib.sustainability.distribution import build_distribution_snapshot, assign_quintiles
 
 
 def _fake_cfg():
@@ -59,6 +68,7 @@ def test_run_full_scoring_pipeline_basic():
     assert 'obs' in fr and 'exp' in fr and 'extreme' in fr and 'weight' in fr
     # Snapshot & quintile
     assert result['snapshot'] is not None
+    assert result['snapshot_sketch']['n'] == sum(1 for r in result['windows_scored'] if r['window_type'] == 'GAME')
     if sample['window_type'] == 'GAME':
         assert 'quintile' in sample
 
@@ -66,3 +76,101 @@ def test_run_full_scoring_pipeline_basic():
 def test_run_full_scoring_pipeline_rejects_persistence():
     with pytest.raises(OfflinePersistenceDisabledError):
         run_full_scoring_pipeline(season_id=2025, games=[], persist=True)
+
+
+def _staged_rows(games, priors, cfg):
+    metrics = list(cfg.weights.keys())
+    rows = build_all_players_windows(games, freshness_days=cfg.freshness_days)
+    rows = annotate_zscores(rows, priors, FALLBACK_SD_CONSTANTS)
+    rows = compute_reliability(rows, cfg.k_r)
+    rows = annotate_finishing_residuals(rows, FALLBACK_SD_CONSTANTS)
+    rows = apply_soft_clipping(rows, metrics=metrics, c=cfg.constants['c'])
+    rows = compute_contributions(rows, weights=cfg.weights, metrics=metrics)
+    rows = apply_logistic_scoring(rows, guardrails=cfg.constants)
+    rows = attach_components_json(rows, metrics=metrics, weights=cfg.weights)
+    snap = build_distribution_snapshot(rows, 'GAME', cfg.model_version, cfg.config_hash)
+    return assign_quintiles(rows, snap)
+
+
+def test_frame_pipeline_matches_staged_row_functions():
+    games = []
+    for pid, pos in ((1, 'F'), (2, 'D'), (3, 'F')):
+        for i in range(12):
+            games.append({
+                'player_id': pid, 'season_id': 2025, 'position_code': pos,
+                'game_id': f'G{pid}-{i}', 'game_date': f'2025-01-{i + 1:02d}',
+                'shots': (i * pid) % 5, 'goals': (i + pid) % 2, 'onice_goals_for': (i + pid) % 3,
+                'onice_shots_for': 8 + (i * 3 + pid) % 7, 'points': i % 2, 'ixg': 0.1 * ((i + pid) % 4),
+                'icf': 3, 'hdcf': 1,
+            })
+    priors = [
+        {'player_id': pid, 'stat_code': m, 'post_mean': mean}
+        for pid in (1, 2)
+        for m, mean in (('sh_pct', 0.1), ('oish_pct', 0.08), ('ipp', 0.6))
+    ]
+    cfg = _fake_cfg()
+    result = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=priors)
+    assert result['windows_scored'] == _staged_rows(games, priors, cfg)
+    assert len(result['windows']) == len(result['windows_scored'])
+    assert 'z_sh_pct' in result['windows_enriched'][0] and 'score' not in result['windows_enriched'][0]
+
+
+def test_sharded_pipeline_is_identical_for_any_worker_count():
+    games = []
+    for pid in range(1, 9):
+        for i in range(6):
+            games.append({
+                'player_id': pid, 'season_id': 2025, 'position_code': 'D' if pid % 3 == 0 else 'F',
+                'game_id': f'G{i}', 'game_date': f'2025-01-{i * 2 + 1:02d}',
+                'shots': (i + pid) % 5, 'goals': i % 2, 'onice_goals_for': 1 + pid % 2,
+                'onice_shots_for': 10 + i, 'points': pid % 2, 'ixg': 0.05 * (i + pid), 'icf': 3, 'hdcf': 1,
+            })
+    priors = [
+        {'player_id': pid, 'stat_code': m, 'post_mean': 0.1 + 0.01 * pid}
+        for pid in range(1, 9) for m in ('sh_pct', 'oish_pct', 'ipp')
+    ]
+    cfg = _fake_cfg()
+    serial = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=priors)
+    sharded = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=priors, workers=3)
+    assert sharded['windows_scored'] == serial['windows_scored']
+    assert list(sharded['windows_enriched']) == list(serial['windows_enriched'])
+    strip = lambda snap: {k: v for k, v in snap.items() if k != 'created_at'}
+    assert strip(sharded['snapshot']) == strip(serial['snapshot'])
+
+
+def test_pipeline_accepts_prebuilt_prior_index():
+    games = [
+        {'player_id': pid, 'season_id': 2025, 'position_code': 'F', 'game_id': f'G{i}', 'game_date': f'2025-01-{i + 1:02d}',
+         'shots': 2 + i % 3, 'goals': i % 2, 'onice_goals_for': 1, 'onice_shots_for': 9, 'points': 1, 'ixg': 0.3, 'icf': 3, 'hdcf': 1}
+        for pid in (1, 2) for i in range(5)
+    ]
+    priors = [{'player_id': 1, 'stat_code': m, 'post_mean': 0.1} for m in ('sh_pct', 'oish_pct', 'ipp')]
+    cfg = _fake_cfg()
+    first = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=priors)
+    index = first['prior_index']
+    again = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=index, workers=2)
+    assert again['prior_index'] is index
+    assert again['windows_scored'] == first['windows_scored']
+
+
+def test_grouped_snapshots_keep_game_snapshot_and_tier_every_group():
+    games = []
+    for pid in range(1, 9):
+        for i in range(6):
+            games.append({
+                'player_id': pid, 'season_id': 2025, 'position_code': 'D' if pid % 3 == 0 else 'F',
+                'game_id': f'G{i}', 'game_date': f'2025-01-{i * 2 + 1:02d}',
+                'shots': (i + pid) % 5, 'goals': i % 2, 'onice_goals_for': 1 + pid % 2,
+                'onice_shots_for': 10 + i, 'points': pid % 2, 'ixg': 0.05 * (i + pid), 'icf': 3, 'hdcf': 1,
+            })
+    cfg = _fake_cfg()
+    plain = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=[])
+    grouped = run_full_scoring_pipeline(
+        season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=[],
+        grouped_snapshots=True, tier_by_group=True,
+    )
+    strip = lambda snap: {k: v for k, v in snap.items() if k != 'created_at'}
+    assert strip(grouped['snapshot']) == strip(plain['snapshot'])
+    assert plain['snapshots'] is None and len(grouped['snapshots']) == 8
+    assert all(r['quintile'] in (1, 2, 3, 4, 5) for r in grouped['windows_scored'])
+    assert all('quintile' not in r for r in plain['windows_scored'] if r['window_type'] != 'GAME')
@@ -0,0 +1,67 @@
+import pytest
+
+from lib.sustainability.config_loader import DEFAULT_CONFIG, SustainabilityConfig
+from lib.sustainability.constants import FALLBACK_SD_CONSTANTS
+from lib.sustainability.frame import WindowFrame
+from lib.sustainability.fused import score_frame_fused
+from lib.sustainability.pipeline import run_full_scoring_pipeline, score_window_frame
+from lib.sustainability.synthetic import SyntheticSeasonSpec, generate_season_games
+from lib.sustainability.windows import build_window_frame
+
+
+def _fake_cfg(**toggles):
+    return SustainabilityConfig(
+        model_version=DEFAULT_CONFIG['model_version'],
+        weights=DEFAULT_CONFIG['weights_json'],
+        toggles={**DEFAULT_CONFIG['toggles_json'], **toggles},
+        constants=DEFAULT_CONFIG['constants_json'],
+        sd_mode='fixed',
+        freshness_days=DEFAULT_CONFIG['freshness_days'],
+        config_hash='testhash',
+        source='default',
+    )
+
+
+def _games():
+    return generate_season_games(SyntheticSeasonSpec(n_players=15, n_games=12, churn_rate=0.05))
+
+
+def _priors():
+    # Players 1-10 only, so later call-ups score without priors.
+    return [
+        {'player_id': pid, 'stat_code': m, 'post_mean': mean + 0.003 * pid}
+        for pid in range(1, 11)
+        for m, mean in (('sh_pct', 0.1), ('oish_pct', 0.08), ('ipp', 0.5))
+    ]
+
+
+@pytest.mark.parametrize('use_finishing', [True, False])
+@pytest.mark.parametrize('metrics', [None, ['sh_pct', 'ipp']])
+def test_fused_kernel_matches_staged_frame(use_finishing, metrics):
+    cfg = _fake_cfg(use_finishing_residuals=use_finishing)
+    base = build_window_frame(_games(), freshness_days=cfg.freshness_days)
+    staged = WindowFrame.from_columns({k: list(v) for k, v in base.columns.items()})
+    fused = WindowFrame.from_columns({k: list(v) for k, v in base.columns.items()})
+    score_window_frame(staged, cfg, FALLBACK_SD_CONSTANTS, _priors(), metrics=metrics, kernel='staged')
+    score_window_frame(fused, cfg, FALLBACK_SD_CONSTANTS, _priors(), metrics=metrics, kernel='fused')
+    assert fused.column_names == staged.column_names
+    assert fused.to_rows() == staged.to_rows()
+
+
+def test_full_pipeline_fused_kernel_is_identical():
+    cfg = _fake_cfg()
+    kwargs = dict(season_id=2025, games=_games(), cfg=cfg, league_priors=[], player_priors_rows=_priors())
+    staged = run_full_scoring_pipeline(**kwargs)
+    fused = run_full_scoring_pipeline(kernel='fused', **kwargs)
+    sharded = run_full_scoring_pipeline(kernel='fused', workers=2, **kwargs)
+    assert fused['windows_scored'] == staged['windows_scored']
+    assert sharded['windows_scored'] == staged['windows_scored']
+    assert list(fused['windows_enriched']) == list(staged['windows_enriched'])
+    with pytest.raises(ValueError):
+        run_full_scoring_pipeline(kernel='simd', **kwargs)
+
+
+def test_fused_kernel_rejects_non_positive_c():
+    frame = WindowFrame.from_rows([{'player_id': 1, 'position_code': 'F', 'sh_pct': 0.1, 'shots': 3}])
+    with pytest.raises(ValueError):
+        score_frame_fused(frame, [], FALLBACK_SD_CONSTANTS, k_r={}, c=0, weights={}, guardrails={}, scoring_metrics=[])
@@ -0,0 +1,133 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from lib.http_client import HttpClient, RetryPolicy, parse_retry_after
+
+
+class _Upstream(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.peers = set()
+        self.script = []  # (status, headers) consumed per request, then 200
+        self.hits = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self):
+        server = self.server
+        with server.lock:
+            server.peers.add(self.client_address)
+            server.hits += 1
+            status, headers = server.script.pop(0) if server.script else (200, {})
+        body = b'{"ok": true}'
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._respond()
+
+
+@pytest.fixture
+def upstream():
+    server = _Upstream()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_repeated_calls_reuse_one_connection(upstream):
+    client = HttpClient()
+    for _ in range(5):
+        assert client.get(upstream.url + '/t').json() == {'ok': True}
+    assert len(upstream.peers) == 1
+    stats = client.metrics()[upstream.url.split('//')[1]]
+    assert stats['requests'] == 5 and stats['statuses'] == {'200': 5}
+
+
+def test_retry_after_is_honoured_then_succeeds(upstream):
+    sleeps = []
+    client = HttpClient(sleep=sleeps.append)
+    upstream.script = [(503, {'Retry-After': '2'}), (429, {})]
+    response = client.get(upstream.url)
+    assert response.status_code == 200 and upstream.hits == 3
+    assert sleeps[0] == 2.0
+    assert 0.5 <= sleeps[1] <= 1.5  # backoff_base * 2 with +/-50% jitter
+    assert client.metrics()[upstream.url.split('//')[1]]['retries'] == 2
+
+
+def test_long_retry_after_and_posts_are_not_retried(upstream):
+    sleeps = []
+    client = HttpClient(sleep=sleeps.append, retry=RetryPolicy(retry_after_max=5))
+    upstream.script = [(429, {'Retry-After': '60'})]
+    assert client.get(upstream.url).status_code == 429
+    upstream.script = [(503, {})]
+    assert client.post(upstream.url, json={'step': 'score'}).status_code == 503
+    assert sleeps == [] and upstream.hits == 2
+
+
+def test_connection_errors_retry_with_backoff_then_raise():
+    sleeps = []
+    client = HttpClient(sleep=sleeps.append, rand=lambda: 0.5, retry=RetryPolicy(retries=2, backoff_base=0.1))
+    with pytest.raises(requests.ConnectionError):
+        client.get('http://127.0.0.1:9/unreachable', timeout=0.5)
+    assert sleeps == [0.1, 0.2]
+    assert client.metrics()['127.0.0.1:9']['errors'] == 3
+
+
+def test_per_host_concurrency_is_capped(upstream):
+    client = HttpClient(max_per_host=2)
+    active, peak, lock = [0], [0], threading.Lock()
+    real = client.session.request
+
+    def tracked(*args, **kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            threading.Event().wait(0.05)
+            return real(*args, **kwargs)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    client.session.request = tracked
+    threads = [threading.Thread(target=client.get, args=(upstream.url,)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert peak[0] == 2
+    assert client.metrics()[upstream.url.split('//')[1]]['max_in_flight'] == 2
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    now = datetime(2026, 1, 14, 12, 0, tzinfo=timezone.utc)
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=30), usegmt=True), now=now) == 30.0
+    assert parse_retry_after('soon') is None and parse_retry_after(None) is None
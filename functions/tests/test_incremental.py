@@ -0,0 +1,161 @@
+import pytest
+
+from lib.sustainability.config_loader import DEFAULT_CONFIG, SustainabilityConfig
+from lib.sustainability.incremental import IncrementalOrderError, IncrementalWindowState, run_incremental_scoring
+from lib.sustainability.orchestrator import orchestrate_full_run
+from lib.sustainability.pipeline import run_full_scoring_pipeline
+from lib.sustainability.prior_cache import PriorCache
+from lib.sustainability.windows import build_all_players_windows
+
+
+def _cfg():
+    return SustainabilityConfig(
+        model_version=DEFAULT_CONFIG['model_version'],
+        weights=DEFAULT_CONFIG['weights_json'],
+        toggles=DEFAULT_CONFIG['toggles_json'],
+        constants=DEFAULT_CONFIG['constants_json'],
+        sd_mode='fixed',
+        freshness_days=10,
+        config_hash='hash',
+        source='default',
+    )
+
+
+def _season():
+    games = []
+    for day in range(1, 29):
+        for pid in (1, 2, 3):
+            if (day + pid) % 3 == 0:
+                continue  # not every player plays every day
+            games.append({
+                'player_id': pid, 'season_id': 2025, 'position_code': 'D' if pid == 3 else 'F',
+                'game_id': f'G{day}', 'game_date': f'2025-01-{day:02d}',
+                'shots': (day * pid) % 6, 'goals': (day + pid) % 2, 'onice_goals_for': (day % 3) + 1,
+                'onice_shots_for': 9 + (day * pid) % 5, 'points': day % 2, 'ixg': 0.07 * ((day * pid) % 9),
+                'icf': 4, 'hdcf': 1,
+            })
+    return games
+
+
+PRIORS = [
+    {'player_id': pid, 'stat_code': m, 'post_mean': mean}
+    for pid in (1, 2, 3)
+    for m, mean in (('sh_pct', 0.1), ('oish_pct', 0.08), ('ipp', 0.6))
+]
+
+
+def test_daily_updates_match_full_rebuild(tmp_path):
+    games = _season()
+    state_path = str(tmp_path / 'state.json')
+    emitted = []
+    for day in range(1, 29):
+        slate = [g for g in games if g['game_date'] == f'2025-01-{day:02d}']
+        state = IncrementalWindowState.load(state_path, freshness_days=10)
+        emitted.extend(state.update(slate).to_rows())
+        state.save(state_path)
+    full = build_all_players_windows(games, freshness_days=10)
+    key = lambda r: (r['player_id'], r['game_date'], r['window_type'])
+    assert sorted(emitted, key=key) == sorted(full, key=key)
+
+
+def test_incremental_scoring_emits_only_new_slate_rows(tmp_path):
+    games = _season()
+    cfg = _cfg()
+    state_path = str(tmp_path / 'state.json')
+    history = [g for g in games if g['game_date'] < '2025-01-28']
+    slate = [g for g in games if g['game_date'] == '2025-01-28']
+    run_incremental_scoring(history, state_path, cfg=cfg, player_priors_rows=PRIORS)
+    result = run_incremental_scoring(slate, state_path, cfg=cfg, player_priors_rows=PRIORS)
+
+    assert result['players_updated'] == sorted(g['player_id'] for g in slate)
+    assert len(result['windows_scored']) == len(slate) * 4
+    full = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=PRIORS, assign_tiers=False)
+    expected = [r for r in full['windows_scored'] if r['game_date'].isoformat() == '2025-01-28']
+    strip = lambda rows: [{k: v for k, v in r.items() if k not in ('quintile', 'provisional_tier')} for r in rows]
+    key = lambda r: (r['player_id'], r['window_type'])
+    assert sorted(strip(result['windows_scored']), key=key) == sorted(expected, key=key)
+
+
+def test_replayed_slate_leaves_state_unchanged(tmp_path):
+    games = _season()
+    state_path = str(tmp_path / 'state.json')
+    history = [g for g in games if g['game_date'] < '2025-01-20']
+    slate = [g for g in games if g['game_date'] == '2025-01-20']
+    state = IncrementalWindowState(freshness_days=10)
+    state.update(history)
+    first = state.update(slate)
+    state.save(state_path)
+    with open(state_path, encoding='utf-8') as fh:
+        saved = fh.read()
+
+    replay = state.update(slate)
+    state.save(state_path)
+
+    assert len(first) == len(slate) * 4
+    assert len(replay) == 0
+    assert state.duplicates_skipped == len(slate)
+    with open(state_path, encoding='utf-8') as fh:
+        assert fh.read() == saved
+    reloaded = IncrementalWindowState.load(state_path, freshness_days=10)
+    assert len(reloaded.update(slate)) == 0
+
+
+def test_out_of_order_game_requires_rebuild(tmp_path):
+    state = IncrementalWindowState(freshness_days=10)
+    games = _season()
+    state.update([g for g in games if g['game_date'] <= '2025-01-10'])
+    with pytest.raises(IncrementalOrderError):
+        state.update([g for g in games if g['game_date'] == '2025-01-05'])
+
+
+def test_orchestrator_incremental_uses_local_state(tmp_path):
+    slate = [g for g in _season() if g['game_date'] == '2025-01-02']
+    res = orchestrate_full_run(
+        season_id=2025,
+        games=slate,
+        cfg=_cfg(),
+        incremental=True,
+        incremental_state_path=str(tmp_path / 'state.json'),
+    )
+    assert res.total_rows_scored == len(slate) * 4
+    assert res.phases['incremental']['players_updated'] == len(slate)
+
+
+def test_incremental_snapshot_matches_full_rebuild(tmp_path):
+    games = _season()
+    cfg = _cfg()
+    state_path = str(tmp_path / 'state.json')
+    for day in range(1, 29):
+        slate = [g for g in games if g['game_date'] == f'2025-01-{day:02d}']
+        result = run_incremental_scoring(slate, state_path, cfg=cfg, player_priors_rows=PRIORS)
+
+    full = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, league_priors=[], player_priors_rows=PRIORS)
+    cuts = ('n', 't20', 't40', 't60', 't80')
+    assert {k: result['snapshot'][k] for k in cuts} == {k: full['snapshot'][k] for k in cuts}
+    expected = [r for r in full['windows_scored'] if r['game_date'].isoformat() == '2025-01-28']
+    key = lambda r: (r['player_id'], r['window_type'])
+    tiers = lambda rows: [(key(r), r.get('quintile'), r.get('provisional_tier')) for r in sorted(rows, key=key)]
+    assert tiers(result['windows_scored']) == tiers(expected)
+    assert not any(r.get('provisional_tier') for r in result['windows_scored'] if r['window_type'] == 'GAME')
+
+    other = SustainabilityConfig(**{**vars(cfg), 'config_hash': 'other'})
+    with pytest.raises(ValueError, match='rebuild required'):
+        run_incremental_scoring([], state_path, cfg=other, player_priors_rows=PRIORS)
+
+
+def test_orchestrator_incremental_builds_snapshot_and_uses_prior_cache(tmp_path):
+    games = _season()
+    state_path = str(tmp_path / 'state.json')
+    kwargs = dict(season_id=2025, cfg=_cfg(), incremental=True, incremental_state_path=state_path, prior_cache=PriorCache())
+    first = orchestrate_full_run(games=[g for g in games if g['game_date'] < '2025-01-28'], **kwargs)
+    res = orchestrate_full_run(games=[g for g in games if g['game_date'] == '2025-01-28'], **kwargs)
+
+    assert first.phases['prior_cache']['misses'] > 0
+    assert res.phases['prior_cache']['misses'] == 0 and res.phases['prior_cache']['memory_hits'] > 0
+    full = orchestrate_full_run(season_id=2025, games=games, cfg=_cfg())
+    assert res.snapshot_n == full.snapshot_n and res.snapshot_thresholds == full.snapshot_thresholds
+
+    with pytest.raises(ValueError, match='workers'):
+        orchestrate_full_run(games=games, workers=2, **kwargs)
+    with pytest.raises(ValueError, match='grouped'):
+        orchestrate_full_run(games=games, grouped_snapshots=True, **kwargs)
@@ -0,0 +1,73 @@
+from lib.sustainability.config_loader import DEFAULT_CONFIG, SustainabilityConfig
+from lib.sustainability.frame import WindowFrame
+from lib.sustainability.multi_season import run_multi_season_scoring, season_frame
+from lib.sustainability.pipeline import run_full_scoring_pipeline
+from lib.sustainability.player_priors import compute_player_posteriors, compute_player_posteriors_multi
+from lib.sustainability.priors import compute_league_beta_priors_multi
+from lib.sustainability.pipeline import _league_priors_map
+from lib.sustainability.synthetic import SyntheticSeasonSpec, aggregate_season_rows, generate_season_games
+
+
+def _fake_cfg():
+    return SustainabilityConfig(
+        model_version=DEFAULT_CONFIG['model_version'],
+        weights=DEFAULT_CONFIG['weights_json'],
+        toggles=DEFAULT_CONFIG['toggles_json'],
+        constants=DEFAULT_CONFIG['constants_json'],
+        sd_mode='fixed',
+        freshness_days=DEFAULT_CONFIG['freshness_days'],
+        config_hash='testhash',
+        source='default',
+    )
+
+
+def _seasons(first=2022, last=2025):
+    games = []
+    for sid in range(first, last + 1):
+        games.extend(generate_season_games(SyntheticSeasonSpec(
+            n_players=12, n_games=6, season_id=sid, seed=sid, start_date=f'{sid}-10-10', churn_rate=0.05,
+        )))
+    return games
+
+
+def test_multi_season_matches_per_season_pipeline():
+    cfg = _fake_cfg()
+    games = _seasons()
+    league_rows, player_rows = aggregate_season_rows(games)
+    seasons = [2024, 2025]
+    batch = run_multi_season_scoring(
+        seasons, games, cfg=cfg, league_aggregates=league_rows, player_season_rows=player_rows,
+    )
+    for sid in seasons:
+        single = run_full_scoring_pipeline(
+            sid,
+            [g for g in games if g['season_id'] == sid],
+            cfg=cfg,
+            league_priors=[p for p in batch['league_priors'] if p.season_id == sid],
+            player_priors_rows=compute_player_posteriors(
+                sid, _league_priors_map(batch['league_priors']), cfg, rows=player_rows,
+            ),
+            materialize_rows=False,
+        )
+        assert season_frame(batch, sid).to_rows() == single['frame'].to_rows()
+        snap = {k: v for k, v in batch['seasons'][sid]['snapshot'].items() if k != 'created_at'}
+        assert snap == {k: v for k, v in single['snapshot'].items() if k != 'created_at'}
+    lo, hi = batch['seasons'][2025]['row_range']
+    assert hi == len(batch['frame']) and lo == batch['seasons'][2024]['row_range'][1]
+
+
+def test_player_posteriors_multi_matches_single_target():
+    cfg = _fake_cfg()
+    league_rows, player_rows = aggregate_season_rows(_seasons())
+    priors = _league_priors_map(compute_league_beta_priors_multi([2024, 2025], None, cfg, aggregates=league_rows))
+    multi = compute_player_posteriors_multi([2024, 2025], priors, cfg, rows=player_rows)
+    for sid in (2024, 2025):
+        assert multi[sid] == compute_player_posteriors(sid, priors, cfg, rows=player_rows)
+
+
+def test_window_frame_concat_keeps_sparse_columns():
+    a = WindowFrame.from_rows([{'player_id': 1, 'score': 10.0}])
+    b = WindowFrame.from_rows([{'player_id': 2}, {'player_id': 3, 'score': 30.0}])
+    rows = WindowFrame.concat([a, b]).to_rows()
+    assert [r['player_id'] for r in rows] == [1, 2, 3]
+    assert rows[0]['score'] == 10.0 and 'score' not in rows[1] and rows[2]['score'] == 30.0
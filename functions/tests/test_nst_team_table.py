@@ -0,0 +1,75 @@
+import glob
+import os
+
+import pytest
+
+from lib.nst_team_table import (
+    PARSERS,
+    TeamTableNotFound,
+    _legacy_parse,
+    benchmark_parsers,
+    column_plan,
+    parse_team_table,
+)
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'fixtures', 'nst', '*.html')))
+
+
+def _pages():
+    out = []
+    for path in FIXTURES:
+        with open(path, encoding='utf-8') as fh:
+            out.append(fh.read())
+    return out
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_parsers_match_original_parse_on_fixture_pages(parser):
+    assert len(FIXTURES) == 3
+    for page in _pages():
+        expected = _legacy_parse(page, fd='2026-01-14', sit='5v5')
+        assert parse_team_table(page, fd='2026-01-14', sit='5v5', parser=parser) == expected
+
+
+def test_per_sixty_headers_are_cleaned_and_filtered():
+    page = next(p for p, path in zip(_pages(), FIXTURES) if path.endswith('pp_y.html'))
+    headers, rows = parse_team_table(page, sit='pp')
+    assert 'CF_perSixty' in headers and 'Point Pct' in headers
+    assert len(rows) == 32
+    assert 'CF' not in rows[0] and 'CF_perSixty' not in rows[0]
+    assert all(r['CFPct'] is None or 0 <= r['CFPct'] <= 100 for r in rows)
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_typed_values_and_short_rows(parser):
+    html = (
+        '<html><body><table id="other"><tr><td>x</td></tr></table>'
+        '<table id="teams"><thead><tr><th>Team</th><th>GP</th><th>TOI</th><th>CF%</th><th>PDO</th><th>W</th></tr></thead>'
+        '<tbody><tr><td><a href="#"> Boston Bruins </a></td><td>10</td><td>600:30</td><td>152.5</td><td>1.012</td><td>-</td></tr>'
+        '<tr><td>Dallas Stars</td><td>9</td></tr></tbody></table></body></html>'
+    )
+    _, rows = parse_team_table(html, fd='2026-01-14', sit='5v5', parser=parser, typed=True)
+    assert rows == [
+        {'date': '2026-01-14', 'situation': '5v5', 'Team': 'Boston Bruins', 'GP': 10, 'TOI': '600:30',
+         'CFPct': None, 'PDO': 1.012, 'W': None},
+        {'date': '2026-01-14', 'situation': '5v5', 'Team': 'Dallas Stars', 'GP': 9, 'TOI': None,
+         'CFPct': None, 'PDO': None, 'W': None},
+    ]
+    assert parse_team_table(html, parser=parser)[1][0]['GP'] == '10'
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_missing_table_raises(parser):
+    with pytest.raises(TeamTableNotFound):
+        parse_team_table('<html><table id="teams-summary"><tr><td>1</td></tr></table></html>', parser=parser)
+
+
+def test_column_plan_skips_unneeded_columns():
+    plan = column_plan(['', 'Team', 'ROW', 'CFPct'])
+    assert [(name, i) for name, i, _ in plan] == [('Team', 1), ('CFPct', 3)]
+
+
+def test_benchmark_reports_speedup_against_original_parse():
+    result = benchmark_parsers(_pages()[:1], repeats=1)
+    assert result['parsers']['legacy']['speedup'] == 1.0
+    assert set(result['parsers']) == {'legacy', *PARSERS}
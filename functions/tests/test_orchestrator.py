@@ -31,3 +31,16 @@ def test_orchestrate_full_run_basic():
     assert d['total_rows_scored'] > 0
     assert d['persisted_count'] == 0
     assert 'config' in d['phases'] and 'scoring_pipeline' in d['phases']
+
+
+def test_orchestrator_returns_grouped_snapshots():
+    from lib.sustainability.synthetic import SyntheticSeasonSpec, generate_season_games
+    games = generate_season_games(SyntheticSeasonSpec(n_players=20, n_games=8, season_id=2025, seed=3))
+    cfg = _fake_cfg()
+    res = orchestrate_full_run(season_id=2025, games=games, cfg=cfg, grouped_snapshots=True)
+    groups = {(s['window_type'], s['position_code']) for s in res.snapshots}
+    assert groups == {(wt, pos) for wt in ('GAME', 'G5', 'G10', 'STD') for pos in ('F', 'D')}
+    assert sum(s['n'] for s in res.snapshots if s['window_type'] == 'GAME') == res.snapshot_n
+    single = orchestrate_full_run(season_id=2025, games=games, cfg=cfg)
+    assert single.snapshots is None
+    assert single.snapshot_thresholds == res.snapshot_thresholds
@@ -0,0 +1,79 @@
+import pytest
+
+from lib.sustainability.config_loader import load_config
+from lib.sustainability.player_priors import compute_player_posteriors
+from lib.sustainability.posterior_arrays import (
+    build_player_season_counts,
+    compute_league_beta_priors_columns,
+    compute_posterior_columns,
+    posterior_columns_to_rows,
+    sweep_player_posteriors,
+)
+from lib.sustainability.priors import compute_league_beta_priors
+from lib.sustainability.synthetic import SyntheticSeasonSpec, aggregate_season_rows, generate_season_games
+
+
+def _season_rows():
+    games = []
+    for sid in (2022, 2023, 2024, 2025):
+        games.extend(generate_season_games(SyntheticSeasonSpec(
+            n_players=25, n_games=6, season_id=sid, seed=sid, start_date=f"{sid}-10-10", churn_rate=0.2,
+        )))
+    league_rows, player_rows = aggregate_season_rows(games)
+    player_rows += [
+        {"player_id": 900, "season_id": 2025, "position_code": "D", "sh_pct_successes": 2, "sh_pct_trials": 30},
+        {"player_id": 901, "season_id": 2024, "position_code": "F", "sh_pct_successes": 5, "sh_pct_trials": 40},
+        {"player_id": 902, "season_id": 2025, "sh_pct_successes": 1, "sh_pct_trials": 10},
+        {"player_id": 902, "season_id": 2021, "sh_pct_successes": 3, "sh_pct_trials": 20},
+    ]
+    return league_rows, player_rows
+
+
+def _league_map(cfg, league_rows):
+    priors = compute_league_beta_priors(2025, None, cfg, aggregates=[r for r in league_rows if r["season_id"] == 2025])
+    return {(p.season_id, p.position_code, p.stat_code): p for p in priors}
+
+
+def test_league_priors_columns_match_row_wise():
+    cfg = load_config(db_client=None, allow_fallback=True)
+    league_rows, _ = _season_rows()
+    aggregates = league_rows + [
+        {"season_id": 2025, "position_code": "D", "ipp_successes": 9, "ipp_trials": 4},
+        {"season_id": 2025, "position_code": None},
+        {"season_id": 2025, "position_code": "F"},
+    ]
+    assert compute_league_beta_priors_columns(2025, None, cfg, aggregates=aggregates) == compute_league_beta_priors(
+        2025, None, cfg, aggregates=aggregates
+    )
+
+
+@pytest.mark.parametrize("weights", [None, [0.6, 0.3, 0.1], [1.0], [0.5, 0.0, 0.5], [0.0, 1.0]])
+def test_posterior_columns_match_row_wise(weights):
+    cfg = load_config(db_client=None, allow_fallback=True)
+    league_rows, player_rows = _season_rows()
+    priors = _league_map(cfg, league_rows)
+    counts = build_player_season_counts(player_rows, 2025)
+    cols = compute_posterior_columns(counts, priors, weights)
+    expected = compute_player_posteriors(2025, priors, cfg, rows=player_rows, season_weights=weights)
+    assert posterior_columns_to_rows(counts, cols, cfg.model_version) == expected
+    rookies = {r["player_id"] for r in expected if r["rookie_status"]}
+    # 902's only history season lies outside the blend window but still rules out rookie status
+    assert 902 not in rookies
+    assert rookies == (set() if weights and weights[0] == 0 else {900})
+    assert cols["has_weight"][counts.player_ids.index(900)] is (not weights or weights[0] > 0)
+
+
+def test_sweep_supports_longer_history():
+    cfg = load_config(db_client=None, allow_fallback=True)
+    league_rows, player_rows = _season_rows()
+    priors = _league_map(cfg, league_rows)
+    counts = build_player_season_counts(player_rows, 2025, n_history=3)
+    assert counts.season_ids == [2025, 2024, 2023, 2022]
+    vectors = [[0.6, 0.3, 0.1], [0.4, 0.3, 0.2, 0.1], [1.0, 0.0, 0.0, 1.0]]
+    sweep = sweep_player_posteriors(counts, priors, vectors)
+    assert len(sweep) == 3
+    assert sweep[0] == compute_posterior_columns(counts, priors, vectors[0])
+    # the fourth slot only matters once it carries weight
+    assert sweep[1]["sh_pct_post_mean"] != sweep[0]["sh_pct_post_mean"]
+    with pytest.raises(ValueError):
+        compute_posterior_columns(counts, priors, [0.2] * 5)
@@ -0,0 +1,70 @@
+from lib.sustainability.config_loader import DEFAULT_CONFIG, SustainabilityConfig
+from lib.sustainability.orchestrator import orchestrate_full_run
+from lib.sustainability.pipeline import run_pre_scoring_pipeline
+from lib.sustainability.prior_cache import PriorCache
+from lib.sustainability.synthetic import SyntheticSeasonSpec, aggregate_season_rows, generate_season_games
+
+
+def _cfg(config_hash='testhash'):
+    return SustainabilityConfig(
+        model_version=DEFAULT_CONFIG['model_version'],
+        weights=DEFAULT_CONFIG['weights_json'],
+        toggles=DEFAULT_CONFIG['toggles_json'],
+        constants=DEFAULT_CONFIG['constants_json'],
+        sd_mode='fixed',
+        freshness_days=DEFAULT_CONFIG['freshness_days'],
+        config_hash=config_hash,
+        source='default',
+    )
+
+
+class _Client:
+    def __init__(self, league_rows, player_rows):
+        self.league_rows = league_rows
+        self.player_rows = player_rows
+
+    def fetch_league_aggregates(self, season_id):
+        return [r for r in self.league_rows if r['season_id'] == season_id]
+
+    def fetch_player_season_rows(self, season_ids):
+        return [r for r in self.player_rows if r['season_id'] in season_ids]
+
+
+def _fixture():
+    games = []
+    for sid in (2024, 2025):
+        games.extend(generate_season_games(SyntheticSeasonSpec(n_players=12, n_games=5, season_id=sid, seed=sid, start_date=f'{sid}-10-10')))
+    league_rows, player_rows = aggregate_season_rows(games)
+    return [g for g in games if g['season_id'] == 2025], _Client(league_rows, player_rows)
+
+
+def test_orchestrator_reports_cache_hits_and_misses():
+    games, client = _fixture()
+    cache = PriorCache()
+    first = orchestrate_full_run(2025, games, db_client=client, cfg=_cfg(), prior_cache=cache).phases['prior_cache']
+    assert first['misses'] == 3 and first['memory_hits'] == 0 and first['stores'] == 3
+    second = orchestrate_full_run(2025, games, db_client=client, cfg=_cfg(), prior_cache=cache).phases['prior_cache']
+    assert second['misses'] == 0 and second['memory_hits'] == 3
+    assert second['lookups'] == {'sd_constants': 'memory', 'league_priors': 'memory', 'player_priors': 'memory'}
+    # a new config hash is a new key for every kind
+    third = orchestrate_full_run(2025, games, db_client=client, cfg=_cfg('otherhash'), prior_cache=cache).phases['prior_cache']
+    assert third['misses'] == 3 and third['entries'] == 6
+
+
+def test_changed_aggregates_miss_and_cached_results_match(tmp_path):
+    games, client = _fixture()
+    cache = PriorCache(max_entries=2, cache_dir=str(tmp_path))
+    cold = run_pre_scoring_pipeline(2025, games, db_client=client, cfg=_cfg())
+    warm1 = run_pre_scoring_pipeline(2025, games, db_client=client, cfg=_cfg(), prior_cache=cache)
+    assert len(cache) == 2  # LRU bound; the third entry lives on disk only
+    fresh = PriorCache(cache_dir=str(tmp_path))
+    warm2 = run_pre_scoring_pipeline(2025, games, db_client=client, cfg=_cfg(), prior_cache=fresh)
+    assert fresh.lookups == {'sd_constants': 'disk', 'league_priors': 'disk', 'player_priors': 'disk'}
+    for res in (warm1, warm2):
+        assert res['league_priors'] == cold['league_priors']
+        assert res['player_priors'] == cold['player_priors']
+        assert res['windows_enriched'] == cold['windows_enriched']
+
+    next(r for r in client.league_rows if r['season_id'] == 2025)['sh_pct_successes'] += 1
+    run_pre_scoring_pipeline(2025, games, db_client=client, cfg=_cfg(), prior_cache=fresh)
+    assert fresh.lookups == {'sd_constants': 'memory', 'league_priors': 'miss', 'player_priors': 'miss'}
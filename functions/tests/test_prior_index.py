@@ -0,0 +1,35 @@
+import math
+import pickle
+
+from lib.sustainability.prior_index import PriorIndex
+from lib.sustainability.zscores import _build_prior_lookup
+
+
+ROWS = [
+    {'player_id': 1, 'stat_code': 'sh_pct', 'post_mean': 0.1},
+    {'player_id': '2', 'stat_code': 'sh_pct', 'post_mean': 0.12},
+    {'player_id': 2, 'stat_code': 'ipp', 'post_mean': 0.55},
+    {'player_id': 3, 'stat_code': 'ipp', 'post_mean': None},
+    {'player_id': 1, 'stat_code': 'sh_pct', 'post_mean': 0.11},
+]
+
+
+def test_prior_index_matches_tuple_lookup():
+    index = PriorIndex.from_rows(ROWS)
+    assert index.to_mapping() == _build_prior_lookup(ROWS)
+    assert len(index) == 2 and index.get(1, 'sh_pct') == 0.11 and index.get(1, 'ipp') is None
+    slots = index.slots([2, 1, 99, 2])
+    assert slots[2] == index.missing_slot
+    assert index.gather(slots, 'sh_pct') == [0.12, 0.11, None, 0.12]
+    assert index.gather(slots, 'ipp') == [0.55, None, None, 0.55]
+    assert index.gather(slots, 'oish_pct') == [None] * 4
+    assert math.isnan(index.values[index.missing_slot])
+
+
+def test_prior_index_coerce_and_pickle_roundtrip():
+    index = PriorIndex.coerce({(1, 'sh_pct'): 0.1, (4, 'ipp'): 0.6})
+    assert PriorIndex.coerce(index) is index
+    assert len(PriorIndex.coerce({})) == 0
+    clone = pickle.loads(pickle.dumps(index))
+    assert clone == index
+    assert clone.gather(clone.slots([4, 1]), 'ipp') == [0.6, None]
@@ -0,0 +1,72 @@
+import json
+
+from lib.sustainability.config_loader import DEFAULT_CONFIG, SustainabilityConfig
+from lib.sustainability.orchestrator import orchestrate_full_run
+from lib.sustainability.pipeline import run_full_scoring_pipeline
+from lib.sustainability.profiling import StageProfiler
+from lib.sustainability.synthetic import SyntheticSeasonSpec, generate_season_games
+
+
+def _fake_cfg():
+    return SustainabilityConfig(
+        model_version=DEFAULT_CONFIG['model_version'],
+        weights=DEFAULT_CONFIG['weights_json'],
+        toggles=DEFAULT_CONFIG['toggles_json'],
+        constants=DEFAULT_CONFIG['constants_json'],
+        sd_mode='fixed',
+        freshness_days=DEFAULT_CONFIG['freshness_days'],
+        config_hash='testhash',
+        source='default',
+    )
+
+
+def test_profiler_nesting_memory_and_exports():
+    prof = StageProfiler(track_memory=True)
+    with prof.stage('outer', rows_in=3) as outer:
+        with prof.stage('inner') as inner:
+            blob = [0] * 200_000
+            inner.rows_out = len(blob)
+        del blob
+        outer.rows_out = 3
+    prof.close()
+    phases = prof.to_phases()
+    assert phases['inner']['rows_out'] == 200_000
+    assert phases['outer']['duration_ms'] >= phases['inner']['duration_ms']
+    # child peak carries up to the enclosing stage
+    assert phases['outer']['peak_kb'] >= phases['inner']['peak_kb'] > 1000
+
+    trace = prof.to_chrome_trace()
+    assert [e['name'] for e in trace['traceEvents']] == ['outer', 'inner']
+    assert all(e['ph'] == 'X' for e in trace['traceEvents'])
+
+    events = prof.to_speedscope()['profiles'][0]['events']
+    assert [e['type'] for e in events] == ['O', 'O', 'C', 'C']
+    assert events[0]['frame'] == events[-1]['frame']
+
+
+def test_pipeline_profiling_does_not_change_output():
+    games = generate_season_games(SyntheticSeasonSpec(n_players=20, n_games=6))
+    cfg = _fake_cfg()
+    plain = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, player_priors_rows=[])
+    prof = StageProfiler()
+    profiled = run_full_scoring_pipeline(season_id=2025, games=games, cfg=cfg, player_priors_rows=[], profiler=prof)
+    assert profiled['windows_scored'] == plain['windows_scored']
+    stages = prof.to_phases()
+    for name in ('windows', 'zscores', 'reliability', 'clipping', 'contributions', 'logistic', 'components_json', 'snapshot', 'tiers'):
+        assert name in stages
+    assert stages['windows']['rows_in'] == len(games)
+    assert stages['windows']['rows_out'] == len(plain['windows_scored'])
+
+
+def test_orchestrator_records_stages_and_writes_trace(tmp_path):
+    games = generate_season_games(SyntheticSeasonSpec(n_players=10, n_games=5))
+    path = tmp_path / 'trace.json'
+    res = orchestrate_full_run(season_id=2025, games=games, cfg=_fake_cfg(), trace_path=str(path))
+    phase = res.phases['scoring_pipeline']
+    assert 'components_json' in phase['stages']
+    assert phase['trace_path'] == str(path)
+    payload = json.loads(path.read_text())
+    assert {e['name'] for e in payload['traceEvents']} >= {'windows', 'snapshot'}
+
+    res = orchestrate_full_run(season_id=2025, games=games, cfg=_fake_cfg(), profile=False)
+    assert 'stages' not in res.phases['scoring_pipeline']
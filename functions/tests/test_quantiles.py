@@ -0,0 +1,67 @@
+import json
+import random
+
+from lib.sustainability.distribution import (
+    PERCENT_CUTS,
+    _percentile,
+    build_distribution_snapshot,
+    build_distribution_snapshot_from_sketch,
+    build_distribution_sketch,
+)
+from lib.sustainability.quantiles import QuantileSketch
+
+
+def _rows(scores, window_type='GAME'):
+    return [
+        {'player_id': i, 'season_id': 2025, 'window_type': window_type, 'score': s}
+        for i, s in enumerate(scores, start=1)
+    ]
+
+
+def test_exact_mode_matches_percentile_and_snapshot():
+    rng = random.Random(3)
+    scores = [rng.randint(0, 100) for _ in range(5000)]
+    sketch = QuantileSketch().update(scores)
+    assert sketch.is_exact
+    ordered = sorted(float(s) for s in scores)
+    assert sketch.quantiles(PERCENT_CUTS) == [_percentile(ordered, p) for p in PERCENT_CUTS]
+
+    rows = _rows(scores)
+    ref = build_distribution_snapshot(rows, window_type='GAME', model_version=1, config_hash='h')
+    via_sketch = build_distribution_snapshot_from_sketch(
+        build_distribution_sketch(rows, window_type='GAME'), window_type='GAME', model_version=1, config_hash='h'
+    )
+    assert via_sketch.to_dict() == ref.to_dict()
+
+
+def test_merge_and_round_trip():
+    rng = random.Random(5)
+    scores = [rng.randint(0, 100) for _ in range(2000)]
+    whole = QuantileSketch().update(scores)
+    merged = QuantileSketch()
+    for s in range(4):
+        merged.merge(QuantileSketch().update(scores[s::4]))
+    assert merged.quantiles(PERCENT_CUTS) == whole.quantiles(PERCENT_CUTS)
+
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(merged.to_dict())))
+    assert restored.quantiles(PERCENT_CUTS) == merged.quantiles(PERCENT_CUTS)
+    assert restored.n == merged.n
+
+
+def test_kll_mode_stays_within_rank_error_bound():
+    rng = random.Random(11)
+    values = [rng.random() for _ in range(20000)]
+    sketch = QuantileSketch(k=64, exact_limit=128)
+    for s in range(3):
+        sketch.merge(QuantileSketch(k=64, exact_limit=128).update(values[s::3]))
+    assert not sketch.is_exact
+    assert sketch.retained < 1000
+    ordered = sorted(values)
+    bound = sketch.rank_error_bound()
+    for p, q in zip(PERCENT_CUTS, sketch.quantiles(PERCENT_CUTS)):
+        rank = ordered.index(q)
+        target = round((len(values) - 1) * p)
+        assert abs(rank - target) / len(values) <= bound
+
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+    assert restored.quantiles(PERCENT_CUTS) == sketch.quantiles(PERCENT_CUTS)
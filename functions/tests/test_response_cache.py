@@ -0,0 +1,142 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from lib.response_cache import MemoryBackend, ResponseCache, SQLiteBackend
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_hit_then_miss_and_independent_copies():
+    clock = Clock()
+    cache = ResponseCache(ttl=10, clock=clock)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {'rows': [len(calls)]}
+
+    value, status = cache.get_or_load('k', load)
+    assert (value, status) == ({'rows': [1]}, 'miss')
+    value['rows'].append('mutated')
+    assert cache.get_or_load('k', load) == ({'rows': [1]}, 'hit')
+    clock.now += 11
+    assert cache.get_or_load('k', load) == ({'rows': [2]}, 'miss')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 2, 0.3333)
+
+
+def test_should_cache_skips_rejected_values():
+    cache = ResponseCache(should_cache=lambda v: v['status_code'] == 200)
+    assert cache.get_or_load('k', lambda: {'status_code': 502})[1] == 'miss'
+    assert cache.get_or_load('k', lambda: {'status_code': 200})[1] == 'miss'
+    assert cache.get_or_load('k', lambda: {'status_code': 500}) == ({'status_code': 200}, 'hit')
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ResponseCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'v': 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('k', load))) for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.1)  # followers are now blocked on the leader's flight
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert sorted(status for _, status in results) == ['coalesced'] * 4 + ['miss']
+    assert all(value == {'v': 1} for value, _ in results)
+
+
+def test_loader_errors_reach_every_waiter_and_are_not_cached():
+    cache = ResponseCache()
+
+    def boom():
+        raise RuntimeError('upstream down')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load('k', boom)
+    assert cache.stats()['errors'] == 1
+    assert cache.get_or_load('k', lambda: 7) == (7, 'miss')
+
+
+def test_stale_while_revalidate_refreshes_in_background():
+    clock = Clock()
+    cache = ResponseCache(ttl=10, stale_ttl=60, clock=clock)
+    cache.get_or_load('k', lambda: 'old')
+    clock.now += 20
+    refreshed = threading.Event()
+
+    def load():
+        refreshed.set()
+        return 'new'
+
+    assert cache.get_or_load('k', load) == ('old', 'stale')
+    assert refreshed.wait(5)
+    for _ in range(100):
+        if cache.backend.get('k').data == '"new"':
+            break
+        time.sleep(0.01)
+    assert cache.get_or_load('k', lambda: 'unused') == ('new', 'hit')
+    clock.now += 100
+    assert cache.get_or_load('k', lambda: 'newest') == ('newest', 'miss')
+
+
+def test_memory_backend_evicts_least_recently_used():
+    cache = ResponseCache(MemoryBackend(max_entries=2))
+    cache.get_or_load('a', lambda: 1)
+    cache.get_or_load('b', lambda: 2)
+    cache.get_or_load('a', lambda: 0)
+    cache.get_or_load('c', lambda: 3)
+    assert cache.get_or_load('a', lambda: 0) == (1, 'hit')
+    assert cache.get_or_load('b', lambda: 20) == (20, 'miss')
+
+
+def test_sqlite_backend_is_shared_across_instances(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    ResponseCache(SQLiteBackend(path)).get_or_load('k', lambda: {'a': [1, 2]})
+    other = ResponseCache(SQLiteBackend(path))
+    assert other.get_or_load('k', lambda: None) == ({'a': [1, 2]}, 'hit')
+    assert other.stats()['backend'] == 'sqlite' and other.stats()['entries'] == 1
+
+
+def test_sqlite_backend_closes_every_connection(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(sqlite3, 'connect', tracking_connect)
+    backend = SQLiteBackend(str(tmp_path / 'cache.sqlite'))
+    cache = ResponseCache(backend)
+    cache.get_or_load('k', lambda: {'a': 1})
+    cache.get_or_load('k', lambda: {'a': 2})
+    cache.invalidate('k')
+    assert len(backend) == 0
+
+    assert len(opened) >= 4
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
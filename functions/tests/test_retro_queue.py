@@ -0,0 +1,166 @@
+import json
+
+from lib.sustainability.columnar_export import open_scored_columns
+from lib.sustainability.config_loader import load_config
+from lib.sustainability.orchestrator import orchestrate_full_run
+from lib.sustainability.pipeline import run_full_scoring_pipeline
+from lib.sustainability.retro_queue import RetroJobStore, RetroWorker
+from lib.sustainability.synthetic import SyntheticSeasonSpec, generate_season_games
+
+PRIORS = [
+    {'player_id': pid, 'stat_code': m, 'post_mean': mean}
+    for pid in range(1, 16)
+    for m, mean in (('sh_pct', 0.1), ('oish_pct', 0.09), ('ipp', 0.5))
+]
+
+
+def _games(season_id):
+    return generate_season_games(SyntheticSeasonSpec(n_players=15, n_games=10, season_id=season_id, seed=season_id))
+
+
+def _worker(tmp_path, store, **kwargs):
+    cfg = load_config(db_client=None, allow_fallback=True)
+    return RetroWorker(store, _games, str(tmp_path / 'out'), cfg=cfg, player_priors_rows=PRIORS, **kwargs)
+
+
+def test_enqueue_dedupes_and_claim_coalesces_per_season(tmp_path):
+    store = RetroJobStore(str(tmp_path / 'retro.db'))
+    a = store.enqueue('config_change', 2025)
+    assert store.enqueue('config_change', 2025) == a
+    store.enqueue_retro_task('stat_correction', 7, 2025)
+    store.enqueue_retro_task('stat_correction', 3, 2024)
+    store.enqueue_retro_task('stat_correction', 5, 2024)
+    store.enqueue_retro_task('stat_correction', 3, 2024)
+    assert store.counts()['pending'] == 4
+
+    batches = {b['season_id']: b for b in store.claim_batches()}
+    assert batches[2025]['player_ids'] is None and batches[2025]['jobs'] == 2
+    assert batches[2024]['player_ids'] == [3, 5] and batches[2024]['reasons'] == ['stat_correction']
+    assert store.counts()['running'] == 4
+    assert store.claim_batches() == []
+
+
+def test_worker_rebuilds_season_once_and_checkpoints(tmp_path):
+    store = RetroJobStore(str(tmp_path / 'retro.db'))
+    for _ in range(3):
+        store.enqueue('config_change', 2025)
+    store.enqueue('stat_correction', 2025, player_id=4)
+    summary = _worker(tmp_path, store).run_once()
+
+    assert [b['status'] for b in summary['batches']] == ['done']
+    assert summary['counts']['done'] == 2
+    full = run_full_scoring_pipeline(2025, _games(2025), cfg=load_config(db_client=None, allow_fallback=True), player_priors_rows=PRIORS)
+    with open_scored_columns(summary['batches'][0]['path']) as cols:
+        assert cols.meta['season_id'] == 2025
+        assert cols.to_rows() == full['windows_scored']
+    (batch,) = store.batches()
+    assert batch['progress']['stage'] == 'done' and batch['result']['rows'] == len(full['windows_scored'])
+    assert store.latest_season_snapshot(2025)['t60'] == full['snapshot']['t60']
+
+
+def test_player_batch_tiers_against_latest_season_snapshot(tmp_path):
+    store = RetroJobStore(str(tmp_path / 'retro.db'))
+    store.enqueue('config_change', 2025)
+    _worker(tmp_path, store).run_once()
+    store.enqueue('stat_correction', 2025, player_id=2)
+    store.enqueue('stat_correction', 2025, player_id=9)
+    summary = _worker(tmp_path, store).run_once()
+
+    (batch,) = summary['batches']
+    assert batch['player_ids'] == [2, 9]
+    full = run_full_scoring_pipeline(2025, _games(2025), cfg=load_config(db_client=None, allow_fallback=True), player_priors_rows=PRIORS)
+    expected = [r for r in full['windows_scored'] if r['player_id'] in (2, 9)]
+    with open_scored_columns(batch['path']) as cols:
+        assert cols.to_rows() == expected
+
+
+def test_failed_batch_requeues_until_max_attempts(tmp_path):
+    store = RetroJobStore(str(tmp_path / 'retro.db'), max_attempts=2)
+    store.enqueue('config_change', 2025)
+
+    def broken(season_id):
+        raise RuntimeError('games unavailable')
+
+    cfg = load_config(db_client=None, allow_fallback=True)
+    worker = RetroWorker(store, broken, str(tmp_path / 'out'), cfg=cfg, player_priors_rows=PRIORS)
+    assert worker.run_once()['batches'][0]['status'] == 'failed'
+    assert store.counts()['pending'] == 1
+    worker.run_once()
+    assert store.counts()['failed'] == 1 and 'games unavailable' in store.jobs('failed')[0]['error']
+
+
+def test_recover_requeues_only_stale_batches(tmp_path):
+    store = RetroJobStore(str(tmp_path / 'retro.db'))
+    store.enqueue('config_change', 2025)
+    (batch,) = store.claim_batches(owner='other-host:1:abc')
+    assert store.recover(owner='me') == 0
+    assert store.recover(stale_after_sec=0, owner='other-host:1:abc') == 0
+    assert store.recover(stale_after_sec=0, owner='me') == 1
+    assert store.counts()['pending'] == 1
+    # The slow worker's late result does not overwrite the recovered batch
+    assert store.complete(batch['id'], {'rows': 0}) is False
+    assert store.counts()['pending'] == 1
+
+
+def test_workers_sharing_a_store_leave_live_batches_alone(tmp_path):
+    store = RetroJobStore(str(tmp_path / 'retro.db'))
+    store.enqueue('config_change', 2025)
+    a = _worker(tmp_path, store)
+    (batch,) = store.claim_batches(owner=a.owner)
+    store.enqueue('config_change', 2024)
+
+    summary = _worker(tmp_path, RetroJobStore(str(tmp_path / 'retro.db'))).run_once()
+    assert summary['recovered'] == 0
+    assert [b['season_id'] for b in summary['batches']] == [2024]
+    assert [b['id'] for b in store.batches('running')] == [batch['id']]
+
+    assert store.complete(batch['id'], {'rows': 1}) is True
+    assert store.counts()['done'] == 2 and store.counts()['running'] == 0
+
+
+def test_process_pool_runs_seasons_in_parallel(tmp_path):
+    store = RetroJobStore(str(tmp_path / 'retro.db'))
+    store.enqueue('config_change', 2024)
+    store.enqueue('config_change', 2025)
+    store.enqueue('stat_correction', 2025, player_id=1)
+    summary = _worker(tmp_path, store, workers=2).run_once()
+    assert sorted(b['season_id'] for b in summary['batches']) == [2024, 2025]
+    assert all(b['status'] == 'done' for b in summary['batches'])
+
+
+def test_orchestrator_enqueues_config_change_locally(tmp_path):
+    cfg = load_config(db_client=None, allow_fallback=True)
+    path = str(tmp_path / 'retro.db')
+    res = orchestrate_full_run(2025, _games(2025), cfg=cfg, previous_config_hash='old', retro_queue_path=path)
+    assert res.phases['retro_enqueue']['store'] == 'local'
+    assert [j['reason'] for j in RetroJobStore(path).jobs('pending')] == ['config_change']
+    orchestrate_full_run(2025, _games(2025), cfg=cfg, previous_config_hash=cfg.config_hash, retro_queue_path=path)
+    assert RetroJobStore(path).counts()['pending'] == 1
+
+
+def test_orchestrator_enqueues_config_change_in_incremental_mode(tmp_path):
+    cfg = load_config(db_client=None, allow_fallback=True)
+    path = str(tmp_path / 'retro.db')
+    res = orchestrate_full_run(
+        2025, _games(2025), cfg=cfg, incremental=True, incremental_state_path=str(tmp_path / 'state.json'),
+        previous_config_hash='old', retro_queue_path=path,
+    )
+    assert 'incremental' in res.phases
+    assert res.phases['retro_enqueue']['store'] == 'local'
+    assert [j['reason'] for j in RetroJobStore(path).jobs('pending')] == ['config_change']
+
+
+def test_orchestrator_enqueues_config_change_in_streaming_mode(tmp_path):
+    cfg = load_config(db_client=None, allow_fallback=True)
+    path = str(tmp_path / 'retro.db')
+    src = tmp_path / 'games.jsonl'
+    with open(src, 'w') as fh:
+        for g in sorted(_games(2025), key=lambda g: g['player_id']):
+            fh.write(json.dumps(g, default=str) + '\n')
+    res = orchestrate_full_run(
+        2025, [], cfg=cfg, streaming_input_path=str(src), streaming_output_path=str(tmp_path / 'scored.jsonl'),
+        previous_config_hash='old', retro_queue_path=path,
+    )
+    assert 'streaming' in res.phases
+    assert res.phases['retro_enqueue']['store'] == 'local'
+    assert [j['reason'] for j in RetroJobStore(path).jobs('pending')] == ['config_change']
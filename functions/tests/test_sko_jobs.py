@@ -0,0 +1,231 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from api import index as index_api
+from lib import sko_jobs
+from lib.sko_jobs import SkoJobRunner, SkoJobStore, step_dependencies
+
+
+class FakeSteps:
+    """Stands in for `_post_step`: records calls and peak concurrency."""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, endpoint, headers, payload, step):
+        with self._lock:
+            self.calls.append((step, payload, headers))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if step in self.fail:
+            return {"step": step, "status": "error", "status_code": 500, "message": f"{step} broke",
+                    "response": {"error": "boom"}, "duration_sec": self.delay}
+        return {"step": step, "status": "ok", "status_code": 200, "message": f"{step} step completed",
+                "response": {"message": "done"}, "duration_sec": self.delay}
+
+
+def _configure(monkeypatch):
+    monkeypatch.setenv("SKO_PIPELINE_ENDPOINT", "https://pipeline.example.test/run")
+    monkeypatch.setenv("SKO_PIPELINE_SECRET", "test-secret")
+
+
+def _runner(tmp_path, post_step, **kwargs):
+    return SkoJobRunner(store=SkoJobStore(str(tmp_path / "jobs.sqlite")), post_step=post_step, **kwargs)
+
+
+def test_step_dependencies_follow_pipeline_order_unless_parallel():
+    assert step_dependencies(["score", "backfill", "upload"]) == {
+        "score": ["backfill"],
+        "backfill": [],
+        "upload": ["backfill", "score"],
+    }
+    assert step_dependencies(["score", "upload"], parallel=True) == {"score": [], "upload": []}
+
+
+def test_submit_returns_immediately_and_runs_steps_in_order(monkeypatch, tmp_path):
+    _configure(monkeypatch)
+    fake = FakeSteps(delay=0.05)
+    runner = _runner(tmp_path, fake)
+
+    started = time.perf_counter()
+    submitted = runner.submit({"steps": ["train", "score"], "asOfDate": "2026-07-22", "secret": "drop-me"})
+    assert time.perf_counter() - started < 0.05
+    assert submitted["success"] is True
+    assert submitted["status"] == "queued"
+
+    job = runner.wait(submitted["job_id"], timeout=5)
+
+    assert job["status"] == "succeeded"
+    assert [s["step"] for s in job["steps"]] == ["train", "score"]
+    assert [s["status"] for s in job["steps"]] == ["ok", "ok"]
+    assert all(s["duration_sec"] is not None and s["status_code"] == 200 for s in job["steps"])
+    assert [call[0] for call in fake.calls] == ["train", "score"]
+    assert fake.max_active == 1
+    assert fake.calls[0][1] == {"asOfDate": "2026-07-22"}
+    assert fake.calls[0][2]["Authorization"] == "Bearer test-secret"
+
+
+def test_parallel_payload_runs_independent_steps_concurrently(monkeypatch, tmp_path):
+    _configure(monkeypatch)
+    fake = FakeSteps(delay=0.2)
+    runner = _runner(tmp_path, fake)
+
+    submitted = runner.submit({"steps": ["score", "upload"], "parallel": True})
+    job = runner.wait(submitted["job_id"], timeout=5)
+
+    assert job["status"] == "succeeded"
+    assert job["parallel"] is True
+    assert fake.max_active == 2
+    assert all("parallel" not in call[1] for call in fake.calls)
+
+
+def test_failed_step_skips_its_dependents(monkeypatch, tmp_path):
+    _configure(monkeypatch)
+    fake = FakeSteps(delay=0.01, fail={"train"})
+    runner = _runner(tmp_path, fake)
+
+    job = runner.wait(runner.submit({"steps": ["backfill", "train", "score"]})["job_id"], timeout=5)
+
+    assert job["status"] == "failed"
+    assert job["message"] == "train step failed"
+    assert {s["step"]: s["status"] for s in job["steps"]} == {
+        "backfill": "ok",
+        "train": "error",
+        "score": "skipped",
+    }
+    assert [call[0] for call in fake.calls] == ["backfill", "train"]
+
+
+def test_submit_fails_closed_without_secret(monkeypatch, tmp_path):
+    monkeypatch.setenv("SKO_PIPELINE_ENDPOINT", "https://pipeline.example.test/run")
+    monkeypatch.delenv("SKO_PIPELINE_SECRET", raising=False)
+    fake = FakeSteps()
+    runner = _runner(tmp_path, fake)
+
+    result = runner.submit({"step": "score"})
+
+    assert result == {
+        "success": False,
+        "message": "SKO pipeline authentication is not configured.",
+        "steps": [],
+    }
+    assert fake.calls == []
+
+
+def test_jobs_left_running_by_another_process_are_failed(tmp_path):
+    store = SkoJobStore(str(tmp_path / "jobs.sqlite"))
+    store.create("old", ["score"], {"score": []}, False, {}, owner="other-host:1:abc")
+    store.update_job("old", status="running", started_at=time.time() - 3600)
+
+    SkoJobRunner(store=store, post_step=FakeSteps(), stale_after_sec=0)
+
+    job = store.get("old")
+    assert job["status"] == "failed"
+    assert job["message"] == "interrupted"
+    assert job["steps"][0]["status"] == "skipped"
+
+
+def test_store_error_fails_the_job_instead_of_leaving_it_running(monkeypatch, tmp_path):
+    _configure(monkeypatch)
+    runner = _runner(tmp_path, FakeSteps(delay=0.01))
+    update_step = runner.store.update_step
+
+    def flaky_update_step(job_id, step, **fields):
+        if step == "score" and fields.get("status") == "running":
+            raise RuntimeError("disk full")
+        update_step(job_id, step, **fields)
+
+    monkeypatch.setattr(runner.store, "update_step", flaky_update_step)
+
+    job = runner.wait(runner.submit({"steps": ["train", "score", "upload"]})["job_id"], timeout=5)
+
+    assert job["status"] == "failed"
+    assert job["message"] == "RuntimeError: disk full"
+    assert job["finished_at"] is not None
+    assert {s["step"]: s["status"] for s in job["steps"]} == {
+        "train": "ok",
+        "score": "skipped",
+        "upload": "skipped",
+    }
+    assert runner._jobs == {}
+
+
+def test_unschedulable_steps_end_the_job_instead_of_spinning(tmp_path):
+    fake = FakeSteps(delay=0.01)
+    runner = _runner(tmp_path, fake)
+    deps = {"score": ["upload"], "upload": ["score"]}
+    runner.store.create("cycle", ["score", "upload"], deps, False, {}, runner.owner)
+
+    runner._run("cycle", "https://pipeline.example.test/run", {}, {}, ["score", "upload"], deps)
+
+    job = runner.store.get("cycle")
+    assert job["status"] == "failed"
+    assert [s["status"] for s in job["steps"]] == ["skipped", "skipped"]
+    assert fake.calls == []
+
+
+def test_finished_jobs_are_not_retained(monkeypatch, tmp_path):
+    _configure(monkeypatch)
+    runner = _runner(tmp_path, FakeSteps(delay=0.01))
+
+    job_ids = [runner.submit({"step": "score"})["job_id"] for _ in range(3)]
+    for job_id in job_ids:
+        assert runner.wait(job_id, timeout=5)["status"] == "succeeded"
+
+    assert runner._jobs == {}
+
+
+def test_job_routes_are_off_unless_enabled_and_never_on_vercel(monkeypatch):
+    _configure(monkeypatch)
+    monkeypatch.setattr(index_api, "get_sko_job_runner", lambda: pytest.fail("runner must not start"))
+    client = index_api.app.test_client()
+    auth = {"Authorization": "Bearer test-secret"}
+
+    monkeypatch.delenv("SKO_JOBS_ENABLED", raising=False)
+    assert client.post("/sko/jobs", json={"step": "score"}, headers=auth).status_code == 501
+
+    monkeypatch.setenv("SKO_JOBS_ENABLED", "1")
+    monkeypatch.setenv("VERCEL", "1")
+    assert client.post("/sko/jobs", json={"step": "score"}, headers=auth).status_code == 501
+    assert client.get("/sko/jobs/abc", headers=auth).status_code == 501
+
+    config = json.loads((Path(__file__).resolve().parents[1] / "vercel.json").read_text())
+    assert not any(route["src"].startswith("/sko/jobs") for route in config["routes"])
+
+
+def test_job_endpoints_return_job_id_then_progress(monkeypatch, tmp_path):
+    _configure(monkeypatch)
+    monkeypatch.setenv("SKO_JOBS_ENABLED", "1")
+    monkeypatch.delenv("VERCEL", raising=False)
+    runner = _runner(tmp_path, FakeSteps(delay=0.01))
+    monkeypatch.setattr(index_api, "get_sko_job_runner", lambda: runner)
+    client = index_api.app.test_client()
+    auth = {"Authorization": "Bearer test-secret"}
+
+    response = client.post("/sko/jobs?steps=score,upload", json={"asOfDate": "2026-07-22"}, headers=auth)
+
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["steps"] == ["score", "upload"]
+    assert body["status_url"] == f"/sko/jobs/{body['job_id']}"
+
+    runner.wait(body["job_id"], timeout=5)
+    status = client.get(body["status_url"], headers=auth)
+    assert status.status_code == 200
+    assert status.get_json()["status"] == "succeeded"
+    assert [s["status"] for s in status.get_json()["steps"]] == ["ok", "ok"]
+
+    assert client.get("/sko/jobs/missing", headers=auth).status_code == 404
+    assert client.get(body["status_url"]).status_code == 401
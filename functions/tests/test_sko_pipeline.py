@@ -13,7 +13,7 @@ def test_orchestrator_fails_closed_without_secret(monkeypatch):
     monkeypatch.setenv("SKO_PIPELINE_ENDPOINT", "https://pipeline.example.test/run")
     monkeypatch.delenv("SKO_PIPELINE_SECRET", raising=False)
     post = Mock()
-    monkeypatch.setattr(sko_pipeline.requests, "post", post)
+    monkeypatch.setattr(sko_pipeline.http_client.get_client(), "post", post)
 
     result = sko_pipeline.trigger_sko_step_forward({"step": "score"})
 
@@ -29,7 +29,7 @@ def test_orchestrator_rejects_unknown_step_before_request(monkeypatch):
     monkeypatch.setenv("SKO_PIPELINE_ENDPOINT", "https://pipeline.example.test/run")
     monkeypatch.setenv("SKO_PIPELINE_SECRET", "test-secret")
     post = Mock()
-    monkeypatch.setattr(sko_pipeline.requests, "post", post)
+    monkeypatch.setattr(sko_pipeline.http_client.get_client(), "post", post)
 
     result = sko_pipeline.trigger_sko_step_forward({"step": "unknown"})
 
@@ -50,7 +50,7 @@ def test_orchestrator_sends_only_allowed_step_with_required_auth(monkeypatch):
         json=Mock(return_value={"message": "score complete"}),
     )
     post = Mock(return_value=response)
-    monkeypatch.setattr(sko_pipeline.requests, "post", post)
+    monkeypatch.setattr(sko_pipeline.http_client.get_client(), "post", post)
 
     result = sko_pipeline.trigger_sko_step_forward(
         {"step": "score", "asOfDate": "2026-07-22", "secret": "drop-me"}
@@ -0,0 +1,123 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from lib.sustainability.config_loader import load_config
+from lib.sustainability.orchestrator import orchestrate_full_run
+from lib.sustainability.pipeline import run_full_scoring_pipeline
+from lib.sustainability.streaming import StreamOrderError, iter_player_games, read_scored_rows, run_streaming_scoring
+from lib.sustainability.synthetic import SyntheticSeasonSpec, generate_season_games
+
+
+def _setup():
+    cfg = load_config(db_client=None, allow_fallback=True)
+    games = generate_season_games(SyntheticSeasonSpec(n_players=25, n_games=14, season_id=2025, seed=11))
+    games.sort(key=lambda g: g['player_id'])
+    priors = [
+        {'player_id': pid, 'stat_code': m, 'post_mean': mean}
+        for pid in range(1, 26)
+        for m, mean in (('sh_pct', 0.1), ('oish_pct', 0.09), ('ipp', 0.5))
+    ]
+    return cfg, games, priors
+
+
+def _write_jsonl(path, games, opener=open):
+    with opener(path, 'wt') as fh:
+        for g in games:
+            fh.write(json.dumps(g, default=str) + '\n')
+    return str(path)
+
+
+def _as_json(rows):
+    return [json.loads(json.dumps(r, default=str)) for r in rows]
+
+
+def _thresholds(snap):
+    return {k: v for k, v in snap.items() if k != 'created_at'}
+
+
+def test_streaming_matches_full_pipeline(tmp_path):
+    cfg, games, priors = _setup()
+    src = _write_jsonl(tmp_path / 'games.jsonl', games)
+    out = str(tmp_path / 'scored.jsonl')
+    result = run_streaming_scoring(2025, src, out, cfg=cfg, player_priors_rows=priors, batch_size=50)
+    full = run_full_scoring_pipeline(2025, games, cfg=cfg, player_priors_rows=priors)
+
+    assert result['players'] == 25 and result['games_read'] == len(games)
+    assert result['max_player_games'] == 14
+    assert result['rows_written'] == len(full['windows_scored'])
+    assert list(read_scored_rows(out)) == _as_json(full['windows_scored'])
+    assert _thresholds(result['snapshot']) == _thresholds(full['snapshot'])
+    assert result['snapshot_sketch'] == full['snapshot_sketch']
+    assert sorted(os.listdir(tmp_path)) == ['games.jsonl', 'scored.jsonl']
+
+
+def test_streaming_grouped_tiers_match_full_pipeline(tmp_path):
+    cfg, games, priors = _setup()
+    src = _write_jsonl(tmp_path / 'games.jsonl.gz', games, opener=gzip.open)
+    out = str(tmp_path / 'scored.jsonl')
+    kwargs = dict(cfg=cfg, player_priors_rows=priors, grouped_snapshots=True, tier_by_group=True, kernel='fused')
+    result = run_streaming_scoring(2025, src, out, **kwargs)
+    full = run_full_scoring_pipeline(2025, games, **kwargs)
+
+    assert list(read_scored_rows(out)) == _as_json(full['windows_scored'])
+    assert _thresholds(result['snapshot']) == _thresholds(full['snapshot'])
+    assert [_thresholds(s) for s in result['snapshots']] == [_thresholds(s) for s in full['snapshots']]
+
+
+@pytest.mark.parametrize('assign_tiers', [True, False])
+def test_streaming_writes_gzipped_output(tmp_path, assign_tiers):
+    cfg, games, priors = _setup()
+    src = _write_jsonl(tmp_path / 'games.jsonl', games)
+    out = str(tmp_path / 'scored.jsonl.gz')
+    result = run_streaming_scoring(2025, src, out, cfg=cfg, player_priors_rows=priors, assign_tiers=assign_tiers)
+    full = run_full_scoring_pipeline(2025, games, cfg=cfg, player_priors_rows=priors, assign_tiers=assign_tiers)
+
+    with open(out, 'rb') as fh:
+        assert fh.read(2) == b'\x1f\x8b'
+    rows = list(read_scored_rows(out))
+    assert len(rows) == result['rows_written']
+    assert rows == _as_json(full['windows_scored'])
+    assert sorted(os.listdir(tmp_path)) == ['games.jsonl', 'scored.jsonl.gz']
+
+
+def test_streaming_accepts_iterable_without_tiers(tmp_path):
+    cfg, games, priors = _setup()
+    out = str(tmp_path / 'scored.jsonl')
+    result = run_streaming_scoring(2025, None, out, cfg=cfg, player_priors_rows=priors, assign_tiers=False, games=iter(games))
+    rows = list(read_scored_rows(out))
+    assert len(rows) == result['rows_written'] == len(games) * 4
+    assert all('quintile' not in r for r in rows)
+    assert result['snapshot']['n'] == len(games)
+
+
+def test_unsorted_input_raises_and_leaves_no_output(tmp_path):
+    cfg, games, priors = _setup()
+    out = str(tmp_path / 'scored.jsonl')
+    shuffled = games[:3] + games[20:23] + games[3:6]
+    with pytest.raises(StreamOrderError):
+        run_streaming_scoring(2025, None, out, cfg=cfg, player_priors_rows=priors, games=shuffled)
+    assert os.listdir(tmp_path) == []
+
+
+def test_iter_player_games_groups_consecutive_runs():
+    rows = [{'player_id': 2, 'g': 1}, {'player_id': 2, 'g': 2}, {'player_id': None}, {'player_id': '5', 'g': 3}]
+    assert [(pid, [r['g'] for r in run]) for pid, run in iter_player_games(rows)] == [(2, [1, 2]), (5, [3])]
+
+
+def test_orchestrator_streaming_mode(tmp_path):
+    cfg, games, priors = _setup()
+    src = _write_jsonl(tmp_path / 'games.jsonl', games)
+    out = str(tmp_path / 'scored.jsonl')
+    res = orchestrate_full_run(
+        2025, [], cfg=cfg, streaming_input_path=src, streaming_output_path=out,
+        grouped_snapshots=False,
+    )
+    assert res.total_rows_scored == len(games) * 4
+    assert res.snapshot_n == len(games)
+    assert res.phases['streaming']['players'] == 25
+    assert 'stream_score' in res.phases['streaming']['stages']
+    with pytest.raises(ValueError):
+        orchestrate_full_run(2025, [], cfg=cfg, streaming_input_path=src)
@@ -0,0 +1,62 @@
+from dataclasses import replace
+
+import pytest
+
+from lib.sustainability.config_loader import load_config
+from lib.sustainability.pipeline import run_full_scoring_pipeline
+from lib.sustainability.sweep import config_variant, evaluate_configs, grid_configs, prepare_sweep, random_configs
+from lib.sustainability.synthetic import SyntheticSeasonSpec, generate_season_games
+
+
+def _setup():
+    cfg = load_config(db_client=None, allow_fallback=True)
+    games = generate_season_games(SyntheticSeasonSpec(n_players=30, n_games=12, season_id=2025, seed=7))
+    priors = [
+        {'player_id': pid, 'stat_code': m, 'post_mean': mean}
+        for pid in range(1, 31)
+        for m, mean in (('sh_pct', 0.1), ('oish_pct', 0.09), ('ipp', 0.5))
+    ]
+    return cfg, games, priors
+
+
+def test_sweep_matches_full_pipeline_per_config():
+    cfg, games, priors = _setup()
+    base = prepare_sweep(2025, games, cfg=cfg, player_priors_rows=priors)
+    variants = [
+        cfg,
+        config_variant(cfg, weights={'sh_pct': -2.0, 'ixg_per60': 0.2}, c=1.5),
+        config_variant(cfg, k_r={'ipp': 5}, guardrails={'lower_raw': 0.1, 'upper_raw': 0.9}),
+    ]
+    out = evaluate_configs(base, variants)
+    assert out['rows'] == 30 * 12
+    for variant, res in zip(variants, out['configs']):
+        full = run_full_scoring_pipeline(2025, games, cfg=variant, player_priors_rows=priors, include_components=False)
+        game_rows = [r for r in full['windows_scored'] if r['window_type'] == 'GAME']
+        assert base.scores(variant) == [r['score'] for r in game_rows]
+        assert res['thresholds'] == {k: full['snapshot'][k] for k in ('t20', 't40', 't60', 't80')}
+        assert res['tier_counts'] == [sum(1 for r in game_rows if r['quintile'] == q) for q in range(1, 6)]
+        assert res['config_hash'] == variant.config_hash
+    assert out['configs'][0]['tier_agreement'] == 1.0
+    assert out['configs'][0]['mean_abs_tier_shift'] == 0.0
+    assert out['configs'][1]['config_hash'] != cfg.config_hash
+
+
+def test_grid_and_random_configs():
+    cfg, games, priors = _setup()
+    grid = grid_configs(cfg, weights={'sh_pct': [-1.0, -1.5], 'ipp': [-0.5, -1.0]}, c=[2.0, 3.0])
+    assert len(grid) == 8 and len({g.config_hash for g in grid}) == 8
+    sample = random_configs(cfg, 5, seed=1)
+    assert [s.config_hash for s in sample] == [s.config_hash for s in random_configs(cfg, 5, seed=1)]
+    base = prepare_sweep(2025, games, cfg=cfg, player_priors_rows=priors)
+    out = evaluate_configs(base, grid + sample)
+    assert len(out['configs']) == 13
+    assert all(sum(r['tier_counts']) == out['rows'] for r in out['configs'])
+    assert all(0.0 <= r['tier_agreement'] <= 1.0 for r in out['configs'])
+
+
+def test_sweep_rejects_stage_changing_configs():
+    cfg, games, priors = _setup()
+    base = prepare_sweep(2025, games, cfg=cfg, player_priors_rows=priors)
+    other = config_variant(cfg)
+    with pytest.raises(ValueError):
+        evaluate_configs(base, [replace(other, freshness_days=10)])
@@ -0,0 +1,43 @@
+from statistics import mean
+
+from lib.sustainability.synthetic import (
+    SyntheticSeasonSpec,
+    generate_season_columns,
+    generate_season_games,
+    load_or_generate,
+)
+
+
+def test_generator_is_seeded_and_consistent():
+    spec = SyntheticSeasonSpec(n_players=300, n_games=12, seed=7)
+    games = generate_season_games(spec)
+    assert games == generate_season_games(spec)
+    assert games != generate_season_games(SyntheticSeasonSpec(n_players=300, n_games=12, seed=8))
+    assert len(games) == 300 * 12
+    for g in games:
+        assert 0 <= g['goals'] <= g['shots'] <= g['icf']
+        assert g['goals'] <= g['onice_goals_for'] <= g['onice_shots_for']
+        assert g['goals'] <= g['points'] <= g['onice_goals_for']
+        assert g['hdcf'] <= g['shots']
+    assert abs(mean(g['shots'] for g in games) - spec.shot_rate) < 0.15
+    assert sorted({g['game_date'] for g in games})[-1] == '2025-01-12'
+
+
+def test_roster_churn_and_position_mix():
+    spec = SyntheticSeasonSpec(n_players=1000, n_games=10, churn_rate=0.05, forward_share=0.5, days_between_games=2)
+    cols = generate_season_columns(spec)
+    slate = cols['player_id'][-1000:]
+    assert len(set(slate)) == 1000
+    assert max(cols['player_id']) > 1000
+    share_f = cols['position_code'][:1000].count('F') / 1000
+    assert 0.45 < share_f < 0.55
+    assert cols['game_date'][-1] == '2025-01-19'
+
+
+def test_fixture_cache_round_trip(tmp_path):
+    spec = SyntheticSeasonSpec(n_players=50, n_games=5)
+    games, hit = load_or_generate(spec, str(tmp_path))
+    assert hit is False
+    cached, hit = load_or_generate(spec, str(tmp_path))
+    assert hit is True
+    assert cached == games == generate_season_games(spec)
@@ -1,6 +1,12 @@
 import pytest
 from datetime import date, timedelta
-from lib.sustainability.windows import build_player_windows, build_all_players_windows
+from lib.sustainability.windows import (
+    WINDOW_COLUMNS,
+    build_player_windows,
+    build_all_players_windows,
+    build_all_players_windows_columnar,
+    build_window_columns,
+)
 
 
 def _make_games(player_id=1, start=date(2025,1,1), n=7):
@@ -66,3 +72,23 @@ def test_build_all_players():
     # Each game -> 4 rows
     assert len(out) == (3+2)*4
     assert len({r['player_id'] for r in out}) == 2
+
+
+def test_columnar_windows_match_reference():
+    games = _make_games(player_id=1, n=14) + _make_games(player_id=2, start=date(2025,2,1), n=3)
+    # Out-of-order and stale dates exercise sorting plus the STD freshness cutoff
+    games[0]['game_date'] = date(2024,11,20).isoformat()
+    games[5]['game_date'] = date(2024,12,1).isoformat()
+    games[7]['ixg'] = None
+    games.reverse()
+    for freshness in (45, 10, 0):
+        reference = build_all_players_windows(games, freshness_days=freshness)
+        assert build_all_players_windows_columnar(games, freshness_days=freshness) == reference
+
+
+def test_window_columns_are_aligned():
+    cols = build_window_columns(_make_games(n=4))
+    assert list(cols) == WINDOW_COLUMNS
+    assert {len(values) for values in cols.values()} == {16}
+    assert cols['window_type'][:4] == ['GAME', 'G5', 'G10', 'STD']
+    assert cols['game_id'][3] is None
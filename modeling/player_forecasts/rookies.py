@@ -4,11 +4,14 @@ from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime, timezone
 import hashlib
+import http.client
 import json
 import math
 from pathlib import Path
 from statistics import median
+import threading
 from typing import Any
+from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
 from .contract import (
@@ -88,11 +91,58 @@ def normalize_player_landing(
     }
 
 
+LANDING_HOST = "api-web.nhle.com"
+LANDING_HEADERS = {"User-Agent": "FHFH-player-forecasts/4.0"}
+_landing_connections = threading.local()
+
+
+def _landing_connection() -> http.client.HTTPSConnection:
+    # One keep-alive connection per capture worker thread, reused across players
+    connection = getattr(_landing_connections, "connection", None)
+    if connection is None:
+        connection = http.client.HTTPSConnection(LANDING_HOST, timeout=45)
+        _landing_connections.connection = connection
+    return connection
+
+
+def _drop_landing_connection() -> None:
+    connection = getattr(_landing_connections, "connection", None)
+    if connection is not None:
+        connection.close()
+        _landing_connections.connection = None
+
+
+def _landing_get(path: str) -> tuple[http.client.HTTPResponse, bytes]:
+    connection = _landing_connection()
+    try:
+        connection.request("GET", path, headers=LANDING_HEADERS)
+        response = connection.getresponse()
+        return response, response.read()
+    except Exception:
+        _drop_landing_connection()
+        raise
+
+
+def _fetch_landing(player_id: int) -> bytes:
+    path = f"/v1/player/{player_id}/landing"
+    url = f"https://{LANDING_HOST}{path}"
+    try:
+        response, raw = _landing_get(path)
+    except (http.client.HTTPException, ConnectionError):
+        # The server closed an idle keep-alive connection: reconnect once
+        _drop_landing_connection()
+        response, raw = _landing_get(path)
+    if 200 <= response.status < 300:
+        return raw
+    if 300 <= response.status < 400:
+        # Redirects keep urllib's handling
+        with urlopen(Request(url, headers=LANDING_HEADERS), timeout=45) as redirected:
+            return redirected.read()
+    raise HTTPError(url, response.status, response.reason, response.headers, None)
+
+
 def _capture_one(player_id: int, fetched_at: str) -> dict[str, Any]:
-    url = f"https://api-web.nhle.com/v1/player/{player_id}/landing"
-    request = Request(url, headers={"User-Agent": "FHFH-player-forecasts/4.0"})
-    with urlopen(request, timeout=45) as response:
-        raw = response.read()
+    raw = _fetch_landing(player_id)
     return normalize_player_landing(
         json.loads(raw.decode("utf-8")),
         expected_player_id=player_id,
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import json
 import hashlib
+import http.client
+import io
+import threading
 from contextlib import contextmanager
 from pathlib import Path
+from urllib.error import HTTPError
 
 import pytest
 
@@ -59,6 +63,7 @@ from modeling.player_forecasts.season import (
     evaluate_season_game,
     freeze_season_dataset,
 )
+from modeling.player_forecasts import rookies as rookies_module
 from modeling.player_forecasts.rookies import (
     evaluate_rookie_transition_model,
     learn_rookie_transition_model,
@@ -1142,3 +1147,103 @@ def test_prospective_freeze_binds_fixed_artifact_and_target_season(tmp_path, mon
     assert evidence["evidenceKind"] == "untouched_prospective"
     assert evidence["tuningPermitted"] is False
     assert evidence["metrics"]["targets"]["goals"]["rows"] == 1
+
+
+class _FakeLandingResponse:
+    def __init__(self, status: int, body: bytes = b"", reason: str = "OK"):
+        self.status = status
+        self.reason = reason
+        self.headers = http.client.HTTPMessage()
+        self._body = body
+
+    def read(self) -> bytes:
+        return self._body
+
+
+class _FakeLandingConnection:
+    """Scripted stand-in for HTTPSConnection: each request pops the next outcome."""
+
+    script: list = []
+    opened: list = []
+
+    def __init__(self, host: str, timeout: float = 0):
+        self.host = host
+        self.paths: list[str] = []
+        self.closed = False
+        _FakeLandingConnection.opened.append(self)
+
+    def request(self, method: str, path: str, headers=None) -> None:
+        assert method == "GET" and headers == rookies_module.LANDING_HEADERS
+        self.paths.append(path)
+
+    def getresponse(self) -> _FakeLandingResponse:
+        outcome = _FakeLandingConnection.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fake_landing(monkeypatch):
+    _FakeLandingConnection.script = []
+    _FakeLandingConnection.opened = []
+    monkeypatch.setattr(rookies_module.http.client, "HTTPSConnection", _FakeLandingConnection)
+    monkeypatch.setattr(rookies_module, "_landing_connections", threading.local())
+    return _FakeLandingConnection
+
+
+def test_landing_fetch_reuses_one_connection_per_thread(fake_landing):
+    fake_landing.script = [_FakeLandingResponse(200, b'{"playerId": 1}'), _FakeLandingResponse(203, b'{"playerId": 2}')]
+
+    assert rookies_module._fetch_landing(1) == b'{"playerId": 1}'
+    assert rookies_module._fetch_landing(2) == b'{"playerId": 2}'
+
+    assert len(fake_landing.opened) == 1
+    assert fake_landing.opened[0].host == "api-web.nhle.com"
+    assert fake_landing.opened[0].paths == ["/v1/player/1/landing", "/v1/player/2/landing"]
+
+
+def test_landing_fetch_reconnects_once_after_dropped_keep_alive(fake_landing):
+    fake_landing.script = [
+        _FakeLandingResponse(200, b"first"),
+        http.client.RemoteDisconnected("idle connection closed"),
+        _FakeLandingResponse(200, b"second"),
+    ]
+
+    assert rookies_module._fetch_landing(1) == b"first"
+    assert rookies_module._fetch_landing(2) == b"second"
+
+    first, second = fake_landing.opened
+    assert first.closed and not second.closed
+    assert second.paths == ["/v1/player/2/landing"]
+
+    fake_landing.script = [ConnectionResetError("reset"), ConnectionResetError("reset again")]
+    with pytest.raises(ConnectionResetError):
+        rookies_module._fetch_landing(3)
+
+
+def test_landing_fetch_follows_redirects_through_urlopen(fake_landing, monkeypatch):
+    fake_landing.script = [_FakeLandingResponse(301, reason="Moved Permanently")]
+    requested = []
+
+    def fake_urlopen(request, timeout):
+        requested.append((request.full_url, request.get_header("User-agent"), timeout))
+        return io.BytesIO(b"redirected")
+
+    monkeypatch.setattr(rookies_module, "urlopen", fake_urlopen)
+
+    assert rookies_module._fetch_landing(7) == b"redirected"
+    assert requested == [("https://api-web.nhle.com/v1/player/7/landing", "FHFH-player-forecasts/4.0", 45)]
+
+
+def test_landing_fetch_raises_http_error_for_error_statuses(fake_landing):
+    fake_landing.script = [_FakeLandingResponse(404, reason="Not Found")]
+
+    with pytest.raises(HTTPError) as excinfo:
+        rookies_module._fetch_landing(9)
+
+    assert excinfo.value.code == 404
+    assert excinfo.value.url == "https://api-web.nhle.com/v1/player/9/landing"
@@ -14,6 +14,7 @@ _FUNCTIONS_ROOT = Path(__file__).resolve().parents[2] / "functions"
 if str(_FUNCTIONS_ROOT) not in sys.path:
     sys.path.insert(0, str(_FUNCTIONS_ROOT))
 
+from lib import http_client
 from lib.env_loader import ensure_loaded_for
 
 def clean_header(header: str) -> str:
@@ -70,7 +71,7 @@ def fetch_team_table(from_season='20242025', thru_season='20242025',
     try:
 
         # Fetch the team table page
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get_client().get(url, headers=headers, timeout=10)
         response.raise_for_status()
 
         # Parse the HTML content